@@ -2,4 +2,18 @@
 
 cd $PHYSICS_TOP/trace/trace
 
-pydm main.py "$@" &
+# Stamp the version into _version.py so Trace never has to ask git at
+# startup. It is restamped whenever the checkout has changed since, e.g.
+# after a deploy pulls a new tag.
+if [ ! -f _version.py ] || [ ../.git/index -nt _version.py ]; then
+    python utilities/version.py > /dev/null || echo "Unable to stamp the Trace version" >&2
+fi
+
+# With TRACE_SERVER set, open a window in the running Trace server if there
+# is one, otherwise start Trace as the server for later launches
+if [ -n "$TRACE_SERVER" ]; then
+    python launch_client.py "$@" && exit 0
+    pydm main.py --server "$@" &
+else
+    pydm main.py "$@" &
+fi
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Trace's modules import each other from the trace directory
+TRACE_DIR = Path(__file__).resolve().parent / "trace"
+sys.path.insert(0, str(TRACE_DIR))
+
+# Default to rendering offscreen so benchmarks can run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks import (  # noqa: E402
+    SCENARIOS,
+    write_report,
+    run_benchmarks,
+    find_regressions,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Trace's performance benchmarks against a stub archiver.")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run, default all: {', '.join(SCENARIOS)}")
+    parser.add_argument("-o", "--output", default="benchmark_report.json", help="File to write the JSON report to")
+    parser.add_argument("-b", "--baseline", help="Previous report to check for regressions against")
+    parser.add_argument("-t", "--threshold", type=float, default=1.25, help="Slowdown ratio counted as a regression")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Timed runs of each scenario")
+    parser.add_argument("-w", "--warmup", type=int, default=1, help="Untimed runs of each scenario before timing")
+    parser.add_argument("-s", "--scale", type=float, default=1.0, help="Multiplier for the size of each workload")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the stub archiver waits per request")
+    parser.add_argument("--sample_period", type=float, default=1.0, help="Seconds between archived samples")
+    args = parser.parse_args()
+    output = Path(args.output).resolve()
+    baseline = Path(args.baseline).resolve() if args.baseline else None
+
+    # Trace loads its assets relative to the working directory
+    os.chdir(TRACE_DIR)
+
+    report = run_benchmarks(
+        args.scenarios,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        scale=args.scale,
+        latency=args.latency,
+        sample_period=args.sample_period,
+    )
+    write_report(report, output)
+
+    for name, result in report["scenarios"].items():
+        if result["median"] is None:
+            print(f"{name:<28} FAILED {'; '.join(result['errors'])}")
+        else:
+            print(f"{name:<28} median {result['median']:8.3f} s  min {result['min']:8.3f} s  {result['metrics']}")
+
+    if baseline:
+        regressions = find_regressions(report, json.loads(baseline.read_text()), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,4 @@
+from .stub_archiver import StubArchiver
+from .synthetic_pv import SyntheticPVSource
+from .scenarios import SCENARIOS, BenchmarkContext, Stopwatch, settle
+from .runner import run_benchmarks, find_regressions, write_report
@@ -0,0 +1,152 @@
+import os
+import json
+import platform
+import statistics
+from pathlib import Path
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+from pydm import PyDMApplication
+
+from config import logger
+from utilities import get_version
+from benchmarks import (
+    SCENARIOS,
+    Stopwatch,
+    StubArchiver,
+    BenchmarkContext,
+    SyntheticPVSource,
+    settle,
+)
+
+MAIN_FILE = Path(__file__).parent.parent / "main.py"
+
+
+def run_benchmarks(
+    scenarios: list[str] = None,
+    repeat: int = 3,
+    warmup: int = 1,
+    scale: float = 1.0,
+    latency: float = 0.0,
+    sample_period: float = 1.0,
+) -> dict:
+    """Run benchmark scenarios against a full Trace display backed by a stub
+    archiver and synthetic live data.
+
+    Parameters
+    ----------
+    scenarios : list[str], optional
+        Names of the scenarios to run, by default all of them.
+    repeat : int, optional
+        Number of timed runs of each scenario, by default 3.
+    warmup : int, optional
+        Number of untimed runs of each scenario before the timed runs, by default 1.
+    scale : float, optional
+        Multiplier for the size of each scenario's workload, by default 1.0.
+    latency : float, optional
+        Seconds the stub archiver waits before each response, by default 0.0.
+    sample_period : float, optional
+        Seconds between the stub archiver's samples, by default 1.0.
+
+    Returns
+    -------
+    dict
+        The benchmark report.
+    """
+    names = scenarios or list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark scenarios: {', '.join(sorted(unknown))}")
+
+    archiver = StubArchiver(sample_period=sample_period, latency=latency, pv_count=max(int(200_000 * scale), 100))
+    archiver.start()
+    os.environ["PYDM_ARCHIVER_URL"] = archiver.url
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "version": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"repeat": repeat, "scale": scale, "latency": latency, "sample_period": sample_period},
+        "scenarios": {},
+    }
+
+    app = PyDMApplication(ui_file=str(MAIN_FILE), command_line_args=[], hide_nav_bar=True)
+    try:
+        display = app.main_window.display_widget()
+        pv_source = SyntheticPVSource(parent=display)
+
+        # The request cooldown debounces interactive zooming and panning;
+        # remove it so scenarios measure fetching and drawing, not waiting
+        display.plot.request_cooldown = 0
+
+        with TemporaryDirectory() as work_dir:
+            context = BenchmarkContext(display, archiver, pv_source, Path(work_dir), scale)
+            for name in names:
+                logger.info(f"Running benchmark: {name}")
+                runs, errors, metrics = [], [], {}
+                for i in range(warmup + repeat):
+                    stopwatch = Stopwatch()
+                    try:
+                        metrics = SCENARIOS[name](context, stopwatch)
+                    except TimeoutError as e:
+                        # Record the failure and keep going so one stuck scenario
+                        # does not prevent reporting on the others
+                        logger.error(f"Benchmark {name} failed: {e}")
+                        errors.append(str(e))
+                        continue
+                    finally:
+                        settle(context)
+                    if i >= warmup:
+                        runs.append(stopwatch.elapsed)
+
+                report["scenarios"][name] = {
+                    "runs": runs,
+                    "min": min(runs) if runs else None,
+                    "median": statistics.median(runs) if runs else None,
+                    "metrics": metrics,
+                    "errors": errors,
+                }
+                if runs:
+                    logger.info(f"{name}: median {statistics.median(runs):.3f} s")
+    finally:
+        app.main_window.close()
+        archiver.stop()
+
+    return report
+
+
+def find_regressions(report: dict, baseline: dict, threshold: float = 1.25) -> list[str]:
+    """Compare a benchmark report against a baseline report.
+
+    Parameters
+    ----------
+    report : dict
+        The new benchmark report.
+    baseline : dict
+        A previous report to compare against.
+    threshold : float, optional
+        The ratio of median times above which a scenario has regressed, by default 1.25.
+
+    Returns
+    -------
+    list[str]
+        A description of each scenario that regressed.
+    """
+    regressions = []
+    for name, result in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or not previous["median"]:
+            continue
+        if result["median"] is None:
+            regressions.append(f"{name}: failed ({'; '.join(result['errors'])})")
+            continue
+        ratio = result["median"] / previous["median"]
+        if ratio > threshold:
+            regressions.append(f"{name}: {previous['median']:.3f} s -> {result['median']:.3f} s ({ratio:.2f}x)")
+    return regressions
+
+
+def write_report(report: dict, file_path: Path | str) -> None:
+    """Write a benchmark report as JSON."""
+    Path(file_path).write_text(json.dumps(report, indent=4))
@@ -0,0 +1,371 @@
+import json
+import time
+from pathlib import Path
+from datetime import datetime
+from collections.abc import Callable
+
+import pandas as pd
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QMessageBox, QApplication
+
+from widgets import TraceCurveItem
+
+DAY = 24 * 60 * 60
+TRC_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCENARIOS = {}
+
+
+def scenario(name: str) -> Callable:
+    """Register a benchmark scenario under the given name. Scenarios are called
+    with a BenchmarkContext and a Stopwatch, time only the work inside the
+    stopwatch, and return a dictionary of extra metrics for the report.
+
+    Parameters
+    ----------
+    name : str
+        The name used to select the scenario and to identify it in reports.
+    """
+
+    def register(func: Callable) -> Callable:
+        SCENARIOS[name] = func
+        return func
+
+    return register
+
+
+class Stopwatch:
+    """Accumulates the time spent inside any number of ``with`` blocks."""
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self._start = None
+
+    def __enter__(self) -> "Stopwatch":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed += time.perf_counter() - self._start
+
+
+class SignalCounter:
+    """Counts emissions of a Qt signal so a scenario can wait for them.
+
+    Parameters
+    ----------
+    signal : Signal
+        The bound signal to count.
+    """
+
+    def __init__(self, signal):
+        self.count = 0
+        self._signal = signal
+        self._signal.connect(self._increment)
+
+    def _increment(self, *args) -> None:
+        self.count += 1
+
+    def wait_for(self, count: int, timeout: float = 60.0) -> None:
+        """Process events until the signal has been emitted ``count`` times in total."""
+        wait_until(lambda: self.count >= count, timeout)
+
+    def disconnect(self) -> None:
+        """Stop counting emissions."""
+        self._signal.disconnect(self._increment)
+
+
+class BenchmarkContext:
+    """The application state shared by every scenario in a benchmark run.
+
+    Parameters
+    ----------
+    display : TraceDisplay
+        The Trace display under test.
+    archiver : StubArchiver
+        The stub archiver the display is configured to use.
+    pv_source : SyntheticPVSource
+        The source of live samples for the display's curves.
+    work_dir : Path
+        A directory for files created by scenarios.
+    scale : float, optional
+        Multiplier for the size of each scenario's workload, by default 1.0.
+    """
+
+    def __init__(self, display, archiver, pv_source, work_dir, scale: float = 1.0):
+        self.display = display
+        self.archiver = archiver
+        self.pv_source = pv_source
+        self.work_dir = work_dir
+        self.scale = scale
+
+    def scaled(self, count: int) -> int:
+        """Scale a workload size, keeping at least one item."""
+        return max(int(count * self.scale), 1)
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float = 60.0) -> None:
+    """Process Qt events until the predicate is true.
+
+    Raises
+    ------
+    TimeoutError
+        If the predicate is still false after ``timeout`` seconds.
+    """
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"Timed out after {timeout} s")
+        QApplication.processEvents()
+        time.sleep(0.001)
+
+
+def settle(context: BenchmarkContext, quiet: float = 0.2, timeout: float = 60.0) -> None:
+    """Process events until the plot has no outstanding archive requests and
+    the stub archiver has been idle for ``quiet`` seconds, so work from one
+    scenario does not leak into the next.
+    """
+    plot = context.display.plot
+    deadline = time.perf_counter() + timeout
+    last_count, last_change = context.archiver.request_count, time.perf_counter()
+    while time.perf_counter() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.005)
+        if context.archiver.request_count != last_count:
+            last_count, last_change = context.archiver.request_count, time.perf_counter()
+        busy = plot._pending_archive_responses > 0 or plot._archive_request_queued
+        if not busy and time.perf_counter() - last_change > quiet:
+            return
+
+
+def accept_modal_dialog() -> None:
+    """Accept the active modal message box, if there is one."""
+    dialog = QApplication.activeModalWidget()
+    if isinstance(dialog, QMessageBox):
+        dialog.accept()
+
+
+def clear_plot(context: BenchmarkContext) -> None:
+    """Remove every axis and curve from the display, accepting the
+    confirmation dialog shown for each axis, and reset the view to the last
+    hour so earlier scenarios do not change the work done by later ones.
+    """
+    context.pv_source.clear()
+    timer = QTimer()
+    timer.timeout.connect(accept_modal_dialog)
+    timer.start(0)
+    try:
+        context.display.control_panel.clear_all()
+    finally:
+        timer.stop()
+
+    # Replies aborted by the archiver plugin's timeout are never counted as
+    # received, so reset the plot's request bookkeeping with its curves
+    plot = context.display.plot
+    plot._pending_archive_responses = 0
+    plot._archive_request_queued = False
+
+    end = time.time()
+    plot.setXRange(end - 3600, end, padding=0)
+    settle(context)
+
+
+def write_trc(context: BenchmarkContext, pvs: list[str], start: float, end: float) -> Path:
+    """Write a Trace config file plotting the given PVs over a fixed time range.
+    Curves use unconfigured local channels, so they never connect to a control
+    system and receive live samples only from the synthetic PV source.
+
+    Returns
+    -------
+    Path
+        The path of the written file.
+    """
+    curves = [
+        {
+            "useArchiveData": True,
+            "liveData": True,
+            "channel": f"loc://{pv}",
+            "name": pv,
+            "color": "#008cf9",
+            "lineStyle": 1,
+            "lineWidth": 1,
+            "symbolSize": 10,
+            "yAxisName": f"Axis {i % 4}",
+        }
+        for i, pv in enumerate(pvs)
+    ]
+    axes = [{"name": f"Axis {i}", "orientation": "left", "autoRange": True} for i in range(min(len(pvs), 4))]
+    config = {
+        "archiver_url": context.archiver.url,
+        "plot": {"title": "Benchmark", "xGrid": False, "yGrid": False, "legend": False},
+        "time_axis": {
+            "name": "Main Time Axis",
+            "start": datetime.fromtimestamp(start).strftime(TRC_TIME_FORMAT),
+            "end": datetime.fromtimestamp(end).strftime(TRC_TIME_FORMAT),
+            "location": "bottom",
+        },
+        "y-axes": axes,
+        "curves": curves,
+        "formula": [],
+    }
+
+    file_path = context.work_dir / f"benchmark_{len(pvs)}_curves.trc"
+    file_path.write_text(json.dumps(config, indent=4))
+    return file_path
+
+
+def load_curves(context: BenchmarkContext, count: int, span: float) -> list[TraceCurveItem]:
+    """Open a config with ``count`` curves showing the last ``span`` seconds,
+    and wait for every curve's archive data.
+
+    Returns
+    -------
+    list[TraceCurveItem]
+        The curves on the plot.
+    """
+    plot = context.display.plot
+    end = time.time()
+    file_path = write_trc(context, context.archiver.pv_names[:count], end - span, end)
+
+    clear_plot(context)
+    context.display.file_handler.open_file(file_path)
+    wait_until(lambda: len(plot._curves) == count and all(c.archive_points_accumulated for c in plot._curves))
+
+    curves = [c for c in plot._curves if isinstance(c, TraceCurveItem)]
+    for curve in curves:
+        context.pv_source.add_curve(curve)
+    return curves
+
+
+@scenario("open_100_curve_trc")
+def open_100_curve_trc(context: BenchmarkContext, stopwatch: Stopwatch) -> dict:
+    """Open a config file with 100 curves and draw the first frame once every
+    curve has its archive data.
+    """
+    count = context.scaled(100)
+    plot = context.display.plot
+    end = time.time()
+    file_path = write_trc(context, context.archiver.pv_names[:count], end - 3600, end)
+    clear_plot(context)
+
+    with stopwatch:
+        context.display.file_handler.open_file(file_path)
+        wait_until(lambda: len(plot._curves) == count and all(c.archive_points_accumulated for c in plot._curves))
+        plot.redrawPlot()
+
+    settle(context)
+    return {"curves": len(plot._curves), "archive_points": sum(c.archive_points_accumulated for c in plot._curves)}
+
+
+@scenario("pan_1_week")
+def pan_1_week(context: BenchmarkContext, stopwatch: Stopwatch) -> dict:
+    """Step a one day view of 10 curves back through the last week, waiting
+    for the archive data of each day and drawing it.
+    """
+    plot = context.display.plot
+    load_curves(context, context.scaled(10), DAY)
+    settle(context)
+
+    requests_before = context.archiver.request_count
+    finished = SignalCounter(plot.archive_request_finished)
+    end = time.time()
+    try:
+        with stopwatch:
+            for day in range(1, 8):
+                context.display.set_plot_timerange((end - (day + 1) * DAY, end - day * DAY))
+                finished.wait_for(day)
+                plot.redrawPlot()
+    finally:
+        finished.disconnect()
+
+    settle(context)
+    return {"steps": 7, "archive_requests": context.archiver.request_count - requests_before}
+
+
+@scenario("page_back_1_week")
+def page_back_1_week(context: BenchmarkContext, stopwatch: Stopwatch) -> dict:
+    """Page a one day view of 10 curves back through the last week like a
+    user reading each day, timing only the wait for each day to be drawn.
+    The pause between pages gives the archive prefetcher time to work.
+    """
+    plot = context.display.plot
+    load_curves(context, context.scaled(10), DAY)
+    settle(context)
+
+    requests_before = context.archiver.request_count
+    finished = SignalCounter(plot.archive_request_finished)
+    end = time.time()
+    try:
+        for day in range(1, 8):
+            with stopwatch:
+                context.display.set_plot_timerange((end - (day + 1) * DAY, end - day * DAY))
+                finished.wait_for(day)
+                plot.redrawPlot()
+            settle(context)
+            wait_until(lambda: not plot.archive_prefetcher.busy)
+    finally:
+        finished.disconnect()
+
+    return {"steps": 7, "archive_requests": context.archiver.request_count - requests_before}
+
+
+@scenario("live_100_curves")
+def live_100_curves(context: BenchmarkContext, stopwatch: Stopwatch) -> dict:
+    """Draw 100 curves, each with an hour of live data, while the synthetic
+    source appends a sample to every curve before each frame.
+    """
+    frames = 50
+    plot = context.display.plot
+    load_curves(context, context.scaled(100), 3600)
+    context.pv_source.fill(3600)
+    context.display.autoScroll(True, 3600)
+    settle(context)
+
+    for _ in range(frames):
+        context.pv_source.tick()
+        with stopwatch:
+            plot.redrawPlot()
+
+    context.display.disable_auto_scroll_button.click()
+    return {"frames": frames, "mean_frame_ms": 1000 * stopwatch.elapsed / frames}
+
+
+@scenario("data_insight_1m_points")
+def data_insight_1m_points(context: BenchmarkContext, stopwatch: Stopwatch) -> dict:
+    """Request one million raw points for a PV through the Data Insight Tool's model."""
+    count = context.scaled(1_000_000)
+    model = context.display.data_insight_tool.data_vis_model
+    model.beginResetModel()
+    model.df = pd.DataFrame(columns=["Datetime", "Value", "Severity", "Source"])
+    model.endResetModel()
+
+    period = context.archiver.sample_period
+    end = (time.time() // period) * period
+    start = end - (count - 1) * period
+    replies = SignalCounter(model.reply_recieved)
+    try:
+        with stopwatch:
+            model.request_archive_data(context.archiver.pv_names[0], (start, end))
+            replies.wait_for(1)
+    finally:
+        replies.disconnect()
+
+    return {"rows": len(model.df)}
+
+
+@scenario("pv_search_200k")
+def pv_search_200k(context: BenchmarkContext, stopwatch: Stopwatch) -> dict:
+    """Search the archiver for PV names, matching 200,000 results."""
+    search = context.display.control_panel.archive_search
+    search.archive_url_textedit.setText(context.archiver.url)
+    search.search_box.setText(context.archiver.PV_PREFIX)
+
+    replies = SignalCounter(search.network_manager.finished)
+    try:
+        with stopwatch:
+            search.request_archiver_info()
+            replies.wait_for(1)
+    finally:
+        replies.disconnect()
+
+    return {"results": search.results_table_model.rowCount()}
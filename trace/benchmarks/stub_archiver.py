@@ -0,0 +1,227 @@
+import re
+import json
+import time
+from zlib import crc32
+from datetime import datetime, timezone
+from functools import lru_cache
+from threading import Thread
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+ARCHIVER_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+OPTIMIZED_RE = re.compile(r"^optimized_(\d+)\((.*)\)$")
+
+
+def parse_archiver_time(time_str: str) -> float:
+    """Convert a timestamp formatted for the Archiver Appliance to seconds since the epoch.
+
+    Parameters
+    ----------
+    time_str : str
+        The timestamp, e.g. '2024-07-16T08:00:00.000Z'.
+
+    Returns
+    -------
+    float
+        The timestamp in seconds since the epoch.
+    """
+    return datetime.strptime(time_str, ARCHIVER_TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+
+
+class StubArchiver:
+    """A local stand-in for the EPICS Archiver Appliance, serving generated data
+    over HTTP so benchmarks do not depend on a real archiver or network.
+
+    Every PV has a sample at each multiple of ``sample_period`` with a smooth,
+    deterministic value. Raw and optimized ``getData.json`` requests and
+    ``searchForPVsRegex`` requests are supported, each delayed by ``latency``.
+    Responses are cached so repeated benchmark runs measure the client rather
+    than the stub.
+
+    Parameters
+    ----------
+    sample_period : float, optional
+        Seconds between archived samples of every PV, by default 1.0.
+    latency : float, optional
+        Seconds to wait before answering each request, by default 0.0.
+    pv_count : int, optional
+        The number of PV names known to the search endpoint, by default 1000.
+    max_samples : int, optional
+        The maximum number of raw samples returned per request, by default 10,000,000.
+    host : str, optional
+        The interface to serve on, by default '127.0.0.1'.
+    port : int, optional
+        The port to serve on, by default 0 to pick any free port.
+    """
+
+    PV_PREFIX = "BENCH:PV:"
+
+    def __init__(
+        self,
+        sample_period: float = 1.0,
+        latency: float = 0.0,
+        pv_count: int = 1000,
+        max_samples: int = 10_000_000,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.sample_period = sample_period
+        self.latency = latency
+        self.max_samples = max_samples
+        self.pv_names = [f"{self.PV_PREFIX}{i:06d}" for i in range(pv_count)]
+        self.request_count = 0
+
+        self._server = ThreadingHTTPServer((host, port), StubArchiverRequestHandler)
+        self._server.daemon_threads = True
+        self._server.archiver = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """The base URL to use as PYDM_ARCHIVER_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Start serving requests on a background thread."""
+        if self._thread is None:
+            self._thread = Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests and close the server socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "StubArchiver":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def generate(self, pv: str, start: float, end: float) -> tuple[np.ndarray, np.ndarray]:
+        """Generate the archived samples of a PV between two times.
+
+        Parameters
+        ----------
+        pv : str
+            The PV name, which seeds the phase of its values.
+        start : float
+            The first timestamp to include.
+        end : float
+            The last timestamp to include.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The sample timestamps and values.
+        """
+        first = np.ceil(start / self.sample_period)
+        count = int(min(max(np.floor(end / self.sample_period) - first + 1, 0), self.max_samples))
+        times = (first + np.arange(count)) * self.sample_period
+        return times, self.values_at(pv, times)
+
+    @staticmethod
+    def values_at(pv: str, times: np.ndarray) -> np.ndarray:
+        """The value of a PV at the given times.
+
+        Parameters
+        ----------
+        pv : str
+            The PV name.
+        times : np.ndarray
+            Timestamps to evaluate the PV at.
+
+        Returns
+        -------
+        np.ndarray
+            The PV's values.
+        """
+        phase = crc32(pv.encode()) % 1000
+        return np.sin(2 * np.pi * times / 3600 + phase) + 0.1 * np.sin(times * 0.37 + phase)
+
+    @lru_cache(maxsize=256)
+    def raw_response(self, pv: str, start: float, end: float) -> bytes:
+        """Build the body of a raw getData.json response."""
+        times, values = self.generate(pv, start, end)
+        secs = np.floor(times).astype(np.int64)
+        nanos = ((times - secs) * 1e9).astype(np.int64)
+        points = ",".join(
+            f'{{"secs":{s},"nanos":{n},"val":{v:.9g},"severity":0,"status":0}}'
+            for s, n, v in zip(secs.tolist(), nanos.tolist(), values.tolist())
+        )
+        return f'[{{"meta":{{"name":{json.dumps(pv)},"PREC":"3"}},"data":[{points}]}}]'.encode()
+
+    @lru_cache(maxsize=256)
+    def optimized_response(self, pv: str, start: float, end: float, n_bins: int) -> bytes:
+        """Build the body of an optimized getData.json response. Each bin's
+        statistics are estimated from a fixed number of evaluations so large
+        ranges stay cheap to serve.
+        """
+        total = max(np.floor(end / self.sample_period) - np.ceil(start / self.sample_period) + 1, 0)
+        if total <= n_bins:
+            # The real archiver sends raw data when there are fewer samples than bins
+            return self.raw_response(pv, start, end)
+
+        edges = np.linspace(start, end, n_bins + 1)
+        probes = edges[:-1, None] + (edges[1] - edges[0]) * np.linspace(0, 1, 8, endpoint=False)
+        values = self.values_at(pv, probes)
+        stats = np.column_stack((values.mean(axis=1), values.std(axis=1), values.min(axis=1), values.max(axis=1)))
+        count = int(total // n_bins)
+        points = ",".join(
+            f'{{"secs":{int(t)},"nanos":0,"val":[{m:.9g},{s:.9g},{lo:.9g},{hi:.9g},{count}],"severity":0,"status":0}}'
+            for t, (m, s, lo, hi) in zip(edges[:-1].tolist(), stats.tolist())
+        )
+        return f'[{{"meta":{{"name":{json.dumps(pv)},"PREC":"3"}},"data":[{points}]}}]'.encode()
+
+    def search_response(self, regex: str) -> bytes:
+        """Build the body of a searchForPVsRegex response."""
+        pattern = re.compile(regex)
+        return "\n".join(name for name in self.pv_names if pattern.fullmatch(name)).encode()
+
+
+class StubArchiverRequestHandler(BaseHTTPRequestHandler):
+    """Answers Archiver Appliance requests using the server's StubArchiver."""
+
+    def do_GET(self) -> None:
+        """Route a GET request to the matching StubArchiver response."""
+        archiver = self.server.archiver
+        archiver.request_count += 1
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        time.sleep(archiver.latency)
+
+        try:
+            if url.path == "/retrieval/data/getData.json":
+                pv = query["pv"][0]
+                start = parse_archiver_time(query["from"][0])
+                end = parse_archiver_time(query["to"][0])
+                optimized = OPTIMIZED_RE.match(pv)
+                if optimized:
+                    body = archiver.optimized_response(optimized[2], start, end, int(optimized[1]))
+                else:
+                    body = archiver.raw_response(pv, start, end)
+                self._send(body, "application/json")
+            elif url.path == "/retrieval/bpl/searchForPVsRegex":
+                self._send(archiver.search_response(query.get("regex", [".*"])[0]), "text/plain")
+            else:
+                self.send_error(404)
+        except (KeyError, ValueError, re.error) as e:
+            self.send_error(400, str(e))
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        """Send a successful response with the given body."""
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """Silence the default per-request logging to stderr."""
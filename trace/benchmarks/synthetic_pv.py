@@ -0,0 +1,91 @@
+import time
+
+import numpy as np
+from qtpy.QtCore import Slot, QTimer, QObject
+
+
+class SyntheticPVSource(QObject):
+    """Feeds random-walk samples to curves at a fixed rate, standing in for
+    live PV updates so benchmarks do not need an IOC.
+
+    Samples go through ``TraceCurveItem.append_sample``, the same path as
+    values received from a live channel.
+
+    Parameters
+    ----------
+    rate_hz : float, optional
+        Updates per second for every curve, by default 10.0.
+    seed : int, optional
+        Seed for the random walk, by default 0.
+    parent : QObject, optional
+        Parent QObject for memory management, by default None.
+    """
+
+    def __init__(self, rate_hz: float = 10.0, seed: int = 0, parent: QObject = None):
+        super().__init__(parent)
+        self.rate_hz = rate_hz
+        self.samples_sent = 0
+        self._rng = np.random.default_rng(seed)
+        self._curves = []
+        self._values = np.empty(0)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.tick)
+
+    def add_curve(self, curve) -> None:
+        """Start sending samples to the given curve.
+
+        Parameters
+        ----------
+        curve : TraceCurveItem
+            The curve to send samples to.
+        """
+        self._curves.append(curve)
+        self._values = np.append(self._values, 0.0)
+
+    def clear(self) -> None:
+        """Stop sending samples to every curve."""
+        self._curves = []
+        self._values = np.empty(0)
+
+    def start(self) -> None:
+        """Start sending samples."""
+        self._timer.start(max(int(1000 / self.rate_hz), 1))
+
+    def stop(self) -> None:
+        """Stop sending samples."""
+        self._timer.stop()
+
+    def fill(self, duration: float, end: float = None) -> None:
+        """Immediately give every curve the samples the source would have sent
+        over a period of time, as if it had been running. The samples are
+        written to the curves' live buffers in bulk.
+
+        Parameters
+        ----------
+        duration : float
+            The length of the period in seconds.
+        end : float, optional
+            The end of the period, by default now.
+        """
+        end = time.time() if end is None else end
+        count = int(duration * self.rate_hz)
+        if count == 0:
+            return
+
+        times = end - duration + np.arange(1, count + 1) / self.rate_hz
+        for i, curve in enumerate(self._curves):
+            values = self._values[i] + np.cumsum(self._rng.normal(size=count))
+            curve.live_buffer.extend(times, values)
+            curve.data_changed.emit()
+            self._values[i] = values[-1]
+        self.samples_sent += count * len(self._curves)
+
+    @Slot()
+    def tick(self) -> None:
+        """Send one sample to every curve."""
+        now = time.time()
+        self._values += self._rng.normal(size=self._values.size)
+        for curve, value in zip(self._curves, self._values.tolist()):
+            curve.append_sample(now, value)
+        self.samples_sent += len(self._curves)
@@ -2,32 +2,104 @@ import os
 from json import load
 from logging import getLogger
 from pathlib import Path
+from functools import lru_cache
+from collections.abc import Mapping
 
 from qtpy.QtGui import QColor
 
 config_file = Path(__file__).parent / "config.json"
-with config_file.open() as f:
-    loaded_json = load(f)
 
 light_stylesheet = Path(__file__).parent / "stylesheets/light_mode.qss"
 dark_stylesheet = Path(__file__).parent / "stylesheets/dark_mode.qss"
 
 logger = getLogger("")
 
-datetime_pv = loaded_json["datetime_pv"]
 
-# Set default save file directory
-# If the directory does not exist, set it to the home directory
-save_file_dir = Path(os.path.expandvars(loaded_json["save_file_dir"]))
-if not save_file_dir.is_dir():
-    logger.warning(f"Config file's save_file_dir path does not exist: {save_file_dir}")
-    save_file_dir = Path.home()
-    logger.warning(f"Setting save_file_dir to home: {save_file_dir}")
+@lru_cache(maxsize=1)
+def load_config() -> dict:
+    """Read and parse config.json the first time a setting is needed."""
+    with config_file.open() as f:
+        return load(f)
+
+
+class ColorPalettes(Mapping):
+    """Read-only mapping of palette names to their colors. Each palette's
+    QColors are only created the first time that palette is looked up, so
+    unused palettes cost nothing at startup.
+
+    Parameters
+    ----------
+    hex_codes : dict[str, list[str]]
+        Palette names mapped to their colors' hex codes.
+    """
+
+    def __init__(self, hex_codes: dict[str, list[str]]):
+        self._hex_codes = hex_codes
+        self._palettes: dict[str, list[QColor]] = {}
+
+    def __getitem__(self, name: str) -> list[QColor]:
+        if name not in self._palettes:
+            self._palettes[name] = [QColor(hex_code) for hex_code in self._hex_codes[name]]
+        return self._palettes[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._hex_codes
+
+    def __iter__(self):
+        return iter(self._hex_codes)
+
+    def __len__(self) -> int:
+        return len(self._hex_codes)
+
+
+def _datetime_pv() -> str:
+    return load_config()["datetime_pv"]
+
+
+def _save_file_dir() -> Path:
+    """Default save file directory. If the directory does not exist, use the
+    home directory instead.
+    """
+    save_file_dir = Path(os.path.expandvars(load_config()["save_file_dir"]))
+    if not save_file_dir.is_dir():
+        logger.warning(f"Config file's save_file_dir path does not exist: {save_file_dir}")
+        save_file_dir = Path.home()
+        logger.warning(f"Setting save_file_dir to home: {save_file_dir}")
+    return save_file_dir
+
+
+def _stall_log_file() -> Path:
+    """Event loop stalls longer than the threshold are logged to this file."""
+    return Path(os.path.expandvars(load_config().get("stall_log_file", "$HOME/.trace/stalls.log")))
+
+
+def _stall_threshold_ms() -> int:
+    return load_config().get("stall_threshold_ms", 500)
+
+
+def _color_palette() -> ColorPalettes:
+    return ColorPalettes(load_config()["color_palettes"])
+
+
+# Settings are read from config.json when first imported or accessed, and
+# then cached as module attributes
+_LAZY_SETTINGS = {
+    "loaded_json": load_config,
+    "datetime_pv": _datetime_pv,
+    "save_file_dir": _save_file_dir,
+    "stall_log_file": _stall_log_file,
+    "stall_threshold_ms": _stall_threshold_ms,
+    "color_palette": _color_palette,
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _LAZY_SETTINGS[name]()
+    globals()[name] = value
+    return value
 
-# Set color palettes from loaded json file
-color_palette: dict[str, list[QColor]] = {}
-for name, hex_codes in loaded_json["color_palettes"].items():
-    color_palette[name] = [QColor(hex_code) for hex_code in hex_codes]
 
 # Set the default thread count for numexpr
 # 8 is determined to be a safe default for most systems according to numxerpr documentation
@@ -1,2 +1,3 @@
 from .trace_file_convert import TraceFileConverter, PathAction
 from .file_handler import TraceFileHandler
+from .live_recording import LiveRecorder, LiveReplayer, read_recording
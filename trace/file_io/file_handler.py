@@ -7,7 +7,8 @@ from qtpy.QtWidgets import QFileDialog, QMessageBox
 
 from pydm.widgets.archiver_time_plot import PyDMArchiverTimePlot
 
-from config import logger, save_file_dir
+import config
+from config import logger
 from file_io import TraceFileConverter
 from utilities import IOTimeParser
 
@@ -45,9 +46,22 @@ class TraceFileHandler(QObject):
         super().__init__(parent)
         self.plot = plot
         self.current_file = None
-        self.current_dir = save_file_dir
+        self._current_dir = None
         self.converter = TraceFileConverter()
 
+    @property
+    def current_dir(self) -> Path:
+        """The directory file dialogs open in. Defaults to the configured
+        save file directory, which is only checked when first needed.
+        """
+        if self._current_dir is None:
+            self._current_dir = config.save_file_dir
+        return self._current_dir
+
+    @current_dir.setter
+    def current_dir(self, directory: Path) -> None:
+        self._current_dir = directory
+
     @Slot()
     def save_file(self) -> None:
         """Export the current plot data to the current file"""
@@ -0,0 +1,364 @@
+import json
+import time
+from pathlib import Path
+from weakref import WeakSet
+
+import numpy as np
+from qtpy.QtCore import Slot, QTimer, Signal, QObject
+
+from config import logger
+from services import normalize_address
+
+RECORDING_MAGIC = b"TRACEREC"
+RECORDING_VERSION = 1
+HEADER_SIZE = 65536
+
+# Fixed size records so the file can be memory mapped as a single array
+RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("channel", "<u4"), ("value", "<f8")])
+
+
+def recording_header_size(channels: list[str]) -> int:
+    """The number of bytes a recording header listing the channels needs,
+    which must not exceed HEADER_SIZE.
+    """
+    return len(RECORDING_MAGIC) + len(json.dumps({"version": RECORDING_VERSION, "channels": channels}).encode())
+
+
+def write_recording_header(file, channels: list[str]) -> None:
+    """Write the fixed size header at the start of a recording file.
+
+    Parameters
+    ----------
+    file : BinaryIO
+        The recording file, opened for writing.
+    channels : list[str]
+        The channel addresses, indexed by the records' channel field.
+    """
+    if recording_header_size(channels) > HEADER_SIZE:
+        raise ValueError(f"Too many channels to record: {len(channels)}")
+    header = json.dumps({"version": RECORDING_VERSION, "channels": channels}).encode()
+
+    file.seek(0)
+    file.write(RECORDING_MAGIC + header.ljust(HEADER_SIZE - len(RECORDING_MAGIC)))
+
+
+def read_recording(file_path: Path | str) -> tuple[list[str], np.memmap]:
+    """Open a recording file without loading its records into memory.
+
+    Parameters
+    ----------
+    file_path : Path | str
+        Path to the recording file.
+
+    Returns
+    -------
+    tuple[list[str], np.memmap]
+        The recorded channel addresses, and a read-only memory map of the
+        records in the order they were received.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a Trace recording.
+    """
+    file_path = Path(file_path)
+    with file_path.open("rb") as file:
+        if file.read(len(RECORDING_MAGIC)) != RECORDING_MAGIC:
+            raise ValueError(f"Not a Trace recording: {file_path}")
+        header = json.loads(file.read(HEADER_SIZE - len(RECORDING_MAGIC)))
+
+    # Ignore a partially written record at the end of the file
+    n_records = (file_path.stat().st_size - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if n_records <= 0:
+        return header["channels"], np.empty(0, dtype=RECORD_DTYPE)
+    records = np.memmap(file_path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n_records,))
+    return header["channels"], records
+
+
+class LiveRecorder(QObject):
+    """Records live samples from curves to an append-only file. Samples are
+    buffered in memory and appended to the file periodically, so recording
+    does not write to disk on every update.
+
+    Samples are recorded from the shared live channels the curves follow,
+    once per PV however many curves show it. When several curves follow a
+    PV through different filters, the least filtered channel is recorded.
+    The channels recorded are updated as curves are removed, change PV, or
+    change channel. Recording stops, with an error logged, if a new channel
+    would not fit in the file's fixed size header.
+
+    Attributes
+    ----------
+    stopped : Signal
+        Emitted when recording stops, whether stopped by the user or because
+        the header is full.
+    """
+
+    stopped = Signal()
+
+    FLUSH_INTERVAL_MS = 1000
+
+    def __init__(self, parent: QObject = None):
+        """Initialize an idle recorder.
+
+        Parameters
+        ----------
+        parent : QObject, optional
+            Parent QObject for memory management, by default None.
+        """
+        super().__init__(parent)
+        self.file_path = None
+        self._file = None
+        self._channels = []
+        self._indexes = {}
+        self._pending = []
+        self._curves = WeakSet()
+        self._sources = {}
+        self._header_stale = False
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self.flush)
+
+    @property
+    def recording(self) -> bool:
+        """Whether the recorder currently has a file open."""
+        return self._file is not None
+
+    def start(self, file_path: Path | str, curves: list = ()) -> None:
+        """Start recording to a new file, replacing any existing file.
+
+        Parameters
+        ----------
+        file_path : Path | str
+            The file to record to.
+        curves : list[TraceCurveItem], optional
+            Curves to start recording immediately, by default none.
+        """
+        self.stop()
+        self.file_path = Path(file_path)
+        self._file = self.file_path.open("wb")
+        self._channels = []
+        self._indexes = {}
+        write_recording_header(self._file, self._channels)
+        logger.info(f"Recording live data to {self.file_path}")
+
+        for curve in curves:
+            self.add_curve(curve)
+        if self.recording:
+            self._flush_timer.start(self.FLUSH_INTERVAL_MS)
+
+    def add_curve(self, curve) -> None:
+        """Record the live samples of the given curve's PV.
+
+        Parameters
+        ----------
+        curve : TraceCurveItem
+            The curve to record samples from.
+        """
+        if not self.recording or curve in self._curves:
+            return
+        self._curves.add(curve)
+        curve.live_channel_changed.connect(self.update_sources)
+        self.update_sources()
+
+    @Slot()
+    def update_sources(self) -> None:
+        """Record from one shared live channel per PV of the recorded curves,
+        and stop recording channels no curve follows any more.
+        """
+        if not self.recording:
+            return
+        wanted = {}
+        for curve in self._curves:
+            channel = curve.live_channel
+            if channel is None:
+                continue
+            current = wanted.get(channel.address)
+            if current is None or channel.filters < current[0].filters:
+                wanted[channel.address] = (channel, curve.address)
+
+        for address, (channel, record_sample) in list(self._sources.items()):
+            if address not in wanted or wanted[address][0] is not channel:
+                self._disconnect_source(channel, record_sample)
+                del self._sources[address]
+
+        for address, (channel, curve_address) in wanted.items():
+            if address in self._sources:
+                continue
+            if address not in self._indexes:
+                if recording_header_size([*self._channels, curve_address]) > HEADER_SIZE:
+                    logger.error(
+                        f"Stopped recording to {self.file_path}: the header cannot list more than "
+                        f"{len(self._channels)} channels"
+                    )
+                    self.stop()
+                    return
+                self._indexes[address] = len(self._channels)
+                self._channels.append(curve_address)
+                self._header_stale = True
+            index = self._indexes[address]
+
+            def record_sample(timestamp: float, value: float, index: int = index) -> None:
+                self._pending.append((timestamp, index, value))
+
+            channel.sample_received.connect(record_sample)
+            self._sources[address] = (channel, record_sample)
+
+    @staticmethod
+    def _disconnect_source(channel: QObject, record_sample) -> None:
+        """Stop recording a shared live channel."""
+        try:
+            channel.sample_received.disconnect(record_sample)
+        except (RuntimeError, TypeError):
+            # The channel was already deleted
+            pass
+
+    @Slot()
+    def flush(self) -> None:
+        """Append all buffered samples to the recording file."""
+        if not self.recording:
+            return
+        if self._header_stale:
+            write_recording_header(self._file, self._channels)
+            self._file.seek(0, 2)
+            self._header_stale = False
+        if self._pending:
+            records, self._pending = self._pending, []
+            self._file.write(np.array(records, dtype=RECORD_DTYPE).tobytes())
+        self._file.flush()
+
+    def stop(self) -> None:
+        """Write any buffered samples and close the recording file."""
+        if not self.recording:
+            return
+        self._flush_timer.stop()
+        for channel, record_sample in self._sources.values():
+            self._disconnect_source(channel, record_sample)
+        self._sources = {}
+        for curve in self._curves:
+            try:
+                curve.live_channel_changed.disconnect(self.update_sources)
+            except (RuntimeError, TypeError):
+                # The curve was already deleted
+                pass
+        self._curves = WeakSet()
+        self.flush()
+        self._file.close()
+        self._file = None
+        logger.info(f"Stopped recording live data to {self.file_path}")
+        self.stopped.emit()
+
+
+class LiveReplayer(QObject):
+    """Feeds a recording back through curves as if the samples were arriving
+    live. Sample timestamps are shifted to the time of playback and scaled by
+    the replay speed. The curves are expected to be detached from live data
+    and the archiver while the recording is replayed.
+
+    Attributes
+    ----------
+    finished : Signal
+        Emitted when the replay ends, having replayed every recorded sample
+        or been stopped.
+    """
+
+    finished = Signal()
+
+    TICK_INTERVAL_MS = 20
+
+    def __init__(self, parent: QObject = None):
+        """Initialize an idle replayer.
+
+        Parameters
+        ----------
+        parent : QObject, optional
+            Parent QObject for memory management, by default None.
+        """
+        super().__init__(parent)
+        self.channels = []
+        self.speed = 1.0
+        self._records = np.empty(0, dtype=RECORD_DTYPE)
+        self._curves = {}
+        self._position = 0
+        self._recording_start = 0.0
+        self._replay_start = 0.0
+
+        self._tick_timer = QTimer(self)
+        self._tick_timer.timeout.connect(self.tick)
+
+    @property
+    def replaying(self) -> bool:
+        """Whether a recording is currently being replayed."""
+        return self._tick_timer.isActive()
+
+    def load(self, file_path: Path | str) -> list[str]:
+        """Load a recording to be replayed.
+
+        Parameters
+        ----------
+        file_path : Path | str
+            Path to the recording file.
+
+        Returns
+        -------
+        list[str]
+            The channel addresses in the recording.
+        """
+        self.stop()
+        self.channels, self._records = read_recording(file_path)
+        logger.info(f"Loaded {len(self._records)} samples for {len(self.channels)} channels from {file_path}")
+        return self.channels
+
+    def start(self, curves: list, speed: float = 1.0) -> None:
+        """Start replaying the loaded recording into the given curves.
+
+        Parameters
+        ----------
+        curves : list[TraceCurveItem]
+            Curves to replay samples into, matched to the recording by PV.
+            Recorded channels without a matching curve are skipped, and
+            every curve showing a recorded PV is replayed into.
+        speed : float, optional
+            Replay speed relative to the recording, by default 1.0.
+        """
+        curves_by_address = {}
+        for curve in curves:
+            if curve.address:
+                curves_by_address.setdefault(normalize_address(curve.address), []).append(curve)
+        self._curves = {}
+        for i, channel in enumerate(self.channels):
+            if normalize_address(channel) in curves_by_address:
+                self._curves[i] = curves_by_address[normalize_address(channel)]
+        self.speed = max(float(speed), 1e-3)
+        self._position = 0
+        if len(self._records) == 0:
+            self.finished.emit()
+            return
+
+        self._recording_start = float(self._records["timestamp"][0])
+        self._replay_start = time.time()
+        self._tick_timer.start(self.TICK_INTERVAL_MS)
+
+    def stop(self) -> None:
+        """Stop replaying, emitting finished if a replay was running."""
+        if not self.replaying:
+            return
+        self._tick_timer.stop()
+        self.finished.emit()
+
+    @Slot()
+    def tick(self) -> None:
+        """Feed all samples that are due at the current replay time."""
+        now = time.time()
+        recorded_now = self._recording_start + (now - self._replay_start) * self.speed
+        end = self._position + int(np.searchsorted(self._records["timestamp"][self._position :], recorded_now, "right"))
+
+        batch = np.asarray(self._records[self._position : end])
+        self._position = end
+        timestamps = self._replay_start + (batch["timestamp"] - self._recording_start) / self.speed
+        for timestamp, channel, value in zip(timestamps, batch["channel"], batch["value"]):
+            for curve in self._curves.get(int(channel), ()):
+                curve.append_sample(float(timestamp), float(value))
+
+        if self._position >= len(self._records):
+            self.stop()
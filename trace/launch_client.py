@@ -0,0 +1,75 @@
+"""
+launch_client.py
+
+Hands a Trace launch to a resident Trace server, if one is running. Only the
+standard library is imported so a forwarded launch never pays the Qt and
+PyDM import cost.
+
+Exits with 0 if the launch was forwarded, or 1 if Trace must be started.
+Run with --stop to make the resident Trace server quit.
+"""
+
+import sys
+import json
+import socket
+import tempfile
+from getpass import getuser
+from pathlib import Path
+
+
+def socket_path() -> Path:
+    """The path of the current user's Trace server socket."""
+    return Path(tempfile.gettempdir()) / f"trace-{getuser()}.sock"
+
+
+def send_request(request: dict, timeout: float = 2.0) -> bool:
+    """Send a request to the running Trace server.
+
+    Parameters
+    ----------
+    request : dict
+        The request, see TraceInstanceServer for the supported requests.
+    timeout : float, optional
+        Seconds to wait for the server to reply, by default 2.0.
+
+    Returns
+    -------
+    bool
+        True if the server accepted the request, False if there is no server.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+
+    message = json.dumps(request).encode() + b"\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path()))
+            client.sendall(message)
+            return client.makefile("rb").readline().strip() == b"ok"
+    except OSError:
+        return False
+
+
+def forward_launch(args: list[str], timeout: float = 2.0) -> bool:
+    """Ask the running Trace server to open a new window.
+
+    Parameters
+    ----------
+    args : list[str]
+        Trace command line arguments for the new window.
+    timeout : float, optional
+        Seconds to wait for the server to reply, by default 2.0.
+
+    Returns
+    -------
+    bool
+        True if the server opened the window, False if there is no server.
+    """
+    return send_request({"args": args}, timeout)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--stop"]:
+        sys.exit(0 if send_request({"quit": True}) else 1)
+    sys.exit(0 if forward_launch(sys.argv[1:]) else 1)
@@ -1,13 +1,13 @@
 import os
 import argparse
-import subprocess
+from time import perf_counter, process_time
 from socket import gethostname
 from getpass import getuser
 from pathlib import Path
 from datetime import datetime
 
 from qtpy.QtGui import QFont, QColor, QImage, QKeySequence
-from qtpy.QtCore import Qt, Slot, QSize, Signal, QBuffer, QIODevice, QSettings
+from qtpy.QtCore import Qt, Slot, QSize, QTimer, Signal, QBuffer, QIODevice, QSettings
 from qtpy.QtWidgets import (
     QMenu,
     QLabel,
@@ -25,21 +25,92 @@ from qtpy.QtWidgets import (
     QVBoxLayout,
     QApplication,
     QButtonGroup,
+    QInputDialog,
     QAbstractButton,
 )
 from pyqtgraph.exporters import ImageExporter
 
 from pydm import Display
-from pydm.widgets import PyDMLabel, PyDMArchiverTimePlot
+from pydm.widgets import PyDMLabel
+from pydm.main_window import PyDMMainWindow
 from pydm.utilities.macro import parse_macro_string
 
-from config import logger, datetime_pv
-from file_io import PathAction, TraceFileHandler
-from widgets import ControlPanel, ElogPostModal, DataInsightTool, PlotSettingsModal
-from services import Theme, IconColors, ThemeManager, get_user, post_entry
+import config
+from config import logger
+from file_io import PathAction, LiveRecorder, LiveReplayer, TraceFileHandler
+from widgets import TracePlot, ControlPanel, TraceCurveItem, PlotSettingsModal
+from services import (
+    Theme,
+    IconColors,
+    ThemeManager,
+    StallWatchdog,
+    MetricsMonitor,
+    RenderScheduler,
+    TraceInstanceServer,
+    metrics,
+    pv_metadata,
+    normalize_address,
+)
+from utilities import VersionAction
 
 DISABLE_AUTO_SCROLL = -2  # Using -2 as invalid since QButtonGroups use -1 as invalid
 
+# Windows opened in this process, kept referenced until they are closed
+open_windows = set()
+
+
+def track_window(window: PyDMMainWindow) -> None:
+    """Keep a Trace window alive until it is closed, then delete it. If it
+    was the application's main window, the most recent remaining window
+    takes its place.
+
+    Parameters
+    ----------
+    window : PyDMMainWindow
+        The window to track.
+    """
+    app = QApplication.instance()
+
+    def forget_window():
+        open_windows.discard(window)
+        if app.main_window is window:
+            app.main_window = next(iter(open_windows), None)
+
+    window.setAttribute(Qt.WA_DeleteOnClose)
+    window.destroyed.connect(forget_window)
+    open_windows.add(window)
+
+
+def open_trace_window(args: list[str]) -> PyDMMainWindow:
+    """Open a new Trace window in this process, as if Trace had been
+    launched with the given command line arguments.
+
+    Parameters
+    ----------
+    args : list[str]
+        Command line arguments for the new window's display.
+
+    Returns
+    -------
+    PyDMMainWindow
+        The new window.
+    """
+    app = QApplication.instance()
+    window = PyDMMainWindow(
+        hide_nav_bar=app.hide_nav_bar,
+        hide_menu_bar=app.hide_menu_bar,
+        hide_status_bar=app.hide_status_bar,
+    )
+    track_window(window)
+
+    # TraceDisplay configures the window it is opened in through app.main_window
+    app.main_window = window
+    window.open(__file__, args=args)
+    window.show()
+    window.raise_()
+    window.activateWindow()
+    return window
+
 
 class TraceDisplay(Display):
     """Main display widget for the Trace application.
@@ -53,6 +124,9 @@ class TraceDisplay(Display):
     gridline_opacity_change = Signal(int)
     set_all_y_axis_gridlines = Signal(bool)
 
+    # Startup phases timed in __init__, in the order they run
+    STARTUP_PHASES = ("theme", "build_ui", "configure_app", "icons", "parse_args", "load_inputs")
+
     def __init__(self, parent=None, args=None, macros=None) -> None:
         """Initialize the Trace display and construct the UI.
 
@@ -76,25 +150,156 @@ class TraceDisplay(Display):
         if not app.main_window:
             return
 
-        self.theme_manager = ThemeManager(
-            app,
-        )
-        settings = QSettings()
-        self.is_dark_mode = settings.value("isDarkTheme", False, type=bool)
-        self.build_ui()
-        self.configure_app(app)
-        self.setup_icons()
+        # Time each startup phase, reported once the event loop is running
+        self._startup_start = perf_counter()
+        self._startup_cpu_before = process_time()
+
+        with metrics.timer("startup.theme"):
+            self.theme_manager = ThemeManager(
+                app,
+            )
+            settings = QSettings()
+            self.is_dark_mode = settings.value("isDarkTheme", False, type=bool)
+        with metrics.timer("startup.build_ui"):
+            self.build_ui()
+        with metrics.timer("startup.configure_app"):
+            self.configure_app(app)
+        with metrics.timer("startup.icons"):
+            self.setup_icons()
+        self.theme_manager.theme_changed.connect(self.on_theme_changed)
         self.resize(1000, 600)
 
         # Set plot's timerange after the UI is built
         default_button = self.timespan_buttons.button(3600)
         default_button.setChecked(True)
 
-        input_file, startup_pvs = self.parse_cli_args(args, macros)
-        if input_file:
-            self.file_handler.open_file(input_file)
-        for pv in startup_pvs:
-            self.layout().itemAt(0).widget().widget(1).add_curve(pv)
+        with metrics.timer("startup.parse_args"):
+            input_file, startup_pvs, startup_options = self.parse_cli_args(args, macros)
+        if startup_options["server"] and app.findChild(TraceInstanceServer) is None:
+            self.start_launch_server(app)
+        with metrics.timer("startup.load_inputs"):
+            if startup_options["metrics_file"]:
+                self.metrics_monitor.start_export(startup_options["metrics_file"], startup_options["metrics_interval"])
+            if input_file:
+                self.file_handler.open_file(input_file)
+            for pv in startup_pvs:
+                self.layout().itemAt(0).widget().widget(1).add_curve(pv)
+            if startup_options["replay"]:
+                self.start_replay(startup_options["replay"], startup_options["replay_speed"])
+            if startup_options["record"]:
+                self.start_recording(startup_options["record"])
+
+        QTimer.singleShot(0, self.log_startup_times)
+
+    def start_launch_server(self, app: QApplication) -> None:
+        """Accept launches forwarded by launch_client.py, opening each in a
+        new window of this process. The process stays resident after its
+        windows are closed so later launches start quickly.
+
+        Parameters
+        ----------
+        app : QApplication
+            The instance of the QApplication.
+        """
+        server = TraceInstanceServer(app)
+        if not server.listen():
+            server.deleteLater()
+            return
+
+        server.launch_requested.connect(open_trace_window)
+        server.quit_requested.connect(app.quit)
+        app.aboutToQuit.connect(server.close)
+        app.setQuitOnLastWindowClosed(False)
+        track_window(app.main_window)
+
+    @Slot()
+    def log_startup_times(self) -> None:
+        """Log how long startup took, broken down by phase. Called when the
+        event loop first runs, after the window has been shown.
+        """
+        first_display = not metrics.timer_stats("startup.first_event")
+        total = perf_counter() - self._startup_start
+        metrics.observe("startup.first_event", total)
+        phases = ", ".join(
+            f"{phase} {metrics.timer_stats(f'startup.{phase}').get('last', 0):.3f} s" for phase in self.STARTUP_PHASES
+        )
+        message = f"Trace display ready in {total:.3f} s ({phases})"
+        if first_display:
+            message += f"; {self._startup_cpu_before:.3f} s of CPU time was spent starting Python, Qt, and PyDM first"
+        logger.info(message)
+
+    @property
+    def data_insight_tool(self) -> QWidget:
+        """The Data Insight Tool for the plot, created on first use.
+
+        Returns
+        -------
+        DataInsightTool
+            The application's Data Insight Tool window.
+        """
+        if self._data_insight_tool is None:
+            # Imported on first use to keep pandas and scipy off the startup path
+            from widgets import DataInsightTool
+
+            self._data_insight_tool = DataInsightTool(self)
+            self._data_insight_tool.plot = self.plot
+            self.control_panel.curve_list_changed.connect(self._data_insight_tool.update_pv_select_box)
+        return self._data_insight_tool
+
+    @Slot()
+    def show_data_insight_tool(self) -> None:
+        """Show the Data Insight Tool, creating it if needed."""
+        self.data_insight_tool.show()
+
+    @Slot()
+    def show_correlation_tool(self) -> None:
+        """Show the Correlation Plot, creating it if needed."""
+        if self._correlation_tool is None:
+            from widgets import CorrelationTool
+
+            self._correlation_tool = CorrelationTool(self.plot, self)
+            self.control_panel.curve_list_changed.connect(self._correlation_tool.update_curve_boxes)
+        self._correlation_tool.show()
+
+    @Slot()
+    def show_spectral_tool(self) -> None:
+        """Show the Spectral Analysis tool, creating it if needed."""
+        if self._spectral_tool is None:
+            from widgets import SpectralTool
+
+            self._spectral_tool = SpectralTool(self.plot, self)
+            self.control_panel.curve_list_changed.connect(self._spectral_tool.update_curve_boxes)
+        self._spectral_tool.show()
+
+    @Slot()
+    def show_waveform_viewer(self) -> None:
+        """Show the Waveform Viewer, creating it if needed."""
+        if self._waveform_viewer is None:
+            from widgets import WaveformViewer
+
+            self._waveform_viewer = WaveformViewer(self.plot.archive_fetcher, self)
+        self._waveform_viewer.show()
+
+    @Slot(bool)
+    def show_statistics_panel(self, visible: bool) -> None:
+        """Show or hide the statistics panel below the plot, creating it the
+        first time it is shown.
+
+        Parameters
+        ----------
+        visible : bool
+            Whether the panel should be shown.
+        """
+        if self.statistics_panel is None:
+            if not visible:
+                return
+            from widgets import StatisticsPanel
+
+            plot_side_layout = self.plot.parentWidget().layout()
+            self.statistics_panel = StatisticsPanel(self.plot, self.plot.parentWidget())
+            self.statistics_panel.setMaximumHeight(200)
+            plot_side_layout.insertWidget(plot_side_layout.indexOf(self.plot) + 1, self.statistics_panel)
+        self.statistics_panel.setVisible(visible)
 
     @property
     def gridline_opacity(self) -> int:
@@ -136,7 +341,6 @@ class TraceDisplay(Display):
         self.control_panel = ControlPanel(theme_manager=self.theme_manager)
         self.control_panel.layout().setContentsMargins(8, 0, 0, 0)
         self.control_panel.plot = self.plot
-        self.control_panel.curve_list_changed.connect(self.data_insight_tool.update_pv_select_box)
 
         # Create main splitter
         main_splitter = QSplitter(self)
@@ -176,7 +380,7 @@ class TraceDisplay(Display):
 
         background_color = "#1E1E1E" if self.theme_manager.get_current_theme() == Theme.DARK else "white"
 
-        self.plot = PyDMArchiverTimePlot(
+        self.plot = TracePlot(
             plot_side_widget,
             background=background_color,
             optimized_data_bins=5000,
@@ -189,14 +393,26 @@ class TraceDisplay(Display):
         multi_axis_plot.sigXRangeChangedManually.connect(self.disable_auto_scroll_button.click)
         plot_side_layout.addWidget(self.plot)
 
-        self.data_insight_tool = DataInsightTool(self)
-        self.data_insight_tool.plot = self.plot
+        self.render_scheduler = RenderScheduler(self.plot, parent=self)
+
+        self.live_recorder = LiveRecorder(self)
+        self.live_replayer = LiveReplayer(self)
+        self.live_replayer.finished.connect(self.stop_replay)
+        self.plot.curve_added.connect(self.live_recorder.add_curve)
+
+        # The Data Insight Tool and analysis tools are created the first time they are opened
+        self.statistics_panel = None
+        self._data_insight_tool = None
+        self._correlation_tool = None
+        self._spectral_tool = None
+        self._waveform_viewer = None
 
         self.settings_button = QPushButton(self.plot)
         self.settings_button.setFlat(True)
 
         self.plot_settings = PlotSettingsModal(self.settings_button, self.plot)
         self.plot_settings.auto_scroll_interval_change.connect(self.set_auto_scroll_interval)
+        self.plot_settings.render_rate_change.connect(self.render_scheduler.set_target_fps)
         self.plot_settings.grid_alpha_change.connect(self.gridline_opacity_change.emit)
         self.plot_settings.set_all_y_axis_gridlines.connect(self.plot.setShowYGrid)
         self.plot_settings.set_all_y_axis_gridlines.connect(self.set_all_y_axis_gridlines.emit)
@@ -334,12 +550,46 @@ class TraceDisplay(Display):
         footer_spacer = QSpacerItem(40, 12, QSizePolicy.Expanding, QSizePolicy.Minimum)
         footer_layout.addSpacerItem(footer_spacer)
 
-        self.time_label = PyDMLabel(footer_widget, f"ca://{datetime_pv}")
+        # Performance metrics summary, hidden until enabled from the Trace menu
+        # One monitor is shared by every Trace window in the process
+        app = QApplication.instance()
+        self.metrics_monitor = app.findChild(MetricsMonitor) or MetricsMonitor(parent=app)
+        self.metrics_monitor.updated.connect(self.update_metrics_label)
+        self.metrics_label = QLabel(footer_widget)
+        self.metrics_label.setFont(self.footer_label_font)
+        self.metrics_label.setToolTip("Performance Metrics")
+        self.metrics_label.setAlignment(Qt.AlignBottom)
+        self.metrics_label.hide()
+        footer_layout.addWidget(self.metrics_label)
+        self.metrics_breaker = BreakerLabel(footer_widget)
+        self.metrics_breaker.hide()
+        footer_layout.addWidget(self.metrics_breaker)
+
+        self.time_label = PyDMLabel(footer_widget, f"ca://{config.datetime_pv}")
         self.time_label.setAlignment(Qt.AlignBottom)
         footer_layout.addWidget(self.time_label)
 
         return footer_widget
 
+    @Slot(bool)
+    def show_metrics(self, show: bool) -> None:
+        """Show or hide the performance metrics summary in the footer.
+
+        Parameters
+        ----------
+        show : bool
+            Whether the summary should be shown.
+        """
+        self.metrics_label.setVisible(show)
+        self.metrics_breaker.setVisible(show)
+        self.update_metrics_label()
+
+    @Slot()
+    def update_metrics_label(self) -> None:
+        """Refresh the performance metrics summary if it is shown."""
+        if self.metrics_label.isVisible():
+            self.metrics_label.setText(self.metrics_monitor.summary())
+
     def parse_time_input(self) -> None:
         """
         Parse user entered time input. Allows user to add 'm' 'h', 'd', 'w', or 'M'
@@ -408,8 +658,11 @@ class TraceDisplay(Display):
         """
         self.settings_button.setIcon(self.theme_manager.create_icon("msc.settings-gear", IconColors.PRIMARY))
 
+    @Slot(Theme)
     def on_theme_changed(self, theme: Theme) -> None:
-        """Handle theme changes - update icons and button text
+        """Handle theme changes - update the plot background, icons, and menu
+        text. Called while the ThemeManager has updates disabled, so all of
+        these are painted together.
 
         Parameters
         ----------
@@ -421,19 +674,14 @@ class TraceDisplay(Display):
         None
             Applies UI updates relevant to the selected theme.
         """
-        if theme == Theme.DARK:
-            self.theme_toggle_button.setText("Light Mode")
-            icon = self.theme_manager.create_icon("fa.sun-o", IconColors.PRIMARY)
+        self.is_dark_mode = theme == Theme.DARK
+        if self.is_dark_mode:
+            self.theme_action.setText("Switch to Light Mode")
+            self.plot.setBackgroundColor(QColor("#1E1E1E"))
         else:
-            self.theme_toggle_button.setText("Dark Mode")
-            icon = self.theme_manager.create_icon("fa.moon-o", IconColors.PRIMARY)
-
-        if icon:
-            self.theme_toggle_button.setIcon(icon)
-
-        settings_icon = self.theme_manager.create_icon("msc.settings-gear", IconColors.PRIMARY)
-        if settings_icon:
-            self.settings_button.setIcon(settings_icon)
+            self.theme_action.setText("Switch to Dark Mode")
+            self.plot.setBackgroundColor(QColor("#FFFFFF"))
+        self.setup_icons()
 
     def set_curve_palette(self, palette_name: str, apply: bool = False):
         """
@@ -467,6 +715,21 @@ class TraceDisplay(Display):
         app.main_window.toggle_status_bar(False)
         app.main_window.ui.actionShow_Status_Bar.setChecked(False)
 
+        # Stop redrawing the plot while the window is hidden or minimized
+        self.render_scheduler.watch_window(app.main_window)
+
+        # Write out any buffered samples if the app closes while recording
+        app.aboutToQuit.connect(self.live_recorder.stop)
+        app.aboutToQuit.connect(self.metrics_monitor.stop_export)
+        app.aboutToQuit.connect(pv_metadata.stop)
+
+        # Log what the GUI thread was doing whenever the event loop stalls.
+        # One watchdog serves every Trace window in the process
+        if config.stall_threshold_ms > 0 and app.findChild(StallWatchdog) is None:
+            stall_watchdog = StallWatchdog(config.stall_log_file, config.stall_threshold_ms, parent=app)
+            stall_watchdog.start()
+            app.aboutToQuit.connect(stall_watchdog.stop)
+
         # Create a TraceFileController instance for handling file I/O operations
         self.file_handler = TraceFileHandler(self.plot, self)
         self.file_handler.axes_signal.connect(self.control_panel.set_axes)
@@ -518,9 +781,28 @@ class TraceDisplay(Display):
 
         fetch_archive = menu.addAction("Fetch Archive Data", self.fetch_archive)
         fetch_archive.setShortcut(QKeySequence("Ctrl+F"))
-        dit_action = menu.addAction("Data Insight Tool...", self.data_insight_tool.show)
+        dit_action = menu.addAction("Data Insight Tool...", self.show_data_insight_tool)
         dit_action.setShortcut(QKeySequence("Ctrl+D"))
+        menu.addAction("Correlation Plot...", self.show_correlation_tool)
+        menu.addAction("Spectral Analysis...", self.show_spectral_tool)
+        menu.addAction("Waveform Viewer...", self.show_waveform_viewer)
+        statistics_action = menu.addAction("Show Statistics")
+        statistics_action.setCheckable(True)
+        statistics_action.triggered.connect(self.show_statistics_panel)
+        menu.addSeparator()
+
+        self.record_action = menu.addAction("Record Live Data...")
+        self.record_action.setCheckable(True)
+        self.record_action.setChecked(self.live_recorder.recording)
+        self.record_action.triggered.connect(self.toggle_recording)
+        self.live_recorder.stopped.connect(lambda: self.record_action.setChecked(False))
+        menu.addAction("Replay Recording...", self.open_replay)
+        menu.addAction("Stop Replay", self.live_replayer.stop)
+        menu.addSeparator()
 
+        metrics_action = menu.addAction("Show Performance Metrics")
+        metrics_action.setCheckable(True)
+        metrics_action.triggered.connect(self.show_metrics)
         menu.addSeparator()
 
         if self.is_dark_mode:
@@ -538,23 +820,9 @@ class TraceDisplay(Display):
         Returns
         -------
         None
-            Applies the selected theme and refreshes the UI.
+            Applies the selected theme, see on_theme_changed for the UI updates.
         """
-        if self.is_dark_mode:
-            self.theme_manager.set_theme(Theme.LIGHT)
-            self.theme_action.setText("Switch to Dark Mode")
-            self.plot.setBackgroundColor(QColor("#FFFFFF"))
-            self.setup_icons()
-            self.is_dark_mode = False
-        else:
-            self.theme_manager.set_theme(Theme.DARK)
-            self.theme_action.setText("Switch to Light Mode")
-            self.plot.setBackgroundColor(QColor("#1E1E1E"))
-            self.setup_icons()
-            self.is_dark_mode = True
-
-        QApplication.processEvents()
-        self.repaint()
+        self.theme_manager.set_theme(Theme.LIGHT if self.is_dark_mode else Theme.DARK)
 
     @Slot()
     def save_plot_image(self) -> None:
@@ -592,6 +860,10 @@ class TraceDisplay(Display):
             True if the post was successful, False otherwise.
         """
         # Test if API is reachable
+        # Imported on first use to keep the E-Log client off the startup path
+        from widgets import ElogPostModal
+        from services import get_user, post_entry
+
         status_code, _ = get_user()
         if status_code != 200:
             error_dialog = QMessageBox()
@@ -654,18 +926,104 @@ class TraceDisplay(Display):
 
     @Slot()
     def fetch_archive(self) -> None:
-        """Trigger a fetch of data from the EPICS Archiver Appliance.
+        """Trigger a fetch of data from the EPICS Archiver Appliance. Requests
+        still in flight are superseded by the new ones.
+        """
+        logger.info("Requesting data from archiver")
+        self.plot.requestDataFromArchiver()
 
-        Returns
-        -------
-        None
-            Queues a data request if one is not already pending.
+    @Slot(bool)
+    def toggle_recording(self, checked: bool) -> None:
+        """Start or stop recording live data. Starting prompts the user for
+        the file to record to.
+
+        Parameters
+        ----------
+        checked : bool
+            Whether recording should be started.
         """
-        if not (self.plot._archive_request_queued):
-            logger.info("Requesting data from archiver")
-            self.plot.requestDataFromArchiver()
+        if not checked:
+            self.live_recorder.stop()
+            return
+
+        default_filename = datetime.now().strftime(f"{getuser()}_trace_%Y%m%d_%H%M%S.trec")
+        file_path, _ = QFileDialog.getSaveFileName(
+            None,
+            "Record Live Data",
+            os.path.join(os.path.expanduser("~"), default_filename),
+            "Trace Recordings (*.trec);;All Files (*)",
+        )
+        if file_path:
+            self.start_recording(file_path)
         else:
-            logger.info("Archive fetch is already queued")
+            self.record_action.setChecked(False)
+
+    def start_recording(self, file_path: Path | str) -> None:
+        """Record live data from every curve on the plot, including curves
+        added while recording.
+
+        Parameters
+        ----------
+        file_path : Path | str
+            The file to record to.
+        """
+        curves = [c for c in self.plot._curves if isinstance(c, TraceCurveItem)]
+        try:
+            self.live_recorder.start(file_path, curves)
+        except OSError as e:
+            logger.error(f"Failed to start recording: {e}")
+        if hasattr(self, "record_action"):
+            self.record_action.setChecked(self.live_recorder.recording)
+
+    @Slot()
+    def open_replay(self) -> None:
+        """Prompt the user for a recording and replay speed, then replay it."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            None,
+            "Replay Recording",
+            os.path.expanduser("~"),
+            "Trace Recordings (*.trec);;All Files (*)",
+        )
+        if not file_path:
+            return
+
+        speed, ok = QInputDialog.getDouble(self, "Replay Recording", "Replay speed:", 1.0, 0.01, 1000.0, 2)
+        if ok:
+            self.start_replay(file_path, speed)
+
+    def start_replay(self, file_path: Path | str, speed: float = 1.0) -> None:
+        """Replay a recording through the plot's curves. Curves are added for
+        any recorded channels that are not already on the plot. Every curve
+        is detached from live data and the archiver until the replay ends.
+
+        Parameters
+        ----------
+        file_path : Path | str
+            The recording to replay.
+        speed : float, optional
+            Replay speed relative to the recording, by default 1.0.
+        """
+        try:
+            channels = self.live_replayer.load(file_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load recording: {e}")
+            return
+
+        self.plot.set_replaying(True)
+        on_plot = {normalize_address(c.address) for c in self.plot._curves if c.address}
+        for channel in channels:
+            if normalize_address(channel) not in on_plot:
+                self.control_panel.add_curve(channel)
+
+        curves = [c for c in self.plot._curves if isinstance(c, TraceCurveItem)]
+        self.live_replayer.start(curves, speed)
+
+    @Slot()
+    def stop_replay(self) -> None:
+        """Reattach the plot's curves to live data and the archiver once a
+        replay has ended.
+        """
+        self.plot.set_replaying(False)
 
     @Slot(tuple)
     def set_plot_timerange(self, timerange: tuple[float, float]) -> None:
@@ -680,10 +1038,12 @@ class TraceDisplay(Display):
         Returns
         -------
         None
-            Sets the x-axis view range of the plot.
+            Sets the x-axis view range of the plot, and prefetches the
+            archive data on either side of it.
         """
         self.disable_auto_scroll_button.click()
         self.plot.setXRange(*timerange)
+        self.plot.archive_prefetcher.navigate(*timerange)
         logger.debug(f"Plot timerange set to {timerange[0]} - {timerange[1]}")
 
     @Slot()
@@ -775,21 +1135,6 @@ class TraceDisplay(Display):
         refresh_interval = self.plot_settings.auto_scroll_interval
         self.plot.setAutoScroll(enable, timespan, refresh_rate=refresh_interval)
 
-    @staticmethod
-    def git_version():
-        """Get the current git tag for the project.
-
-        Returns
-        -------
-        str
-            The output of `git describe --tags`, or an empty string on failure.
-        """
-        project_directory = __file__.rsplit("/", 1)[0]
-        git_cmd = subprocess.run(
-            f"cd {project_directory} && git describe --tags", text=True, shell=True, capture_output=True
-        )
-        return git_cmd.stdout.strip()
-
     def parse_cli_args(self, args, macros):
         """Parse CLI-style arguments and macros into startup configuration.
 
@@ -803,10 +1148,13 @@ class TraceDisplay(Display):
 
         Returns
         -------
-        tuple[str, list[str]]
-            A tuple of `(input_file, startup_pvs)` where `input_file` is the
-            selected configuration file path (or empty string) and
-            `startup_pvs` is a de-duplicated list of PV/formula strings to add.
+        tuple[str, list[str], dict]
+            A tuple of `(input_file, startup_pvs, startup_options)` where
+            `input_file` is the selected configuration file path (or empty
+            string), `startup_pvs` is a de-duplicated list of PV/formula strings
+            to add, and `startup_options` holds the `record`, `replay`,
+            `replay_speed`, `metrics_file`, `metrics_interval`, and `server`
+            options.
         """
         args = args or []
         macros = macros or {}
@@ -829,7 +1177,7 @@ class TraceDisplay(Display):
             formatter_class=argparse.RawTextHelpFormatter,
         )
 
-        parser.add_argument("-v", "--version", action="version", version="%(prog)s " + self.git_version())
+        parser.add_argument("-v", "--version", action=VersionAction)
         parser.add_argument(
             "-i",
             "--input_file",
@@ -869,6 +1217,44 @@ class TraceDisplay(Display):
             ),
         )
 
+        parser.add_argument(
+            "--record",
+            default="",
+            help="File path to record incoming live data to",
+        )
+        parser.add_argument(
+            "--replay",
+            default="",
+            help="File path of a recording to replay instead of connecting to live data",
+        )
+        parser.add_argument(
+            "--replay_speed",
+            type=float,
+            default=1.0,
+            help="Replay speed relative to the recording, e.g. 10 to replay 10x faster",
+        )
+        parser.add_argument(
+            "--server",
+            action="store_true",
+            help="\n".join(
+                [
+                    "Open later launches made through launch_client.py in this process",
+                    "The process stays running after its windows are closed",
+                ]
+            ),
+        )
+        parser.add_argument(
+            "--metrics_file",
+            default="",
+            help="File path to periodically export performance metrics to\nUse a .prom suffix for Prometheus text",
+        )
+        parser.add_argument(
+            "--metrics_interval",
+            type=int,
+            default=10000,
+            help="Milliseconds between performance metrics exports",
+        )
+
         # Parse arguments and ignore unknowns
         known, unknown = parser.parse_known_args(args)
         for arg in unknown:
@@ -901,7 +1287,16 @@ class TraceDisplay(Display):
         # Remove duplicates from startup_pvs
         startup_pvs = list(dict.fromkeys(startup_pvs))
 
-        return (input_file, startup_pvs)
+        startup_options = {
+            "record": known.record,
+            "replay": known.replay,
+            "replay_speed": known.replay_speed,
+            "metrics_file": known.metrics_file,
+            "metrics_interval": known.metrics_interval,
+            "server": known.server,
+        }
+
+        return (input_file, startup_pvs, startup_options)
 
 
 class BreakerLabel(QLabel):
@@ -1,2 +1,28 @@
-from .elog_client import get_user, post_entry, get_logbooks
+from importlib import import_module
+
 from .theme_manager import ThemeManager, Theme, IconColors
+from .metrics import Metrics, MetricsMonitor, metrics
+from .watchdog import StallWatchdog
+from .instance_server import TraceInstanceServer
+from .render_scheduler import RenderScheduler
+from .live_data_store import LiveDataStore, LiveDataBudget, EvictionPolicy, live_data_budget
+from .archive_cache import ArchiveCache, archive_cache
+from .archive_fetcher import ArchiveFetcher, ArchivePrefetcher, archive_url, decode_archive_data, decode_waveform_data
+from .pv_metadata import PVMetadata, PVMetadataService, pv_metadata, normalize_address
+from .live_channels import SharedLiveChannel, LiveChannelRegistry, live_channels
+
+# The E-Log client imports requests, so it is only imported when first used
+# to keep it off the startup path
+_LAZY_EXPORTS = {
+    "get_user": ".elog_client",
+    "post_entry": ".elog_client",
+    "get_logbooks": ".elog_client",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,148 @@
+import os
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from pydm.utilities import remove_protocol
+
+type CacheKey = tuple[str, str, str, float, float]
+
+
+class ArchiveCache:
+    """Least recently used cache of data received from the archiver.
+
+    Data is stored in segments, each holding the reply to one request for a
+    PV over a time range with a processing command. A lookup is served if
+    segments with the same PV and processing cover the whole requested range,
+    stitching adjacent segments together as needed.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The total size of cached arrays before the least recently used
+        segments are evicted, by default 64 MiB.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024**2
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._segments: OrderedDict[CacheKey, np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    @staticmethod
+    def source_key(pv: str, processing_command: str = "") -> tuple[str, str, str]:
+        """The archiver, PV, and processing that segments are grouped by."""
+        return (os.getenv("PYDM_ARCHIVER_URL", ""), remove_protocol(pv), processing_command)
+
+    def store(self, pv: str, processing_command: str, start: float, end: float, data: np.ndarray) -> None:
+        """Cache the archiver's reply to a request. Segments made redundant by
+        the new one are removed.
+
+        Parameters
+        ----------
+        pv : str
+            The PV the data was requested for.
+        processing_command : str
+            The processing command the data was requested with.
+        start : float
+            The start of the requested time range.
+        end : float
+            The end of the requested time range. Times after now are not cached.
+        data : np.ndarray
+            The data received, with timestamps at index 0.
+        """
+        end = min(end, time.time())
+        if end <= start:
+            return
+        source = self.source_key(pv, processing_command)
+        for key in self._keys_for(source):
+            if key[3] <= start and end <= key[4]:
+                return
+            if start <= key[3] and key[4] <= end:
+                self._remove(key)
+
+        key = (*source, start, end)
+        self._segments[key] = data
+        self.nbytes += data.nbytes
+        while self.nbytes > self.max_bytes and len(self._segments) > 1:
+            self._remove(next(iter(self._segments)))
+
+    def covers(self, pv: str, processing_command: str, start: float, end: float) -> bool:
+        """Whether the cache holds all of a PV's data in the given range."""
+        return self._cover(self.source_key(pv, processing_command), start, end) is not None
+
+    def lookup(self, pv: str, processing_command: str, start: float, end: float) -> np.ndarray | None:
+        """Get a PV's cached data in the given time range. The newest sample
+        before the range is included, as the archiver does.
+
+        Parameters
+        ----------
+        pv : str
+            The PV to get data for.
+        processing_command : str
+            The processing command the data must have been requested with.
+        start : float
+            The start of the time range.
+        end : float
+            The end of the time range.
+
+        Returns
+        -------
+        np.ndarray | None
+            The data, or None if the cache does not cover the whole range.
+        """
+        segments = self._cover(self.source_key(pv, processing_command), start, end)
+        if segments is None:
+            return None
+
+        pieces = []
+        cursor = start
+        for i, key in enumerate(segments):
+            self._segments.move_to_end(key)
+            data = self._segments[key]
+            last = i == len(segments) - 1
+            low = np.searchsorted(data[0], cursor, side="left")
+            if i == 0 and low > 0:
+                low -= 1
+            high = np.searchsorted(data[0], end if last else key[4], side="right" if last else "left")
+            pieces.append(data[:, low:high])
+            cursor = key[4]
+        return np.concatenate(pieces, axis=1) if len(pieces) > 1 else pieces[0].copy()
+
+    def clear(self) -> None:
+        """Remove all cached data."""
+        self._segments.clear()
+        self.nbytes = 0
+
+    def _keys_for(self, source: tuple[str, str, str]) -> list[CacheKey]:
+        """The keys of all segments with the given source, oldest range first."""
+        return sorted((key for key in self._segments if key[:3] == source), key=lambda key: key[3])
+
+    def _cover(self, source: tuple[str, str, str], start: float, end: float) -> list[CacheKey] | None:
+        """Find segments that together cover the range, or None if there is a gap."""
+        keys = self._keys_for(source)
+        segments = []
+        cursor = start
+        while True:
+            candidates = [key for key in keys if key[3] <= cursor <= key[4]]
+            if not candidates:
+                return None
+            best = max(candidates, key=lambda key: key[4])
+            segments.append(best)
+            if best[4] >= end:
+                return segments
+            if best[4] <= cursor:
+                return None
+            cursor = best[4]
+
+    def _remove(self, key: CacheKey) -> None:
+        self.nbytes -= self._segments.pop(key).nbytes
+
+
+# One cache is shared by every window in the process
+archive_cache = ArchiveCache()
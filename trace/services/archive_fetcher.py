@@ -0,0 +1,532 @@
+import os
+import json
+import time
+import threading
+from queue import Queue
+from datetime import datetime, timezone
+from functools import partial
+from itertools import count
+from collections.abc import Callable, Hashable
+
+import numpy as np
+from qtpy.QtCore import QUrl, Slot, QTimer, Signal, QObject
+from qtpy.QtNetwork import QNetworkReply, QNetworkRequest, QNetworkAccessManager
+
+from pydm.utilities import remove_protocol
+from pydm.widgets.archiver_time_plot import ArchivePlotCurveItem, PyDMArchiverTimePlot
+
+from config import logger
+from services import metrics
+from services.archive_cache import ArchiveCache
+
+
+def archive_url(base_url: str, pv: str, start: float, end: float, processing_command: str = "") -> str:
+    """Build the Archiver Appliance URL for a PV's data, in the form used by
+    PyDM's archiver plugin.
+
+    Parameters
+    ----------
+    base_url : str
+        The archiver's URL, e.g. the value of PYDM_ARCHIVER_URL.
+    pv : str
+        The PV to get data for, without a protocol.
+    start : float
+        Timestamp of the oldest data to retrieve.
+    end : float
+        Timestamp of the newest data to retrieve.
+    processing_command : str, optional
+        Processing for the archiver to apply, e.g. "optimized_2000", by default none.
+
+    Returns
+    -------
+    str
+        The request URL.
+    """
+    from_str = datetime.fromtimestamp(start, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    to_str = datetime.fromtimestamp(end, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    if processing_command:
+        pv = f"{processing_command}({pv})"
+    return f"{base_url}/retrieval/data/getData.json?pv={pv}&from={from_str}&to={to_str}"
+
+
+def decode_archive_data(data_dict: list[dict], optimized: bool = False) -> np.ndarray:
+    """Convert an Archiver Appliance JSON reply into the array PyDM's archiver
+    plugin sends to curves.
+
+    Parameters
+    ----------
+    data_dict : list[dict]
+        The decoded JSON reply.
+    optimized : bool, optional
+        Whether optimized data was requested, by default False.
+
+    Returns
+    -------
+    np.ndarray
+        Timestamps and values with shape (2, N), or for optimized data
+        timestamps, means, standard deviations, minimums, and maximums with
+        shape (5, N).
+    """
+    points = data_dict[0]["data"]
+    times = [point["secs"] for point in points]
+    values = [point["val"] for point in points]
+    if optimized:
+        try:
+            return np.array((times, *([value[i] for value in values] for i in range(4))))
+        except TypeError:
+            # The archiver sends raw data if there are fewer points than bins
+            pass
+    return np.array((times, values))
+
+
+def decode_waveform_data(data_dict: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """Convert an Archiver Appliance JSON reply for a waveform PV into its
+    timestamps and waveforms.
+
+    Parameters
+    ----------
+    data_dict : list[dict]
+        The decoded JSON reply.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Timestamps with shape (N,), including their nanoseconds, and the
+        waveforms with shape (N, width). Waveforms shorter than the longest
+        are padded with NaN.
+    """
+    points = data_dict[0]["data"]
+    times = np.array([point["secs"] + point.get("nanos", 0) * 1e-9 for point in points])
+    values = [np.atleast_1d(np.asarray(point["val"], dtype=float)) for point in points]
+    waveforms = np.full((len(values), max((value.size for value in values), default=0)), np.nan)
+    for row, value in zip(waveforms, values):
+        row[: value.size] = value
+    return times, waveforms
+
+
+class ArchiveFetcher(QObject):
+    """Sends requests for archive data and tracks them so superseded requests
+    can be cancelled.
+
+    Each request is made on behalf of an owner, such as a curve, and is given
+    a generation ID. A new request from the same owner supersedes the old
+    one: the old reply is aborted at the network level, and if it has already
+    finished, it is discarded before it is decoded. Only the reply to an
+    owner's latest request is ever delivered.
+
+    The latency, size, and decode time of each delivered reply are recorded
+    in the shared metrics as archive.latency, archive.bytes, and
+    archive.decode. Large replies can be decoded on the fetcher's worker
+    thread instead of the GUI thread; they are still delivered on the GUI
+    thread, and only if they have not been superseded meanwhile.
+
+    Parameters
+    ----------
+    parent : QObject, optional
+        Parent QObject for memory management, by default None.
+    """
+
+    # Requests still running after this long are aborted, as PyDM's archiver plugin does
+    TIMEOUT_MS = 7500
+
+    _decoded = Signal(object)
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self._network_manager = QNetworkAccessManager(self)
+        self._generations = count(1)
+        # Replies being decoded on the worker thread are kept with no QNetworkReply
+        self._requests: dict[Hashable, tuple[int, QNetworkReply | None]] = {}
+        self._decode_jobs: Queue | None = None
+        self._decoded.connect(self._deliver)
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __contains__(self, owner: Hashable) -> bool:
+        return owner in self._requests
+
+    def owners(self) -> list[Hashable]:
+        """The owners of all requests in flight."""
+        return list(self._requests)
+
+    def fetch(
+        self,
+        owner: Hashable,
+        pv: str,
+        start: float,
+        end: float,
+        processing_command: str,
+        callback: Callable[[np.ndarray | None], None],
+        priority: QNetworkRequest.Priority = QNetworkRequest.NormalPriority,
+        decode: Callable[[list[dict]], object] = None,
+        threaded: bool = False,
+    ) -> bool:
+        """Request a PV's archive data, superseding the owner's previous request.
+
+        Parameters
+        ----------
+        owner : Hashable
+            Who the request is made for.
+        pv : str
+            The PV to get data for, without a protocol.
+        start : float
+            Timestamp of the oldest data to retrieve.
+        end : float
+            Timestamp of the newest data to retrieve.
+        processing_command : str
+            Processing for the archiver to apply, or an empty string for raw data.
+        callback : Callable[[np.ndarray | None], None]
+            Called with the decoded data, or None if the request failed. Not
+            called if the request is superseded or cancelled.
+        priority : QNetworkRequest.Priority, optional
+            The request's network priority, by default normal.
+        decode : Callable[[list[dict]], object], optional
+            Converts the JSON reply into the data passed to the callback, by
+            default decode_archive_data.
+        threaded : bool, optional
+            Decode the reply on the worker thread rather than the GUI
+            thread, for replies too large to decode between frames, by
+            default False.
+
+        Returns
+        -------
+        bool
+            True if a request from the owner was still in flight and has been superseded.
+        """
+        superseded = self.cancel(owner)
+        base_url = os.getenv("PYDM_ARCHIVER_URL")
+        if base_url is None:
+            logger.error(f"Cannot fetch archive data for {pv}, PYDM_ARCHIVER_URL is not set")
+            self._fail_later(callback)
+            return superseded
+        if not 0 < start < end:
+            # An empty range, such as a zero-width view, has no data to fetch
+            logger.debug(f"Not fetching archive data for {pv} over the empty range {start} to {end}")
+            self._fail_later(callback)
+            return superseded
+
+        request = QNetworkRequest(QUrl(archive_url(base_url, pv, start, end, processing_command)))
+        request.setPriority(priority)
+        reply = self._network_manager.get(request)
+        generation = next(self._generations)
+        self._requests[owner] = (generation, reply)
+
+        if decode is None:
+            decode = partial(decode_archive_data, optimized=bool(processing_command))
+        sent_at = time.perf_counter()
+        reply.finished.connect(lambda: self._finished(owner, generation, reply, decode, callback, sent_at, threaded))
+        # The timer is deleted with its reply, so it never fires for a finished request or a deleted fetcher
+        timeout = QTimer(reply)
+        timeout.setSingleShot(True)
+        timeout.timeout.connect(lambda: self._timeout(owner, generation))
+        timeout.start(self.TIMEOUT_MS)
+        return superseded
+
+    def _fail_later(self, callback: Callable[[np.ndarray | None], None]) -> None:
+        """Deliver a failure for a request that could not be sent, once
+        control returns to the event loop, unless the fetcher is deleted first.
+        """
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: callback(None))
+        timer.timeout.connect(timer.deleteLater)
+        timer.start(0)
+
+    def cancel(self, owner: Hashable) -> bool:
+        """Abort the owner's request, if it is in flight.
+
+        Parameters
+        ----------
+        owner : Hashable
+            Who the request was made for.
+
+        Returns
+        -------
+        bool
+            True if a request was cancelled.
+        """
+        request = self._requests.pop(owner, None)
+        if request is None:
+            return False
+        metrics.increment("archive.cancelled")
+        if request[1] is not None:
+            request[1].abort()
+        return True
+
+    def cancel_all(self) -> None:
+        """Abort every request in flight."""
+        for owner in self.owners():
+            self.cancel(owner)
+
+    def is_current(self, owner: Hashable, generation: int) -> bool:
+        """Whether the generation is the owner's latest request."""
+        return owner in self._requests and self._requests[owner][0] == generation
+
+    def _timeout(self, owner: Hashable, generation: int) -> None:
+        """Abort a request that has taken too long, delivering a failure."""
+        if self.is_current(owner, generation) and self._requests[owner][1] is not None:
+            logger.debug(f"Archive request for {owner} timed out")
+            self._requests[owner][1].abort()
+
+    def _finished(
+        self,
+        owner: Hashable,
+        generation: int,
+        reply: QNetworkReply,
+        decode: Callable[[list[dict]], object],
+        callback: Callable[[np.ndarray | None], None],
+        sent_at: float,
+        threaded: bool,
+    ) -> None:
+        """Decode a finished reply and deliver it, unless it has been superseded."""
+        reply.deleteLater()
+        if not self.is_current(owner, generation):
+            return
+        del self._requests[owner]
+
+        if reply.error() != QNetworkReply.NoError:
+            logger.debug(f"Request for data from archiver failed, request url: {reply.url()} error: {reply.error()}")
+            callback(None)
+            return
+
+        body = bytes(reply.readAll())
+        metrics.observe("archive.latency", time.perf_counter() - sent_at)
+        metrics.increment("archive.bytes", len(body))
+        url = reply.url().toString()
+        if not threaded:
+            callback(self._decode(body, decode, url))
+            return
+
+        # Still the owner's request while it is decoded, so a new request supersedes it
+        self._requests[owner] = (generation, None)
+        if self._decode_jobs is None:
+            self._start_decoder()
+        self._decode_jobs.put((owner, generation, body, decode, callback, url))
+
+    @staticmethod
+    def _decode(body: bytes, decode: Callable[[list[dict]], object], url: str) -> object | None:
+        """Decode a reply's body, or return None if it cannot be read."""
+        try:
+            with metrics.timer("archive.decode"):
+                return decode(json.loads(body))
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            logger.debug(f"Unreadable reply from archiver, request url: {url}: {e}")
+            return None
+
+    def _start_decoder(self) -> None:
+        """Start the worker thread that decodes threaded replies. It stops
+        when the fetcher is destroyed.
+        """
+        jobs = self._decode_jobs = Queue()
+        threading.Thread(target=self._decode_work, args=(jobs,), name="ArchiveFetcher", daemon=True).start()
+        self.destroyed.connect(lambda: jobs.put(None))
+
+    def _decode_work(self, jobs: Queue) -> None:
+        """Decode replies from the queue on the worker thread until stopped."""
+        while (job := jobs.get()) is not None:
+            owner, generation, body, decode, callback, url = job
+            data = self._decode(body, decode, url)
+            try:
+                self._decoded.emit((owner, generation, callback, data))
+            except RuntimeError:
+                return  # The fetcher was deleted while the reply was decoded
+
+    @Slot(object)
+    def _deliver(self, result: tuple) -> None:
+        """Deliver a reply decoded on the worker thread, unless it has been superseded."""
+        owner, generation, callback, data = result
+        if not self.is_current(owner, generation):
+            return
+        del self._requests[owner]
+        callback(data)
+
+
+class ArchivePrefetcher(QObject):
+    """Speculatively fetches the archive data adjacent to a plot's visible
+    time range into an ArchiveCache, so paging through history is served
+    from the cache instead of waiting on the archiver.
+
+    The direction of navigation is taken from successive ranges of the same
+    width. While paging in one direction, the next window in that direction
+    is prefetched; otherwise both neighbouring windows are. Prefetches are
+    made at low priority after the plot's own requests have finished, using
+    the processing command the plot would request for the window. In-flight
+    prefetches are aborted when the direction changes or the plot is zoomed.
+
+    Parameters
+    ----------
+    plot : PyDMArchiverTimePlot
+        The plot to prefetch for. Must provide ``archive_processing_command``.
+    cache : ArchiveCache
+        The cache prefetched data is stored in.
+    fetcher : ArchiveFetcher
+        Sends the prefetch requests.
+    parent : QObject, optional
+        Parent QObject for memory management, by default None.
+    """
+
+    # Range changes are only acted on once they have settled for this long
+    DEBOUNCE_MS = 250
+    # Relative change in the range's width treated as a zoom
+    ZOOM_TOLERANCE = 0.01
+    # Range shifts further than this many widths are jumps, not paging
+    MAX_PAGE_SHIFT = 2
+
+    def __init__(
+        self, plot: PyDMArchiverTimePlot, cache: ArchiveCache, fetcher: ArchiveFetcher, parent: QObject = None
+    ):
+        super().__init__(parent)
+        self.plot = plot
+        self.cache = cache
+        self.fetcher = fetcher
+        self.enabled = True
+        self.direction = 0
+        self._range = None
+        self._windows = []
+        # Prefetches are owned by (pv, processing command, start, end, direction)
+        self._in_flight: set[tuple[str, str, float, float, int]] = set()
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._navigate_to_view)
+
+        # Gives the plot time to make its own requests before prefetching
+        self._fetch_timer = QTimer(self)
+        self._fetch_timer.setSingleShot(True)
+        self._fetch_timer.setInterval(self.DEBOUNCE_MS)
+        self._fetch_timer.timeout.connect(self._fetch_pending)
+
+        plot.plotItem.vb.sigXRangeChanged.connect(self._debounce.start)
+        plot.archive_request_finished.connect(self._fetch_pending)
+
+    @property
+    def busy(self) -> bool:
+        """Whether any prefetches are planned or in flight."""
+        return bool(self._windows or self._in_flight) or self._debounce.isActive() or self._fetch_timer.isActive()
+
+    @Slot()
+    def _navigate_to_view(self) -> None:
+        """Navigate to the plot's visible time range."""
+        self.navigate(*self.plot.getViewBox().viewRange()[0])
+
+    def navigate(self, min_x: float, max_x: float) -> None:
+        """Prefetch the windows next to the given time range, which the plot
+        is now showing.
+
+        Parameters
+        ----------
+        min_x : float
+            Timestamp at the left of the visible range.
+        max_x : float
+            Timestamp at the right of the visible range.
+        """
+        self._debounce.stop()
+        if not self.enabled or self.plot.auto_scroll_timer.isActive():
+            self._range = None
+            return
+
+        self._windows = self.plan(min_x, max_x)
+        self._fetch_timer.start()
+
+    def plan(self, min_x: float, max_x: float) -> list[tuple[float, float, int]]:
+        """Update the navigation direction from the new range, aborting
+        prefetches that no longer apply, and choose the windows to prefetch.
+
+        Parameters
+        ----------
+        min_x : float
+            Timestamp at the left of the new range.
+        max_x : float
+            Timestamp at the right of the new range.
+
+        Returns
+        -------
+        list[tuple[float, float, int]]
+            The start, end, and direction of each window to prefetch.
+        """
+        width = max_x - min_x
+        if width <= 0:
+            return []
+
+        direction = 0
+        zoomed = True
+        if self._range is not None:
+            prev_min, prev_max = self._range
+            shift = min_x - prev_min
+            zoomed = abs(width - (prev_max - prev_min)) > self.ZOOM_TOLERANCE * width
+            if not zoomed and abs(shift) <= self.MAX_PAGE_SHIFT * width:
+                direction = int(np.sign(shift)) or self.direction
+
+        if zoomed:
+            self.cancel()
+        elif direction != self.direction:
+            self.cancel(lambda window_direction: window_direction != direction)
+        self.direction = direction
+        self._range = (min_x, max_x)
+
+        windows = []
+        if direction <= 0:
+            windows.append((min_x - width, min_x, -1))
+        now = time.time()
+        if direction >= 0 and max_x < now:
+            windows.append((max_x, min(max_x + width, now), 1))
+        return windows
+
+    def cancel(self, predicate=None) -> None:
+        """Abort in-flight prefetches.
+
+        Parameters
+        ----------
+        predicate : Callable[[int], bool], optional
+            Only abort prefetches whose direction it returns True for, by default all.
+        """
+        for request_key in list(self._in_flight):
+            if predicate is None or predicate(request_key[4]):
+                self.fetcher.cancel(request_key)
+                self._in_flight.discard(request_key)
+
+    @Slot()
+    def _fetch_pending(self) -> None:
+        """Request the planned windows, once the plot's own requests are done."""
+        plot = self.plot
+        if not self._windows or plot._pending_archive_responses or plot._archive_request_queued:
+            return
+        if os.getenv("PYDM_ARCHIVER_URL") is None:
+            self._windows = []
+            return
+
+        for start, end, direction in self._windows:
+            for curve in plot._curves:
+                if not (isinstance(curve, ArchivePlotCurveItem) and curve.address):
+                    continue
+                if not (curve.use_archive_data and curve.isVisible()):
+                    continue
+                pv = remove_protocol(curve.address)
+                processing_command = plot.archive_processing_command(curve, end - start)
+                request_key = (pv, processing_command, start, end, direction)
+                if request_key in self._in_flight or self.cache.covers(pv, processing_command, start, end):
+                    continue
+
+                self._in_flight.add(request_key)
+                self.fetcher.fetch(
+                    request_key,
+                    pv,
+                    start,
+                    end,
+                    processing_command,
+                    lambda data, request_key=request_key: self._receive_data(request_key, data),
+                    priority=QNetworkRequest.LowPriority,
+                )
+                metrics.increment("archive.prefetch_requests")
+        self._windows = []
+
+    def _receive_data(self, request_key: tuple[str, str, float, float, int], data: np.ndarray | None) -> None:
+        """Store prefetched data in the cache."""
+        self._in_flight.discard(request_key)
+        if data is None:
+            return
+        pv, processing_command, start, end, _ = request_key
+        self.cache.store(pv, processing_command, start, end, data)
+        metrics.increment("archive.prefetch_bytes", data.nbytes)
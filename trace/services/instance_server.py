@@ -0,0 +1,128 @@
+import sys
+import json
+
+from qtpy.QtCore import Slot, Signal, QObject
+from qtpy.QtNetwork import QLocalServer, QLocalSocket
+
+from config import logger
+from launch_client import socket_path
+
+
+class TraceInstanceServer(QObject):
+    """Lets a running Trace process accept launches from new invocations,
+    so they open a window in the resident process instead of starting a new
+    interpreter and importing Qt and PyDM again. Windows opened this way
+    share the process' caches.
+
+    Requests are sent by ``launch_client.py`` as one JSON object per
+    connection, either ``{"args": [...]}`` to open a window or
+    ``{"quit": true}`` to stop the process, and acknowledged with ``ok``.
+
+    Attributes
+    ----------
+    launch_requested : Signal
+        Emitted with the command line arguments of each forwarded launch.
+    quit_requested : Signal
+        Emitted when a client asks the resident process to quit.
+    """
+
+    launch_requested = Signal(list)
+    quit_requested = Signal()
+
+    def __init__(self, parent: QObject = None):
+        """Create the server. Call listen to start accepting launches.
+
+        Parameters
+        ----------
+        parent : QObject, optional
+            Parent QObject for memory management, by default None.
+        """
+        super().__init__(parent)
+        self.path = str(socket_path())
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._accept_connection)
+
+    @property
+    def listening(self) -> bool:
+        """Whether the server is accepting launches."""
+        return self._server.isListening()
+
+    def listen(self) -> bool:
+        """Start accepting launches, unless another Trace server is already
+        running for this user. A socket left behind by a crashed server is
+        removed first.
+
+        Returns
+        -------
+        bool
+            True if the server is listening.
+        """
+        if self.listening:
+            return True
+        if sys.platform == "win32":
+            logger.warning("The Trace launch server is not supported on Windows")
+            return False
+
+        probe = QLocalSocket()
+        probe.connectToServer(self.path)
+        if probe.waitForConnected(500):
+            probe.disconnectFromServer()
+            logger.warning(f"Another Trace server is already listening on {self.path}")
+            return False
+
+        QLocalServer.removeServer(self.path)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        if not self._server.listen(self.path):
+            logger.warning(f"Unable to start the Trace launch server: {self._server.errorString()}")
+            return False
+        logger.info(f"Accepting Trace launches on {self.path}")
+        return True
+
+    @Slot()
+    def close(self) -> None:
+        """Stop accepting launches and remove the socket."""
+        if self.listening:
+            self._server.close()
+
+    @Slot()
+    def _accept_connection(self) -> None:
+        """Read launches from each pending connection."""
+        while self._server.hasPendingConnections():
+            connection = self._server.nextPendingConnection()
+            connection.readyRead.connect(lambda connection=connection: self._read_launch(connection))
+            connection.disconnected.connect(connection.deleteLater)
+            self._read_launch(connection)
+
+    def _read_launch(self, connection: QLocalSocket) -> None:
+        """Handle a launch once its message has been received in full.
+
+        Parameters
+        ----------
+        connection : QLocalSocket
+            The connection the launch is sent over.
+        """
+        if not connection.canReadLine():
+            return
+
+        line = bytes(connection.readLine()).decode(errors="replace")
+        try:
+            request = json.loads(line)
+            quit_requested = request.get("quit", False)
+            args = request.get("args", [])
+            if not isinstance(args, list):
+                raise TypeError("args must be a list")
+        except (ValueError, AttributeError, TypeError) as e:
+            logger.warning(f"Ignoring invalid Trace launch request: {e}")
+            connection.write(b"error\n")
+            connection.disconnectFromServer()
+            return
+
+        connection.write(b"ok\n")
+        connection.flush()
+        connection.disconnectFromServer()
+        if quit_requested:
+            logger.info("Trace server asked to quit")
+            self.quit_requested.emit()
+        else:
+            logger.debug(f"Received Trace launch: {args}")
+            self.launch_requested.emit([str(arg) for arg in args])
@@ -0,0 +1,279 @@
+import time
+from weakref import WeakSet
+
+from qtpy.QtCore import Slot, Signal, QObject
+
+from pydm.widgets.channel import PyDMChannel
+
+from config import logger
+from services import metrics, normalize_address
+from utilities import RingBuffer, ChannelFilters, filtered_address
+from services.live_data_store import LiveDataStore
+
+
+class SharedLiveChannel(QObject):
+    """One live subscription to a PV, through a set of filters, shared by
+    every consumer of it in the process.
+
+    Each update is timestamped and appended to the shared ``buffer`` once,
+    then announced with sample_received. Consumers read the buffer through
+    its zero-copy views rather than keeping their own copies. The buffer
+    retains as much as the consumers' live data stores ask for: the largest
+    capacity and the longest retention time.
+
+    Filters the channel's server cannot apply are applied here, as updates
+    arrive, so consumers only ever see filtered samples.
+
+    Parameters
+    ----------
+    address : str
+        The PV's normalized address, without filters.
+    filters : ChannelFilters
+        The filters the channel is subscribed through.
+    parent : QObject, optional
+        Parent QObject for memory management, by default None.
+
+    Attributes
+    ----------
+    sample_received : Signal
+        Emitted with the timestamp and value of each sample appended to the buffer.
+    connection_state_changed : Signal
+        Emitted with the live channel's connection state.
+    units_changed : Signal
+        Emitted with the PV's units.
+    severity_changed : Signal
+        Emitted with the PV's alarm severity.
+    """
+
+    sample_received = Signal(float, float)
+    connection_state_changed = Signal(bool)
+    units_changed = Signal(str)
+    severity_changed = Signal(int)
+
+    def __init__(self, address: str, filters: ChannelFilters, parent: QObject = None):
+        super().__init__(parent)
+        self.address = address
+        self.filters = filters
+        self.connected = False
+        self.units = ""
+        self.severity = None
+        self.updates_received = 0
+        self.buffer = RingBuffer(LiveDataStore.DEFAULT_CAPACITY)
+        self._consumers = WeakSet()
+        self._stores = WeakSet()
+        self._skip = 0
+        self._last_kept_value = None
+
+        channel_address = filtered_address(address, filters)
+        self.server_filtered = channel_address != address
+        self.channel = PyDMChannel(
+            address=channel_address,
+            connection_slot=self._receive_connection,
+            value_slot=self.receive_value,
+            unit_slot=self._receive_units,
+            severity_slot=self._receive_severity,
+        )
+        self.channel.connect()
+
+    @property
+    def consumers(self) -> list:
+        """The objects currently sharing the channel."""
+        return list(self._consumers)
+
+    def add_consumer(self, consumer: object, store: QObject = None) -> None:
+        """Start sharing the channel with a consumer, retaining as much live
+        data as the consumer's store asks for.
+
+        Parameters
+        ----------
+        consumer : object
+            The consumer, referenced weakly.
+        store : LiveDataStore, optional
+            The store whose capacity and retention time the consumer uses.
+        """
+        self._consumers.add(consumer)
+        if store is not None:
+            self._stores.add(store)
+            self.update_retention()
+
+    def remove_consumer(self, consumer: object) -> None:
+        """Stop sharing the channel with a consumer."""
+        self._consumers.discard(consumer)
+
+    def update_retention(self) -> None:
+        """Resize the buffer to the largest retained capacity and longest
+        retention time of the consumers' stores.
+        """
+        stores = list(self._stores)
+        if not stores:
+            return
+        capacity = max(store.retained_capacity for store in stores)
+        if capacity != self.buffer.capacity:
+            self.buffer.resize(capacity)
+        max_ages = [store.max_age for store in stores]
+        self.buffer.max_age = None if None in max_ages else max(max_ages)
+
+    def close(self) -> None:
+        """Unsubscribe from the PV. The buffer stays readable by anything
+        still referencing it.
+        """
+        self.channel.disconnect()
+        self._consumers.clear()
+
+    def receive_value(self, value: float) -> None:
+        """Timestamp a live update and append it to the shared buffer, unless
+        it is filtered out.
+
+        Parameters
+        ----------
+        value : float
+            The PV's new value.
+        """
+        self.updates_received += 1
+        if not (self.server_filtered or self._keep_update(value)):
+            return
+        timestamp = time.time()
+        self.buffer.append(timestamp, value)
+        self.sample_received.emit(timestamp, value)
+
+    def _keep_update(self, value: float) -> bool:
+        """Whether a live update passes the filters, for channels whose
+        server does not apply them.
+        """
+        if self.filters.decimation > 1:
+            keep = self._skip == 0
+            self._skip = (self._skip + 1) % self.filters.decimation
+            if not keep:
+                return False
+        if self.filters.deadband > 0:
+            if self._last_kept_value is not None and abs(value - self._last_kept_value) < self.filters.deadband:
+                return False
+            self._last_kept_value = value
+        return True
+
+    @Slot(bool)
+    def _receive_connection(self, connected: bool) -> None:
+        self.connected = connected
+        self.connection_state_changed.emit(connected)
+
+    @Slot(str)
+    def _receive_units(self, units: str) -> None:
+        self.units = units
+        self.units_changed.emit(units)
+
+    @Slot(int)
+    def _receive_severity(self, severity: int) -> None:
+        self.severity = severity
+        self.severity_changed.emit(severity)
+
+
+class LiveChannelRegistry(QObject):
+    """Process-wide registry of shared live channels, so a PV shown by
+    several curves or windows is subscribed to and buffered once.
+
+    Channels are reference counted by their consumers: ``acquire`` returns
+    the channel for a PV and its filters, creating it for the first
+    consumer, and ``release`` unsubscribes it when its last consumer goes
+    away. Consumers that are garbage collected without being released are
+    dropped the next time the registry is pruned.
+
+    Parameters
+    ----------
+    parent : QObject, optional
+        Parent QObject for memory management, by default None.
+    """
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self._channels: dict[tuple[str, ChannelFilters], SharedLiveChannel] = {}
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def __contains__(self, address: str) -> bool:
+        address = normalize_address(address)
+        return any(key[0] == address for key in self._channels)
+
+    @property
+    def channels(self) -> list[SharedLiveChannel]:
+        """Every shared channel currently subscribed."""
+        return list(self._channels.values())
+
+    @property
+    def memory_usage(self) -> int:
+        """The total number of bytes allocated for shared live data."""
+        return sum(channel.buffer.nbytes for channel in self._channels.values())
+
+    def acquire(
+        self, address: str, consumer: object, filters: ChannelFilters = None, store: QObject = None
+    ) -> SharedLiveChannel:
+        """Get the shared channel for a PV, subscribing to it if this is its
+        first consumer.
+
+        Parameters
+        ----------
+        address : str
+            The PV's address, with or without a protocol.
+        consumer : object
+            The object that will read the channel, referenced weakly.
+        filters : ChannelFilters, optional
+            The filters to subscribe through, by default none.
+        store : LiveDataStore, optional
+            The store whose capacity and retention time the consumer uses.
+
+        Returns
+        -------
+        SharedLiveChannel
+            The channel, already shared with any other consumers.
+        """
+        key = (normalize_address(address), filters or ChannelFilters())
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = SharedLiveChannel(*key)
+            metrics.increment("live.channels_opened")
+            logger.debug(f"Subscribed to shared live channel {channel.channel.address}")
+        channel.add_consumer(consumer, store)
+        return channel
+
+    def release(self, channel: SharedLiveChannel, consumer: object) -> None:
+        """Stop a consumer's use of a shared channel, unsubscribing it if no
+        other consumer is left.
+
+        Parameters
+        ----------
+        channel : SharedLiveChannel
+            The channel returned by acquire.
+        consumer : object
+            The consumer that acquired it.
+        """
+        channel.remove_consumer(consumer)
+        if not channel.consumers:
+            self._close((channel.address, channel.filters))
+
+    @Slot()
+    def prune(self) -> None:
+        """Unsubscribe every channel whose consumers have all gone away."""
+        for key, channel in list(self._channels.items()):
+            if not channel.consumers:
+                self._close(key)
+
+    def clear(self) -> None:
+        """Unsubscribe every channel, whether or not it still has consumers."""
+        for key in list(self._channels):
+            self._close(key)
+
+    def _close(self, key: tuple[str, ChannelFilters]) -> None:
+        channel = self._channels.pop(key, None)
+        if channel is None:
+            return
+        try:
+            channel.close()
+            channel.deleteLater()
+        except RuntimeError:
+            # The channel was already deleted, such as when the process is exiting
+            return
+        logger.debug(f"Unsubscribed from shared live channel {channel.channel.address}")
+
+
+# One registry is shared by every window in the process
+live_channels = LiveChannelRegistry()
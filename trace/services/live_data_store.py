@@ -0,0 +1,276 @@
+from enum import Enum
+from weakref import WeakSet
+
+import numpy as np
+from qtpy.QtCore import Slot, QTimer, Signal, QObject
+
+from config import logger
+from utilities import RingBuffer
+
+
+class EvictionPolicy(Enum):
+    """How the live data store frees memory when over its budget."""
+
+    OLDEST = "oldest"
+    DOWNSAMPLE = "downsample"
+
+
+class LiveDataBudget(QObject):
+    """Process-wide memory budget for live data, kept across the live data
+    stores of every plot in the process.
+
+    The budget is checked periodically rather than on every sample. When it
+    is exceeded every buffer is shrunk to the same reduced capacity, either
+    dropping its oldest samples or downsampling them in place first. The
+    reduced capacity is kept as ``reduced_capacity``, which the stores size
+    new buffers and shared channels by, so the budget is not undone by the
+    next curve added. It is lifted when the budget or a store's capacity is
+    changed.
+
+    Parameters
+    ----------
+    budget_mb : int, optional
+        The total memory budget for live data in MiB, by default 512.
+    policy : EvictionPolicy, optional
+        How memory is freed when over budget, by default EvictionPolicy.OLDEST.
+    parent : QObject, optional
+        Parent QObject for memory management, by default None.
+
+    Attributes
+    ----------
+    memory_usage_changed : Signal
+        Emitted with the total bytes allocated for live data after each check.
+    """
+
+    memory_usage_changed = Signal(int)
+
+    DEFAULT_BUDGET_MB = 512
+    CHECK_INTERVAL_MS = 5000
+
+    def __init__(
+        self,
+        budget_mb: int = DEFAULT_BUDGET_MB,
+        policy: EvictionPolicy = EvictionPolicy.OLDEST,
+        parent: QObject = None,
+    ):
+        super().__init__(parent)
+        self._stores = WeakSet()
+        self.limit = budget_mb * 1024**2
+        self.policy = policy
+        self.reduced_capacity = None
+
+        self._check_timer = None
+
+    def add_store(self, store: "LiveDataStore") -> None:
+        """Count a store's buffers toward the budget, until it is garbage collected."""
+        self._stores.add(store)
+
+    def start_checks(self) -> None:
+        """Start the periodic budget check. It is started with the first
+        buffer rather than on construction, so the process-wide budget can
+        be created on import, before the application.
+        """
+        if self._check_timer is None:
+            self._check_timer = QTimer(self)
+            self._check_timer.timeout.connect(self.enforce_budget)
+            self._check_timer.start(self.CHECK_INTERVAL_MS)
+
+    @property
+    def buffers(self) -> list[RingBuffer]:
+        """Every live buffer of the stores, each once."""
+        buffers = []
+        for store in list(self._stores):
+            buffers.extend(buffer for buffer in store.buffers if buffer not in buffers)
+        return buffers
+
+    @property
+    def memory_usage(self) -> int:
+        """The total number of bytes allocated for live data in the process."""
+        return sum(buffer.nbytes for buffer in self.buffers)
+
+    def lift_reduction(self) -> None:
+        """Give every store's buffers back their full capacity, if they were
+        reduced to keep within the budget.
+        """
+        if self.reduced_capacity is None:
+            return
+        self.reduced_capacity = None
+        for store in list(self._stores):
+            store.apply_capacity()
+
+    def set_budget(self, budget_mb: int) -> None:
+        """Set the total memory budget for live data. Buffers reduced to keep
+        within the previous budget regain as much of their capacity as fits.
+
+        Parameters
+        ----------
+        budget_mb : int
+            The memory budget in MiB.
+        """
+        self.limit = int(budget_mb) * 1024**2
+        self.lift_reduction()
+        self.enforce_budget()
+
+    def set_policy(self, policy: EvictionPolicy | str) -> None:
+        """Set how memory is freed when over budget.
+
+        Parameters
+        ----------
+        policy : EvictionPolicy | str
+            The eviction policy or its value.
+        """
+        self.policy = EvictionPolicy(policy)
+
+    @Slot()
+    def enforce_budget(self) -> None:
+        """Reduce the retained capacity in proportion, shrinking every buffer
+        to it, if the process is over its budget.
+        """
+        buffers = self.buffers
+        usage = sum(buffer.nbytes for buffer in buffers)
+        if usage > self.limit and buffers:
+            # Buffers smaller than the reduced capacity keep their size, so it
+            # is lowered until the buffers it shrinks free enough memory
+            capacity = max(buffer.capacity for buffer in buffers)
+            reduced_usage = usage
+            while reduced_usage > self.limit and capacity > 1:
+                capacity = int(capacity * self.limit / reduced_usage)
+                reduced_usage = sum(buffer.nbytes * min(buffer.capacity, capacity) / buffer.capacity for buffer in buffers)
+            logger.warning(f"Live data uses {usage / 1024**2:.1f} MiB, reducing buffers to at most {capacity} samples")
+            self.reduced_capacity = capacity
+            for buffer in buffers:
+                capacity = min(buffer.capacity, self.reduced_capacity)
+                if self.policy == EvictionPolicy.DOWNSAMPLE:
+                    buffer.downsample(capacity)
+                buffer.resize(capacity)
+            usage = self.memory_usage
+
+        self.memory_usage_changed.emit(usage)
+
+
+class LiveDataStore(QObject):
+    """Owner of the live data ring buffers for the curves of one plot. It
+    sets the capacity and retention time of their buffers, and counts them
+    toward the process-wide LiveDataBudget.
+
+    Curves following a shared live channel read its buffer instead of their
+    own. The store counts those buffers in its memory usage, and has the
+    channels resize them when its capacity or retention changes, since
+    other plots' curves may be sharing them.
+    """
+
+    DEFAULT_CAPACITY = 18000
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, budget: LiveDataBudget = None, parent: QObject = None):
+        """Initialize the store.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            The number of samples retained per curve, by default 18000.
+        budget : LiveDataBudget, optional
+            The memory budget the store's buffers count toward, by default
+            the one shared by every plot in the process.
+        parent : QObject, optional
+            Parent QObject for memory management, by default None.
+        """
+        super().__init__(parent)
+        self._buffers = WeakSet()
+        self._channels = WeakSet()
+        self.capacity = capacity
+        self.max_age = None
+        self.dtype = np.float64
+        self.budget = budget or live_data_budget
+        self.budget.add_store(self)
+
+    @property
+    def retained_capacity(self) -> int:
+        """The number of samples retained per curve: the capacity, or less
+        if the buffers were reduced to keep within the budget.
+        """
+        if self.budget.reduced_capacity is None:
+            return self.capacity
+        return min(self.capacity, self.budget.reduced_capacity)
+
+    @property
+    def buffers(self) -> list[RingBuffer]:
+        """All live buffers currently owned by the store, and the buffers of
+        the shared channels its curves follow.
+        """
+        buffers = list(self._buffers)
+        buffers.extend(channel.buffer for channel in self._channels if channel.buffer not in buffers)
+        return buffers
+
+    @property
+    def memory_usage(self) -> int:
+        """The total number of bytes allocated for the store's live data."""
+        return sum(buffer.nbytes for buffer in self.buffers)
+
+    def create_buffer(self) -> RingBuffer:
+        """Create a ring buffer using the store's current retention settings.
+
+        Returns
+        -------
+        RingBuffer
+            The new buffer, tracked by the store until it is garbage collected.
+        """
+        buffer = RingBuffer(self.retained_capacity, dtype=self.dtype, max_age=self.max_age)
+        self._buffers.add(buffer)
+        self.budget.start_checks()
+        return buffer
+
+    def add_channel(self, channel: QObject) -> None:
+        """Track the buffer of a shared live channel followed by one of the
+        store's curves, counting it toward the store's memory usage and budget.
+
+        Parameters
+        ----------
+        channel : SharedLiveChannel
+            The channel, tracked until it is garbage collected.
+        """
+        self._channels.add(channel)
+        self.budget.start_checks()
+
+    def apply_capacity(self) -> None:
+        """Resize every buffer, and have the shared channels resize theirs,
+        to the retained capacity.
+        """
+        for buffer in self._buffers:
+            buffer.resize(self.retained_capacity)
+        for channel in self._channels:
+            channel.update_retention()
+
+    def set_capacity(self, capacity: int) -> None:
+        """Set the number of samples retained per curve, resizing existing
+        buffers. Any reduction made to keep within the budget is lifted, then
+        reapplied if still needed.
+
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of samples to retain per curve.
+        """
+        self.capacity = int(capacity)
+        self.budget.lift_reduction()
+        self.apply_capacity()
+        self.budget.enforce_budget()
+
+    def set_max_age(self, max_age: float | None) -> None:
+        """Set the maximum age of retained samples for every curve.
+
+        Parameters
+        ----------
+        max_age : float | None
+            The retention time in seconds, or None to limit retention by count only.
+        """
+        self.max_age = max_age or None
+        for buffer in self._buffers:
+            buffer.max_age = self.max_age
+            if self.max_age is not None and len(buffer):
+                buffer.trim_before(buffer.times[-1] - self.max_age)
+        for channel in self._channels:
+            channel.update_retention()
+
+
+# One budget covers the live data of every plot in the process
+live_data_budget = LiveDataBudget()
@@ -0,0 +1,287 @@
+import json
+import time
+from pathlib import Path
+from threading import Lock
+from contextlib import contextmanager
+
+from qtpy.QtCore import Slot, QTimer, Signal, QObject
+
+from config import logger
+
+
+class Metrics:
+    """A lightweight registry of performance counters and timers for Trace's
+    hot paths. Recording a value is a dictionary update behind a lock, so
+    instrumentation can stay enabled in production.
+
+    Every metric is identified by a dotted name and optional labels, e.g.
+    ``metrics.increment("live.samples", curve="SOME:PV")``. Counters only
+    increase; timers keep the count, sum, maximum, and latest duration of
+    their observations in seconds. Per-second rates of every counter are
+    computed by ``update_rates``, which MetricsMonitor calls periodically.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters = {}
+        self._timers = {}
+        self._rates = {}
+        self._rate_marks = {}
+        self._rate_time = time.monotonic()
+        self.started = time.time()
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return (name, tuple(sorted(labels.items())))
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        """Add to a counter.
+
+        Parameters
+        ----------
+        name : str
+            The counter's name.
+        value : float, optional
+            The amount to add, by default 1.
+        **labels
+            Labels distinguishing this counter from others with the same name.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Record one duration for a timer.
+
+        Parameters
+        ----------
+        name : str
+            The timer's name.
+        seconds : float
+            The observed duration in seconds.
+        **labels
+            Labels distinguishing this timer from others with the same name.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            stats = self._timers.get(key)
+            if stats is None:
+                self._timers[key] = {"count": 1, "sum": seconds, "max": seconds, "last": seconds}
+                return
+            stats["count"] += 1
+            stats["sum"] += seconds
+            stats["last"] = seconds
+            if seconds > stats["max"]:
+                stats["max"] = seconds
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time the body of a ``with`` block as one observation of a timer."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        """The current value of a counter, or 0 if it has not been incremented."""
+        return self._counters.get(self._key(name, labels), 0)
+
+    def timer_stats(self, name: str, **labels) -> dict:
+        """A copy of a timer's statistics, or an empty dict if it has no observations."""
+        return dict(self._timers.get(self._key(name, labels), {}))
+
+    def rate(self, name: str, **labels) -> float:
+        """The per-second rate of a counter at the last call to update_rates."""
+        return self._rates.get(self._key(name, labels), 0.0)
+
+    def total_rate(self, name: str) -> float:
+        """The summed per-second rate of every counter with the given name, whatever its labels."""
+        return sum(rate for (key_name, _), rate in self._rates.items() if key_name == name)
+
+    def update_rates(self) -> None:
+        """Compute each counter's per-second rate since the previous call."""
+        now = time.monotonic()
+        with self._lock:
+            elapsed = now - self._rate_time
+            if elapsed <= 0:
+                return
+            self._rates = {
+                key: (value - self._rate_marks.get(key, 0)) / elapsed for key, value in self._counters.items()
+            }
+            self._rate_marks = dict(self._counters)
+            self._rate_time = now
+
+    def reset(self) -> None:
+        """Remove every recorded metric."""
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+            self._rates.clear()
+            self._rate_marks.clear()
+            self._rate_time = time.monotonic()
+            self.started = time.time()
+
+    def snapshot(self) -> dict:
+        """All current metrics as a JSON serializable dictionary."""
+
+        def entry(key: tuple, **values) -> dict:
+            name, labels = key
+            return {"name": name, "labels": dict(labels), **values}
+
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "started": self.started,
+                "counters": [
+                    entry(key, value=value, rate=self._rates.get(key, 0.0)) for key, value in self._counters.items()
+                ],
+                "timers": [entry(key, **stats) for key, stats in self._timers.items()],
+            }
+
+    def to_prometheus(self) -> str:
+        """All current metrics in the Prometheus text exposition format.
+        Counters are exported as ``trace_<name>_total`` and timers as a
+        summary ``trace_<name>_seconds`` with an extra ``_max`` gauge.
+        """
+
+        def metric_name(name: str) -> str:
+            return "trace_" + "".join(c if c.isalnum() else "_" for c in name)
+
+        def label_str(labels: dict) -> str:
+            if not labels:
+                return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for v in labels.values())
+            return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+        snapshot = self.snapshot()
+        lines = []
+        seen = set()
+        for counter in sorted(snapshot["counters"], key=lambda c: c["name"]):
+            name = metric_name(counter["name"]) + "_total"
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{label_str(counter['labels'])} {counter['value']}")
+        for timer in sorted(snapshot["timers"], key=lambda t: t["name"]):
+            name = metric_name(timer["name"]) + "_seconds"
+            labels = label_str(timer["labels"])
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} summary")
+                lines.append(f"# TYPE {name}_max gauge")
+            lines.append(f"{name}_count{labels} {timer['count']}")
+            lines.append(f"{name}_sum{labels} {timer['sum']:.9g}")
+            lines.append(f"{name}_max{labels} {timer['max']:.9g}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, file_path: Path | str) -> None:
+        """Write all current metrics to a file. Files ending in '.prom' or
+        '.txt' are written in the Prometheus text format, others as JSON.
+        The file is replaced atomically so readers never see a partial write.
+
+        Parameters
+        ----------
+        file_path : Path | str
+            The file to write.
+        """
+        file_path = Path(file_path)
+        if file_path.suffix in (".prom", ".txt"):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.snapshot(), indent=4)
+
+        temp_path = file_path.with_name(file_path.name + ".tmp")
+        temp_path.write_text(text)
+        temp_path.replace(file_path)
+
+
+metrics = Metrics()
+
+
+class MetricsMonitor(QObject):
+    """Periodically updates the rates of a Metrics registry, and optionally
+    exports the metrics to a file. Event loop stalls are recorded in the
+    registry as ``event_loop.stall`` by the StallWatchdog.
+
+    Attributes
+    ----------
+    updated : Signal
+        Emitted after the rates are updated, about once per second.
+    """
+
+    updated = Signal()
+
+    UPDATE_INTERVAL_MS = 1000
+
+    def __init__(self, registry: Metrics = None, parent: QObject = None):
+        """Start the rate update timer.
+
+        Parameters
+        ----------
+        registry : Metrics, optional
+            The registry to monitor, by default the shared ``metrics`` registry.
+        parent : QObject, optional
+            Parent QObject for memory management, by default None.
+        """
+        super().__init__(parent)
+        self.registry = registry or metrics
+        self.export_path = None
+
+        self._update_timer = QTimer(self)
+        self._update_timer.timeout.connect(self.update)
+        self._update_timer.start(self.UPDATE_INTERVAL_MS)
+
+        self._export_timer = QTimer(self)
+        self._export_timer.timeout.connect(self.export)
+
+    def start_export(self, file_path: Path | str, interval_ms: int = 10000) -> None:
+        """Write the metrics to a file now and then every ``interval_ms``.
+
+        Parameters
+        ----------
+        file_path : Path | str
+            The file to write, see Metrics.export for the supported formats.
+        interval_ms : int, optional
+            Milliseconds between exports, by default 10000.
+        """
+        self.export_path = Path(file_path)
+        self.export()
+        self._export_timer.start(interval_ms)
+        logger.info(f"Exporting performance metrics to {self.export_path}")
+
+    def stop_export(self) -> None:
+        """Stop exporting the metrics, writing them one final time."""
+        if self.export_path is None:
+            return
+        self._export_timer.stop()
+        self.export()
+        self.export_path = None
+
+    @Slot()
+    def export(self) -> None:
+        """Write the metrics to the export file, if one is set."""
+        if self.export_path is None:
+            return
+        try:
+            self.registry.export(self.export_path)
+        except OSError as e:
+            logger.warning(f"Unable to export performance metrics: {e}")
+
+    @Slot()
+    def update(self) -> None:
+        """Update the registry's rates and announce new values."""
+        self.registry.update_rates()
+        self.updated.emit()
+
+    def summary(self) -> str:
+        """A short, human readable summary of the most important metrics."""
+        frame = self.registry.timer_stats("render.frame")
+        stalls = self.registry.timer_stats("event_loop.stall")
+        parts = [
+            f"Frame {1000 * frame.get('last', 0):.1f} ms",
+            f"Live {self.registry.total_rate('live.samples'):.0f} pts/s",
+            f"Archive {self.registry.total_rate('archive.points'):.0f} pts/s",
+            f"Stalls {stalls.get('count', 0)} (max {1000 * stalls.get('max', 0):.0f} ms)",
+        ]
+        return " | ".join(parts)
@@ -0,0 +1,273 @@
+import time
+import threading
+from queue import Queue
+from typing import NamedTuple
+from collections.abc import Iterable
+
+from qtpy.QtCore import Slot, QTimer, Signal, QObject
+
+from pydm.utilities import protocol_and_address
+
+from config import logger
+
+
+class PVMetadata(NamedTuple):
+    """Descriptive fields of a PV. Fields that could not be read are empty
+    strings.
+    """
+
+    description: str = ""
+    units: str = ""
+
+
+def normalize_address(address: str) -> str:
+    """The key a PV's metadata is cached under, with its protocol made
+    explicit so "PV" and "ca://PV" share an entry.
+    """
+    protocol, name = protocol_and_address(address.strip())
+    return f"{protocol or 'ca'}://{name}"
+
+
+class PVMetadataService(QObject):
+    """Shared source of PV metadata (description and units) for the Data
+    Insight Tool and other views that label PVs.
+
+    Metadata is cached by PV for ``ttl`` seconds, so it can be read without
+    waiting. Requests for uncached PVs made within ``BATCH_MS`` of each
+    other are sent as one batch to a persistent worker thread, which reads
+    the whole batch with a single Channel Access or PV Access get, and
+    metadata_changed is emitted for each PV when its metadata arrives.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        Seconds metadata is cached for, by default 300.
+    timeout : float, optional
+        Seconds to wait on PVs when reading metadata, by default 2.0.
+    parent : QObject, optional
+        Parent QObject for memory management, by default None.
+
+    Attributes
+    ----------
+    metadata_changed : Signal
+        Emitted with a PV's normalized address and its PVMetadata, or None
+        if it could not be read.
+    """
+
+    metadata_changed = Signal(str, object)
+    _fetched = Signal(dict)
+
+    DEFAULT_TTL_S = 300.0
+    # PVs whose metadata could not be read are retried sooner
+    FAILURE_TTL_S = 30.0
+    BATCH_MS = 50
+    # The record fields read for Channel Access PVs, in PVMetadata's order
+    CA_FIELDS = ("DESC", "EGU")
+
+    def __init__(self, ttl: float = DEFAULT_TTL_S, timeout: float = 2.0, parent: QObject = None):
+        super().__init__(parent)
+        self.ttl = ttl
+        self.timeout = timeout
+        self._cache: dict[str, tuple[float, PVMetadata | None]] = {}
+        self._queued: list[str] = []
+        self._in_flight: set[str] = set()
+        self._batches: Queue[list[str] | None] = None
+        self._thread = None
+        self._batch_timer = None
+        self._pva_context = None
+
+        # Batches are read on the worker thread and received on this object's thread
+        self._fetched.connect(self._receive)
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is running."""
+        return self._thread is not None
+
+    def get(self, address: str) -> PVMetadata | None:
+        """Get a PV's cached metadata, requesting it if it is missing or stale.
+
+        Parameters
+        ----------
+        address : str
+            The PV's address, with or without a protocol.
+
+        Returns
+        -------
+        PVMetadata | None
+            The cached metadata, which may be stale, or None if it has not
+            been read yet.
+        """
+        self.request([address])
+        entry = self._cache.get(normalize_address(address))
+        return None if entry is None else entry[1]
+
+    def request(self, addresses: Iterable[str]) -> None:
+        """Queue the PVs whose cached metadata is missing or stale to be read.
+
+        Parameters
+        ----------
+        addresses : Iterable[str]
+            The PVs' addresses, with or without protocols.
+        """
+        now = time.monotonic()
+        for address in addresses:
+            if not address or not address.strip():
+                continue
+            key = normalize_address(address)
+            if key in self._in_flight or key in self._queued:
+                continue
+            entry = self._cache.get(key)
+            if entry is not None and now < entry[0]:
+                continue
+            self._queued.append(key)
+
+        if not self._queued:
+            return
+        if self._batch_timer is None:
+            self._batch_timer = QTimer(self)
+            self._batch_timer.setSingleShot(True)
+            self._batch_timer.setInterval(self.BATCH_MS)
+            self._batch_timer.timeout.connect(self._send_batch)
+        if not self._batch_timer.isActive():
+            self._batch_timer.start()
+
+    def invalidate(self, address: str = None) -> None:
+        """Drop a PV's cached metadata, or all cached metadata."""
+        if address is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(normalize_address(address), None)
+
+    def start(self) -> None:
+        """Start the worker thread. Called when the first batch is sent."""
+        if self.running:
+            return
+        # Each worker thread has its own queue, so a stopped worker can
+        # finish its batch without taking batches meant for a new one
+        self._batches = Queue()
+        self._thread = threading.Thread(target=self._work, args=(self._batches,), name="PVMetadata", daemon=True)
+        self._thread.start()
+
+    @Slot()
+    def stop(self) -> None:
+        """Stop the worker thread. A batch it is still reading is discarded
+        rather than waited on.
+        """
+        if self._batch_timer is not None:
+            self._batch_timer.stop()
+        self._queued.clear()
+        self._in_flight.clear()
+        if not self.running:
+            return
+        self._batches.put(None)
+        self._batches = None
+        self._thread = None
+
+    @Slot()
+    def _send_batch(self) -> None:
+        """Send the queued PVs to the worker thread as one batch."""
+        batch, self._queued = self._queued, []
+        if not batch:
+            return
+        self.start()
+        self._in_flight.update(batch)
+        self._batches.put(batch)
+
+    @Slot(dict)
+    def _receive(self, results: dict[str, PVMetadata | None]) -> None:
+        """Cache a batch read by the worker thread and announce each PV's metadata."""
+        now = time.monotonic()
+        for key, metadata in results.items():
+            if key not in self._in_flight:
+                continue  # Stopped while the batch was being read
+            self._in_flight.discard(key)
+            ttl = self.ttl if metadata is not None else self.FAILURE_TTL_S
+            self._cache[key] = (now + ttl, metadata)
+            self.metadata_changed.emit(key, metadata)
+
+    def _work(self, batches: Queue) -> None:
+        """Read batches from the queue on the worker thread until stopped."""
+        while (batch := batches.get()) is not None:
+            try:
+                results = self.fetch(batch)
+            except Exception as e:
+                if batches is not self._batches:
+                    return  # Stopped, possibly because the process is exiting
+                logger.warning(f"Unable to read PV metadata: {e}")
+                results = dict.fromkeys(batch)
+            self._fetched.emit(results)
+
+    def fetch(self, addresses: list[str]) -> dict[str, PVMetadata | None]:
+        """Read the metadata for a batch of normalized addresses, blocking
+        until it is read. Called on the worker thread.
+
+        Parameters
+        ----------
+        addresses : list[str]
+            Addresses as returned by normalize_address.
+
+        Returns
+        -------
+        dict[str, PVMetadata | None]
+            Each address's metadata, or None if it could not be read.
+        """
+        by_protocol = {}
+        for address in addresses:
+            protocol, name = address.split("://", 1)
+            by_protocol.setdefault(protocol, []).append(name)
+
+        results = {}
+        for protocol, names in by_protocol.items():
+            if protocol == "ca":
+                metadata = self._fetch_ca(names)
+            elif protocol == "pva":
+                metadata = self._fetch_pva(names)
+            else:
+                # Local and calculated channels have no metadata to read
+                metadata = [None] * len(names)
+            results.update({f"{protocol}://{name}": data for name, data in zip(names, metadata)})
+        return results
+
+    def _fetch_ca(self, names: list[str]) -> list[PVMetadata | None]:
+        # pyepics loads libca on import, so it is only imported on the worker thread
+        import epics
+
+        epics.ca.use_initial_context()
+        records = [name.split(".")[0] for name in names]
+        fields = [f"{record}.{field}" for record in records for field in self.CA_FIELDS]
+        values = epics.caget_many(fields, timeout=self.timeout, connection_timeout=self.timeout)
+
+        metadata = []
+        n_fields = len(self.CA_FIELDS)
+        for i in range(len(records)):
+            description, units = values[i * n_fields : (i + 1) * n_fields]
+            if description is None and units is None:
+                metadata.append(None)
+                continue
+            metadata.append(PVMetadata(description or "", units or ""))
+        return metadata
+
+    def _fetch_pva(self, names: list[str]) -> list[PVMetadata | None]:
+        try:
+            from p4p.client.thread import Context
+        except ImportError:
+            logger.debug("No PVAccess Python library available, PVA metadata is not read")
+            return [None] * len(names)
+
+        if self._pva_context is None:
+            self._pva_context = Context("pva")
+        values = self._pva_context.get(names, timeout=self.timeout, throw=False)
+
+        metadata = []
+        for value in values:
+            if isinstance(value, Exception) or "display" not in value:
+                metadata.append(None)
+                continue
+            display = value["display"]
+            metadata.append(PVMetadata(display.get("description", ""), display.get("units", "")))
+        return metadata
+
+
+# One service is shared by every window in the process
+pv_metadata = PVMetadataService()
@@ -0,0 +1,197 @@
+from time import perf_counter
+
+from qtpy.QtCore import Qt, Slot, QEvent, Signal, QObject
+from qtpy.QtWidgets import QWidget
+
+from pydm.widgets import PyDMArchiverTimePlot
+
+from config import logger
+from services import metrics
+
+
+class RenderScheduler(QObject):
+    """Central frame scheduler for a PyDMArchiverTimePlot. Curves only mark
+    the plot as needing a redraw when new data arrives; the scheduler then
+    coalesces all of those updates into at most one redraw per frame.
+
+    The frame interval starts at the target FPS and is stretched whenever the
+    measured redraw cost would exceed the frame budget. Rendering pauses
+    entirely while the watched window is hidden or minimized.
+
+    Attributes
+    ----------
+    frame_rate_changed : Signal
+        Emitted with the effective frame rate (Hz) whenever it changes.
+    paused_changed : Signal
+        Emitted with the new paused state when rendering pauses or resumes.
+    """
+
+    frame_rate_changed = Signal(float)
+    paused_changed = Signal(bool)
+
+    MIN_FPS = 1
+    MAX_FPS = 60
+    DEFAULT_FPS = 10
+
+    # Fraction of each frame the redraw is allowed to occupy
+    FRAME_BUDGET = 0.5
+    # Smoothing factor for the redraw cost moving average
+    COST_SMOOTHING = 0.2
+    # Relative change required before the timer interval is updated
+    INTERVAL_HYSTERESIS = 0.1
+
+    def __init__(self, plot: PyDMArchiverTimePlot, target_fps: int = DEFAULT_FPS, parent: QObject = None):
+        """Take over the plot's redraw timer and drive it at the target FPS.
+
+        Parameters
+        ----------
+        plot : PyDMArchiverTimePlot
+            The plot whose redraws should be scheduled.
+        target_fps : int, optional
+            The maximum number of redraws per second, by default 10.
+        parent : QObject, optional
+            Parent QObject for memory management, by default None.
+        """
+        super().__init__(parent)
+        self.plot = plot
+        self._window = None
+        self._paused = False
+        self._resume_auto_scroll = False
+        self._frame_cost_ms = 0.0
+        self._target_fps = self.DEFAULT_FPS
+        self._interval_ms = 0
+
+        # Route the plot's redraw timer through the scheduler. PyDM restarts
+        # this timer whenever a curve is added, so it is reused rather than
+        # replaced to keep that behavior intact.
+        self.plot.redraw_timer.timeout.disconnect(self.plot.redrawPlot)
+        self.plot.redraw_timer.timeout.connect(self.render_frame)
+
+        self.set_target_fps(target_fps)
+
+    @property
+    def target_fps(self) -> int:
+        """The maximum number of redraws per second."""
+        return self._target_fps
+
+    @property
+    def frame_rate(self) -> float:
+        """The effective redraw rate (Hz) after adapting to the redraw cost."""
+        return 1000 / self._interval_ms
+
+    @property
+    def frame_cost(self) -> float:
+        """Moving average of the time (ms) taken to redraw the plot."""
+        return self._frame_cost_ms
+
+    @property
+    def paused(self) -> bool:
+        """Whether rendering is paused because the window is not visible."""
+        return self._paused
+
+    @Slot(int)
+    def set_target_fps(self, fps: int) -> None:
+        """Set the maximum number of redraws per second.
+
+        Parameters
+        ----------
+        fps : int
+            The target frame rate, clamped between MIN_FPS and MAX_FPS.
+        """
+        self._target_fps = min(max(int(fps), self.MIN_FPS), self.MAX_FPS)
+        logger.debug(f"Setting plot render target to {self._target_fps} FPS")
+        self._update_interval(force=True)
+
+    def watch_window(self, window: QWidget) -> None:
+        """Pause rendering while the given window is hidden or minimized.
+
+        Parameters
+        ----------
+        window : QWidget
+            The top level window containing the plot.
+        """
+        if self._window is not None:
+            self._window.removeEventFilter(self)
+        self._window = window
+        window.installEventFilter(self)
+        self._set_paused(not self._window_visible())
+
+    @Slot()
+    def render_frame(self) -> None:
+        """Redraw the plot if any curve received data since the last frame,
+        then adapt the frame interval to the measured redraw cost.
+        """
+        if self._paused:
+            # PyDM restarts the redraw timer when curves are added
+            self.plot.redraw_timer.stop()
+            return
+        if not self.plot._needs_redraw:
+            return
+
+        start = perf_counter()
+        self.plot.redrawPlot()
+        cost = perf_counter() - start
+        metrics.observe("render.frame", cost)
+        cost_ms = cost * 1000
+
+        self._frame_cost_ms += self.COST_SMOOTHING * (cost_ms - self._frame_cost_ms)
+        self._update_interval()
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        """Pause or resume rendering when the watched window changes visibility."""
+        if obj is self._window and event.type() in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange):
+            self._set_paused(not self._window_visible())
+        return super().eventFilter(obj, event)
+
+    def _window_visible(self) -> bool:
+        """Check if the watched window is shown and not minimized."""
+        return self._window.isVisible() and not (self._window.windowState() & Qt.WindowMinimized)
+
+    def _set_paused(self, paused: bool) -> None:
+        """Stop or restart the plot's timers. Autoscroll is also suspended so
+        the x-axis does not keep moving while nothing is shown.
+
+        Parameters
+        ----------
+        paused : bool
+            Whether rendering should be paused.
+        """
+        if paused == self._paused:
+            return
+        self._paused = paused
+
+        auto_scroll_timer = self.plot.auto_scroll_timer
+        if paused:
+            self.plot.redraw_timer.stop()
+            self._resume_auto_scroll = auto_scroll_timer.isActive()
+            auto_scroll_timer.stop()
+        else:
+            if self._resume_auto_scroll:
+                auto_scroll_timer.start()
+                self.plot.auto_scroll()
+            if self.plot._curves:
+                self.plot.set_needs_redraw()
+                self.plot.redraw_timer.start()
+
+        logger.debug(f"Plot rendering {'paused' if paused else 'resumed'}")
+        self.paused_changed.emit(paused)
+
+    def _update_interval(self, force: bool = False) -> None:
+        """Set the redraw timer interval from the target FPS, stretched so a
+        redraw never takes more than FRAME_BUDGET of a frame.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Apply the interval even if it is within the hysteresis band, by default False.
+        """
+        target_ms = 1000 / self._target_fps
+        budget_ms = self._frame_cost_ms / self.FRAME_BUDGET
+        interval_ms = int(min(max(target_ms, budget_ms), 1000 / self.MIN_FPS))
+
+        if not force and abs(interval_ms - self._interval_ms) <= self.INTERVAL_HYSTERESIS * self._interval_ms:
+            return
+
+        self._interval_ms = interval_ms
+        self.plot.redraw_timer.setInterval(interval_ms)
+        self.frame_rate_changed.emit(self.frame_rate)
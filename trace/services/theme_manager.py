@@ -2,9 +2,8 @@ from __future__ import annotations
 
 from enum import Enum
 
-import qtawesome as qta
 from qtpy.QtGui import QIcon, QColor, QPalette
-from qtpy.QtCore import Signal, QObject, QSettings
+from qtpy.QtCore import QSize, QTimer, Signal, QObject, QSettings
 from qtpy.QtWidgets import QPushButton, QApplication, QStyleFactory
 
 from config import dark_stylesheet, light_stylesheet
@@ -12,6 +11,7 @@ from config import dark_stylesheet, light_stylesheet
 type ColorHex = str
 type IconColorDict = dict[str, ColorHex]
 type ButtonIconInfo = tuple[str, QPushButton, str, str]
+type IconKey = tuple[str, ColorHex, float]
 
 
 class Theme(Enum):
@@ -58,6 +58,18 @@ class ThemeManager(QObject):
 
     theme_changed = Signal(Theme)
 
+    # Sizes each icon is rasterized at when it is first created. Widgets
+    # asking for other sizes get the nearest size, scaled.
+    ICON_SIZES = (16, 24, 32, 48)
+
+    # Rendered icons, keyed by name, color, and scale factor. Every icon
+    # requested is also pre-rendered for the other theme while idle, so
+    # toggling the theme does not rasterize anything. The caches are shared
+    # by every window's ThemeManager in the process.
+    _icon_cache: dict[IconKey, QIcon] = {}
+    _requested_icons: set[tuple[str, str, float, ColorHex | None]] = set()
+    _stylesheets: dict[Theme, str] = {}
+
     def __init__(
         self,
         app: QApplication,
@@ -81,6 +93,8 @@ class ThemeManager(QObject):
         """
         super().__init__(parent)
         self.app = app
+        # Keep the window being themed, as the process may open more windows
+        self.window = app.main_window
         self.current_theme = Theme.LIGHT
         self.app.setStyle(QStyleFactory.create("Fusion"))
 
@@ -184,20 +198,44 @@ class ThemeManager(QObject):
         >>> theme_manager.set_theme(Theme.LIGHT)
         """
         self.current_theme = theme
-
-        if theme == Theme.DARK:
-            self.app.setPalette(self.dark_palette)
-            stylesheet = dark_stylesheet.read_text()
-        else:
-            self.app.setPalette(self.light_palette)
-            stylesheet = light_stylesheet.read_text()
-
-        self.app.main_window.setStyleSheet(stylesheet)
+        palette = self.dark_palette if theme == Theme.DARK else self.light_palette
+        stylesheet = self.stylesheet(theme)
+
+        # Apply the whole theme as one update: widgets are re-polished and
+        # their icons swapped while updates are disabled, then repainted once
+        self.window.setUpdatesEnabled(False)
+        try:
+            self.app.setPalette(palette)
+            if self.window.styleSheet() != stylesheet:
+                self.window.setStyleSheet(stylesheet)
+            self.theme_changed.emit(theme)
+        finally:
+            self.window.setUpdatesEnabled(True)
 
         settings = QSettings()
         settings.setValue("isDarkTheme", theme == Theme.DARK)
 
-        self.theme_changed.emit(theme)
+        QTimer.singleShot(0, self.prerender_icons)
+
+    def stylesheet(self, theme: Theme) -> str:
+        """
+        Get the stylesheet for a theme. Each stylesheet is read from disk
+        only once.
+
+        Parameters
+        ----------
+        theme : Theme
+            The theme to get the stylesheet for.
+
+        Returns
+        -------
+        str
+            The contents of the theme's stylesheet.
+        """
+        if theme not in self._stylesheets:
+            path = dark_stylesheet if theme == Theme.DARK else light_stylesheet
+            self._stylesheets[theme] = path.read_text()
+        return self._stylesheets[theme]
 
     def toggle_theme(self) -> None:
         """
@@ -279,8 +317,54 @@ class ThemeManager(QObject):
         >>> warning_icon = theme_manager.create_icon('fa.exclamation-triangle', IconColors.WARNING)
         >>> custom_icon = theme_manager.create_icon('fa.gear', custom_color='#ff0000')
         """
+        self._requested_icons.add((icon_name, color_type, scale_factor, custom_color))
         color = custom_color or self.get_icon_color(color_type)
-        return qta.icon(icon_name, color=color, scale_factor=scale_factor)
+        return self._cached_icon(icon_name, color, scale_factor)
+
+    def prerender_icons(self) -> None:
+        """
+        Render every icon requested so far in both themes' colors, so later
+        theme changes and new widgets reuse the cached icons.
+        """
+        for icon_name, color_type, scale_factor, custom_color in self._requested_icons.copy():
+            for colors in (self.light_icon_colors, self.dark_icon_colors):
+                color = custom_color or colors.get(color_type, colors[IconColors.PRIMARY])
+                self._cached_icon(icon_name, color, scale_factor)
+
+    def _cached_icon(self, icon_name: str, color: ColorHex, scale_factor: float) -> QIcon:
+        """
+        Get an icon from the cache, rendering it first if needed.
+
+        qtawesome icons are redrawn from the icon font every time a widget
+        paints them, so the icon is rasterized once at each of ICON_SIZES
+        into a pixmap icon instead.
+
+        Parameters
+        ----------
+        icon_name : str
+            The qtawesome icon name.
+        color : ColorHex
+            The hex color to draw the icon in.
+        scale_factor : float
+            Scale factor for icon size.
+
+        Returns
+        -------
+        QIcon
+            The cached icon.
+        """
+        key = (icon_name, color, scale_factor)
+        if key not in self._icon_cache:
+            # Imported on first use, as loading its icon fonts slows startup
+            import qtawesome as qta
+
+            source = qta.icon(icon_name, color=color, scale_factor=scale_factor)
+            icon = QIcon()
+            for size in self.ICON_SIZES:
+                for mode in (QIcon.Normal, QIcon.Disabled):
+                    icon.addPixmap(source.pixmap(QSize(size, size), mode), mode)
+            self._icon_cache[key] = icon
+        return self._icon_cache[key]
 
     def get_all_icon_colors(self) -> IconColorDict:
         """
@@ -0,0 +1,177 @@
+import sys
+import time
+import logging
+import threading
+import traceback
+from pathlib import Path
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+
+from qtpy.QtCore import Slot, QTimer, QObject
+
+from config import logger
+from services.metrics import Metrics, metrics
+
+
+class StallWatchdog(QObject):
+    """Watches the GUI event loop from a background thread and records what
+    the main thread is doing whenever the loop stops responding.
+
+    A timer on the main thread updates a heartbeat. When the watchdog thread
+    sees no heartbeat for longer than the threshold, it samples the main
+    thread's Python stack every SAMPLE_INTERVAL_MS until the loop recovers.
+    Each stall is then written to a rotating log file with its duration and
+    its most frequently sampled stacks, and the innermost frames of every
+    sample are added to ``hotspots`` to find the worst offenders over the
+    whole session. Each stall's duration is also recorded in the metrics
+    registry as ``event_loop.stall``.
+
+    Parameters
+    ----------
+    log_file : Path | str
+        The file stall reports are written to.
+    threshold_ms : int, optional
+        Milliseconds without a heartbeat before the event loop is considered stalled, by default 500.
+    registry : Metrics, optional
+        The registry stalls are recorded in, by default the shared ``metrics`` registry.
+    parent : QObject, optional
+        Parent QObject for memory management, by default None.
+    """
+
+    HEARTBEAT_MS = 50
+    SAMPLE_INTERVAL_MS = 10
+    # Number of innermost frames kept from each sampled stack
+    STACK_DEPTH = 12
+    # Number of distinct stacks written for each stall
+    REPORTED_STACKS = 3
+    LOG_MAX_BYTES = 1024**2
+    LOG_BACKUP_COUNT = 3
+
+    def __init__(self, log_file: Path | str, threshold_ms: int = 500, registry: Metrics = None, parent: QObject = None):
+        super().__init__(parent)
+        self.log_file = Path(log_file)
+        self.threshold = threshold_ms / 1000
+        self.registry = registry or metrics
+        self.stall_count = 0
+        self.hotspots = Counter()
+
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.perf_counter()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._stall_logger = None
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.timeout.connect(self.beat)
+
+    @property
+    def running(self) -> bool:
+        """Whether the watchdog thread is running."""
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start the heartbeat and the watchdog thread."""
+        if self.running:
+            return
+        self._stall_logger = self._create_stall_logger()
+        self._stopped.clear()
+        self.beat()
+        self._heartbeat.start(self.HEARTBEAT_MS)
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        logger.debug(f"Watching for event loop stalls over {int(self.threshold * 1000)} ms")
+
+    @Slot()
+    def stop(self) -> None:
+        """Stop the watchdog thread and log the session's hottest frames."""
+        if not self.running:
+            return
+        self._heartbeat.stop()
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+        if self.stall_count:
+            hottest = "\n".join(f"    {count:6d}  {frame}" for frame, count in self.hotspots.most_common(10))
+            self._stall_logger.warning(f"{self.stall_count} stalls this session, hottest frames:\n{hottest}")
+        for handler in self._stall_logger.handlers[:]:
+            self._stall_logger.removeHandler(handler)
+            handler.close()
+
+    @Slot()
+    def beat(self) -> None:
+        """Record that the event loop is responsive."""
+        self._last_beat = time.perf_counter()
+
+    def sample_stack(self) -> tuple[str, ...]:
+        """Capture the innermost frames of the main thread's Python stack.
+
+        Returns
+        -------
+        tuple[str, ...]
+            One 'file:line in function' entry per frame, innermost last, or
+            an empty tuple if the main thread has no Python frame.
+        """
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return ()
+        summary = traceback.extract_stack(frame, limit=self.STACK_DEPTH)
+        return tuple(f"{Path(f.filename).name}:{f.lineno} in {f.name}" for f in summary)
+
+    def _watch(self) -> None:
+        """Body of the watchdog thread."""
+        interval = self.SAMPLE_INTERVAL_MS / 1000
+        samples = Counter()
+        stall_start = None
+        while not self._stopped.wait(interval):
+            since_beat = time.perf_counter() - self._last_beat
+            if since_beat > self.threshold:
+                if stall_start is None:
+                    stall_start = self._last_beat
+                stack = self.sample_stack()
+                if stack:
+                    samples[stack] += 1
+            elif stall_start is not None:
+                self._report(self._last_beat - stall_start, samples)
+                samples = Counter()
+                stall_start = None
+
+    def _report(self, duration: float, samples: Counter) -> None:
+        """Log a stall and add its samples to the session's hotspots.
+
+        Parameters
+        ----------
+        duration : float
+            Seconds between the last heartbeat before the stall and the first after it.
+        samples : Counter
+            The number of times each distinct stack was sampled during the stall.
+        """
+        self.stall_count += 1
+        self.registry.observe("event_loop.stall", duration)
+        total = sum(samples.values())
+        for stack, count in samples.items():
+            self.hotspots[stack[-1]] += count
+
+        lines = [f"Event loop stalled for {duration:.2f} s ({total} samples)"]
+        for stack, count in samples.most_common(self.REPORTED_STACKS):
+            lines.append(f"  {count} samples ({count / total:.0%}):")
+            lines.extend(f"    {frame}" for frame in stack)
+        self._stall_logger.warning("\n".join(lines))
+
+    def _create_stall_logger(self) -> logging.Logger:
+        """Create the logger for stall reports, writing to a rotating log
+        file. Falls back to the application log if the file cannot be opened.
+        """
+        stall_logger = logging.getLogger(f"{__name__}.{id(self)}")
+        stall_logger.setLevel(logging.INFO)
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(self.log_file, maxBytes=self.LOG_MAX_BYTES, backupCount=self.LOG_BACKUP_COUNT)
+        except OSError as e:
+            logger.warning(f"Unable to open stall log {self.log_file}, using the application log: {e}")
+            return stall_logger
+
+        handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
+        stall_logger.addHandler(handler)
+        stall_logger.propagate = False
+        return stall_logger
@@ -8,6 +8,7 @@ from pydm.application import PyDMApplication
 
 from main import TraceDisplay
 from config import logger
+from services import pv_metadata
 
 
 @pytest.fixture
@@ -61,6 +62,7 @@ def qapp(qapp_args):
 
     app = PyDMApplication(use_main_window=False, *qapp_args)
     yield app
+    pv_metadata.stop()
     app.quit()
 
 
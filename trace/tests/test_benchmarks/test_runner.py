@@ -0,0 +1,27 @@
+from benchmarks import find_regressions
+
+
+def test_find_regressions():
+    """Test that scenarios slower than the baseline by more than the threshold,
+    or that failed, are reported.
+
+    Expectations
+    ------------
+    The scenario whose median time grew past the threshold and the scenario that
+    failed are regressions, and scenarios missing from the baseline are ignored.
+    """
+    baseline = {"scenarios": {"fast": {"median": 1.0}, "slow": {"median": 1.0}, "broken": {"median": 1.0}}}
+    report = {
+        "scenarios": {
+            "fast": {"median": 1.1, "errors": []},
+            "slow": {"median": 2.0, "errors": []},
+            "broken": {"median": None, "errors": ["Timed out after 120.0 s"]},
+            "new": {"median": 5.0, "errors": []},
+        }
+    }
+
+    regressions = find_regressions(report, baseline, threshold=1.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("slow")
+    assert regressions[1].startswith("broken")
@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timezone
+from urllib.request import urlopen
+
+import pytest
+
+from benchmarks import StubArchiver
+
+
+@pytest.fixture
+def archiver():
+    """Fixture for a running StubArchiver with a one second sample period.
+
+    Yields
+    ------
+    A started instance of StubArchiver.
+    """
+    with StubArchiver(sample_period=1.0, pv_count=500) as stub:
+        yield stub
+
+
+def archiver_time(timestamp: float) -> str:
+    """Format a timestamp the way PyDM sends it to the Archiver Appliance."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def test_raw_data(archiver):
+    """Test that raw getData.json requests return one sample per sample period.
+
+    Parameters
+    ----------
+    archiver : fixture
+        Running instance of StubArchiver
+
+    Expectations
+    ------------
+    The response is in the Archiver Appliance's JSON format with a sample at
+    every second of the requested range.
+    """
+    pv = "BENCH:PV:000001"
+    url = f"{archiver.url}/retrieval/data/getData.json?pv={pv}&from={archiver_time(1000)}&to={archiver_time(1099)}"
+    with urlopen(url) as reply:
+        assert reply.headers["Content-Type"] == "application/json"
+        data = json.loads(reply.read())
+
+    points = data[0]["data"]
+    assert data[0]["meta"]["name"] == "BENCH:PV:000001"
+    assert len(points) == 100
+    assert [p["secs"] for p in points] == list(range(1000, 1100))
+
+
+def test_optimized_data(archiver):
+    """Test that optimized getData.json requests return the requested number of bins.
+
+    Parameters
+    ----------
+    archiver : fixture
+        Running instance of StubArchiver
+
+    Expectations
+    ------------
+    Each bin's value holds the mean, standard deviation, minimum, maximum, and count.
+    """
+    pv = "optimized_50(BENCH:PV:000001)"
+    url = f"{archiver.url}/retrieval/data/getData.json?pv={pv}&from={archiver_time(0)}&to={archiver_time(86400)}"
+    with urlopen(url) as reply:
+        points = json.loads(reply.read())[0]["data"]
+
+    assert len(points) == 50
+    mean, std, minimum, maximum, count = points[0]["val"]
+    assert minimum <= mean <= maximum
+    assert count > 1
+
+
+def test_search(archiver):
+    """Test that searchForPVsRegex returns the matching PV names.
+
+    Parameters
+    ----------
+    archiver : fixture
+        Running instance of StubArchiver
+
+    Expectations
+    ------------
+    Every name matching the regex is returned, one per line.
+    """
+    with urlopen(f"{archiver.url}/retrieval/bpl/searchForPVsRegex?regex=.*PV:0001.*") as reply:
+        names = reply.read().decode().split()
+
+    assert names == [f"BENCH:PV:{i:06d}" for i in range(100, 200)]
@@ -0,0 +1,214 @@
+import time
+
+import numpy as np
+import pytest
+
+from file_io import LiveRecorder, LiveReplayer, read_recording
+from widgets import TracePlot
+
+
+@pytest.fixture
+def trace_plot(qapp):
+    """Fixture for an instance of TracePlot.
+
+    Yields
+    ------
+    An instance of TracePlot.
+    """
+    plot = TracePlot()
+    yield plot
+
+    plot.clearCurves()
+    plot.deleteLater()
+    qapp.processEvents()
+
+
+def test_record_round_trip(trace_plot, tmp_path):
+    """Test that live samples of recorded curves are written to the file and
+    can be read back as a memory map.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+    tmp_path : fixture
+        Temporary directory for the recording file
+
+    Expectations
+    ------------
+    Every sample is recorded with its timestamp, value, and channel, including
+    samples from a curve added after recording started.
+    """
+    recording = tmp_path / "test.trec"
+    foo = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False)
+    recorder = LiveRecorder()
+    trace_plot.curve_added.connect(recorder.add_curve)
+    recorder.start(recording, [foo])
+
+    foo.receiveNewValue(1.0)
+    bar = trace_plot.addYChannel("ca://BAR:PV", useArchiveData=False)
+    bar.receiveNewValue(2.0)
+    foo.receiveNewValue(3.0)
+    recorder.stop()
+
+    channels, records = read_recording(recording)
+    assert channels == ["ca://FOO:PV", "ca://BAR:PV"]
+    assert isinstance(records, np.memmap)
+    assert np.all(np.diff(records["timestamp"]) >= 0)
+    assert records["value"].tolist() == [1.0, 2.0, 3.0]
+    assert records["channel"].tolist() == [0, 1, 0]
+
+
+def test_record_once_per_pv(trace_plot, tmp_path):
+    """Test that a PV shown by several curves is recorded once, and that
+    removing a curve or changing its PV changes what is recorded.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+    tmp_path : fixture
+        Temporary directory for the recording file
+
+    Expectations
+    ------------
+    Each sample of a shared PV is written once, a curve's new PV is recorded
+    under its own channel, and a removed curve's PV is no longer recorded.
+    """
+    recording = tmp_path / "test.trec"
+    first = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False)
+    second = trace_plot.addYChannel("FOO:PV", useArchiveData=False)
+    recorder = LiveRecorder()
+    recorder.start(recording, [first, second])
+
+    first.receiveNewValue(1.0)
+    second.address = "ca://BAR:PV"
+    second.receiveNewValue(2.0)
+    first.receiveNewValue(3.0)
+    bar_channel = second.live_channel
+    trace_plot.removeCurve(second)
+    bar_channel.sample_received.emit(time.time(), 4.0)
+    recorder.stop()
+
+    channels, records = read_recording(recording)
+    assert channels == ["ca://FOO:PV", "ca://BAR:PV"]
+    assert records["value"].tolist() == [1.0, 2.0, 3.0]
+    assert records["channel"].tolist() == [0, 1, 0]
+
+
+def test_full_header_stops_recording(trace_plot, tmp_path, caplog):
+    """Test that recording stops cleanly once another channel would not fit
+    in the recording's header.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+    tmp_path : fixture
+        Temporary directory for the recording file
+    caplog : fixture
+        pytest fixture for capturing log records
+
+    Expectations
+    ------------
+    Adding the channel that overflows the header stops the recording with an
+    error logged instead of raising, and the file still lists the channels
+    recorded before it.
+    """
+    recording = tmp_path / "test.trec"
+    recorder = LiveRecorder()
+    stopped = []
+    recorder.stopped.connect(lambda: stopped.append(True))
+    trace_plot.curve_added.connect(recorder.add_curve)
+    recorder.start(recording)
+
+    trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False)
+    trace_plot.addYChannel(f"ca://{'LONG:' * 14000}PV", useArchiveData=False)
+
+    assert not recorder.recording
+    assert stopped == [True]
+    assert "Stopped recording" in caplog.text
+    channels, _ = read_recording(recording)
+    assert channels == ["ca://FOO:PV"]
+
+
+def test_replay_feeds_curves(qapp, trace_plot, tmp_path):
+    """Test that replaying a recording appends its samples to every curve
+    showing a recorded PV.
+
+    Parameters
+    ----------
+    qapp : fixture
+        PyDMApplication instance
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+    tmp_path : fixture
+        Temporary directory for the recording file
+
+    Expectations
+    ------------
+    Replayed samples keep their values and relative timing, scaled by the
+    replay speed, and the replayer reports when it is finished.
+    """
+    recording = tmp_path / "test.trec"
+    curve = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False)
+    other = trace_plot.addYChannel("FOO:PV", useArchiveData=False)
+    recorder = LiveRecorder()
+    recorder.start(recording, [curve])
+    for i in range(5):
+        curve.live_channel.sample_received.emit(1000.0 + i, float(i))
+    recorder.stop()
+
+    trace_plot.set_replaying(True)
+    replayer = LiveReplayer()
+    finished = []
+    replayer.finished.connect(lambda: finished.append(True))
+    replayer.load(recording)
+    replayer.start([curve, other], speed=1000.0)
+    replayer._replay_start -= 1
+    replayer.tick()
+
+    assert finished
+    assert not replayer.replaying
+    for replayed in (curve, other):
+        assert replayed.live_buffer.values.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert np.allclose(np.diff(replayed.live_buffer.times), 1 / 1000, atol=1e-6)
+
+
+def test_replay_detaches_curves(trace_plot):
+    """Test that curves are detached from live data and the archiver while
+    replaying, and reattached once the replay ends.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    Replaying curves, including curves added while replaying, follow no live
+    channel, make no archive requests, and start empty; live updates do not
+    reach them. Afterward they follow their live channels and request archive
+    data again, and are saved with their own archive setting throughout.
+    """
+    curve = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=True)
+    curve.receiveNewValue(1.0)
+    channel = curve.live_channel
+
+    trace_plot.set_replaying(True)
+    added = trace_plot.addYChannel("ca://BAR:PV", useArchiveData=True)
+    channel.receive_value(2.0)
+
+    for replaying in (curve, added):
+        assert replaying.replaying
+        assert replaying.live_channel is None
+        assert not replaying.use_archive_data
+        assert replaying.to_dict()["useArchiveData"]
+    assert len(curve.live_buffer) == 0
+    assert not curve.backfill_live_data(0, time.time())
+
+    trace_plot.set_replaying(False)
+    for reattached in (curve, added):
+        assert not reattached.replaying
+        assert reattached.live_channel is not None
+        assert reattached.use_archive_data
@@ -0,0 +1,46 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+import main
+
+
+def test_startup_skips_heavy_imports():
+    """Test that importing Trace's main module does not import the libraries
+    only needed by tools that are opened on demand.
+
+    Expectations
+    ------------
+    pandas, scipy, and requests are not imported until the Data Insight Tool
+    or E-Log client is first used, the analysis tools' modules are not
+    imported until they are first opened, qtawesome is not imported until
+    the first icon is created, and config.json is not parsed until a setting
+    is first read.
+    """
+    deferred = (
+        "pandas",
+        "scipy",
+        "requests",
+        "qtawesome",
+        "widgets.statistics_panel",
+        "widgets.correlation_tool",
+        "widgets.spectral_tool",
+        "widgets.waveform_viewer",
+    )
+    check = (
+        "import sys, main, config; "
+        f"print(' '.join(m for m in {deferred!r} if m in sys.modules), "
+        "'config.json' if config.load_config.cache_info().currsize else '')"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", check],
+        cwd=Path(main.__file__).parent,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from widgets import TracePlot
+from services import ArchiveCache
+
+
+@pytest.fixture
+def plot(qapp):
+    """Fixture for a TracePlot with its archive prefetcher.
+
+    Yields
+    ------
+    An instance of TracePlot.
+    """
+    plot = TracePlot()
+    yield plot
+
+    plot.deleteLater()
+    qapp.processEvents()
+
+
+def segment(start: int, end: int) -> np.ndarray:
+    """Archive data with one sample per second from start to end, valued by timestamp."""
+    times = np.arange(start, end + 1, dtype=float)
+    return np.vstack((times, times * 2))
+
+
+def test_cache_stitches_segments():
+    """Test that lookups are served from adjacent cached segments.
+
+    Expectations
+    ------------
+    A range spanning two segments returns their samples in order without
+    duplicates, starting with the newest sample before the range; a range
+    with a gap, or with a different processing command, is not served.
+    """
+    cache = ArchiveCache()
+    cache.store("ca://PV:A", "", 100, 200, segment(100, 200))
+    cache.store("ca://PV:A", "", 200, 300, segment(200, 300))
+
+    data = cache.lookup("PV:A", "", 150.5, 250)
+    assert np.array_equal(data[0], np.arange(150, 251))
+    assert np.array_equal(data[1], data[0] * 2)
+
+    assert cache.covers("PV:A", "", 100, 300)
+    assert not cache.covers("PV:A", "", 50, 150)
+    assert not cache.covers("PV:A", "optimized_100", 150, 250)
+    assert not cache.covers("PV:B", "", 150, 250)
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache stays within its size by evicting the least recently used segments.
+
+    Expectations
+    ------------
+    After a lookup refreshes the oldest segment, storing a new one evicts the
+    segment that has gone unused the longest.
+    """
+    size = segment(0, 99).nbytes
+    cache = ArchiveCache(max_bytes=2 * size)
+    cache.store("PV:A", "", 0, 99, segment(0, 99))
+    cache.store("PV:B", "", 0, 99, segment(0, 99))
+    cache.lookup("PV:A", "", 0, 99)
+    cache.store("PV:C", "", 0, 99, segment(0, 99))
+
+    assert len(cache) == 2
+    assert cache.nbytes == 2 * size
+    assert cache.covers("PV:A", "", 0, 99)
+    assert not cache.covers("PV:B", "", 0, 99)
+
+
+def test_prefetch_follows_direction(plot):
+    """Test that the prefetcher plans windows in the direction of navigation.
+
+    Parameters
+    ----------
+    plot : fixture
+        Instance of TracePlot
+
+    Expectations
+    ------------
+    Both neighbouring windows are planned for a new range, only the older
+    window while paging back, only the newer window after turning around,
+    and both again after zooming.
+    """
+    prefetcher = plot.archive_prefetcher
+    day = 86400
+    end = 1_700_000_000
+
+    assert prefetcher.plan(end - day, end) == [(end - 2 * day, end - day, -1), (end, end + day, 1)]
+    assert prefetcher.plan(end - 2 * day, end - day) == [(end - 3 * day, end - 2 * day, -1)]
+    assert prefetcher.direction == -1
+    assert prefetcher.plan(end - day, end) == [(end, end + day, 1)]
+    assert prefetcher.direction == 1
+    assert prefetcher.plan(end - 3 * day, end) == [(end - 6 * day, end - 3 * day, -1), (end, end + 3 * day, 1)]
+    assert prefetcher.direction == 0
@@ -0,0 +1,194 @@
+import logging
+import threading
+
+import numpy as np
+import pytest
+
+from services import ArchiveFetcher, metrics, decode_archive_data, decode_waveform_data
+from benchmarks import StubArchiver
+
+
+@pytest.fixture
+def archiver(monkeypatch):
+    """Fixture for a running StubArchiver that answers after a short delay,
+    set as the PYDM_ARCHIVER_URL.
+
+    Yields
+    ------
+    A started instance of StubArchiver.
+    """
+    with StubArchiver(sample_period=1.0, latency=0.2) as stub:
+        monkeypatch.setenv("PYDM_ARCHIVER_URL", stub.url)
+        yield stub
+
+
+@pytest.fixture
+def fetcher(qapp):
+    """Fixture for an ArchiveFetcher.
+
+    Yields
+    ------
+    An instance of ArchiveFetcher.
+    """
+    fetcher = ArchiveFetcher()
+    yield fetcher
+
+    fetcher.cancel_all()
+    fetcher.deleteLater()
+    qapp.processEvents()
+
+
+def test_decode_archive_data():
+    """Test converting archiver replies into curve data.
+
+    Expectations
+    ------------
+    Raw replies become (2, N) arrays and optimized replies (5, N) arrays,
+    falling back to raw when the archiver sends raw values.
+    """
+    raw = [{"data": [{"secs": 1, "val": 1.5}, {"secs": 2, "val": 2.5}]}]
+    optimized = [{"data": [{"secs": 1, "val": [1.5, 0.1, 1.0, 2.0, 4]}]}]
+
+    assert np.array_equal(decode_archive_data(raw), [[1, 2], [1.5, 2.5]])
+    assert np.array_equal(decode_archive_data(raw, optimized=True), [[1, 2], [1.5, 2.5]])
+    assert np.array_equal(decode_archive_data(optimized, optimized=True), [[1], [1.5], [0.1], [1.0], [2.0]])
+
+
+def test_decode_waveform_data():
+    """Test converting archiver replies for waveform PVs into waveform history.
+
+    Expectations
+    ------------
+    Timestamps include nanoseconds, and waveforms become rows of a 2D array,
+    shorter ones padded with NaN.
+    """
+    reply = [{"data": [{"secs": 1, "nanos": 500_000_000, "val": [1, 2, 3]}, {"secs": 2, "val": [4, 5]}]}]
+    times, waveforms = decode_waveform_data(reply)
+
+    assert np.array_equal(times, [1.5, 2.0])
+    assert np.array_equal(waveforms, [[1, 2, 3], [4, 5, np.nan]], equal_nan=True)
+
+
+def test_superseded_request_is_not_delivered(qtbot, archiver, fetcher):
+    """Test that a new request from an owner supersedes its previous one.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt fixture for waiting on the event loop
+    archiver : fixture
+        Running instance of StubArchiver
+    fetcher : fixture
+        Instance of ArchiveFetcher
+
+    Expectations
+    ------------
+    Only the latest request's data is delivered, the superseded request is
+    counted as cancelled, and no requests are left in flight. The delivered
+    reply's size in bytes, latency, and decode time are recorded.
+    """
+    received = []
+    cancelled = metrics.counter("archive.cancelled")
+    received_bytes = metrics.counter("archive.bytes")
+    latencies = metrics.timer_stats("archive.latency").get("count", 0)
+    decodes = metrics.timer_stats("archive.decode").get("count", 0)
+
+    assert not fetcher.fetch("curve", "BENCH:PV:000001", 1000, 1099, "", received.append)
+    assert fetcher.fetch("curve", "BENCH:PV:000002", 2000, 2009, "", received.append)
+    assert fetcher.owners() == ["curve"]
+
+    qtbot.waitUntil(lambda: "curve" not in fetcher, timeout=5000)
+    qtbot.wait(300)
+    assert len(received) == 1
+    assert np.array_equal(received[0][0], np.arange(2000, 2010))
+    assert metrics.counter("archive.cancelled") == cancelled + 1
+    assert metrics.counter("archive.bytes") > received_bytes
+    assert metrics.timer_stats("archive.latency").get("count", 0) == latencies + 1
+    assert metrics.timer_stats("archive.decode").get("count", 0) == decodes + 1
+
+
+def test_threaded_decode(qtbot, archiver, fetcher):
+    """Test decoding replies on the fetcher's worker thread.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt fixture for waiting on the event loop
+    archiver : fixture
+        Running instance of StubArchiver
+    fetcher : fixture
+        Instance of ArchiveFetcher
+
+    Expectations
+    ------------
+    The reply is decoded off the GUI thread and delivered on it, and a reply
+    superseded while it is being decoded is not delivered.
+    """
+    decoded_on, delivered_on, received = [], [], []
+    release = threading.Event()
+    release.set()
+
+    def decode(data_dict):
+        decoded_on.append(threading.current_thread())
+        release.wait(5)
+        return decode_archive_data(data_dict)
+
+    def callback(data):
+        delivered_on.append(threading.current_thread())
+        received.append(data)
+
+    fetcher.fetch("viewer", "BENCH:PV:000001", 1000, 1099, "", callback, decode=decode, threaded=True)
+    qtbot.waitUntil(lambda: "viewer" not in fetcher, timeout=5000)
+    assert decoded_on[0] is not threading.main_thread()
+    assert delivered_on == [threading.main_thread()]
+    assert np.array_equal(received[0][0], np.arange(1000, 1100))
+
+    release.clear()
+    fetcher.fetch("viewer", "BENCH:PV:000001", 1000, 1099, "", callback, decode=decode, threaded=True)
+    qtbot.waitUntil(lambda: len(decoded_on) == 2, timeout=5000)
+    fetcher.fetch("viewer", "BENCH:PV:000002", 2000, 2009, "", callback, decode=decode, threaded=True)
+    release.set()
+    qtbot.waitUntil(lambda: "viewer" not in fetcher, timeout=5000)
+    qtbot.wait(100)
+    assert len(received) == 2
+    assert np.array_equal(received[1][0], np.arange(2000, 2010))
+
+
+def test_cancel_and_failure(qtbot, archiver, fetcher, monkeypatch, caplog):
+    """Test cancelling a request, and delivering a request that cannot be sent.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt fixture for waiting on the event loop
+    archiver : fixture
+        Running instance of StubArchiver
+    fetcher : fixture
+        Instance of ArchiveFetcher
+    monkeypatch : fixture
+        pytest fixture for unsetting PYDM_ARCHIVER_URL
+    caplog : fixture
+        pytest fixture for capturing log records
+
+    Expectations
+    ------------
+    A cancelled request is never delivered, cancelling an owner without a
+    request does nothing, an empty range is delivered as None without
+    logging an error, and without an archiver URL the callback is called
+    with None and an error is logged.
+    """
+    received = []
+    fetcher.fetch("curve", "BENCH:PV:000001", 1000, 1099, "", received.append)
+    assert fetcher.cancel("curve")
+    assert not fetcher.cancel("curve")
+    qtbot.wait(400)
+    assert received == []
+
+    fetcher.fetch("curve", "BENCH:PV:000001", 1000, 1000, "", received.append)
+    qtbot.waitUntil(lambda: received == [None], timeout=1000)
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+
+    monkeypatch.delenv("PYDM_ARCHIVER_URL")
+    fetcher.fetch("curve", "BENCH:PV:000001", 1000, 1099, "", received.append)
+    qtbot.waitUntil(lambda: received == [None, None], timeout=1000)
+    assert "PYDM_ARCHIVER_URL is not set" in caplog.text
@@ -0,0 +1,80 @@
+from threading import Thread
+
+import pytest
+
+import launch_client
+from services import TraceInstanceServer, instance_server
+
+
+@pytest.fixture
+def server(qapp, tmp_path, monkeypatch):
+    """Fixture for a listening TraceInstanceServer on a temporary socket.
+
+    Yields
+    ------
+    An instance of TraceInstanceServer.
+    """
+    path = tmp_path / "trace.sock"
+    monkeypatch.setattr(launch_client, "socket_path", lambda: path)
+    monkeypatch.setattr(instance_server, "socket_path", lambda: path)
+
+    server = TraceInstanceServer()
+    assert server.listen()
+    yield server
+
+    server.close()
+    server.deleteLater()
+
+
+def send_in_thread(func, *args) -> list:
+    """Call a blocking client function on another thread so the server can
+    answer it, returning a list that receives the function's result.
+    """
+    result = []
+    Thread(target=lambda: result.append(func(*args)), daemon=True).start()
+    return result
+
+
+def test_forward_launch(server, qtbot):
+    """Test that a launch sent by the client is accepted and announced.
+
+    Parameters
+    ----------
+    server : fixture
+        Listening instance of TraceInstanceServer
+    qtbot : fixture
+        pytest-qt fixture for waiting on signals
+
+    Expectations
+    ------------
+    The server emits the launch's arguments and the client reports success.
+    """
+    args = ["-p", "SOME:PV", "f://{A}+{B}"]
+    with qtbot.waitSignal(server.launch_requested, timeout=2000) as blocker:
+        result = send_in_thread(launch_client.forward_launch, args)
+
+    assert blocker.args == [args]
+    qtbot.waitUntil(lambda: result == [True], timeout=2000)
+
+
+def test_quit_and_missing_server(server, qtbot):
+    """Test the quit request, and that the client reports when no server is listening.
+
+    Parameters
+    ----------
+    server : fixture
+        Listening instance of TraceInstanceServer
+    qtbot : fixture
+        pytest-qt fixture for waiting on signals
+
+    Expectations
+    ------------
+    A quit request is announced; once the server is closed, launches fail
+    so the caller can start Trace itself.
+    """
+    with qtbot.waitSignal(server.quit_requested, timeout=2000):
+        result = send_in_thread(launch_client.send_request, {"quit": True})
+    qtbot.waitUntil(lambda: result == [True], timeout=2000)
+
+    server.close()
+    assert not launch_client.forward_launch(["-p", "SOME:PV"], timeout=0.5)
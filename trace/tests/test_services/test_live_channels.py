@@ -0,0 +1,79 @@
+from pydm.data_plugins import plugin_for_address
+
+from services import LiveDataStore, LiveChannelRegistry
+from utilities import ChannelFilters
+
+
+class Consumer:
+    """Stand-in for a curve reading a shared channel."""
+
+
+def test_channels_are_reference_counted(qapp):
+    """Test that a PV's consumers share one channel until the last releases it.
+
+    Parameters
+    ----------
+    qapp : fixture
+        PyDMApplication instance
+
+    Expectations
+    ------------
+    Consumers of the same PV and filters share a channel whatever protocol
+    prefix they use, different filters get a separate channel, and the
+    channel is unsubscribed only when its last consumer releases it.
+    """
+    registry = LiveChannelRegistry()
+    first, second, filtered = Consumer(), Consumer(), Consumer()
+
+    channel = registry.acquire("ca://SHARED:PV", first)
+    assert registry.acquire("SHARED:PV", second) is channel
+    decimated = registry.acquire("SHARED:PV", filtered, ChannelFilters(decimation=4))
+    assert decimated is not channel
+    assert len(registry) == 2
+
+    plugin = plugin_for_address(channel.channel.address)
+    registry.release(channel, first)
+    assert "SHARED:PV" in registry
+    assert channel.channel in plugin.channels
+
+    registry.release(channel, second)
+    registry.release(decimated, filtered)
+    assert "SHARED:PV" not in registry
+    assert channel.channel not in plugin.channels
+
+
+def test_updates_are_buffered_once(qapp):
+    """Test that each update is appended to the shared buffer once and
+    announced to every consumer.
+
+    Parameters
+    ----------
+    qapp : fixture
+        PyDMApplication instance
+
+    Expectations
+    ------------
+    The buffer holds each update once, filters the server cannot apply are
+    applied as updates arrive, and the buffer keeps the largest capacity
+    asked for by the consumers' stores.
+    """
+    registry = LiveChannelRegistry()
+    small, large = LiveDataStore(capacity=100), LiveDataStore(capacity=1000)
+    consumers = [Consumer(), Consumer()]
+    channel = registry.acquire("loc://SHARED_LOCAL?type=float&init=0", consumers[0], ChannelFilters(2), small)
+    registry.acquire("loc://SHARED_LOCAL?type=float&init=0", consumers[1], ChannelFilters(2), large)
+    assert channel.buffer.capacity == 1000
+
+    channel.buffer.clear()
+    received = []
+    channel.sample_received.connect(lambda timestamp, value: received.append(value))
+    for value in range(6):
+        channel.receive_value(float(value))
+
+    assert channel.buffer.values.tolist() == [0.0, 2.0, 4.0]
+    assert received == [0.0, 2.0, 4.0]
+    assert channel.updates_received >= 6
+
+    registry.clear()
+    small.deleteLater()
+    large.deleteLater()
@@ -0,0 +1,99 @@
+import numpy as np
+
+from services import LiveDataStore, EvictionPolicy, LiveDataBudget, LiveChannelRegistry
+
+
+class Consumer:
+    """Stand-in for a curve reading a shared channel."""
+
+
+def test_enforce_budget_shrinks_buffers(qapp):
+    """Test that buffers are reduced when the stores exceed their memory budget.
+
+    Parameters
+    ----------
+    qapp : fixture
+        PyDMApplication instance
+
+    Expectations
+    ------------
+    After enforcing the budget, the memory usage of every store counted
+    toward it is within the budget and the newest samples are kept.
+    """
+    budget = LiveDataBudget(budget_mb=1)
+    stores = [LiveDataStore(capacity=100_000, budget=budget), LiveDataStore(capacity=50_000, budget=budget)]
+    buffers = [store.create_buffer() for store in stores for _ in range(2)]
+    for buffer in buffers:
+        buffer.extend(np.arange(100_000.0), np.arange(100_000.0))
+    assert budget.memory_usage == sum(store.memory_usage for store in stores) > budget.limit
+
+    budget.enforce_budget()
+
+    assert budget.memory_usage <= budget.limit
+    for buffer in buffers:
+        assert buffer.times[-1] == 99_999
+
+
+def test_enforce_budget_downsample(qapp):
+    """Test that the downsample policy keeps the full time range of each buffer.
+
+    Parameters
+    ----------
+    qapp : fixture
+        PyDMApplication instance
+
+    Expectations
+    ------------
+    The oldest sample is retained after the buffer is reduced.
+    """
+    budget = LiveDataBudget(budget_mb=1, policy=EvictionPolicy.DOWNSAMPLE)
+    buffer = LiveDataStore(capacity=100_000, budget=budget).create_buffer()
+    buffer.extend(np.arange(100_000.0), np.arange(100_000.0))
+
+    budget.enforce_budget()
+
+    assert budget.memory_usage <= budget.limit
+    assert buffer.times[0] == 0
+    assert buffer.times[-1] == 99_999
+
+
+def test_budget_is_kept_by_new_buffers(qapp):
+    """Test that the capacity reduced to keep within the budget is kept by
+    buffers created afterward and by shared channels resized afterward,
+    until the budget is raised.
+
+    Parameters
+    ----------
+    qapp : fixture
+        PyDMApplication instance
+
+    Expectations
+    ------------
+    New buffers and shared channel buffers are sized to the reduced
+    capacity, and raising the budget restores the full capacity.
+    """
+    consumer = Consumer()
+    registry = LiveChannelRegistry()
+    budget = LiveDataBudget(budget_mb=1)
+    store = LiveDataStore(capacity=100_000, budget=budget)
+    buffer = store.create_buffer()
+    buffer.extend(np.arange(100_000.0), np.arange(100_000.0))
+    budget.enforce_budget()
+    reduced = store.retained_capacity
+    assert reduced < store.capacity
+    assert buffer.capacity == reduced
+
+    assert store.create_buffer().capacity == reduced
+    channel = registry.acquire("loc://BUDGET_LOCAL?type=float&init=0", consumer, store=store)
+    store.add_channel(channel)
+    channel.update_retention()
+    assert channel.buffer.capacity == reduced
+
+    budget.set_budget(64)
+    assert store.retained_capacity == store.capacity
+    assert buffer.capacity == store.capacity
+    assert channel.buffer.capacity == store.capacity
+
+    registry.clear()
+    store.deleteLater()
+    budget.deleteLater()
@@ -0,0 +1,96 @@
+import json
+import time
+
+import pytest
+
+from services import Metrics
+
+
+@pytest.fixture
+def registry():
+    """Fixture for an empty Metrics registry.
+
+    Returns
+    -------
+    An instance of Metrics.
+    """
+    return Metrics()
+
+
+def test_counters_and_timers(registry, monkeypatch):
+    """Test that counters, timers, and rates accumulate their observations.
+
+    Parameters
+    ----------
+    registry : fixture
+        Instance of Metrics for testing
+    monkeypatch : fixture
+        Pytest monkeypatch fixture
+
+    Expectations
+    ------------
+    Counters are kept separately per label, timers track their count, sum,
+    and maximum, and rates are the counter increase per second.
+    """
+    clock = iter([100.0, 102.0])
+    monkeypatch.setattr(time, "monotonic", lambda: next(clock))
+    registry.reset()
+
+    registry.increment("live.samples", curve="A")
+    registry.increment("live.samples", 9, curve="A")
+    registry.increment("live.samples", 4, curve="B")
+    registry.observe("render.frame", 0.01)
+    registry.observe("render.frame", 0.03)
+    with registry.timer("formula.evaluate"):
+        pass
+    registry.update_rates()
+
+    assert registry.counter("live.samples", curve="A") == 10
+    assert registry.counter("live.samples", curve="B") == 4
+    assert registry.rate("live.samples", curve="A") == 5
+    assert registry.total_rate("live.samples") == 7
+
+    frame = registry.timer_stats("render.frame")
+    assert frame["count"] == 2
+    assert frame["sum"] == pytest.approx(0.04)
+    assert frame["max"] == 0.03
+    assert frame["last"] == 0.03
+    assert registry.timer_stats("formula.evaluate")["count"] == 1
+
+
+def test_export(registry, tmp_path):
+    """Test exporting metrics as JSON and in the Prometheus text format.
+
+    Parameters
+    ----------
+    registry : fixture
+        Instance of Metrics for testing
+    tmp_path : fixture
+        Pytest temporary directory fixture
+
+    Expectations
+    ------------
+    The file's suffix selects the format, and both formats contain every metric.
+    """
+    registry.increment("archive.points", 100, curve='SOME:"PV"')
+    registry.observe("archive.latency", 0.25)
+
+    json_path = tmp_path / "metrics.json"
+    registry.export(json_path)
+    snapshot = json.loads(json_path.read_text())
+    assert snapshot["counters"][0] == {
+        "name": "archive.points",
+        "labels": {"curve": 'SOME:"PV"'},
+        "value": 100,
+        "rate": 0.0,
+    }
+    assert snapshot["timers"][0]["sum"] == 0.25
+
+    prom_path = tmp_path / "metrics.prom"
+    registry.export(prom_path)
+    lines = prom_path.read_text().splitlines()
+    assert "# TYPE trace_archive_points_total counter" in lines
+    assert 'trace_archive_points_total{curve="SOME:\\"PV\\""} 100' in lines
+    assert "trace_archive_latency_seconds_count 1" in lines
+    assert "trace_archive_latency_seconds_sum 0.25" in lines
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,107 @@
+import epics
+import pytest
+
+from services import PVMetadata, PVMetadataService, normalize_address
+
+
+@pytest.fixture
+def service(qapp):
+    """Fixture for a PVMetadataService whose reads are recorded instead of
+    going to Channel Access.
+
+    Yields
+    ------
+    An instance of PVMetadataService with a ``batches`` list of the batches read.
+    """
+    service = PVMetadataService(ttl=60)
+    service.batches = []
+
+    def fetch(addresses: list[str]) -> dict:
+        service.batches.append(addresses)
+        return {address: PVMetadata(f"{address} description", "mA") for address in addresses}
+
+    service.fetch = fetch
+    yield service
+
+    service.stop()
+    service.deleteLater()
+    qapp.processEvents()
+
+
+def test_normalize_address():
+    """Test that addresses with and without the default protocol share a key.
+
+    Expectations
+    ------------
+    Addresses without a protocol are treated as Channel Access.
+    """
+    assert normalize_address("PV:A") == "ca://PV:A"
+    assert normalize_address(" ca://PV:A ") == "ca://PV:A"
+    assert normalize_address("pva://PV:A") == "pva://PV:A"
+
+
+def test_requests_are_batched_and_cached(qtbot, service):
+    """Test that requests made together are read in one batch on the worker
+    thread and then served from the cache.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt fixture for waiting on signals
+    service : fixture
+        Instance of PVMetadataService with recorded reads
+
+    Expectations
+    ------------
+    Both PVs are read in a single batch, duplicates are requested once,
+    metadata_changed is emitted for each PV, and later lookups are served
+    from the cache without another read until the entry is invalidated.
+    """
+    assert service.get("PV:A") is None
+    service.request(["ca://PV:A", "PV:B", ""])
+
+    with qtbot.waitSignals([service.metadata_changed] * 2, timeout=2000):
+        pass
+    assert service.batches == [["ca://PV:A", "ca://PV:B"]]
+
+    assert service.get("ca://PV:B") == PVMetadata("ca://PV:B description", "mA")
+    qtbot.wait(2 * service.BATCH_MS)
+    assert len(service.batches) == 1
+
+    service.invalidate("PV:B")
+    with qtbot.waitSignal(service.metadata_changed, timeout=2000):
+        assert service.get("PV:B") is None
+    assert service.batches[-1] == ["ca://PV:B"]
+
+
+def test_fetch_ca_fields(monkeypatch):
+    """Test that Channel Access metadata is read with one get for the whole batch.
+
+    Parameters
+    ----------
+    monkeypatch : fixture
+        pytest fixture for replacing epics.caget_many
+
+    Expectations
+    ------------
+    Only the DESC and EGU fields of every record are requested, together,
+    values are mapped onto PVMetadata, and PVs that cannot be reached have
+    no metadata.
+    """
+    values = {"PV:A.DESC": "Beam current", "PV:A.EGU": "mA"}
+    requests = []
+
+    def caget_many(pvs, **kwargs):
+        requests.append(pvs)
+        return [values.get(pv) for pv in pvs]
+
+    monkeypatch.setattr(epics, "caget_many", caget_many)
+    service = PVMetadataService()
+    results = service.fetch(["ca://PV:A.VAL", "ca://PV:MISSING", "loc://PV:LOCAL"])
+
+    assert requests == [["PV:A.DESC", "PV:A.EGU", "PV:MISSING.DESC", "PV:MISSING.EGU"]]
+    assert results == {
+        "ca://PV:A.VAL": PVMetadata("Beam current", "mA"),
+        "ca://PV:MISSING": None,
+        "loc://PV:LOCAL": None,
+    }
@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock
+
+import pytest
+from qtpy.QtWidgets import QWidget
+
+from pydm.widgets import PyDMArchiverTimePlot
+
+from services import RenderScheduler
+
+
+@pytest.fixture
+def scheduler(qapp):
+    """Fixture for a RenderScheduler driving a plot with a mocked redraw.
+
+    Yields
+    ------
+    An instance of RenderScheduler.
+    """
+    plot = PyDMArchiverTimePlot()
+    scheduler = RenderScheduler(plot, target_fps=20)
+    plot.redrawPlot = MagicMock(side_effect=lambda: setattr(plot, "_needs_redraw", False))
+    yield scheduler
+
+    plot.deleteLater()
+    qapp.processEvents()
+
+
+def test_render_frame_coalesces_updates(scheduler):
+    """Test that several data updates between frames cause a single redraw.
+
+    Parameters
+    ----------
+    scheduler : fixture
+        Instance of RenderScheduler for testing
+
+    Expectations
+    ------------
+    The plot is redrawn once per frame with new data, and not at all otherwise.
+    """
+    plot = scheduler.plot
+    for _ in range(5):
+        plot.set_needs_redraw()
+
+    scheduler.render_frame()
+    scheduler.render_frame()
+
+    plot.redrawPlot.assert_called_once()
+    assert plot.redraw_timer.interval() == 50
+
+
+def test_render_frame_adapts_to_cost(scheduler, monkeypatch):
+    """Test that an expensive redraw stretches the frame interval.
+
+    Parameters
+    ----------
+    scheduler : fixture
+        Instance of RenderScheduler for testing
+    monkeypatch : fixture
+        Pytest monkeypatch fixture
+
+    Expectations
+    ------------
+    The frame interval grows beyond the target so redraws stay within the frame budget.
+    """
+    clock = iter(i * 0.2 for i in range(100))
+    monkeypatch.setattr("services.render_scheduler.perf_counter", lambda: next(clock))
+
+    for _ in range(10):
+        scheduler.plot.set_needs_redraw()
+        scheduler.render_frame()
+
+    assert scheduler.frame_rate < scheduler.target_fps
+    assert scheduler.plot.redraw_timer.interval() > 50
+
+
+def test_pause_when_window_hidden(qapp, scheduler):
+    """Test that rendering pauses while the watched window is hidden.
+
+    Parameters
+    ----------
+    qapp : fixture
+        PyDMApplication instance
+    scheduler : fixture
+        Instance of RenderScheduler for testing
+
+    Expectations
+    ------------
+    No redraws happen while hidden, and showing the window resumes rendering.
+    """
+    window = QWidget()
+    scheduler.watch_window(window)
+    assert scheduler.paused
+
+    scheduler.plot.set_needs_redraw()
+    scheduler.render_frame()
+    scheduler.plot.redrawPlot.assert_not_called()
+
+    window.show()
+    qapp.processEvents()
+    assert not scheduler.paused
+
+    scheduler.render_frame()
+    scheduler.plot.redrawPlot.assert_called_once()
+
+    window.close()
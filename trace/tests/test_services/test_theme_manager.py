@@ -0,0 +1,97 @@
+import pytest
+from qtpy.QtWidgets import QWidget
+
+from services import Theme, IconColors, ThemeManager
+
+
+@pytest.fixture
+def theme_manager(qapp, monkeypatch):
+    """Fixture for a ThemeManager styling a plain widget in place of a main window.
+
+    Yields
+    ------
+    An instance of ThemeManager.
+    """
+    window = QWidget()
+    monkeypatch.setattr(qapp, "main_window", window, raising=False)
+    manager = ThemeManager(qapp)
+    yield manager
+
+    manager.set_theme(Theme.LIGHT)
+    manager.deleteLater()
+    window.deleteLater()
+
+
+def test_icons_are_cached(theme_manager):
+    """Test that requesting the same icon again reuses the rendered icon.
+
+    Parameters
+    ----------
+    theme_manager : fixture
+        Instance of ThemeManager
+
+    Expectations
+    ------------
+    Identical requests return the same icon, while a different color or scale
+    renders a new one.
+    """
+    icon = theme_manager.create_icon("msc.trash", IconColors.PRIMARY)
+
+    assert theme_manager.create_icon("msc.trash", IconColors.PRIMARY) is icon
+    assert theme_manager.create_icon("msc.trash", IconColors.ERROR) is not icon
+    assert theme_manager.create_icon("msc.trash", IconColors.PRIMARY, scale_factor=1.5) is not icon
+    assert not icon.isNull()
+
+
+def test_prerender_other_theme(theme_manager, monkeypatch):
+    """Test that requested icons are pre-rendered for the other theme.
+
+    Parameters
+    ----------
+    theme_manager : fixture
+        Instance of ThemeManager
+
+    Expectations
+    ------------
+    After pre-rendering, switching themes serves the icons from the cache
+    without drawing any with qtawesome.
+    """
+    theme_manager.set_theme(Theme.LIGHT)
+    theme_manager.create_icon("msc.settings-gear", IconColors.PRIMARY)
+    theme_manager.prerender_icons()
+
+    def fail_icon(*args, **kwargs):
+        raise AssertionError("icon should have been pre-rendered")
+
+    monkeypatch.setattr("qtawesome.icon", fail_icon)
+    theme_manager.set_theme(Theme.DARK)
+    icon = theme_manager.create_icon("msc.settings-gear", IconColors.PRIMARY)
+    assert not icon.isNull()
+
+
+def test_theme_switch_is_batched(theme_manager, qapp):
+    """Test that a theme switch updates widgets with window updates disabled,
+    and reuses the stylesheets it has already read.
+
+    Parameters
+    ----------
+    theme_manager : fixture
+        Instance of ThemeManager
+    qapp : fixture
+        Application instance
+
+    Expectations
+    ------------
+    Updates are disabled while theme_changed is handled and enabled again
+    afterwards, and each stylesheet is read once.
+    """
+    updates_enabled = []
+    theme_manager.theme_changed.connect(lambda _: updates_enabled.append(theme_manager.window.updatesEnabled()))
+
+    for _ in range(3):
+        theme_manager.toggle_theme()
+
+    assert updates_enabled == [False, False, False]
+    assert theme_manager.window.updatesEnabled()
+    assert theme_manager.window.styleSheet() == theme_manager.stylesheet(theme_manager.current_theme)
+    assert set(theme_manager._stylesheets) == {Theme.LIGHT, Theme.DARK}
@@ -0,0 +1,52 @@
+import time
+
+from services import Metrics, StallWatchdog
+
+
+def block_event_loop(seconds: float) -> None:
+    """Hold the main thread without processing events."""
+    time.sleep(seconds)
+
+
+def test_stall_is_sampled_and_logged(qapp, qtbot, tmp_path):
+    """Test that blocking the event loop past the threshold is reported with
+    the stack of the blocking function.
+
+    Parameters
+    ----------
+    qapp : fixture
+        The QApplication for the test session
+    qtbot : fixture
+        pytest-qt fixture for processing events
+    tmp_path : fixture
+        Pytest temporary directory fixture
+
+    Expectations
+    ------------
+    One stall is counted once the event loop recovers and recorded in the
+    metrics registry, the blocking function is the session's hottest frame,
+    and both the stall and the session summary are written to the log file.
+    """
+    log_file = tmp_path / "logs" / "stalls.log"
+    registry = Metrics()
+    watchdog = StallWatchdog(log_file, threshold_ms=100, registry=registry)
+    watchdog.start()
+    try:
+        qtbot.wait(100)
+        assert watchdog.stall_count == 0
+
+        block_event_loop(0.5)
+        qtbot.waitUntil(lambda: watchdog.stall_count == 1, timeout=2000)
+    finally:
+        watchdog.stop()
+
+    stall = registry.timer_stats("event_loop.stall")
+    assert stall["count"] == 1 and stall["max"] > 0.1
+    hottest_frame = watchdog.hotspots.most_common(1)[0][0]
+    assert hottest_frame.startswith("test_watchdog.py:") and hottest_frame.endswith("in block_event_loop")
+
+    log = log_file.read_text()
+    assert "Event loop stalled for" in log
+    assert "in test_stall_is_sampled_and_logged" in log
+    assert "1 stalls this session" in log
+    assert not watchdog.running
@@ -0,0 +1,35 @@
+from utilities import ChannelFilters, rate_decimation, filtered_address
+
+
+def test_filtered_address():
+    """Test that filters are appended to Channel Access addresses as EPICS JSON filters.
+
+    Expectations
+    ------------
+    Record names subscribe through their default field, field names keep
+    their field, and addresses that cannot be filtered by the server or
+    that have no filters are unchanged.
+    """
+    filters = ChannelFilters(decimation=10, deadband=0.5)
+    assert filtered_address("ca://REC:A", filters) == 'ca://REC:A.{"dec":{"n":10},"dbnd":{"abs":0.5}}'
+    assert filtered_address("REC:A.RBV", ChannelFilters(decimation=4)) == 'ca://REC:A.RBV{"dec":{"n":4}}'
+    assert filtered_address("pva://REC:A", filters) == "pva://REC:A"
+    assert filtered_address('ca://REC:A.{"ts":{}}', filters) == 'ca://REC:A.{"ts":{}}'
+    assert filtered_address("ca://REC:A", ChannelFilters()) == "ca://REC:A"
+
+
+def test_rate_decimation():
+    """Test that decimation brings a PV's rate down to the plot's display rate.
+
+    Expectations
+    ------------
+    PVs no faster than the display rate are not decimated, faster PVs are
+    decimated by the largest power of two that keeps at least the display
+    rate, and the decimation is capped.
+    """
+    assert rate_decimation(1.0, 2.0) == 1
+    assert rate_decimation(100.0, 0.0) == 1
+    # 100 Hz over an hour on a 1000 pixel plot
+    assert rate_decimation(100.0, 1000 / 3600) == 256
+    assert rate_decimation(100.0, 30.0) == 2
+    assert rate_decimation(1e6, 1e-3, max_decimation=64) == 64
@@ -0,0 +1,105 @@
+import numpy as np
+
+from utilities import CorrelationSeries, asof_join
+
+
+def test_asof_join_matches_scan():
+    """Test that the as-of join pairs each timestamp with the newest value
+    of each series at or before it.
+
+    Expectations
+    ------------
+    Every pair matches a scan of both series, timestamps before either
+    series starts are left out, and pairs with a NaN are dropped.
+    """
+    rng = np.random.default_rng(0)
+    x_times = np.sort(rng.uniform(0, 100, 300))
+    y_times = np.sort(rng.uniform(10, 100, 200))
+    x_values, y_values = rng.normal(size=300), rng.normal(size=200)
+    x_values[5] = np.nan
+
+    times, xs, ys = asof_join([(x_times, x_values)], [(y_times, y_values)])
+    assert times[0] == y_times[0]
+    for t, x, y in zip(times, xs, ys):
+        assert x == x_values[x_times <= t][-1]
+        assert y == y_values[y_times <= t][-1]
+    assert np.all(np.isfinite(xs))
+
+
+def test_incremental_pairs_match_full_join():
+    """Test that pairing series as they grow gives the same pairs and
+    histogram as pairing them all at once.
+
+    Expectations
+    ------------
+    Pairs are held back until both series reach them, so growing the series
+    in uneven steps matches a single join up to the older of the series'
+    newest samples, the histogram counts every pair,
+    and a new generation rebuilds the pairs.
+    """
+    rng = np.random.default_rng(1)
+    x_times, y_times = np.sort(rng.uniform(0, 1000, 5000)), np.sort(rng.uniform(0, 1000, 3000))
+    x_values, y_values = rng.normal(size=5000), 2 * rng.normal(size=3000)
+
+    pairs = CorrelationSeries(bins=50)
+    x_end = y_end = 0
+    while x_end < x_times.size or y_end < y_times.size:
+        x_end = min(x_end + int(rng.integers(0, 300)), x_times.size)
+        y_end = min(y_end + int(rng.integers(0, 300)), y_times.size)
+        pairs.update([(x_times[:x_end], x_values[:x_end])], [(y_times[:y_end], y_values[:y_end])])
+
+    until = min(x_times[-1], y_times[-1])
+    times, xs, ys = asof_join([(x_times, x_values)], [(y_times, y_values)], until=until)
+    np.testing.assert_array_equal(pairs.times, times)
+    np.testing.assert_array_equal(pairs.x, xs)
+    np.testing.assert_array_equal(pairs.y, ys)
+    assert pairs.counts.sum() == len(pairs)
+
+    x_head, y_head = [(x_times[:10], x_values[:10])], [(y_times[:10], y_values[:10])]
+    pairs.update(x_head, y_head, generation=1)
+    assert len(pairs) == asof_join(x_head, y_head, until=min(x_times[9], y_times[9]))[0].size
+
+
+def test_segments_match_joined_series():
+    """Test that joining series given as segments, such as a curve's archive
+    data and live buffer, matches joining them concatenated.
+
+    Expectations
+    ------------
+    Each timestamp takes the newest value of whichever segment holds it,
+    and empty segments are skipped.
+    """
+    rng = np.random.default_rng(2)
+    x_times, y_times = np.sort(rng.uniform(0, 100, 400)), np.sort(rng.uniform(0, 100, 300))
+    x_values, y_values = rng.normal(size=400), rng.normal(size=300)
+    x_segments = [(x_times[:250], x_values[:250]), (x_times[250:], x_values[250:])]
+    y_segments = [(y_times[:0], y_values[:0]), (y_times, y_values)]
+
+    joined = asof_join([(x_times, x_values)], [(y_times, y_values)])
+    for expected, actual in zip(joined, asof_join(x_segments, y_segments)):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_pairs_follow_dropped_samples():
+    """Test that pairs older than either series' oldest sample are dropped
+    as the series slide forward, as full live buffers do.
+
+    Expectations
+    ------------
+    The pairs stay those of the retained samples, their storage does not
+    grow with the samples seen, and the histogram counts only them.
+    """
+    rng = np.random.default_rng(3)
+    times = np.arange(100_000.0)
+    x_values, y_values = rng.normal(size=times.size), rng.normal(size=times.size)
+
+    pairs = CorrelationSeries(bins=50)
+    window = 1000
+    for end in range(window, times.size + 1, 500):
+        start = end - window
+        pairs.update([(times[start:end], x_values[start:end])], [(times[start:end], y_values[start:end])])
+
+    np.testing.assert_array_equal(pairs.times, times[-window:])
+    np.testing.assert_array_equal(pairs.x, x_values[-window:])
+    assert pairs._times.size <= 4 * window
+    assert pairs.counts.sum() == len(pairs) == window
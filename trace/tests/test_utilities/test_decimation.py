@@ -0,0 +1,99 @@
+import numpy as np
+
+from utilities import M4Decimator, m4_indices
+
+
+def test_m4_indices_keep_extremes():
+    """Test that M4 aggregation keeps the first, last, min, and max of each bin.
+
+    Expectations
+    ------------
+    Each bin contributes at most four samples, and a single spike is retained.
+    """
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[555] = 10.0
+    y[777] = -10.0
+
+    indices = m4_indices(x, y, bin_width=100)
+
+    assert indices.size <= 40
+    assert 555 in indices and 777 in indices
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_decimator_bounded_by_width():
+    """Test that decimated output size depends on the pixel width, not the sample count.
+
+    Expectations
+    ------------
+    The output has at most about four points per pixel and keeps the data's extremes.
+    """
+    x = np.linspace(0, 100, 1_000_000)
+    y = np.sin(x)
+    y[123_456] = 50.0
+
+    dec_x, dec_y = M4Decimator().decimate(x, y, (0, 100), width=500)
+
+    assert dec_x.size <= 4 * 500 + 8
+    assert dec_y.max() == 50.0
+    assert dec_y.min() == y.min()
+
+
+def test_decimator_incremental_update():
+    """Test that appending samples and dropping old ones updates the cache to
+    the same result as decimating from scratch.
+
+    Expectations
+    ------------
+    The incrementally updated and freshly computed outputs are identical.
+    """
+    rng = np.random.default_rng(0)
+    x = np.arange(20_000.0)
+    y = rng.normal(size=x.size)
+    decimator = M4Decimator()
+
+    decimator.decimate(x[:10_000], y[:10_000], (5000, 15_000), width=100)
+    result = decimator.decimate(x[3000:], y[3000:], (5000, 15_000), width=100)
+    expected = M4Decimator().decimate(x[3000:], y[3000:], (5000, 15_000), width=100)
+
+    assert np.array_equal(result[0], expected[0])
+    assert np.array_equal(result[1], expected[1])
+
+
+def test_decimator_passes_through_sparse_data():
+    """Test that data with fewer samples than pixels is not decimated.
+
+    Expectations
+    ------------
+    The visible samples and their immediate neighbors are returned unchanged.
+    """
+    x = np.arange(100.0)
+    y = x * 2
+
+    dec_x, dec_y = M4Decimator().decimate(x, y, (10, 20), width=500)
+
+    assert np.array_equal(dec_x, np.arange(9.0, 22.0))
+    assert np.array_equal(dec_y, dec_x * 2)
+
+
+def test_decimator_caches_only_around_viewport():
+    """Test that only the bins around the viewport are decimated and cached,
+    and that moving the view reuses the bins the new span still covers.
+
+    Expectations
+    ------------
+    The cache's size is bounded by the viewport's width rather than by the
+    sample count, and results after panning match decimating from scratch.
+    """
+    x = np.arange(1_000_000.0)
+    y = np.sin(x / 100)
+    decimator = M4Decimator()
+
+    for start in (500_000, 505_000, 520_000, 100_000):
+        x_range = (start, start + 10_000)
+        result = decimator.decimate(x, y, x_range, width=100)
+        expected = M4Decimator().decimate(x, y, x_range, width=100)
+        assert np.array_equal(result[0], expected[0])
+        assert np.array_equal(result[1], expected[1])
+        assert decimator._x.size <= 4 * 3 * (100 + 2)
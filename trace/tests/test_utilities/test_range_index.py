@@ -0,0 +1,52 @@
+import numpy as np
+
+from utilities import MinMaxIndex
+
+
+def test_extremes_match_scan():
+    """Test that range extremes read from the index match a scan of the range
+    while samples are appended and dropped from the front.
+
+    Expectations
+    ------------
+    Every range's extremes equal NumPy's, ignoring NaNs, after incremental
+    updates and the rebuilds triggered by dropping most of the series.
+    """
+    rng = np.random.default_rng(0)
+    series = rng.normal(size=50_000)
+    series[rng.integers(0, series.size, 200)] = np.nan
+    index = MinMaxIndex(block_size=16)
+
+    first, end = 0, 1000
+    for _ in range(100):
+        end = min(end + int(rng.integers(0, 1000)), series.size)
+        first = max(first, end - int(rng.integers(500, 20_000)))
+        values = series[first:end]
+        index.update(values, first)
+        for _ in range(10):
+            start, stop = sorted(rng.integers(0, values.size + 1, 2))
+            if start == stop:
+                continue
+            assert index.extremes(start, stop) == (np.nanmin(values[start:stop]), np.nanmax(values[start:stop]))
+
+
+def test_generation_rebuilds():
+    """Test that a new generation rebuilds the index for changed values.
+
+    Expectations
+    ------------
+    Values replaced in place are only reflected once the generation changes,
+    and ranges without values other than NaN have NaN extremes.
+    """
+    values = np.arange(1000.0)
+    index = MinMaxIndex()
+    index.update(values, generation=1)
+    assert index.extremes(100, 900) == (100.0, 899.0)
+
+    values[500] = -1.0
+    index.update(values, generation=2)
+    assert index.extremes(100, 900) == (-1.0, 899.0)
+
+    values[:10] = np.nan
+    index.update(values, generation=3)
+    assert all(np.isnan(index.extremes(0, 10)))
@@ -0,0 +1,43 @@
+import numpy as np
+
+from utilities import SeriesCursor
+
+
+def test_cursor_reads_nearest_and_interpolated():
+    """Test that the cursor reads the nearest or interpolated value at a time.
+
+    Expectations
+    ------------
+    The nearest sample is chosen on either side of the time, interpolation
+    is linear between the samples around it, and times outside the series
+    have no value.
+    """
+    times = np.array([0.0, 10.0, 20.0, 30.0])
+    values = np.array([0.0, 100.0, 50.0, 50.0])
+    cursor = SeriesCursor()
+
+    assert cursor.value_at(times, values, 4.0) == (0.0, 0.0)
+    assert cursor.value_at(times, values, 16.0) == (20.0, 50.0)
+    assert cursor.value_at(times, values, 15.0, interpolate=True) == (15.0, 75.0)
+    assert cursor.value_at(times, values, 30.0) == (30.0, 50.0)
+    assert cursor.value_at(times, values, -1.0) is None
+    assert cursor.value_at(times, values, 31.0) is None
+
+
+def test_cursor_hints_match_search():
+    """Test that lookups answered from the last index's hint match a binary search.
+
+    Expectations
+    ------------
+    Sweeping the time back and forth, and changing the series between
+    lookups, always finds the newest sample at or before the time.
+    """
+    rng = np.random.default_rng(0)
+    times = np.cumsum(rng.uniform(0.1, 1.0, 1000))
+    cursor = SeriesCursor()
+
+    sweep = np.concatenate((np.linspace(0, times[-1], 3000), np.linspace(times[-1], 0, 3000)))
+    for timestamp in sweep:
+        assert cursor.index(times, timestamp) == np.searchsorted(times, timestamp, side="right") - 1
+
+    assert cursor.index(times[500:], times[600]) == 100
@@ -0,0 +1,101 @@
+import numpy as np
+
+from utilities import RingBuffer
+
+
+def test_append_wraps_and_keeps_newest():
+    """Test that appending past the capacity keeps only the newest samples.
+
+    Expectations
+    ------------
+    The buffer holds the last `capacity` samples in order, after several compactions.
+    """
+    buffer = RingBuffer(10)
+    for i in range(100):
+        buffer.append(float(i), i * 2.0)
+
+    assert len(buffer) == 10
+    assert np.array_equal(buffer.times, np.arange(90, 100))
+    assert np.array_equal(buffer.values, np.arange(90, 100) * 2.0)
+
+
+def test_views_are_zero_copy():
+    """Test that times and values are views into the buffer's storage.
+
+    Expectations
+    ------------
+    The returned arrays share memory with the buffer's preallocated arrays.
+    """
+    buffer = RingBuffer(10, dtype=np.float32)
+    buffer.extend(np.arange(5.0), np.arange(5.0))
+
+    assert np.shares_memory(buffer.times, buffer._times)
+    assert np.shares_memory(buffer.values, buffer._values)
+    assert buffer.values.dtype == np.float32
+
+
+def test_time_based_retention():
+    """Test that samples older than max_age are dropped.
+
+    Expectations
+    ------------
+    Only samples within max_age of the newest sample are retained.
+    """
+    buffer = RingBuffer(100, max_age=5)
+    for i in range(20):
+        buffer.append(float(i), 0.0)
+
+    assert np.array_equal(buffer.times, np.arange(14, 20))
+
+
+def test_insert_replaces_overlap():
+    """Test that inserted samples replace retained samples in the same time range.
+
+    Expectations
+    ------------
+    The inserted samples are merged in timestamp order without duplicates.
+    """
+    buffer = RingBuffer(100)
+    buffer.extend(np.arange(10.0), np.zeros(10))
+    buffer.insert(np.array([3.5, 4.5, 5.5]), np.ones(3))
+
+    assert np.array_equal(buffer.times, [0, 1, 2, 3, 3.5, 4.5, 5.5, 6, 7, 8, 9])
+    assert buffer.values.sum() == 3
+
+
+def test_downsample_keeps_spikes():
+    """Test that downsampling in place keeps the extremes of the reduced samples.
+
+    Expectations
+    ------------
+    The buffer shrinks to the target size, and a single spike is still present.
+    """
+    buffer = RingBuffer(1000)
+    values = np.zeros(1000)
+    values[123] = 50.0
+    buffer.extend(np.arange(1000.0), values)
+
+    buffer.downsample(100)
+
+    assert len(buffer) <= 100
+    assert buffer.values.max() == 50.0
+    assert buffer.times[-1] == 999
+    assert np.all(np.diff(buffer.times) > 0)
+
+
+def test_value_range_follows_appends():
+    """Test that the value range within a time range tracks appended and dropped samples.
+
+    Expectations
+    ------------
+    The range matches the retained samples within the timestamps, after
+    samples are dropped from the front and the storage is compacted.
+    """
+    buffer = RingBuffer(1000)
+    for i in range(5000):
+        buffer.append(float(i), float(i % 700))
+
+    assert buffer.value_range() == (0.0, 699.0)
+    assert buffer.value_range(4200, 4300) == (0.0, 100.0)
+    assert buffer.value_range(4550, 4600) == (350.0, 400.0)
+    assert all(np.isnan(buffer.value_range(0, 100)))
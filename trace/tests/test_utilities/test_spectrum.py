@@ -0,0 +1,57 @@
+import numpy as np
+from scipy.signal import welch
+
+from utilities import SlidingWelch, resample_uniform, amplitude_spectrum
+
+
+def test_resample_and_amplitude_spectrum():
+    """Test resampling onto a uniform grid and the amplitude spectrum.
+
+    Expectations
+    ------------
+    Grid points take the newest value at or before them, NaN before the
+    series starts, and a sine's amplitude spectrum peaks at its frequency
+    with its amplitude.
+    """
+    samples = resample_uniform(np.array([1.0, 2.0, 4.0]), np.array([10.0, 20.0, 40.0]), 0.5, 1.0, 5)
+    np.testing.assert_array_equal(samples, [np.nan, 10.0, 20.0, 20.0, 40.0])
+
+    step = 1 / 1000
+    times = np.arange(0, 2, step)
+    frequencies, amplitude = amplitude_spectrum(3 * np.sin(2 * np.pi * 60 * times) + 5, step)
+    assert frequencies[np.argmax(amplitude)] == 60.0
+    assert np.isclose(amplitude.max(), 3.0)
+
+
+def test_sliding_welch_matches_scipy():
+    """Test the Welch PSD of a sliding range against SciPy's.
+
+    Expectations
+    ------------
+    The PSD of irregularly sampled data matches SciPy's Welch PSD of the
+    same resampled grid, and sliding the range forward keeps the
+    periodograms of the segments still in range and only computes the
+    segments that have newly filled.
+    """
+    rng = np.random.default_rng(0)
+    times = 1.7e9 + np.sort(rng.uniform(0, 60, 60_000))
+    values = np.sin(2 * np.pi * 60 * times) + rng.normal(size=times.size)
+
+    sliding = SlidingWelch(segment=256)
+    sliding.update(times, values, times[0] + 5, times[0] + 30)
+    before = dict(zip(sliding.segment_times, sliding.power.copy()))
+    added = sliding.update(times, values, times[0] + 10, times[0] + 35)
+    assert 0 < added < len(sliding.power) / 2
+    kept = [time for time in sliding.segment_times if time in before]
+    assert len(kept) == len(sliding.power) - added
+    for time, power in zip(sliding.segment_times, sliding.power):
+        if time in before:
+            np.testing.assert_array_equal(power, before[time])
+
+    grid_start = sliding.segment_times[0] - sliding.segment / 2 * sliding.step
+    count = (len(sliding.power) - 1) * sliding.hop + sliding.segment
+    grid = resample_uniform(times, values, grid_start, sliding.step, count)
+    expected_frequencies, expected = welch(grid, fs=1 / sliding.step, nperseg=256, detrend="constant")
+    frequencies, psd = sliding.psd()
+    np.testing.assert_allclose(frequencies, expected_frequencies)
+    np.testing.assert_allclose(psd, expected)
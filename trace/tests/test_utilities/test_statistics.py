@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from utilities import SummaryIndex, WindowSummary, sample_quantiles
+
+
+def test_summary_index_matches_scan():
+    """Test that range summaries read from the summary index match a scan
+    of the range while samples are appended and dropped from the front.
+
+    Expectations
+    ------------
+    Every range's count, mean, and squared deviations equal a direct
+    computation ignoring NaNs, for a series with a large offset whose level
+    then jumps far from it, after incremental updates and rebuilds.
+    """
+    rng = np.random.default_rng(0)
+    series = 1e6 + rng.normal(size=50_000)
+    series[series.size // 2 :] += 1e9
+    series[rng.integers(0, series.size, 200)] = np.nan
+    sums = SummaryIndex()
+
+    first, end = 0, 1000
+    for _ in range(100):
+        end = min(end + int(rng.integers(0, 1000)), series.size)
+        first = max(first, end - int(rng.integers(500, 20_000)))
+        values = series[first:end]
+        sums.update(values, first)
+        for _ in range(10):
+            start, stop = sorted(rng.integers(0, values.size + 1, 2))
+            expected = WindowSummary.from_values(values[start:stop])
+            summary = sums.summary(start, stop)
+            assert summary.count == expected.count
+            if expected.count:
+                assert summary.mean == pytest.approx(expected.mean)
+                assert summary.m2 == pytest.approx(expected.m2, rel=1e-6, abs=1e-6)
+
+
+def test_combine_and_quantiles():
+    """Test combining summaries and estimating quantiles of several arrays.
+
+    Expectations
+    ------------
+    Combining the summaries of two arrays gives the summary of both together,
+    empty summaries are ignored, and quantiles of few values are exact.
+    """
+    rng = np.random.default_rng(1)
+    a, b = rng.normal(size=300), rng.normal(5.0, 2.0, size=700)
+    combined = WindowSummary.from_values(a).combine(WindowSummary.from_values(b))
+    expected = WindowSummary.from_values(np.concatenate((a, b)))
+    assert combined.count == expected.count
+    assert combined.mean == pytest.approx(expected.mean)
+    assert combined.std == pytest.approx(expected.std)
+    assert combined.rms == pytest.approx(np.sqrt(np.mean(np.concatenate((a, b)) ** 2)))
+    assert (combined.minimum, combined.maximum) == (expected.minimum, expected.maximum)
+    assert WindowSummary().combine(combined) == combined
+    assert np.isnan(WindowSummary().std)
+
+    values = np.concatenate((a, b, [np.nan]))
+    assert sample_quantiles([values[:500], values[500:]], (0.05, 0.5)) == pytest.approx(
+        np.nanquantile(values, (0.05, 0.5))
+    )
+    assert all(np.isnan(sample_quantiles([np.empty(0)], (0.5,))))
@@ -0,0 +1,67 @@
+import sys
+import argparse
+
+import pytest
+
+from utilities import VersionAction, version
+
+
+@pytest.fixture
+def version_file(tmp_path, monkeypatch):
+    """Fixture redirecting the version stamp to a temporary file.
+
+    Yields
+    ------
+    The path of the temporary _version.py.
+    """
+    monkeypatch.setattr(version, "VERSION_FILE", tmp_path / "_version.py")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    version.get_version.cache_clear()
+    yield tmp_path / "_version.py"
+
+    sys.modules.pop("_version", None)
+    version.get_version.cache_clear()
+
+
+def test_stamped_version_skips_git(version_file, monkeypatch):
+    """Test that a stamped version is read without calling git.
+
+    Parameters
+    ----------
+    version_file : fixture
+        Path of a temporary version stamp
+
+    Expectations
+    ------------
+    The stamped version is returned, and git is never run.
+    """
+    version.stamp_version("v1.2.3")
+
+    def fail_describe(*args, **kwargs):
+        raise AssertionError("git should not be called when the version is stamped")
+
+    monkeypatch.setattr(version, "describe_version", fail_describe)
+    assert version.get_version() == "v1.2.3"
+
+
+def test_version_action_is_lazy(monkeypatch, capsys):
+    """Test that the version is only looked up when the version option is given.
+
+    Expectations
+    ------------
+    Parsing arguments without --version never looks up the version; with it,
+    the version is printed and the parser exits.
+    """
+    calls = []
+    monkeypatch.setattr(version, "get_version", lambda: calls.append(1) or "v9.9")
+
+    parser = argparse.ArgumentParser(prog="trace")
+    parser.add_argument("-v", "--version", action=VersionAction)
+    parser.add_argument("-p", "--pvs", nargs="*", default=[])
+
+    parser.parse_args(["-p", "SOME:PV"])
+    assert calls == []
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--version"])
+    assert capsys.readouterr().out.strip() == "trace v9.9"
@@ -0,0 +1,55 @@
+import numpy as np
+
+from utilities import WaveformBuffer
+
+
+def test_append_wraps_and_keeps_newest():
+    """Test that appending beyond capacity keeps the newest waveforms, oldest
+    first, in views of the buffer's storage.
+
+    Expectations
+    ------------
+    The image and times hold the newest waveforms in order without copying,
+    shorter waveforms are padded with NaN, and a wider waveform widens the
+    buffer and increments its generation.
+    """
+    buffer = WaveformBuffer(capacity=4, width=3)
+    for i in range(7):
+        buffer.append(float(i), np.full(3, i))
+
+    assert len(buffer) == 4
+    assert np.array_equal(buffer.times, [3, 4, 5, 6])
+    assert np.array_equal(buffer.image[:, 0], [3, 4, 5, 6])
+    assert np.shares_memory(buffer.image, buffer._rows)
+    assert np.array_equal(buffer.latest(), [6, 6, 6])
+
+    buffer.append(7.0, [7, 7])
+    assert np.array_equal(buffer.latest(), [7, 7, np.nan], equal_nan=True)
+
+    generation = buffer.generation
+    buffer.append(8.0, np.arange(5))
+    assert buffer.width == 5 and buffer.generation > generation
+    assert np.array_equal(buffer.image[:, 0], [5, 6, 7, 0])
+    assert np.array_equal(buffer.latest(), np.arange(5))
+
+
+def test_insert_merges_older_waveforms():
+    """Test merging archived waveforms in behind the live ones.
+
+    Expectations
+    ------------
+    Older waveforms are placed before the retained ones, those overlapping
+    the retained ones are discarded, and only the newest capacity are kept.
+    """
+    buffer = WaveformBuffer(capacity=5, width=2)
+    buffer.append(10.0, [10, 10])
+    buffer.append(11.0, [11, 11])
+
+    times = np.array([7.0, 8.0, 9.0, 10.5])
+    buffer.insert(times, np.repeat(times[:, None], 2, axis=1))
+    assert np.array_equal(buffer.times, [7, 8, 9, 10, 11])
+    assert np.array_equal(buffer.image[:, 1], [7, 8, 9, 10, 11])
+
+    buffer.append(12.0, [12, 12])
+    assert np.array_equal(buffer.times, [8, 9, 10, 11, 12])
+    assert np.array_equal(buffer.image[:, 0], [8, 9, 10, 11, 12])
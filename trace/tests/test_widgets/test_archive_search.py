@@ -6,7 +6,7 @@ from qtpy.QtGui import QDrag
 from qtpy.QtCore import QUrl, QMimeData, QByteArray, QModelIndex
 from qtpy.QtNetwork import QNetworkReply
 
-from widgets import ArchiveSearchWidget
+from widgets import ArchiveSearchWidget, archive_search_catalog
 
 DUMMY_ARCHIVER_URL = "dummy.archiver.url"
 
@@ -99,6 +99,40 @@ def test_archive_search(mock_get, search_wid, data_test, data_expected):
     assert reply_actual.url() == QUrl(url_string)
 
 
+@patch("qtpy.QtNetwork.QNetworkAccessManager.get")
+def test_repeated_search_uses_catalog(mock_get, qapp, search_wid):
+    """Test that a search already made in any window is answered from the
+    process-wide catalog.
+
+    Parameters
+    ----------
+    mock_get : mock.patch
+        Mock qtpy.QtNetwork.QNetworkAccessManager.get to capture calls sent to the archiver
+    qapp : fixture
+        PyDMApplication instance
+    search_wid : fixture
+        Instance of ArchiveSearchWidget for testing
+
+    Expectations
+    ------------
+    A second widget shows the first widget's results without a request.
+    """
+    url_string = f"{DUMMY_ARCHIVER_URL}/retrieval/bpl/searchForPVsRegex?regex=.*FOO.*"
+    reply = create_dummy_reply(data=b"FOO:1 FOO:2")
+    reply.property.return_value = url_string
+    search_wid.populate_results_list(reply)
+
+    with patch.dict(os.environ, {"PYDM_ARCHIVER_URL": DUMMY_ARCHIVER_URL}):
+        other = ArchiveSearchWidget()
+    other.search_box.setText("FOO")
+    other.search_button.click()
+
+    mock_get.assert_not_called()
+    assert other.results_table_model.results_list == ["FOO:1", "FOO:2"]
+    archive_search_catalog.clear()
+    other.deleteLater()
+
+
 def test_populate_results_list_success(search_wid):
     """Test case for populate_results_list method
 
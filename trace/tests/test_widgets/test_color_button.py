@@ -172,7 +172,7 @@ def test_index_color(monkeypatch, index, expected_base_color, expected_dark_fact
     The color returned by index_color matches the expected base color and
     darkness factor
     """
-    monkeypatch.setattr(color_button, "color_palette", TEST_PALETTE)
+    monkeypatch.setattr(color_button.config, "color_palette", TEST_PALETTE)
 
     # Call the static method and calculate expected darker color
     color = ColorButton.index_color(index)
@@ -0,0 +1,137 @@
+from unittest.mock import MagicMock
+
+import pytest
+from qtpy.QtGui import QIcon
+
+from pydm.widgets import PyDMArchiverTimePlot
+
+from widgets import ControlPanel
+
+
+@pytest.fixture
+def control_panel(qapp):
+    """Fixture for an instance of the ControlPanel attached to a plot. Uses a
+    mocked ThemeManager so no main window is required.
+
+    Yields
+    ------
+    An instance of ControlPanel.
+    """
+    theme_manager = MagicMock()
+    theme_manager.create_icon.return_value = QIcon()
+    theme_manager.get_icon_color.return_value = "#000000"
+
+    panel = ControlPanel(theme_manager=theme_manager)
+    panel.plot = PyDMArchiverTimePlot()
+    yield panel
+
+    panel.deleteLater()
+    qapp.processEvents()
+
+
+def test_curve_registry_on_add(control_panel):
+    """Test that adding curves registers them in the curve and CurveItem indices.
+
+    Parameters
+    ----------
+    control_panel : fixture
+        Instance of ControlPanel for widget testing
+
+    Expectations
+    ------------
+    Each curve can be looked up by key, and maps back to its CurveItem and AxisItem.
+    """
+    curve_item = control_panel.add_curve("ca://FOO:PV")
+    axis_item = control_panel.get_last_axis_item()
+
+    assert control_panel.curve_dict["x1"] is curve_item.source
+    assert control_panel.curve_key(curve_item.source) == "x1"
+    assert control_panel.curve_item_for(curve_item.source) is curve_item
+    assert curve_item.axis_item is axis_item
+    assert control_panel.get_axis_item(axis_item.name) is axis_item
+    assert control_panel.curve_item_dict[curve_item.source]["axisItem"] is axis_item
+
+
+def test_curve_registry_on_move(control_panel):
+    """Test that moving a curve to a new axis keeps the indices in sync.
+
+    Parameters
+    ----------
+    control_panel : fixture
+        Instance of ControlPanel for widget testing
+
+    Expectations
+    ------------
+    The new axis is registered by name and the CurveItem points to it.
+    """
+    curve_item = control_panel.add_curve("ca://FOO:PV")
+    control_panel.move_curve_to_axis(curve_item, "mm")
+
+    new_axis = control_panel.get_axis_item("mm")
+    assert new_axis is not None
+    assert curve_item.axis_item is new_axis
+    assert control_panel.curve_item_dict[curve_item.source]["axisItem"] is new_axis
+    assert control_panel.curve_key(curve_item.source) == "x1"
+
+
+def test_curve_registry_on_delete(control_panel):
+    """Test that deleting a curve removes it from every index.
+
+    Parameters
+    ----------
+    control_panel : fixture
+        Instance of ControlPanel for widget testing
+
+    Expectations
+    ------------
+    The deleted curve is no longer found by key, by curve, or in curve_item_dict.
+    """
+    curve_item = control_panel.add_curve("ca://FOO:PV")
+    other_item = control_panel.add_curve("ca://BAR:PV")
+    curve = curve_item.source
+
+    curve_item.close()
+
+    assert "x1" not in control_panel.curve_dict
+    assert control_panel.curve_key(curve) is None
+    assert control_panel.curve_item_for(curve) is None
+    assert list(control_panel.curve_item_dict) == [other_item.source]
+
+
+def test_axis_registry_on_rename(control_panel):
+    """Test that renaming an axis moves its registry entry.
+
+    Parameters
+    ----------
+    control_panel : fixture
+        Instance of ControlPanel for widget testing
+
+    Expectations
+    ------------
+    The axis is found under its new name and not its old one.
+    """
+    axis_item = control_panel.add_empty_axis("Old Name")
+    axis_item.set_axis_name("New Name")
+
+    assert control_panel.get_axis_item("Old Name") is None
+    assert control_panel.get_axis_item("New Name") is axis_item
+
+
+def test_register_curve_drops_duplicate_keys(control_panel):
+    """Test that registering a curve under a new key drops its old key.
+
+    Parameters
+    ----------
+    control_panel : fixture
+        Instance of ControlPanel for widget testing
+
+    Expectations
+    ------------
+    The curve is only registered under the most recent key.
+    """
+    curve_item = control_panel.add_curve("ca://FOO:PV")
+    control_panel.register_curve("x9", curve_item.source)
+
+    assert "x1" not in control_panel.curve_dict
+    assert control_panel.curve_dict["x9"] is curve_item.source
+    assert control_panel.curve_key(curve_item.source) == "x9"
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from benchmarks import StubArchiver
+from widgets.data_insight_tool import DataVisualizationModel
+
+
+@pytest.fixture
+def archiver(monkeypatch):
+    """Fixture for a running StubArchiver that answers after a short delay,
+    set as the PYDM_ARCHIVER_URL.
+
+    Yields
+    ------
+    A started instance of StubArchiver.
+    """
+    with StubArchiver(sample_period=1.0, latency=0.2) as stub:
+        monkeypatch.setenv("PYDM_ARCHIVER_URL", stub.url)
+        yield stub
+
+
+def test_superseded_request_is_discarded(qtbot, qapp, archiver):
+    """Test that the model's archive requests go through its ArchiveFetcher,
+    so a new request supersedes the one in flight.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt fixture for waiting on the event loop
+    qapp : fixture
+        PyDMApplication instance
+    archiver : fixture
+        Running instance of StubArchiver
+
+    Expectations
+    ------------
+    Only the second request's rows are added to the model, and it has no
+    request in flight once they arrive.
+    """
+    model = DataVisualizationModel()
+    end = time.time()
+    model.request_archive_data("ca://PV:FIRST", (end - 3600, end))
+    with qtbot.waitSignal(model.reply_recieved, timeout=5000):
+        model.request_archive_data("ca://PV:SECOND", (end - 60, end))
+    qtbot.wait(400)
+
+    assert 55 <= model.rowCount() <= 61
+    assert set(model.df["Source"]) == {"Archive"}
+    assert not model.cancel_archive_request()
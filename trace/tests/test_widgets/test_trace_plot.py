@@ -0,0 +1,487 @@
+import time
+
+import numpy as np
+import pytest
+
+from pydm.data_plugins import plugin_for_address
+
+from widgets import (
+    TracePlot,
+    SpectralTool,
+    DormantPolicy,
+    TraceCurveItem,
+    CorrelationTool,
+    StatisticsPanel,
+)
+from services import live_channels, live_data_budget
+from utilities import WindowSummary
+from benchmarks import StubArchiver
+
+
+@pytest.fixture
+def trace_plot(qapp):
+    """Fixture for an instance of TracePlot.
+
+    Yields
+    ------
+    An instance of TracePlot.
+    """
+    plot = TracePlot()
+    yield plot
+
+    plot.clearCurves()
+    plot.deleteLater()
+    qapp.processEvents()
+
+
+def test_curve_uses_ring_buffer(trace_plot):
+    """Test that live values are appended to the curve's ring buffer and exposed
+    through PyDM's data_buffer and points_accumulated attributes.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    The curve is a TraceCurveItem whose buffer is registered with the plot's store,
+    and the compatibility attributes match the ring buffer contents.
+    """
+    curve = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False)
+    assert isinstance(curve, TraceCurveItem)
+    assert curve.live_buffer in trace_plot.live_data_store.buffers
+
+    for value in range(5):
+        curve.receiveNewValue(float(value))
+
+    assert curve.points_accumulated == 5
+    assert curve.data_buffer.shape == (2, 5)
+    assert np.array_equal(curve.data_buffer[1], np.arange(5.0))
+    assert curve.max_x() == curve.live_buffer.times[-1]
+
+
+def test_buffer_size_keeps_newest(trace_plot):
+    """Test that changing the plot's buffer size resizes live buffers without clearing them.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    Only the newest samples up to the new size are kept.
+    """
+    curve = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False)
+    for value in range(200):
+        curve.receiveNewValue(float(value))
+
+    trace_plot.setBufferSize(100)
+
+    assert curve.live_buffer.capacity == 100
+    assert np.array_equal(curve.live_buffer.values, np.arange(100.0, 200.0))
+
+
+def test_plots_share_live_data_budget(trace_plot):
+    """Test that each plot sizes its own curves' buffers while every plot's
+    curves count toward the process-wide live data budget.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    Changing one plot's buffer size leaves the other plot's curves alone,
+    and both plots' buffers are counted by the shared budget.
+    """
+    other = TracePlot()
+    curve = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False)
+    other_curve = other.addYChannel("ca://OTHER:PV", useArchiveData=False)
+
+    trace_plot.setBufferSize(500)
+
+    assert other.live_data_store is not trace_plot.live_data_store
+    assert other.live_data_store.budget is trace_plot.live_data_store.budget is live_data_budget
+    assert curve.live_buffer.capacity == 500
+    assert other_curve.live_buffer.capacity == other.live_data_store.capacity != 500
+    assert {id(curve.live_buffer), id(other_curve.live_buffer)} <= {id(buffer) for buffer in live_data_budget.buffers}
+
+    other.clearCurves()
+    other.deleteLater()
+
+
+def test_superseded_archive_request(qtbot, trace_plot, monkeypatch):
+    """Test that a curve's new archive request supersedes the one in flight.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt fixture for waiting on the event loop
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+    monkeypatch : fixture
+        pytest fixture for setting PYDM_ARCHIVER_URL
+
+    Expectations
+    ------------
+    The plot waits on one response per curve, not per request, and the
+    curve only receives the data for its latest request.
+    """
+    with StubArchiver(sample_period=1.0, latency=0.2) as archiver:
+        monkeypatch.setenv("PYDM_ARCHIVER_URL", archiver.url)
+        curve = trace_plot.addYChannel("ca://BENCH:PV:000001", useArchiveData=True)
+        curve.cancel_archive_request()
+        trace_plot._pending_archive_responses = 0
+
+        for start in (1000, 2000):
+            if curve.request_archive_data(start, start + 99):
+                continue
+            trace_plot._pending_archive_responses += 1
+        assert trace_plot._pending_archive_responses == 1
+
+        with qtbot.waitSignal(trace_plot.archive_request_finished, timeout=5000):
+            pass
+        qtbot.wait(300)
+
+    times = curve.archive_data_buffer[0, -curve.archive_points_accumulated :]
+    assert times[0] == 2000 and times[-1] == 2099
+    assert trace_plot._pending_archive_responses == 0
+
+
+def test_hidden_curve_is_dormant(trace_plot):
+    """Test that hiding a curve suspends its live data according to the plot's policy.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    A hidden curve is unsubscribed from its live channel and resubscribed
+    when shown. With a throttled subscription, a hidden curve keeps at most
+    one sample per DORMANT_SAMPLE_S.
+    """
+    curve = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False)
+    plugin = plugin_for_address(curve.address)
+    assert curve.channel in plugin.channels
+
+    curve.setVisible(False)
+    assert curve.dormant
+    assert curve.channel not in plugin.channels
+
+    curve.setVisible(True)
+    assert not curve.dormant
+    assert curve.channel in plugin.channels
+
+    trace_plot.set_dormant_policy(DormantPolicy.THROTTLE)
+    curve.setVisible(False)
+    assert curve.channel in plugin.channels
+    curve.live_buffer.clear()
+    for value in range(5):
+        curve.receiveNewValue(float(value))
+    assert len(curve.live_buffer) == 1
+
+
+def test_shown_curve_backfills_missed_live_data(qtbot, trace_plot, monkeypatch):
+    """Test that a curve shown again backfills only its live data gap.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt fixture for waiting on the event loop
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+    monkeypatch : fixture
+        pytest fixture for setting PYDM_ARCHIVER_URL
+
+    Expectations
+    ------------
+    The archived samples between the last live sample and now are merged
+    into the live buffer, and the plot waits on the request like any other.
+    """
+    with StubArchiver(sample_period=1.0) as archiver:
+        monkeypatch.setenv("PYDM_ARCHIVER_URL", archiver.url)
+        curve = trace_plot.addYChannel("ca://BENCH:PV:000001", useArchiveData=True)
+        curve.cancel_archive_request()
+        trace_plot._pending_archive_responses = 0
+
+        last_live = int(time.time()) - 100
+        curve.live_buffer.clear()
+        curve.append_sample(last_live, 1.0)
+        curve.setVisible(False)
+        with qtbot.waitSignal(trace_plot.archive_request_finished, timeout=5000):
+            curve.setVisible(True)
+            assert trace_plot._pending_archive_responses == 1
+
+    times = curve.live_buffer.times
+    assert times[0] == last_live
+    assert 95 <= len(times) <= 101
+    assert np.all(np.diff(times) > 0)
+
+
+def test_live_filters_resubscribe_channel(trace_plot):
+    """Test that live filters resubscribe the curve's channel without losing data.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    A Channel Access curve is subscribed through the IOC's filters while its
+    address, live buffer, and saved properties keep the unfiltered PV. A
+    larger automatic decimation takes over from the user's, and channels
+    the server cannot filter are filtered as updates arrive.
+    """
+    curve = trace_plot.addYChannel("ca://FOO:PV", useArchiveData=False, liveDecimation=4)
+    assert curve.channel.address == 'ca://FOO:PV.{"dec":{"n":4}}'
+    assert curve.address == "ca://FOO:PV"
+    assert curve.to_dict()["channel"] == "ca://FOO:PV"
+    assert curve.to_dict()["liveDecimation"] == 4
+
+    curve.append_sample(time.time(), 1.0)
+    curve.set_auto_decimation(16)
+    assert curve.channel.address == 'ca://FOO:PV.{"dec":{"n":16}}'
+    assert curve.channel in plugin_for_address(curve.address).channels
+    assert len(curve.live_buffer) == 1
+
+    curve.set_auto_decimation(1)
+    curve.set_live_filters(decimation=1)
+    assert curve.channel.address == "ca://FOO:PV"
+    assert "liveDecimation" not in curve.to_dict()
+
+    local = trace_plot.addYChannel("loc://FOO_LOCAL?type=float&init=0", useArchiveData=False)
+    local.set_live_filters(decimation=3, deadband=0.5)
+    local.live_buffer.clear()
+    for value in (0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 2.0, 2.1, 2.2):
+        local.receiveNewValue(value)
+    assert list(local.live_buffer.values) == [0.0, 2.0]
+
+
+def test_curves_share_live_channel(qapp, trace_plot):
+    """Test that curves showing the same PV, in any plot, share one live
+    channel and buffer.
+
+    Parameters
+    ----------
+    qapp : fixture
+        PyDMApplication instance
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    Curves on two plots read the same buffer, so an update is stored once
+    and seen by both. A paused curve keeps a copy while the other follows
+    new updates. Disconnecting a plot's channels, as closing its window
+    does, releases its curves' shared channels, and the channel is
+    unsubscribed once both curves are removed.
+    """
+    other_plot = TracePlot()
+    first = trace_plot.addYChannel("ca://SHARED:PV", useArchiveData=False)
+    second = other_plot.addYChannel("ca://SHARED:PV", useArchiveData=False)
+    assert first.live_channel is second.live_channel
+    assert first.live_buffer is second.live_buffer
+
+    first.live_buffer.clear()
+    first.receiveNewValue(1.0)
+    assert second.live_buffer.values.tolist() == [1.0]
+
+    second.liveData = False
+    first.receiveNewValue(2.0)
+    assert first.live_buffer.values.tolist() == [1.0, 2.0]
+    assert second.live_buffer.values.tolist() == [1.0]
+
+    second.liveData = True
+    assert second.live_buffer is first.live_buffer
+
+    for channel in other_plot.channels():
+        channel.disconnect()
+    assert second.live_channel is None
+    for channel in other_plot.channels():
+        channel.connect()
+    assert second.live_channel is first.live_channel
+
+    trace_plot.removeCurve(first)
+    assert "ca://SHARED:PV" in live_channels
+    other_plot.clearCurves()
+    assert "ca://SHARED:PV" not in live_channels
+
+    other_plot.deleteLater()
+    qapp.processEvents()
+
+
+def test_y_bounds_from_index(trace_plot):
+    """Test that the curve's y bounds cover only the archive and live data in
+    the measured time range.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    The bounds combine the archive and live data within the range, and a
+    range without data has no bounds.
+    """
+    curve = trace_plot.addYChannel("ca://BOUNDS:PV", useArchiveData=False)
+    curve.live_buffer.extend(np.arange(1000.0, 2000.0), np.sin(np.arange(1000.0)) + 10)
+    curve.receiveArchiveData(np.vstack((np.arange(0.0, 1000.0), np.arange(1000.0))))
+
+    assert curve.dataBounds(1, orthoRange=(1100, 1200)) == pytest.approx((9.0, 11.0), abs=0.01)
+    assert curve.dataBounds(1, orthoRange=(900, 1100)) == pytest.approx((9.0, 999.0), abs=0.01)
+    assert curve.dataBounds(1, orthoRange=(3000, 4000)) == (None, None)
+
+
+def test_crosshair_readout(trace_plot):
+    """Test that the crosshair readout lists each curve's value at the cursor's time.
+
+    Parameters
+    ----------
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    Enabling the crosshair routes its position to the readout instead of
+    PyDM's labels, curves are read from their archive and live data, and
+    disabling the crosshair hides the readout.
+    """
+    curve = trace_plot.addYChannel("ca://READOUT:PV", name="Readout", useArchiveData=False)
+    curve.live_buffer.extend(np.arange(1000.0, 2000.0), np.arange(1000.0) * 2)
+    curve.receiveArchiveData(np.vstack((np.arange(0.0, 1000.0), np.full(1000, 5.0))))
+    assert curve.value_at(1500.4) == (1500.0, 1000.0)
+    assert curve.value_at(1500.5, interpolate=True) == (1500.5, 1001.0)
+    assert curve.value_at(500.0) == (500.0, 5.0)
+    assert curve.value_at(-10.0) is None
+
+    trace_plot.plotItem.setXRange(1000, 2000, padding=0)
+    trace_plot.enableCrosshair(True, 1500, 0)
+    view_box = trace_plot.plotItem.getViewBox()
+    scene_pos = view_box.mapViewToScene(view_box.mapToView(view_box.boundingRect().center()))
+    trace_plot.crosshair_position_updated.emit(scene_pos.x(), scene_pos.y())
+
+    readout = trace_plot.crosshair_readout
+    assert readout.isVisible()
+    assert "Readout" in readout.textItem.toHtml()
+
+    trace_plot.enableCrosshair(False, 0, 0)
+    assert not readout.isVisible()
+
+
+def test_statistics_panel(qtbot, trace_plot):
+    """Test that curves summarize their archive and live data within a time
+    range, and that the statistics panel lists the summaries.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt window for widget testing
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    A curve's summary over a range spanning its archive and live data equals
+    a scan of the values in the range, and the panel's row for the curve
+    shows its name and count.
+    """
+    curve = trace_plot.addYChannel("ca://STATS:PV", name="Stats", useArchiveData=False)
+    curve.receiveArchiveData(np.vstack((np.arange(0.0, 1000.0), np.arange(1000.0))))
+    curve.live_buffer.extend(np.arange(1000.0, 2000.0), np.arange(1000.0) * -1)
+
+    values = np.concatenate((np.arange(500.0, 1000.0), np.arange(501.0) * -1))
+    summary = curve.summary(500, 1500)
+    expected = WindowSummary.from_values(values)
+    assert summary.count == expected.count == 1001
+    assert summary.mean == pytest.approx(expected.mean)
+    assert summary.std == pytest.approx(expected.std)
+    assert (summary.minimum, summary.maximum) == (-500.0, 999.0)
+
+    panel = StatisticsPanel(trace_plot)
+    qtbot.addWidget(panel)
+    trace_plot.plotItem.setXRange(500, 1500, padding=0)
+    panel.show()
+    rows = [panel.table.item(row, 0).text() for row in range(panel.table.rowCount())]
+    row = rows.index("Stats")
+    assert panel.table.item(row, 1).text() == "1001"
+
+
+def test_correlation_tool(qtbot, trace_plot):
+    """Test that the correlation tool pairs two curves' archive and live data
+    and switches to a density image for many pairs.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt window for widget testing
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    The two curves are selected by default and paired, pairs stay drawn as
+    points up to the scatter limit, and new live data is paired incrementally.
+    """
+    x_curve = trace_plot.addYChannel("ca://CORR:X", name="X", useArchiveData=False)
+    y_curve = trace_plot.addYChannel("ca://CORR:Y", name="Y", useArchiveData=False)
+    for curve, scale in ((x_curve, 1.0), (y_curve, 3.0)):
+        curve.receiveArchiveData(np.vstack((np.arange(0.0, 1000.0), np.arange(1000.0) * scale)))
+        curve.live_buffer.extend(np.arange(1000.0, 1010.0), np.arange(1000.0, 1010.0) * scale)
+
+    tool = CorrelationTool(trace_plot)
+    qtbot.addWidget(tool)
+    tool.SCATTER_LIMIT = 500
+    tool.show()
+    assert tool.selected_curves() == (x_curve, y_curve)
+    assert len(tool.pairs) == 1010
+    np.testing.assert_array_equal(tool.pairs.y, tool.pairs.x * 3)
+    assert tool.density.isVisible() and not tool.scatter.isVisible()
+
+    for curve, scale in ((x_curve, 1.0), (y_curve, 3.0)):
+        curve.live_buffer.append(1010.0, 1010.0 * scale)
+    tool.refresh()
+    assert len(tool.pairs) == 1011
+
+
+def test_spectral_tool(qtbot, trace_plot):
+    """Test that the spectral tool computes a curve's spectrum on its worker
+    thread and draws it.
+
+    Parameters
+    ----------
+    qtbot : fixture
+        pytest-qt window for widget testing
+    trace_plot : fixture
+        Instance of TracePlot for widget testing
+
+    Expectations
+    ------------
+    The curve's archive data is analyzed over the visible range, the
+    amplitude spectrum peaks at the signal's frequency, the spectrogram has
+    a row per segment, and hiding the tool stops its worker thread.
+    """
+    times = np.arange(0.0, 100.0, 0.01)
+    curve = trace_plot.addYChannel("ca://SPECTRUM:PV", name="Spectrum", useArchiveData=False)
+    curve.receiveArchiveData(np.vstack((times, np.sin(2 * np.pi * 5 * times))))
+    trace_plot.plotItem.setXRange(10, 90, padding=0)
+
+    tool = SpectralTool(trace_plot)
+    qtbot.addWidget(tool)
+    tool.show()
+    qtbot.waitUntil(lambda: tool.spectrum_curve.getData()[0] is not None, timeout=5000)
+    frequencies, amplitude = tool.spectrum_curve.getData()
+    assert np.isclose(frequencies[np.argmax(amplitude)], 5.0, atol=0.05)
+
+    tool.mode_select_box.setCurrentText(SpectralTool.SPECTROGRAM)
+    qtbot.waitUntil(lambda: tool.spectrogram.isVisible(), timeout=5000)
+    assert tool.spectrogram.image.shape[1] == 513
+
+    tool.hide()
+    assert tool._thread is None
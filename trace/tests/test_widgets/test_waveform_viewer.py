@@ -0,0 +1,91 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from widgets import WaveformViewer
+
+
+@pytest.fixture
+def waveform_viewer(qtbot):
+    """Fixture for an instance of WaveformViewer with a small history.
+
+    Yields
+    ------
+    An instance of WaveformViewer.
+    """
+    viewer = WaveformViewer(capacity=10)
+    qtbot.addWidget(viewer)
+    yield viewer
+
+    viewer.set_address("")
+
+
+def test_waterfall_renders_history(waveform_viewer):
+    """Test that live and archived waveforms are drawn as the latest waveform
+    and a waterfall image.
+
+    Parameters
+    ----------
+    waveform_viewer : fixture
+        Instance of WaveformViewer for widget testing
+
+    Expectations
+    ------------
+    Waveforms received between renders are all kept but drawn once, the
+    waterfall shows one row per waveform, and archived waveforms are
+    merged in behind the live ones.
+    """
+    for i in range(15):
+        waveform_viewer.receive_waveform(np.arange(8) * i)
+    waveform_viewer.render()
+
+    assert np.array_equal(waveform_viewer.latest_curve.getData()[1], np.arange(8) * 14)
+    assert waveform_viewer.waterfall.image.shape == (10, 8)
+    assert waveform_viewer.waterfall.image[-1, 1] == 14
+
+    oldest = waveform_viewer.buffer.times[0]
+    waveform_viewer.set_address("ca://WAVEFORM:PV")
+    waveform_viewer.receive_waveform(np.ones(8))
+    waveform_viewer.receive_archive((np.array([oldest - 2, oldest - 1]), np.zeros((2, 8))))
+    assert len(waveform_viewer.buffer) == 3
+    assert waveform_viewer.waterfall.image.shape == (3, 8)
+
+
+def test_archive_request_fits_history(waveform_viewer):
+    """Test that fetching archived waveforms only requests what the history
+    has room for, decoded off the GUI thread.
+
+    Parameters
+    ----------
+    waveform_viewer : fixture
+        Instance of WaveformViewer for widget testing
+
+    Expectations
+    ------------
+    With live waveforms every second, the range is cut to one interval per
+    free row. Without them, a range longer than one second per free row is
+    sampled by the archiver, and a full history makes no request.
+    """
+    waveform_viewer.archive_fetcher = MagicMock()
+    fetch = waveform_viewer.archive_fetcher.fetch
+    waveform_viewer.set_address("ca://WAVEFORM:PV")
+    waveform_viewer.history_spin_box.setValue(3600)
+    waveform_viewer.fetch_archive()
+    args, kwargs = fetch.call_args
+    assert args[3] - args[2] == 3600
+    assert args[4] == "lastSample_360"
+    assert kwargs["threaded"]
+
+    for i in range(4):
+        waveform_viewer.buffer.append(1000.0 + i, np.zeros(8))
+    waveform_viewer.fetch_archive()
+    args, _ = fetch.call_args
+    assert (args[2], args[3], args[4]) == (994.0, 1000.0, "")
+
+    for i in range(4, 10):
+        waveform_viewer.buffer.append(1000.0 + i, np.zeros(8))
+    fetch.reset_mock()
+    waveform_viewer.fetch_archive()
+    fetch.assert_not_called()
+    assert waveform_viewer.status_label.text() == "The history is full"
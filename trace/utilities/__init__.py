@@ -1,2 +1,12 @@
 from .formula_validation import validate_formula, sanitize_for_validation
 from .time_parser import IOTimeParser
+from .ring_buffer import RingBuffer
+from .decimation import M4Decimator, m4_indices
+from .range_index import MinMaxIndex
+from .readout import SeriesCursor
+from .statistics import SummaryIndex, WindowSummary, sample_quantiles
+from .correlation import CorrelationSeries, asof_join
+from .spectrum import SlidingWelch, grid_step, median_interval, resample_uniform, amplitude_spectrum
+from .waveform_buffer import WaveformBuffer
+from .channel_filters import ChannelFilters, rate_decimation, filtered_address
+from .version import VersionAction, get_version
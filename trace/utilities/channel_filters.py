@@ -0,0 +1,97 @@
+import json
+import math
+from typing import NamedTuple
+
+from pydm.utilities import protocol_and_address
+
+# Protocols whose servers apply EPICS channel filters named in the channel.
+# PyDM's PVAccess plugin monitors channels without a pvRequest, so PVA
+# channels are filtered by the client instead.
+FILTER_PROTOCOLS = ("ca",)
+# The largest decimation applied automatically
+MAX_AUTO_DECIMATION = 1024
+
+
+class ChannelFilters(NamedTuple):
+    """Server-side filters for a live channel subscription. The defaults
+    leave the subscription unfiltered.
+
+    Attributes
+    ----------
+    decimation : int
+        Only every nth update is sent, using the ``dec`` filter.
+    deadband : float
+        Updates that change the value by less than this are not sent, using
+        the ``dbnd`` filter.
+    """
+
+    decimation: int = 1
+    deadband: float = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Whether any update is filtered out."""
+        return self.decimation > 1 or self.deadband > 0
+
+    def to_json(self) -> str:
+        """The filters in the JSON form EPICS channel names take them in."""
+        filters = {}
+        if self.decimation > 1:
+            filters["dec"] = {"n": int(self.decimation)}
+        if self.deadband > 0:
+            filters["dbnd"] = {"abs": float(self.deadband)}
+        return json.dumps(filters, separators=(",", ":"))
+
+
+def filtered_address(address: str, filters: ChannelFilters) -> str:
+    """The channel address that subscribes to a PV through server-side filters.
+
+    Parameters
+    ----------
+    address : str
+        The PV's address, with or without a protocol.
+    filters : ChannelFilters
+        The filters to apply.
+
+    Returns
+    -------
+    str
+        The address with the filters appended to its field, or the address
+        unchanged if it has no filters to apply, its protocol cannot apply
+        them, or it already names filters of its own.
+    """
+    if not address or not filters.active:
+        return address
+    protocol, name = protocol_and_address(address.strip())
+    protocol = protocol or "ca"
+    if protocol not in FILTER_PROTOCOLS or "{" in name:
+        return address
+    # Filters follow a field name, and "REC." names the record's default field
+    separator = "" if "." in name else "."
+    return f"{protocol}://{name}{separator}{filters.to_json()}"
+
+
+def rate_decimation(update_rate: float, display_rate: float, max_decimation: int = MAX_AUTO_DECIMATION) -> int:
+    """The decimation that brings a PV's update rate down to what a plot can
+    display. Decimations are powers of two, so small changes in either rate
+    do not resubscribe the channel.
+
+    Parameters
+    ----------
+    update_rate : float
+        The PV's updates per second.
+    display_rate : float
+        The updates per second the plot can display, e.g. its width in
+        pixels over its time span in seconds.
+    max_decimation : int, optional
+        The largest decimation returned, by default MAX_AUTO_DECIMATION.
+
+    Returns
+    -------
+    int
+        The largest power of two that keeps at least ``display_rate``
+        updates per second, and 1 if the PV updates no faster than that.
+    """
+    if display_rate <= 0 or update_rate <= display_rate:
+        return 1
+    return min(max_decimation, 2 ** int(math.log2(update_rate / display_rate)))
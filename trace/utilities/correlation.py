@@ -0,0 +1,215 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+# The number of bins along each axis of a density grid
+DEFAULT_BINS = 200
+# Fraction of the pairs' span added around them when the grid's extent is set
+EXTENT_MARGIN = 0.1
+
+
+# A series given as chronological (timestamps, values) segments, such as views
+# of a curve's archive data and of its live buffer, which are never joined
+Segments = Sequence[tuple[np.ndarray, np.ndarray]]
+
+
+def series_bounds(segments: Segments) -> tuple[float, float] | None:
+    """The oldest and newest timestamps of a segmented series, or None if it is empty."""
+    filled = [times for times, _ in segments if times.size]
+    return (filled[0][0], filled[-1][-1]) if filled else None
+
+
+def asof_values(segments: Segments, times: np.ndarray) -> np.ndarray:
+    """Each segmented series' newest value at or before each of the given
+    timestamps, found by a binary search of each segment.
+
+    Parameters
+    ----------
+    segments : Segments
+        The series' segments, oldest first.
+    times : np.ndarray
+        The timestamps to look up.
+
+    Returns
+    -------
+    np.ndarray
+        The values, NaN for timestamps before the series starts.
+    """
+    values = np.full(times.size, np.nan)
+    for segment_times, segment_values in segments:
+        index = np.searchsorted(segment_times, times, side="right") - 1
+        found = index >= 0
+        # Later segments are newer, so they replace what earlier ones found
+        values[found] = segment_values[index[found]]
+    return values
+
+
+def asof_join(
+    x_segments: Segments, y_segments: Segments, after: float = -np.inf, until: float = np.inf
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pair two series in time: at every timestamp of either series, take
+    each series' newest value at or before it. Both lookups are vectorized
+    binary searches.
+
+    Parameters
+    ----------
+    x_segments, y_segments : Segments
+        Each series' sorted (timestamps, values) segments, oldest first.
+    after : float, optional
+        Only timestamps after this one are paired, by default all of them.
+    until : float, optional
+        Only timestamps at or before this one are paired, by default all of them.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        The pairs' timestamps and their x and y values. Timestamps before
+        either series starts, and pairs with a NaN, are left out.
+    """
+    new_times = [
+        times[np.searchsorted(times, after, side="right") : np.searchsorted(times, until, side="right")]
+        for times, _ in (*x_segments, *y_segments)
+    ]
+    times = np.unique(np.concatenate(new_times)) if new_times else np.empty(0)
+    xs, ys = asof_values(x_segments, times), asof_values(y_segments, times)
+    finite = np.isfinite(xs) & np.isfinite(ys)
+    return times[finite], xs[finite], ys[finite]
+
+
+class CorrelationSeries:
+    """Time-aligned pairs of two series, with a 2D histogram of them for
+    drawing as a density image when there are too many to draw as points.
+
+    Updates only join and bin the samples newer than the last pair, so
+    following live data costs O(k log n) for k new samples. Samples newer
+    than either series' newest are held back until both have reached them,
+    so a series whose updates arrive later is still paired in order. Pairs
+    older than either series' oldest sample, such as those of live samples
+    a full buffer has dropped, are dropped too and taken out of the
+    histogram, so the pairs never outgrow the series. Any other change to
+    the series must be signaled with a new ``generation``, which rebuilds
+    the pairs. The histogram's extent is padded by EXTENT_MARGIN and only
+    recomputed when new pairs fall outside it.
+
+    Parameters
+    ----------
+    bins : int, optional
+        The number of histogram bins along each axis, by default DEFAULT_BINS.
+    """
+
+    def __init__(self, bins: int = DEFAULT_BINS):
+        self.bins = int(bins)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the pairs and histogram."""
+        self._generation = None
+        self._last_time = -np.inf
+        self._start = 0
+        self._size = 0
+        self._times = np.empty(0)
+        self._xs = np.empty(0)
+        self._ys = np.empty(0)
+        self.counts = np.zeros((self.bins, self.bins))
+        self.extent = None
+
+    @property
+    def times(self) -> np.ndarray:
+        """The pairs' timestamps."""
+        return self._times[self._start : self._size]
+
+    @property
+    def x(self) -> np.ndarray:
+        """The pairs' x values."""
+        return self._xs[self._start : self._size]
+
+    @property
+    def y(self) -> np.ndarray:
+        """The pairs' y values."""
+        return self._ys[self._start : self._size]
+
+    def __len__(self) -> int:
+        return self._size - self._start
+
+    def update(self, x_segments: Segments, y_segments: Segments, generation: object = None) -> int:
+        """Drop the pairs older than either series, then pair the series'
+        samples newer than the last pair, and bin them.
+
+        Parameters
+        ----------
+        x_segments, y_segments : Segments
+            Each series' sorted (timestamps, values) segments, oldest first.
+        generation : object, optional
+            Identifies the current contents of the series, by default None.
+            The pairs are rebuilt when it changes.
+
+        Returns
+        -------
+        int
+            The number of pairs added.
+        """
+        if generation != self._generation:
+            self.reset()
+            self._generation = generation
+        x_bounds, y_bounds = series_bounds(x_segments), series_bounds(y_segments)
+        if x_bounds is None or y_bounds is None:
+            self.reset()
+            self._generation = generation
+            return 0
+        self._trim(max(x_bounds[0], y_bounds[0]))
+
+        until = min(x_bounds[1], y_bounds[1])
+        times, xs, ys = asof_join(x_segments, y_segments, self._last_time, until)
+        self._last_time = max(self._last_time, until)
+        if times.size == 0:
+            return 0
+        self._append(times, xs, ys)
+
+        low_x, high_x, low_y, high_y = self.extent or (np.inf, -np.inf, np.inf, -np.inf)
+        if xs.min() < low_x or xs.max() > high_x or ys.min() < low_y or ys.max() > high_y:
+            self._rebin()
+        else:
+            self.counts += np.histogram2d(xs, ys, bins=self.bins, range=self._ranges())[0]
+        return times.size
+
+    def _trim(self, oldest: float) -> None:
+        """Drop the pairs older than the given timestamp and unbin them."""
+        stop = self._start + int(np.searchsorted(self.times, oldest))
+        if stop == self._start:
+            return
+        xs, ys = self._xs[self._start : stop], self._ys[self._start : stop]
+        self.counts -= np.histogram2d(xs, ys, bins=self.bins, range=self._ranges())[0]
+        self._start = stop
+
+    def _append(self, times: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Add pairs, compacting or growing storage by doubling so appends
+        stay amortized O(1).
+        """
+        kept = self._size - self._start
+        count = kept + times.size
+        if self._size + times.size > self._times.size:
+            size = max(2 * count, 1024)
+            for name in ("_times", "_xs", "_ys"):
+                storage = np.empty(size)
+                storage[:kept] = getattr(self, name)[self._start : self._size]
+                setattr(self, name, storage)
+            self._start, self._size = 0, kept
+        self._times[self._size : self._size + times.size] = times
+        self._xs[self._size : self._size + times.size] = xs
+        self._ys[self._size : self._size + times.size] = ys
+        self._size += times.size
+
+    def _ranges(self) -> list[tuple[float, float]]:
+        low_x, high_x, low_y, high_y = self.extent
+        return [(low_x, high_x), (low_y, high_y)]
+
+    def _rebin(self) -> None:
+        """Set the extent around every pair, padded, and rebuild the histogram."""
+        xs, ys = self.x, self.y
+        extent = []
+        for values in (xs, ys):
+            low, high = float(values.min()), float(values.max())
+            margin = (high - low) * EXTENT_MARGIN or max(abs(low) * EXTENT_MARGIN, 0.5)
+            extent += [low - margin, high + margin]
+        self.extent = tuple(extent)
+        self.counts = np.histogram2d(xs, ys, bins=self.bins, range=self._ranges())[0]
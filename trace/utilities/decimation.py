@@ -0,0 +1,203 @@
+import numpy as np
+
+
+def m4_indices(x: np.ndarray, y: np.ndarray, bin_width: float) -> np.ndarray:
+    """Select the first, minimum, maximum, and last sample of every bin of
+    width ``bin_width`` along x (M4 aggregation). Drawing only these samples
+    gives the same image as drawing every sample when each bin is one pixel
+    wide, so peaks and dips are never lost.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sorted sample timestamps.
+    y : np.ndarray
+        Sample values; NaNs are ignored when finding extremes.
+    bin_width : float
+        The width of each bin in the units of x.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted, unique indices into x and y of the selected samples.
+    """
+    if x.size == 0:
+        return np.empty(0, dtype=np.intp)
+
+    bins = np.floor(x / bin_width)
+    starts = np.flatnonzero(np.concatenate(([True], bins[1:] != bins[:-1])))
+    ends = np.append(starts[1:], x.size) - 1
+
+    bin_min = np.fmin.reduceat(y, starts)
+    bin_max = np.fmax.reduceat(y, starts)
+    lengths = np.diff(np.append(starts, x.size))
+
+    # Index of the first occurrence of each bin's min and max, falling back
+    # to the bin's first sample when the bin is all NaN
+    positions = np.arange(x.size)
+    no_match = x.size
+    min_idx = np.minimum.reduceat(np.where(y == np.repeat(bin_min, lengths), positions, no_match), starts)
+    max_idx = np.minimum.reduceat(np.where(y == np.repeat(bin_max, lengths), positions, no_match), starts)
+    min_idx = np.where(min_idx == no_match, starts, min_idx)
+    max_idx = np.where(max_idx == no_match, starts, max_idx)
+
+    indices = np.column_stack((starts, np.minimum(min_idx, max_idx), np.maximum(min_idx, max_idx), ends)).ravel()
+    return indices[np.concatenate(([True], np.diff(indices) != 0))]
+
+
+class M4Decimator:
+    """Render-time decimation of a growing time series to at most four
+    samples per horizontal pixel of the viewport.
+
+    Bins are aligned to multiples of the bin width rather than to the
+    viewport edges, so the decimated result stays valid while the view
+    scrolls at a constant zoom. Only the bins of a span around the viewport
+    are cached: the visible bins and ``MARGIN`` viewports on either side, so
+    the cost of decimating is bounded by the viewport's width in pixels
+    rather than by the number of samples. When the view leaves the span, the
+    span is moved to it, keeping the bins it still covers and decimating
+    only the new ones. The cache is also updated incrementally as samples
+    are appended or dropped from the front; any other change to the data
+    must be signaled with a new ``generation``.
+    """
+
+    # The number of viewport widths cached on either side of the viewport
+    MARGIN = 1
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the cached decimation."""
+        self._bin_width = None
+        self._generation = None
+        self._span = None
+        self._first_x = None
+        self._last_x = None
+        self._bins = np.empty(0)
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+
+    def decimate(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        x_range: tuple[float, float],
+        width: int,
+        generation: object = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Reduce the data to at most four samples per pixel within the given x range.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Sorted sample timestamps.
+        y : np.ndarray
+            Sample values.
+        x_range : tuple[float, float]
+            The visible range of x.
+        width : int
+            The width of the visible range in pixels.
+        generation : object, optional
+            Identifies the current contents of the data, by default None. The
+            cache is rebuilt when it changes.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Copies of the decimated x and y values in and just around x_range.
+        """
+        x_min, x_max = x_range
+        width = max(int(width), 1)
+        lo, hi = np.searchsorted(x, x_min), np.searchsorted(x, x_max, side="right")
+        lo, hi = max(lo - 1, 0), min(hi + 1, x.size)
+
+        # Nothing to gain when the visible data already fits the pixels
+        if hi - lo <= 4 * width:
+            return x[lo:hi].copy(), y[lo:hi].copy()
+
+        # Round the bin width so floating point jitter in the view range does
+        # not invalidate the cache while scrolling
+        bin_width = float(f"{(x_max - x_min) / width:.3g}")
+        if bin_width != self._bin_width or generation != self._generation:
+            self.reset()
+            self._bin_width = bin_width
+            self._generation = generation
+
+        # The visible bins and one more on either side, for the lines leaving the viewport
+        first_bin, last_bin = np.floor(x_min / bin_width) - 1, np.floor(x_max / bin_width) + 1
+        span = self._span
+        if span is None or first_bin < span[0] or last_bin > span[1]:
+            margin = self.MARGIN * width
+            span = (first_bin - margin, last_bin + margin)
+        self._update(x, y, span)
+
+        start, end = np.searchsorted(self._x, (x_min - bin_width, x_max + bin_width))
+        start, end = max(start - 1, 0), min(end + 1, self._x.size)
+        return self._x[start:end].copy(), self._y[start:end].copy()
+
+    def _update(self, x: np.ndarray, y: np.ndarray, span: tuple[float, float]) -> None:
+        """Bring the cache in line with the data within a span of bins,
+        decimating only the bins that are new to the span or may have
+        changed since the last update: the first bin when samples were
+        dropped from the front, and the bins from the previous last sample
+        on when samples were appended.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Sorted sample timestamps.
+        y : np.ndarray
+            Sample values.
+        span : tuple[float, float]
+            The first and last bins to cache.
+        """
+        width = self._bin_width
+        first_bin, last_bin = span
+        if self._span is None or x[-1] < self._last_x:
+            valid_first, valid_last = first_bin, first_bin - 1
+        else:
+            # The range of bins whose cached samples are still correct
+            valid_first, valid_last = max(self._span[0], first_bin), min(self._span[1], last_bin)
+            if x[0] != self._first_x:
+                valid_first = max(valid_first, np.floor(x[0] / width) + 1)
+            if x[-1] != self._last_x:
+                valid_last = min(valid_last, np.floor(self._last_x / width) - 1)
+
+        if valid_first > valid_last:
+            self._set(x, y, first_bin, last_bin)
+        elif (valid_first, valid_last) != (self._span[0], self._span[1]) or span != self._span:
+            keep = slice(*np.searchsorted(self._bins, (valid_first, valid_last + 1)))
+            kept = (self._x[keep], self._y[keep], self._bins[keep])
+            front = self._decimate_bins(x, y, first_bin, valid_first - 1)
+            back = self._decimate_bins(x, y, valid_last + 1, last_bin)
+            self._x, self._y, self._bins = (np.concatenate(parts) for parts in zip(front, kept, back))
+
+        self._span = span
+        self._first_x, self._last_x = x[0], x[-1]
+
+    def _set(self, x: np.ndarray, y: np.ndarray, first_bin: float, last_bin: float) -> None:
+        """Replace the cache with the decimated samples of a span of bins."""
+        self._x, self._y, self._bins = self._decimate_bins(x, y, first_bin, last_bin)
+
+    def _bin_start(self, x: np.ndarray, bin_number: float) -> int:
+        """The index of the first sample in or after a bin. Bins are assigned
+        by dividing by the bin width, which can round a sample at a bin's
+        edge differently from multiplying the bin number by the width.
+        """
+        index = int(np.searchsorted(x, bin_number * self._bin_width))
+        while index > 0 and np.floor(x[index - 1] / self._bin_width) >= bin_number:
+            index -= 1
+        while index < x.size and np.floor(x[index] / self._bin_width) < bin_number:
+            index += 1
+        return index
+
+    def _decimate_bins(
+        self, x: np.ndarray, y: np.ndarray, first_bin: float, last_bin: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The decimated samples of a range of bins and their bin numbers."""
+        if first_bin > last_bin:
+            return np.empty(0), np.empty(0), np.empty(0)
+        start, end = self._bin_start(x, first_bin), self._bin_start(x, last_bin + 1)
+        indices = start + m4_indices(x[start:end], y[start:end], self._bin_width)
+        return x[indices], y[indices], np.floor(x[indices] / self._bin_width)
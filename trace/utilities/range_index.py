@@ -0,0 +1,162 @@
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 64
+
+
+class MinMaxIndex:
+    """Block min/max index over a growing series, so the extremes of any
+    range of it are found in O(log n) rather than by scanning the range.
+
+    The series is split into fixed-size blocks, and a segment tree is kept
+    over the blocks' minimums and maximums. A range is answered from the
+    tree nodes covering its whole blocks and a scan of the partial blocks at
+    its edges. Samples appended to the series, or dropped from its front,
+    only update the tree's last nodes; any other change to the series must
+    be signaled with a new ``generation``, which rebuilds the index.
+
+    Parameters
+    ----------
+    block_size : int, optional
+        The number of samples summarized by each leaf of the tree, by
+        default DEFAULT_BLOCK_SIZE.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = max(int(block_size), 1)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the index."""
+        self._generation = None
+        self._values = np.empty(0)
+        self._first = 0
+        self._end = 0
+        self._origin = 0
+        # Each level holds [minimums, maximums, count]; level 0 holds the blocks
+        self._levels: list[list] = []
+
+    def update(self, values: np.ndarray, first: int = 0, generation: object = None) -> None:
+        """Bring the index in line with the series.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The series' values. NaNs are ignored.
+        first : int, optional
+            The position of values[0] in the series, counting samples
+            dropped from its front, by default 0.
+        generation : object, optional
+            Identifies the current contents of the series, by default None.
+            The index is rebuilt when it changes.
+        """
+        end = first + values.size
+        block = self.block_size
+        n_blocks = self._levels[0][2] if self._levels else 0
+        rebuild = (
+            generation != self._generation
+            or first < self._first
+            or end < self._end
+            # The block being appended to has been dropped from the front
+            or self._origin + (self._end - self._origin) // block * block < first
+            # Most of the tree covers samples dropped from the front
+            or (first - self._origin) // block > max(n_blocks // 2, 64)
+        )
+        self._values = values
+        if rebuild:
+            self._generation = generation
+            self._origin = first
+            self._levels = []
+            self._first, self._end = first, first
+        elif end == self._end:
+            self._first = first
+            return
+
+        changed = (self._end - self._origin) // block
+        self._first, self._end = first, end
+        self._update_blocks(changed)
+
+    def _update_blocks(self, changed: int) -> None:
+        """Recompute the blocks from the given one on, and their parents."""
+        block = self.block_size
+        start = self._origin + changed * block - self._first
+        tail = self._values[start:]
+        offsets = np.arange(0, tail.size, block)
+        mins = np.fmin.reduceat(tail, offsets) if tail.size else np.empty(0)
+        maxs = np.fmax.reduceat(tail, offsets) if tail.size else np.empty(0)
+        self._write(0, changed, mins, maxs)
+
+        level = 0
+        while self._levels[level][2] > 1:
+            child_mins, child_maxs, count = self._levels[level]
+            changed //= 2
+            lo = 2 * changed
+            mins, maxs = child_mins[lo:count], child_maxs[lo:count]
+            if mins.size % 2:
+                mins, maxs = np.append(mins, np.nan), np.append(maxs, np.nan)
+            self._write(level + 1, changed, np.fmin(mins[0::2], mins[1::2]), np.fmax(maxs[0::2], maxs[1::2]))
+            level += 1
+        del self._levels[level + 1 :]
+
+    def _write(self, level: int, start: int, mins: np.ndarray, maxs: np.ndarray) -> None:
+        """Write nodes to a level from the given position, growing its
+        storage by doubling so appends stay amortized O(1).
+        """
+        if level == len(self._levels):
+            self._levels.append([np.empty(0), np.empty(0), 0])
+        node_mins, node_maxs, _ = self._levels[level]
+        count = start + mins.size
+        if count > node_mins.size:
+            size = max(2 * node_mins.size, count, 16)
+            node_mins = np.concatenate((node_mins[:start], np.empty(size - start)))
+            node_maxs = np.concatenate((node_maxs[:start], np.empty(size - start)))
+        node_mins[start:count] = mins
+        node_maxs[start:count] = maxs
+        self._levels[level] = [node_mins, node_maxs, count]
+
+    def extremes(self, start: int = 0, stop: int = None) -> tuple[float, float]:
+        """The minimum and maximum of a range of the series last updated.
+
+        Parameters
+        ----------
+        start : int, optional
+            The index into the updated values the range starts at, by default 0.
+        stop : int, optional
+            The index into the updated values the range stops before, by
+            default the end of the values.
+
+        Returns
+        -------
+        tuple[float, float]
+            The smallest and largest values in the range, or NaNs if it has
+            no values other than NaN.
+        """
+        values = self._values
+        start, stop, _ = slice(start, stop).indices(values.size)
+        if start >= stop:
+            return np.nan, np.nan
+
+        # Whole blocks are read from the tree and the partial blocks at the edges are scanned
+        block = self.block_size
+        offset = self._first - self._origin
+        first_block = -(-(offset + start) // block)
+        last_block = (offset + stop) // block
+        if first_block >= last_block:
+            edge = values[start:stop]
+            return float(np.fmin.reduce(edge)), float(np.fmax.reduce(edge))
+
+        edges = np.concatenate(
+            (values[start : first_block * block - offset], values[last_block * block - offset : stop])
+        )
+        low, high = (np.fmin.reduce(edges), np.fmax.reduce(edges)) if edges.size else (np.nan, np.nan)
+        for node_mins, node_maxs, _ in self._levels:
+            if first_block >= last_block:
+                break
+            if first_block % 2:
+                low, high = np.fmin(low, node_mins[first_block]), np.fmax(high, node_maxs[first_block])
+                first_block += 1
+            if last_block % 2:
+                last_block -= 1
+                low, high = np.fmin(low, node_mins[last_block]), np.fmax(high, node_maxs[last_block])
+            first_block //= 2
+            last_block //= 2
+        return float(low), float(high)
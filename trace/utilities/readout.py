@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class SeriesCursor:
+    """Finds the samples of a sorted time series around a time, as a
+    crosshair readout does while the mouse moves.
+
+    Lookups are binary searches, O(log n), but the index the last lookup
+    landed on is kept as a hint: when the time has only moved to a
+    neighboring sample, as it does while the mouse moves smoothly, the hint
+    answers in O(1). Hints are checked before they are used, so the series
+    may change between lookups.
+    """
+
+    def __init__(self):
+        self._hint = None
+
+    def index(self, times: np.ndarray, timestamp: float) -> int:
+        """The index of the newest sample at or before a time.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            Sorted sample timestamps.
+        timestamp : float
+            The time to look up.
+
+        Returns
+        -------
+        int
+            The sample's index, or -1 if every sample is after the time.
+        """
+        size = times.size
+        hint = self._hint
+        if hint is not None:
+            for index in (hint, hint + 1, hint - 1):
+                if not 0 <= index < size or times[index] > timestamp:
+                    continue
+                if index + 1 == size or timestamp < times[index + 1]:
+                    self._hint = index
+                    return index
+
+        index = int(np.searchsorted(times, timestamp, side="right")) - 1
+        self._hint = index if index >= 0 else None
+        return index
+
+    def value_at(
+        self, times: np.ndarray, values: np.ndarray, timestamp: float, interpolate: bool = False
+    ) -> tuple[float, float] | None:
+        """The series' value at a time.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            Sorted sample timestamps.
+        values : np.ndarray
+            The samples' values.
+        timestamp : float
+            The time to read the series at.
+        interpolate : bool, optional
+            Interpolate linearly between the samples on either side of the
+            time, rather than taking the nearest sample, by default False.
+
+        Returns
+        -------
+        tuple[float, float] | None
+            The timestamp and value of the nearest sample, or the time and
+            the interpolated value, or None if the time is outside the series.
+        """
+        if times.size == 0 or not times[0] <= timestamp <= times[-1]:
+            return None
+        index = self.index(times, timestamp)
+        if index == times.size - 1:
+            return float(times[index]), float(values[index])
+
+        before, after = times[index], times[index + 1]
+        if interpolate:
+            fraction = (timestamp - before) / (after - before) if after > before else 0.0
+            return float(timestamp), float(values[index] + fraction * (values[index + 1] - values[index]))
+        if after - timestamp < timestamp - before:
+            index += 1
+        return float(times[index]), float(values[index])
@@ -0,0 +1,301 @@
+import numpy as np
+
+from .statistics import SummaryIndex, WindowSummary
+from .range_index import MinMaxIndex
+
+MINIMUM_CAPACITY = 2
+
+
+class RingBuffer:
+    """Preallocated buffer of (timestamp, value) samples with a bounded size.
+
+    Samples are kept contiguous in a sliding window over arrays slightly larger
+    than the capacity. Appending writes past the end of the window; once the
+    spare room runs out the newest samples are copied back to the front in a
+    single move. This keeps appends O(1) amortized, and lets ``times`` and
+    ``values`` be returned as zero-copy views for plotting.
+
+    Samples are dropped from the front when the capacity is reached, or when
+    they are older than ``max_age`` seconds relative to the newest sample.
+    ``generation`` is incremented by any other change to the retained samples,
+    so consumers can cache results derived from them.
+
+    The extremes of the values within any time range are read from a block
+    min/max index, and their mean and spread from a block summary index. Both
+    are brought up to date with the appended samples when they are next
+    read, so ranges are summarized in O(log n).
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of samples to retain.
+    dtype : np.dtype, optional
+        The data type of the values, by default np.float64. Timestamps are
+        always stored as np.float64 to keep sub-second resolution.
+    max_age : float, optional
+        The maximum age of retained samples in seconds, by default None
+        (retention limited by count only).
+    """
+
+    def __init__(self, capacity: int, dtype: np.dtype = np.float64, max_age: float = None):
+        self.dtype = np.dtype(dtype)
+        self.max_age = max_age
+        self.generation = 0
+        # The number of samples moved out of the storage arrays' front, so
+        # samples keep their position in the series across compactions
+        self._base = 0
+        self._index = MinMaxIndex()
+        self._sums = SummaryIndex()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """Allocate empty storage for the given capacity."""
+        self._capacity = max(int(capacity), MINIMUM_CAPACITY)
+        size = self._capacity + max(self._capacity // 4, 16)
+        self._times = np.zeros(size, dtype=np.float64)
+        self._values = np.zeros(size, dtype=self.dtype)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def capacity(self) -> int:
+        """The maximum number of samples retained."""
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes allocated for sample storage."""
+        return self._times.nbytes + self._values.nbytes
+
+    @property
+    def times(self) -> np.ndarray:
+        """Zero-copy view of the retained timestamps, oldest first."""
+        return self._times[self._start : self._end]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Zero-copy view of the retained values, oldest first."""
+        return self._values[self._start : self._end]
+
+    def value_range(self, start_time: float = None, end_time: float = None) -> tuple[float, float]:
+        """The smallest and largest values retained within a time range.
+
+        Parameters
+        ----------
+        start_time : float, optional
+            The oldest timestamp in the range, by default the oldest sample's.
+        end_time : float, optional
+            The newest timestamp in the range, by default the newest sample's.
+
+        Returns
+        -------
+        tuple[float, float]
+            The smallest and largest values, or NaNs if the range has no
+            values other than NaN.
+        """
+        start, stop = self.window(start_time, end_time)
+        self._index.update(self.values, self._base + self._start, self.generation)
+        return self._index.extremes(start, stop)
+
+    def summary(self, start_time: float = None, end_time: float = None) -> WindowSummary:
+        """Summary statistics of the values retained within a time range.
+
+        Parameters
+        ----------
+        start_time : float, optional
+            The oldest timestamp in the range, by default the oldest sample's.
+        end_time : float, optional
+            The newest timestamp in the range, by default the newest sample's.
+
+        Returns
+        -------
+        WindowSummary
+            The values' count, mean, squared deviations, minimum, and maximum.
+        """
+        start, stop = self.window(start_time, end_time)
+        self._sums.update(self.values, self._base + self._start, self.generation)
+        minimum, maximum = self.value_range(start_time, end_time)
+        return self._sums.summary(start, stop)._replace(minimum=minimum, maximum=maximum)
+
+    def window(self, start_time: float = None, end_time: float = None) -> tuple[int, int]:
+        """The indexes into ``times`` and ``values`` of the samples within a
+        time range, as a start and a stop.
+        """
+        times = self.times
+        start = 0 if start_time is None else int(np.searchsorted(times, start_time))
+        stop = times.size if end_time is None else int(np.searchsorted(times, end_time, side="right"))
+        return start, stop
+
+    def clear(self) -> None:
+        """Remove all samples without releasing storage."""
+        self._start = self._end = 0
+        self.generation += 1
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample to the end of the buffer. The timestamp is expected to
+        be no older than the newest sample already in the buffer.
+
+        Parameters
+        ----------
+        timestamp : float
+            The sample's timestamp in seconds since the epoch.
+        value : float
+            The sample's value.
+        """
+        if self._end == self._times.size:
+            self._compact()
+        self._times[self._end] = timestamp
+        self._values[self._end] = value
+        self._end += 1
+
+        if self._end - self._start > self._capacity:
+            self._start += 1
+        if self.max_age is not None and self._times[self._start] < timestamp - self.max_age:
+            self.trim_before(timestamp - self.max_age)
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Add several samples to the end of the buffer, in timestamp order.
+
+        Parameters
+        ----------
+        timestamps : np.ndarray
+            The samples' timestamps in seconds since the epoch.
+        values : np.ndarray
+            The samples' values.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)[-self._capacity :]
+        values = np.asarray(values)[-self._capacity :]
+        count = timestamps.size
+        if count == 0:
+            return
+
+        keep = min(len(self), self._capacity - count)
+        if self._end + count > self._times.size:
+            self._start = self._end - keep
+            self._compact()
+        self._times[self._end : self._end + count] = timestamps
+        self._values[self._end : self._end + count] = values
+        self._end += count
+        self._start = max(self._start, self._end - self._capacity)
+
+        if self.max_age is not None:
+            self.trim_before(timestamps[-1] - self.max_age)
+
+    def insert(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Merge samples into the buffer in timestamp order, replacing any
+        retained samples that fall within the inserted time range. Used to
+        backfill gaps in live data, so this copies the retained samples.
+
+        Parameters
+        ----------
+        timestamps : np.ndarray
+            The samples' timestamps in seconds since the epoch, in order.
+        values : np.ndarray
+            The samples' values.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if timestamps.size == 0:
+            return
+
+        old_times, old_values = self.times, self.values
+        lo, hi = np.searchsorted(old_times, (timestamps[0], timestamps[-1]))
+        merged_times = np.concatenate((old_times[:lo], timestamps, old_times[hi:]))
+        merged_values = np.concatenate((old_values[:lo], np.asarray(values, dtype=self.dtype), old_values[hi:]))
+
+        self.clear()
+        self.extend(merged_times, merged_values)
+
+    def truncate(self, count: int) -> None:
+        """Keep only the newest samples.
+
+        Parameters
+        ----------
+        count : int
+            The number of samples to keep.
+        """
+        self._start = max(self._start, self._end - max(int(count), 0))
+
+    def trim_before(self, timestamp: float) -> None:
+        """Drop all samples older than the given timestamp.
+
+        Parameters
+        ----------
+        timestamp : float
+            The oldest timestamp to retain.
+        """
+        self._start += int(np.searchsorted(self.times, timestamp))
+
+    def resize(self, capacity: int) -> None:
+        """Change the capacity of the buffer, keeping the newest samples.
+
+        Parameters
+        ----------
+        capacity : int
+            The new maximum number of samples to retain.
+        """
+        if max(int(capacity), MINIMUM_CAPACITY) == self._capacity:
+            return
+        times, values = self.times, self.values
+        self._allocate(capacity)
+        self.extend(times, values)
+        self.generation += 1
+
+    def downsample(self, target: int) -> None:
+        """Reduce the number of retained samples in place by replacing groups
+        of neighboring samples with their minimum and maximum, so peaks remain
+        visible. Only the oldest samples are reduced; the newest half of the
+        target is left at full resolution.
+
+        Parameters
+        ----------
+        target : int
+            The number of samples to reduce the buffer to.
+        """
+        count = len(self)
+        target = max(int(target), MINIMUM_CAPACITY)
+        if count <= target:
+            return
+
+        # Keep the newest half of the target untouched and reduce the samples
+        # before it into (min, max) pairs. Samples left over after grouping
+        # stay at full resolution, so at most a third of the remaining room
+        # is reserved for them.
+        keep = target // 2
+        n_groups = max((target - keep) // 3, 1)
+        old = count - keep
+        group_size = old // n_groups
+        grouped = n_groups * group_size
+
+        start = self._start
+        times = self._times[start : start + grouped].reshape(n_groups, group_size)
+        values = self._values[start : start + grouped].reshape(n_groups, group_size)
+
+        rows = np.arange(n_groups)
+        min_idx = values.argmin(axis=1)
+        max_idx = values.argmax(axis=1)
+        first = np.minimum(min_idx, max_idx)
+        second = np.maximum(min_idx, max_idx)
+        # Flat groups have the same min and max; use the group's last sample instead
+        second[first == second] = group_size - 1
+        first[first == second] = 0
+
+        reduced_times = np.column_stack((times[rows, first], times[rows, second])).ravel()
+        reduced_values = np.column_stack((values[rows, first], values[rows, second])).ravel()
+
+        # Write the reduced samples so they end right before the ungrouped samples
+        new_start = start + grouped - reduced_times.size
+        self._times[new_start : start + grouped] = reduced_times
+        self._values[new_start : start + grouped] = reduced_values
+        self._start = new_start
+        self.generation += 1
+
+    def _compact(self) -> None:
+        """Move the retained samples to the front of the storage arrays."""
+        count = len(self)
+        self._base += self._start
+        self._times[:count] = self._times[self._start : self._end]
+        self._values[:count] = self._values[self._start : self._end]
+        self._start, self._end = 0, count
@@ -0,0 +1,243 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# The number of samples in each Welch segment
+DEFAULT_SEGMENT = 1024
+# The most points a series is resampled onto; coarser grids are used for longer ranges
+MAX_GRID_POINTS = 2**20
+
+
+def median_interval(times: np.ndarray) -> float:
+    """The median interval between distinct timestamps, or NaN if there are
+    fewer than two.
+    """
+    intervals = np.diff(times)
+    intervals = intervals[intervals > 0]
+    return float(np.median(intervals)) if intervals.size else np.nan
+
+
+def grid_step(times: np.ndarray, start_time: float, end_time: float) -> float:
+    """The interval of a uniform grid to resample a time range of a series
+    onto: the median interval between its samples in the range, made
+    coarser if needed to keep the grid within MAX_GRID_POINTS.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Sorted sample timestamps.
+    start_time : float
+        The oldest timestamp in the range.
+    end_time : float
+        The newest timestamp in the range.
+
+    Returns
+    -------
+    float
+        The grid's interval, or NaN if the range has fewer than two samples.
+    """
+    window = times[np.searchsorted(times, start_time) : np.searchsorted(times, end_time, side="right")]
+    step = max(median_interval(window), (end_time - start_time) / MAX_GRID_POINTS)
+    return step if step > 0 else np.nan
+
+
+def resample_uniform(times: np.ndarray, values: np.ndarray, start: float, step: float, count: int) -> np.ndarray:
+    """Resample a series onto a uniform grid. The archiver stores values when
+    they change, so each grid point takes the newest value at or before it
+    rather than an interpolation.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Sorted sample timestamps.
+    values : np.ndarray
+        The samples' values.
+    start : float
+        The grid's first timestamp.
+    step : float
+        The interval between grid points.
+    count : int
+        The number of grid points.
+
+    Returns
+    -------
+    np.ndarray
+        The values at the grid points, NaN before the series starts.
+    """
+    grid = start + step * np.arange(count)
+    index = np.searchsorted(times, grid, side="right") - 1
+    samples = values[np.maximum(index, 0)].astype(float)
+    samples[index < 0] = np.nan
+    return samples
+
+
+def amplitude_spectrum(samples: np.ndarray, step: float) -> tuple[np.ndarray, np.ndarray]:
+    """The single-sided amplitude spectrum of uniformly sampled values, with
+    the mean removed and a Hann window applied. NaNs are replaced by the mean.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        The values.
+    step : float
+        The interval between samples in seconds.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The frequencies in Hz and the amplitude at each.
+    """
+    samples = np.asarray(samples, dtype=float)
+    finite = np.isfinite(samples)
+    if samples.size < 2 or not finite.any():
+        return np.empty(0), np.empty(0)
+    samples = np.where(finite, samples - samples[finite].mean(), 0.0)
+    window = np.hanning(samples.size + 1)[:-1]
+    amplitude = 2 * np.abs(np.fft.rfft(samples * window)) / window.sum()
+    amplitude[0] /= 2
+    return np.fft.rfftfreq(samples.size, step), amplitude
+
+
+def periodograms(segments: np.ndarray, step: float) -> np.ndarray:
+    """One-sided power spectral densities of each row of segments, with each
+    row's mean removed and a periodic Hann window applied, as Welch's method
+    averages.
+
+    Parameters
+    ----------
+    segments : np.ndarray
+        The segments, one per row.
+    step : float
+        The interval between samples in seconds.
+
+    Returns
+    -------
+    np.ndarray
+        Each segment's density at the frequencies of np.fft.rfftfreq, per Hz.
+    """
+    length = segments.shape[1]
+    window = np.hanning(length + 1)[:-1]
+    detrended = segments - segments.mean(axis=1, keepdims=True)
+    power = np.abs(np.fft.rfft(detrended * window, axis=1)) ** 2 * step / (window**2).sum()
+    # Fold the negative frequencies in, except for DC and an even length's Nyquist frequency
+    power[:, 1 : None if length % 2 else -1] *= 2
+    return power
+
+
+class SlidingWelch:
+    """Welch power spectral density and spectrogram of a sliding time range
+    of a series.
+
+    The series is resampled onto a uniform grid aligned to the epoch, and
+    split into half-overlapping segments at fixed grid positions. Each
+    segment's periodogram is kept, so as the range slides forward with live
+    data only the segments that have newly filled are computed, and those
+    that have left the range are dropped. Any other change to the series
+    must be signaled with a new ``generation``, which rebuilds them.
+
+    Parameters
+    ----------
+    segment : int, optional
+        The number of samples in each segment, by default DEFAULT_SEGMENT.
+    """
+
+    def __init__(self, segment: int = DEFAULT_SEGMENT):
+        self.segment = max(int(segment), 2)
+        self.hop = self.segment // 2
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the periodograms."""
+        self._generation = None
+        self.step = np.nan
+        self._first_segment = 0
+        self._power = np.empty((0, self.segment // 2 + 1))
+
+    @property
+    def frequencies(self) -> np.ndarray:
+        """The frequencies of the periodograms, in Hz."""
+        return np.fft.rfftfreq(self.segment, self.step) if np.isfinite(self.step) else np.empty(0)
+
+    @property
+    def segment_times(self) -> np.ndarray:
+        """The timestamp at the middle of each segment kept."""
+        first = self._first_segment * self.hop + self.segment / 2
+        return (first + self.hop * np.arange(len(self._power))) * self.step
+
+    @property
+    def power(self) -> np.ndarray:
+        """The periodogram of each segment kept, one per row. Rows for
+        segments with missing data are NaN.
+        """
+        return self._power
+
+    def update(
+        self, times: np.ndarray, values: np.ndarray, start_time: float, end_time: float, generation: object = None
+    ) -> int:
+        """Bring the periodograms in line with a time range of the series.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            Sorted sample timestamps.
+        values : np.ndarray
+            The samples' values.
+        start_time : float
+            The oldest timestamp in the range.
+        end_time : float
+            The newest timestamp in the range. Segments are only computed
+            up to the series' newest sample.
+        generation : object, optional
+            Identifies the current contents of the series, by default None.
+            The periodograms are rebuilt when it changes.
+
+        Returns
+        -------
+        int
+            The number of segments computed.
+        """
+        if times.size == 0:
+            self.reset()
+            return 0
+        end_time = min(end_time, times[-1])
+        span = end_time - start_time
+        if generation != self._generation or not span < 2 * MAX_GRID_POINTS * self.step:
+            self.reset()
+            self._generation = generation
+            self.step = grid_step(times, start_time, end_time)
+            if np.isnan(self.step):
+                return 0
+
+        # Segments are numbered by their first grid point's position from the epoch, divided by the hop
+        first_point, last_point = int(np.ceil(start_time / self.step)), int(np.floor(end_time / self.step))
+        first_segment = -(-first_point // self.hop)
+        end_segment = max((last_point - self.segment + 1) // self.hop + 1, first_segment)
+        if first_segment < self._first_segment or first_segment > self._first_segment + len(self._power):
+            self._power = self._power[:0]
+        else:
+            self._power = self._power[first_segment - self._first_segment : end_segment - self._first_segment]
+        self._first_segment = first_segment
+
+        new_start = first_segment + len(self._power)
+        if new_start >= end_segment:
+            return 0
+        count = (end_segment - new_start - 1) * self.hop + self.segment
+        samples = resample_uniform(times, values, new_start * self.hop * self.step, self.step, count)
+        segments = sliding_window_view(samples, self.segment)[:: self.hop]
+        power = periodograms(np.where(np.isfinite(segments), segments, 0.0), self.step)
+        power[~np.isfinite(segments).all(axis=1)] = np.nan
+        self._power = np.concatenate((self._power, power))
+        return len(power)
+
+    def psd(self) -> tuple[np.ndarray, np.ndarray]:
+        """The Welch power spectral density: the mean of the periodograms of
+        the segments without missing data.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The frequencies in Hz and the density at each, per Hz.
+        """
+        complete = self._power[np.isfinite(self._power[:, 0])]
+        if not len(complete):
+            return np.empty(0), np.empty(0)
+        return self.frequencies, complete.mean(axis=0)
@@ -0,0 +1,297 @@
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from .range_index import DEFAULT_BLOCK_SIZE
+
+# The most values quantiles are estimated from
+QUANTILE_SAMPLES = 10_000
+
+
+class WindowSummary(NamedTuple):
+    """Summary statistics of a range of a series. NaNs are left out, and
+    the statistics of an empty range are NaN.
+
+    Attributes
+    ----------
+    count : int
+        The number of values.
+    mean : float
+        The values' mean.
+    m2 : float
+        The sum of the values' squared deviations from the mean.
+    minimum : float
+        The smallest value.
+    maximum : float
+        The largest value.
+    """
+
+    count: int = 0
+    mean: float = math.nan
+    m2: float = 0.0
+    minimum: float = math.nan
+    maximum: float = math.nan
+
+    @property
+    def std(self) -> float:
+        """The values' population standard deviation."""
+        return math.sqrt(self.m2 / self.count) if self.count else math.nan
+
+    @property
+    def rms(self) -> float:
+        """The values' root mean square."""
+        return math.sqrt(self.mean**2 + self.m2 / self.count) if self.count else math.nan
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "WindowSummary":
+        """Summarize values by scanning them, for data without an index."""
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(values.size, mean, float(((values - mean) ** 2).sum()), float(values.min()), float(values.max()))
+
+    def combine(self, other: "WindowSummary") -> "WindowSummary":
+        """The summary of two ranges together, using Chan's parallel update
+        of the mean and squared deviations.
+        """
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return WindowSummary(
+            count,
+            self.mean + delta * other.count / count,
+            self.m2 + other.m2 + delta**2 * self.count * other.count / count,
+            float(np.fmin(self.minimum, other.minimum)),
+            float(np.fmax(self.maximum, other.maximum)),
+        )
+
+
+class SummaryIndex:
+    """Block summary index over a growing series, so the mean, standard
+    deviation, and RMS of any range of it are found in O(log n) rather than
+    by scanning the range.
+
+    The series is split into fixed-size blocks, each summarized by its
+    count, mean, and squared deviations from its own mean, and a segment
+    tree is kept over the blocks whose nodes are merged as
+    ``WindowSummary.combine`` does. Deviations are always taken from a local
+    mean, so the summaries keep their precision however far the signal's
+    level moves. A range is answered from the tree nodes covering its whole
+    blocks and a scan of the partial blocks at its edges. Samples appended
+    to the series, or dropped from its front, only update the tree's last
+    nodes; any other change to the series must be signaled with a new
+    ``generation``, which rebuilds the index.
+
+    Parameters
+    ----------
+    block_size : int, optional
+        The number of samples summarized by each leaf of the tree, by
+        default DEFAULT_BLOCK_SIZE.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = max(int(block_size), 1)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the index."""
+        self._generation = None
+        self._values = np.empty(0)
+        self._first = 0
+        self._end = 0
+        self._origin = 0
+        # Each level holds [counts, means, squared deviations, count]; level 0 holds the blocks
+        self._levels: list[list] = []
+
+    def update(self, values: np.ndarray, first: int = 0, generation: object = None) -> None:
+        """Bring the index in line with the series.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The series' values. NaNs are left out of the summaries.
+        first : int, optional
+            The position of values[0] in the series, counting samples
+            dropped from its front, by default 0.
+        generation : object, optional
+            Identifies the current contents of the series, by default None.
+            The index is rebuilt when it changes.
+        """
+        end = first + values.size
+        block = self.block_size
+        n_blocks = self._levels[0][3] if self._levels else 0
+        rebuild = (
+            generation != self._generation
+            or first < self._first
+            or end < self._end
+            # The block being appended to has been dropped from the front
+            or self._origin + (self._end - self._origin) // block * block < first
+            # Most of the tree covers samples dropped from the front
+            or (first - self._origin) // block > max(n_blocks // 2, 64)
+        )
+        self._values = values
+        if rebuild:
+            self._generation = generation
+            self._origin = first
+            self._levels = []
+            self._first, self._end = first, first
+        elif end == self._end:
+            self._first = first
+            return
+
+        changed = (self._end - self._origin) // block
+        self._first, self._end = first, end
+        self._update_blocks(changed)
+
+    def _update_blocks(self, changed: int) -> None:
+        """Recompute the blocks from the given one on, and their parents."""
+        block = self.block_size
+        start = self._origin + changed * block - self._first
+        tail = np.asarray(self._values[start:], dtype=float)
+        padded = np.full(-(-tail.size // block) * block, np.nan)
+        padded[: tail.size] = tail
+        padded = padded.reshape(-1, block)
+        finite = np.isfinite(padded)
+        counts = finite.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(finite, padded, 0.0).sum(axis=1) / counts
+        m2s = np.where(finite, padded - means[:, None], 0.0)
+        self._write(0, changed, counts, means, (m2s * m2s).sum(axis=1))
+
+        level = 0
+        while self._levels[level][3] > 1:
+            child_counts, child_means, child_m2s, count = self._levels[level]
+            changed //= 2
+            lo = 2 * changed
+            counts, means, m2s = child_counts[lo:count], child_means[lo:count], child_m2s[lo:count]
+            if counts.size % 2:
+                counts, means, m2s = np.append(counts, 0), np.append(means, np.nan), np.append(m2s, 0.0)
+            self._write(
+                level + 1,
+                changed,
+                *self._merge(counts[0::2], means[0::2], m2s[0::2], counts[1::2], means[1::2], m2s[1::2]),
+            )
+            level += 1
+        del self._levels[level + 1 :]
+
+    @staticmethod
+    def _merge(
+        a_counts: np.ndarray,
+        a_means: np.ndarray,
+        a_m2s: np.ndarray,
+        b_counts: np.ndarray,
+        b_means: np.ndarray,
+        b_m2s: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Merge pairs of summaries elementwise, as ``WindowSummary.combine`` does."""
+        counts = a_counts + b_counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = b_means - a_means
+            means = np.where(
+                b_counts == 0, a_means, np.where(a_counts == 0, b_means, a_means + delta * b_counts / counts)
+            )
+            spread = np.where((a_counts == 0) | (b_counts == 0), 0.0, delta * delta * a_counts * b_counts / counts)
+        return counts, means, a_m2s + b_m2s + spread
+
+    def _write(self, level: int, start: int, counts: np.ndarray, means: np.ndarray, m2s: np.ndarray) -> None:
+        """Write nodes to a level from the given position, growing its
+        storage by doubling so appends stay amortized O(1).
+        """
+        if level == len(self._levels):
+            self._levels.append([np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), 0])
+        node_counts, node_means, node_m2s, _ = self._levels[level]
+        count = start + counts.size
+        if count > node_counts.size:
+            size = max(2 * node_counts.size, count, 16)
+            node_counts = np.concatenate((node_counts[:start], np.empty(size - start, dtype=np.int64)))
+            node_means = np.concatenate((node_means[:start], np.empty(size - start)))
+            node_m2s = np.concatenate((node_m2s[:start], np.empty(size - start)))
+        node_counts[start:count] = counts
+        node_means[start:count] = means
+        node_m2s[start:count] = m2s
+        self._levels[level] = [node_counts, node_means, node_m2s, count]
+
+    def summary(self, start: int = 0, stop: int = None) -> WindowSummary:
+        """The count, mean, and squared deviations of a range of the series
+        last updated. The minimum and maximum are left as NaN.
+
+        Parameters
+        ----------
+        start : int, optional
+            The index into the updated values the range starts at, by default 0.
+        stop : int, optional
+            The index into the updated values the range stops before, by
+            default the end of the values.
+
+        Returns
+        -------
+        WindowSummary
+            The range's summary.
+        """
+        values = self._values
+        start, stop, _ = slice(start, stop).indices(values.size)
+        if start >= stop:
+            return WindowSummary()
+
+        # Whole blocks are read from the tree and the partial blocks at the edges are scanned
+        block = self.block_size
+        offset = self._first - self._origin
+        first_block = -(-(offset + start) // block)
+        last_block = (offset + stop) // block
+        if first_block >= last_block:
+            summary = WindowSummary.from_values(values[start:stop])
+        else:
+            summary = WindowSummary.from_values(values[start : first_block * block - offset]).combine(
+                WindowSummary.from_values(values[last_block * block - offset : stop])
+            )
+            for node_counts, node_means, node_m2s, _ in self._levels:
+                if first_block >= last_block:
+                    break
+                nodes = []
+                if first_block % 2:
+                    nodes.append(first_block)
+                    first_block += 1
+                if last_block % 2:
+                    last_block -= 1
+                    nodes.append(last_block)
+                for node in nodes:
+                    summary = summary.combine(
+                        WindowSummary(int(node_counts[node]), float(node_means[node]), float(node_m2s[node]))
+                    )
+                first_block //= 2
+                last_block //= 2
+        return summary._replace(minimum=math.nan, maximum=math.nan)
+
+
+def sample_quantiles(series: list[np.ndarray], quantiles: tuple[float, ...]) -> list[float]:
+    """Estimate quantiles of several arrays taken together from an evenly
+    strided sample of at most QUANTILE_SAMPLES of their values, so the cost
+    does not grow with the amount of data. Exact for fewer values than that.
+
+    Parameters
+    ----------
+    series : list[np.ndarray]
+        The arrays of values. NaNs are left out.
+    quantiles : tuple[float, ...]
+        The quantiles to estimate, between 0 and 1.
+
+    Returns
+    -------
+    list[float]
+        The estimated quantiles, or NaNs if there are no values.
+    """
+    total = sum(values.size for values in series)
+    if total == 0:
+        return [math.nan] * len(quantiles)
+    step = -(-total // QUANTILE_SAMPLES)
+    sample = np.concatenate([values[::step] for values in series]).astype(float)
+    sample = sample[np.isfinite(sample)]
+    if sample.size == 0:
+        return [math.nan] * len(quantiles)
+    return [float(value) for value in np.quantile(sample, quantiles)]
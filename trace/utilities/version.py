@@ -0,0 +1,106 @@
+"""
+version.py
+
+Trace's version is stamped into ``trace/_version.py`` when it is built or
+deployed, so that startup never forks a shell or reads the git repository:
+
+    python trace/utilities/version.py
+
+Checkouts without a stamp fall back to asking git, but only when the version
+is actually requested (e.g. ``trace --version``), and only once per process.
+"""
+
+import argparse
+import subprocess
+from pathlib import Path
+from functools import lru_cache
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+VERSION_FILE = PROJECT_DIR / "_version.py"
+
+
+def describe_version(timeout: float = 5.0) -> str:
+    """Get the current git tag for the project from git.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        Seconds to wait for git before giving up, by default 5.0.
+
+    Returns
+    -------
+    str
+        The output of `git describe --tags`, or an empty string on failure.
+    """
+    try:
+        git_cmd = subprocess.run(
+            ["git", "describe", "--tags"], cwd=PROJECT_DIR, text=True, capture_output=True, timeout=timeout
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return git_cmd.stdout.strip()
+
+
+@lru_cache(maxsize=1)
+def get_version() -> str:
+    """Get Trace's version, preferring the stamp written at build time.
+
+    Returns
+    -------
+    str
+        The stamped version, else the output of `git describe --tags`, or an
+        empty string if neither is available.
+    """
+    try:
+        from _version import __version__
+
+        return __version__
+    except ImportError:
+        return describe_version()
+
+
+def stamp_version(version: str = None) -> str:
+    """Write the version to ``_version.py`` for get_version to read.
+
+    Parameters
+    ----------
+    version : str, optional
+        The version to stamp, by default the output of `git describe --tags`.
+
+    Returns
+    -------
+    str
+        The stamped version.
+
+    Raises
+    ------
+    ValueError
+        If no version is given and git cannot describe the project.
+    """
+    if version is None:
+        version = describe_version()
+    if not version:
+        raise ValueError("Unable to determine the version to stamp, git describe --tags found no tag")
+    VERSION_FILE.write_text(f"# Generated by utilities/version.py, do not edit\n__version__ = {version!r}\n")
+    get_version.cache_clear()
+    return version
+
+
+class VersionAction(argparse.Action):
+    """Argparse action that prints the program's version and exits. Unlike
+    argparse's "version" action, the version is only looked up if the option
+    is actually given.
+    """
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        if help is None:
+            help = "show program's version number and exit"
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(f"{parser.prog} {get_version()}")
+        parser.exit()
+
+
+if __name__ == "__main__":
+    print(f"Stamped Trace version {stamp_version()!r} in {VERSION_FILE}")
@@ -0,0 +1,141 @@
+import numpy as np
+
+DEFAULT_CAPACITY = 1000
+
+
+class WaveformBuffer:
+    """Preallocated 2D ring buffer of the newest waveforms of an array PV,
+    one row per waveform, for drawing as a waterfall image.
+
+    Every row is written twice, at its slot and at its slot plus the
+    capacity, so the retained rows are always one contiguous block of the
+    storage. ``image`` is a zero-copy view of them, oldest first, that can
+    be handed to an ImageItem as is, and appending a waveform is a single
+    O(width) row write with no reallocation. Rows are stored in single
+    precision, which halves the memory of long histories of wide arrays.
+
+    Waveforms shorter than the buffer's width are padded with NaN. A wider
+    waveform widens the buffer, which reallocates it and increments
+    ``generation``, as do replacing rows and clearing the buffer.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        The number of waveforms retained, by default DEFAULT_CAPACITY.
+    width : int, optional
+        The initial number of elements per waveform, by default 0.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, width: int = 0):
+        self._capacity = max(int(capacity), 1)
+        self._width = max(int(width), 0)
+        self._times = np.zeros(2 * self._capacity)
+        self._rows = np.full((2 * self._capacity, self._width), np.nan, dtype=np.float32)
+        self._next = 0
+        self._count = 0
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """The number of waveforms retained."""
+        return self._capacity
+
+    @property
+    def width(self) -> int:
+        """The number of elements per waveform."""
+        return self._width
+
+    def _start(self) -> int:
+        """The slot of the oldest retained row."""
+        return (self._next - self._count) % self._capacity
+
+    @property
+    def times(self) -> np.ndarray:
+        """A view of the retained waveforms' timestamps, oldest first."""
+        start = self._start()
+        return self._times[start : start + self._count]
+
+    @property
+    def image(self) -> np.ndarray:
+        """A view of the retained waveforms, one per row, oldest first."""
+        start = self._start()
+        return self._rows[start : start + self._count]
+
+    def latest(self) -> np.ndarray | None:
+        """A view of the newest waveform, or None if the buffer is empty."""
+        if not self._count:
+            return None
+        return self._rows[(self._next - 1) % self._capacity]
+
+    def clear(self) -> None:
+        """Remove all waveforms without releasing storage."""
+        self._next = self._count = 0
+        self.generation += 1
+
+    def _widen(self, width: int) -> None:
+        """Reallocate the storage for wider waveforms, keeping the rows."""
+        rows = np.full((2 * self._capacity, width), np.nan, dtype=np.float32)
+        rows[:, : self._width] = self._rows
+        self._rows = rows
+        self._width = width
+        self.generation += 1
+
+    def append(self, timestamp: float, waveform: np.ndarray) -> None:
+        """Add a waveform to the end of the buffer, dropping the oldest if
+        the buffer is full. The timestamp is expected to be no older than
+        the newest waveform already in the buffer.
+
+        Parameters
+        ----------
+        timestamp : float
+            The waveform's timestamp in seconds since the epoch.
+        waveform : np.ndarray
+            The waveform's elements.
+        """
+        waveform = np.ravel(waveform)
+        if waveform.size > self._width:
+            self._widen(waveform.size)
+        slot = self._next
+        for row in (slot, slot + self._capacity):
+            self._times[row] = timestamp
+            self._rows[row, : waveform.size] = waveform
+            self._rows[row, waveform.size :] = np.nan
+        self._next = (slot + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+
+    def insert(self, timestamps: np.ndarray, waveforms: np.ndarray) -> None:
+        """Merge waveforms, such as archived ones, into the buffer by time,
+        keeping the newest ``capacity`` of them. Waveforms already in the
+        buffer replace any inserted at or after the oldest of them.
+
+        Parameters
+        ----------
+        timestamps : np.ndarray
+            The waveforms' sorted timestamps.
+        waveforms : np.ndarray
+            The waveforms, one per row.
+        """
+        waveforms = np.atleast_2d(waveforms)
+        if len(self):
+            keep = timestamps < self.times[0]
+            timestamps, waveforms = timestamps[keep], waveforms[keep]
+        if not timestamps.size:
+            return
+        if waveforms.shape[1] > self._width:
+            self._widen(waveforms.shape[1])
+
+        times = np.concatenate((timestamps, self.times))[-self._capacity :]
+        rows = np.full((times.size, self._width), np.nan, dtype=np.float32)
+        inserted = max(timestamps.size - (timestamps.size + len(self) - times.size), 0)
+        rows[:inserted, : waveforms.shape[1]] = waveforms[timestamps.size - inserted :]
+        rows[inserted:] = self.image[len(self) - (times.size - inserted) :]
+
+        count = times.size
+        self._times[:count] = self._times[self._capacity : self._capacity + count] = times
+        self._rows[:count] = self._rows[self._capacity : self._capacity + count] = rows
+        self._count = count
+        self._next = count % self._capacity
+        self.generation += 1
@@ -1,13 +1,35 @@
-from .archive_search import ArchiveSearchWidget
+from importlib import import_module
+
+from .crosshair_readout import CrosshairReadout
+from .trace_plot import TracePlot, DormantPolicy, TraceCurveItem, curve_series, curve_segments
+from .archive_search import ArchiveSearchWidget, ArchiveSearchCatalog, archive_search_catalog
 from .color_button import ColorButton
 from .frozen_table_view import FrozenTableView
-from .data_insight_tool import DataInsightTool
 from .settings_components import SettingsTitle, SettingsRowItem, ComboBoxWrapper
 from .curve_color_palette_modal import CurveColorPaletteModal
 from .plot_settings import PlotSettingsModal
 from .axis_settings import AxisSettingsModal
 from .curve_settings import CurveSettingsModal
-from .elog_post_modal import ElogPostModal
 from .toggle import ToggleSwitch
 from .formula_dialog import FormulaDialog
 from .control_panel import ControlPanel
+
+# Widgets whose modules import pandas, scipy, epics, or requests, and the
+# analysis tools opened on demand, are only imported when first used,
+# keeping them off the startup path
+_LAZY_EXPORTS = {
+    "DataInsightTool": ".data_insight_tool",
+    "ElogPostModal": ".elog_post_modal",
+    "StatisticsPanel": ".statistics_panel",
+    "CorrelationTool": ".correlation_tool",
+    "SpectralTool": ".spectral_tool",
+    "WaveformViewer": ".waveform_viewer",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,3 +1,4 @@
+import time
 import logging
 from os import getenv
 from typing import Any
@@ -35,6 +36,61 @@ if not logger.hasHandlers():
     handler.setLevel("INFO")
 
 
+class ArchiveSearchCatalog:
+    """Cache of the PV names the archiver returned for each search, shared by
+    every window in the process, so repeating a search in any window does
+    not query the archiver again until the results are ``ttl`` seconds old.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        How long search results are reused, in seconds, by default DEFAULT_TTL_S.
+    """
+
+    DEFAULT_TTL_S = 300.0
+
+    def __init__(self, ttl: float = DEFAULT_TTL_S):
+        self.ttl = ttl
+        self._results: dict[str, tuple[float, list[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def lookup(self, url: str) -> list[str] | None:
+        """The PV names found by a search, or None if it has not been made
+        within the last ``ttl`` seconds.
+
+        Parameters
+        ----------
+        url : str
+            The search's request URL.
+        """
+        entry = self._results.get(url)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return list(entry[1])
+
+    def store(self, url: str, pvs: list[str]) -> None:
+        """Keep the PV names found by a search.
+
+        Parameters
+        ----------
+        url : str
+            The search's request URL.
+        pvs : list[str]
+            The PV names the archiver returned.
+        """
+        self._results[url] = (time.monotonic(), list(pvs))
+
+    def clear(self) -> None:
+        """Forget every search."""
+        self._results.clear()
+
+
+# One catalog is shared by every window in the process
+archive_search_catalog = ArchiveSearchCatalog()
+
+
 class ArchiveResultsTableModel(QAbstractTableModel):
     """This table model holds the results of an archiver appliance PV search. This search is for names matching
     the input search words, and the results are a list of PV names that match that search.
@@ -116,7 +172,8 @@ class ArchiveSearchWidget(QWidget):
 
     This widget provides a search interface for finding PVs by name patterns
     using the archiver appliance. Users can search for PVs and add them to
-    the plot by selecting them from the results table.
+    the plot by selecting them from the results table. Results are kept in
+    the process-wide ArchiveSearchCatalog, which answers repeated searches.
 
     Parameters
     ----------
@@ -244,8 +301,14 @@ class ArchiveSearchWidget(QWidget):
         search_text = search_text.replace("*", ".*")
         search_text = search_text.replace("%", ".*")
         url_string = f"{self.archive_url_textedit.text()}/retrieval/bpl/searchForPVsRegex?regex=.*{search_text}.*"
+        pv_list = archive_search_catalog.lookup(url_string)
+        if pv_list is not None:
+            self.results_table_model.clear()
+            self.results_table_model.replace_rows(pv_list)
+            return
         request = QNetworkRequest(QUrl(url_string))
-        self.network_manager.get(request)
+        reply = self.network_manager.get(request)
+        reply.setProperty("search_url", url_string)
         self.loading_label.show()
 
     def populate_results_list(self, reply: QNetworkReply) -> None:
@@ -261,6 +324,7 @@ class ArchiveSearchWidget(QWidget):
             self.results_table_model.clear()
             bytes_str = reply.readAll()
             pv_list = str(bytes_str, "utf-8").split()
+            archive_search_catalog.store(reply.property("search_url"), pv_list)
             self.results_table_model.replace_rows(pv_list)
         else:
             logger.error(f"Could not retrieve archiver results due to: {reply.error()}")
@@ -5,7 +5,7 @@ from qtpy.QtGui import QColor, QMouseEvent
 from qtpy.QtCore import Qt, Signal
 from qtpy.QtWidgets import QPushButton, QColorDialog
 
-from config import color_palette
+import config
 
 
 class ColorButton(QPushButton):
@@ -108,10 +108,10 @@ class ColorButton(QPushButton):
         palette : str
             Name of selected palette
         """
-        if palette not in color_palette:
+        if palette not in config.color_palette:
             palette = "default"
-        modded_index = index % len(color_palette[palette])
-        color = color_palette[palette][modded_index]
+        modded_index = index % len(config.color_palette[palette])
+        color = config.color_palette[palette][modded_index]
 
-        dark_factor = (index // len(color_palette[palette])) * 35
+        dark_factor = (index // len(config.color_palette[palette])) * 35
         return color.darker(100 + dark_factor)
@@ -19,7 +19,14 @@ from widgets import (
     CurveSettingsModal,
     ArchiveSearchWidget,
 )
-from services import Theme, IconColors, ThemeManager
+from services import (
+    Theme,
+    IconColors,
+    PVMetadata,
+    ThemeManager,
+    pv_metadata,
+    normalize_address,
+)
 from utilities import validate_formula, sanitize_for_validation
 
 PV_KEY_PREFIX = "x"
@@ -49,7 +56,12 @@ class ControlPanel(QtWidgets.QWidget):
         self.setLayout(QtWidgets.QVBoxLayout())
         # self.setStyleSheet("background-color: white;")
 
+        # Indices kept in sync on curve/axis add, move, and delete so lookups
+        # stay constant-time instead of walking the axis and curve layouts
         self._curve_dict = {}
+        self._curve_keys = {}
+        self._curve_items = {}
+        self._axis_items = {}
         self.key_gen = self._generate_curve_key()
         next(self.key_gen)  # Prime the generator
 
@@ -91,12 +103,9 @@ class ControlPanel(QtWidgets.QWidget):
         new_axis_button.clicked.connect(self.add_empty_axis)
         self.layout().addWidget(new_axis_button)
 
-        self.archive_search = ArchiveSearchWidget()
-        self.archive_search.append_PVs_requested.connect(self.add_curves)
-
-        self.formula_dialog = FormulaDialog(self)
-        self.formula_dialog.formula_accepted.connect(self.handle_formula_accepted)
-        self.curve_list_changed.connect(self.formula_dialog.curve_model.refresh)
+        # The PV search and formula windows are created the first time they are opened
+        self._archive_search = None
+        self._formula_dialog = None
 
         self.update_icons()
 
@@ -153,6 +162,23 @@ class ControlPanel(QtWidgets.QWidget):
         """
         self._plot = plot
 
+    @property
+    def archive_search(self) -> ArchiveSearchWidget:
+        """The PV search window, created on first use."""
+        if self._archive_search is None:
+            self._archive_search = ArchiveSearchWidget()
+            self._archive_search.append_PVs_requested.connect(self.add_curves)
+        return self._archive_search
+
+    @property
+    def formula_dialog(self) -> FormulaDialog:
+        """The formula input dialog, created on first use."""
+        if self._formula_dialog is None:
+            self._formula_dialog = FormulaDialog(self)
+            self._formula_dialog.formula_accepted.connect(self.handle_formula_accepted)
+            self.curve_list_changed.connect(self._formula_dialog.curve_model.refresh)
+        return self._formula_dialog
+
     def search_pv(self) -> None:
         """Show or activate the PV search widget."""
         if not self.archive_search.isVisible():
@@ -163,7 +189,7 @@ class ControlPanel(QtWidgets.QWidget):
 
     def show_formula_dialog(self):
         """Show the formula dialog pop-up."""
-        if not hasattr(self, "formula_dialog") or not self.formula_dialog.isVisible():
+        if not self.formula_dialog.isVisible():
             self.formula_dialog.show()
         else:
             self.formula_dialog.raise_()
@@ -179,19 +205,11 @@ class ControlPanel(QtWidgets.QWidget):
             The accepted formula string
         """
         self.add_curve(formula)
-        self.cleanup_duplicate_curves()
 
     def cleanup_duplicate_curves(self) -> None:
-        """Remove duplicate entries in curve dictionary."""
-        seen_curves = {}
-        to_remove = []
-
-        for key, curve in self._curve_dict.items():
-            curve_id = id(curve)
-            if curve_id in seen_curves:
-                to_remove.append(key)
-            else:
-                seen_curves[curve_id] = key
+        """Remove duplicate entries in curve dictionary. Only keys that are no
+        longer the registered key for their curve are removed."""
+        to_remove = [key for key, curve in self._curve_dict.items() if self._curve_keys.get(curve) != key]
 
         for key in to_remove:
             del self._curve_dict[key]
@@ -204,6 +222,54 @@ class ControlPanel(QtWidgets.QWidget):
         """Return dictionary of curves with PV keys."""
         return self._curve_dict
 
+    def register_curve(
+        self, key: str, curve: ArchivePlotCurveItem | FormulaCurveItem, curve_item: "CurveItem" = None
+    ) -> None:
+        """Register a curve under the given variable name. A curve can only be
+        registered under one key at a time, so any previous key for the curve
+        is dropped.
+
+        Parameters
+        ----------
+        key : str
+            The variable name of the curve (e.g. x1, fx1)
+        curve : ArchivePlotCurveItem | FormulaCurveItem
+            The curve to register
+        curve_item : CurveItem, optional
+            The CurveItem widget managing the curve
+        """
+        old_key = self._curve_keys.get(curve)
+        if old_key is not None and old_key != key:
+            self._curve_dict.pop(old_key, None)
+        self._curve_dict[key] = curve
+        self._curve_keys[curve] = key
+        if curve_item is not None:
+            self._curve_items[curve] = curve_item
+
+    def unregister_curve(self, key: str) -> None:
+        """Remove the curve registered under the given variable name, along
+        with its CurveItem entry.
+
+        Parameters
+        ----------
+        key : str
+            The variable name of the curve to remove
+        """
+        curve = self._curve_dict.pop(key, None)
+        if curve is None:
+            return
+        if self._curve_keys.get(curve) == key:
+            del self._curve_keys[curve]
+        self._curve_items.pop(curve, None)
+
+    def curve_key(self, curve: ArchivePlotCurveItem | FormulaCurveItem) -> str | None:
+        """Get the variable name that the given curve is registered under."""
+        return self._curve_keys.get(curve)
+
+    def curve_item_for(self, curve: ArchivePlotCurveItem | FormulaCurveItem) -> "CurveItem":
+        """Get the CurveItem widget that manages the given curve."""
+        return self._curve_items.get(curve)
+
     def _generate_curve_key(self):
         """Generate a unique variable name for a curve, either pv or formula.
 
@@ -255,6 +321,7 @@ class ControlPanel(QtWidgets.QWidget):
         self.match_axis_tick_font(axis)
         axis_item = AxisItem(axis, control_panel=self, theme_manager=self.theme_manager)
         axis_item.curves_list_changed.connect(self.curve_list_changed.emit)
+        self._axis_items[axis_item.name] = axis_item
         self.axis_list.insertWidget(self.axis_list.count() - 1, axis_item)
         logger.debug(f"Added axis {axis.name} to plot")
         self.updateGeometry()
@@ -275,11 +342,27 @@ class ControlPanel(QtWidgets.QWidget):
 
     def get_axis_item(self, axis_name: str) -> "AxisItem":
         """Get an AxisItem by its name."""
-        for index in range(self.axis_list.count()):
-            item = self.axis_list.itemAt(index).widget()
-            if isinstance(item, AxisItem) and item.name == axis_name:
-                return item
-        return None
+        return self._axis_items.get(axis_name)
+
+    def rename_axis_item(self, axis_item: "AxisItem", old_name: str) -> None:
+        """Move the given AxisItem's registry entry from its old name to its
+        current name.
+
+        Parameters
+        ----------
+        axis_item : AxisItem
+            The AxisItem that has been renamed
+        old_name : str
+            The name the AxisItem was previously registered under
+        """
+        if self._axis_items.get(old_name) is axis_item:
+            del self._axis_items[old_name]
+        self._axis_items[axis_item.name] = axis_item
+
+    def remove_axis_item(self, axis_item: "AxisItem") -> None:
+        """Remove the given AxisItem from the axis registry."""
+        if self._axis_items.get(axis_item.name) is axis_item:
+            del self._axis_items[axis_item.name]
 
     def get_last_axis_item(self) -> "AxisItem":
         """Get the last AxisItem in the list."""
@@ -299,10 +382,10 @@ class ControlPanel(QtWidgets.QWidget):
         """
         self.curve_palette = palette_name
         if apply:
-            for index, curve in enumerate(self.curve_item_dict.keys()):
+            for index, (curve, curve_item) in enumerate(self._curve_items.items()):
                 color = ColorButton.index_color(index, palette=self.curve_palette)
                 curve.color = color
-                self.curve_item_dict[curve]["curveItem"].on_color_changed(color)
+                curve_item.on_color_changed(color)
 
     @property
     def curve_item_dict(self):
@@ -310,17 +393,12 @@ class ControlPanel(QtWidgets.QWidget):
         Returns dictionary of curves on plot with associated pvname, axisItem, and curveItem
         """
         plot_curves = {}
-        for i in range(self.axis_list.count() - 1):  # -1 for stretch
-            axis_item = self.axis_list.itemAt(i).widget()
-            if hasattr(axis_item, "layout"):
-                for j in range(axis_item.layout().count()):
-                    widget = axis_item.layout().itemAt(j).widget()
-                    if hasattr(widget, "source"):
-                        curve = widget.source
-                        plot_curves[curve] = {}
-                        plot_curves[curve]["name"] = curve.name()
-                        plot_curves[curve]["axisItem"] = axis_item
-                        plot_curves[curve]["curveItem"] = widget
+        for curve, curve_item in self._curve_items.items():
+            plot_curves[curve] = {
+                "name": curve.name(),
+                "axisItem": curve_item.axis_item,
+                "curveItem": curve_item,
+            }
 
         return plot_curves
 
@@ -708,12 +786,7 @@ class AxisItem(QtWidgets.QWidget):
 
     def handle_curve_deleted(self, curve):
         self.curves_list_changed.emit()
-        curve_key_to_delete = None
-
-        for key, value in self.control_panel.curve_dict.items():
-            if value == curve:
-                curve_key_to_delete = key
-                break
+        curve_key_to_delete = self.control_panel.curve_key(curve)
 
         if curve_key_to_delete:
             dependent_formulas = []
@@ -736,24 +809,11 @@ class AxisItem(QtWidgets.QWidget):
             if dependent_formulas:
                 logger.debug(f"Hidden {len(dependent_formulas)} formulas that depended on {curve_key_to_delete}")
 
-            del self.control_panel.curve_dict[curve_key_to_delete]
+            self.control_panel.unregister_curve(curve_key_to_delete)
 
     def find_curve_item_for_curve(self, target_curve):
         """Find the CurveItem widget that corresponds to a given curve"""
-        for i in range(self.layout().count()):
-            widget = self.layout().itemAt(i).widget()
-            if hasattr(widget, "source") and widget.source == target_curve:
-                return widget
-
-        for i in range(self.control_panel.axis_list.count() - 1):  # -1 for stretch
-            axis_item = self.control_panel.axis_list.itemAt(i).widget()
-            if hasattr(axis_item, "layout"):
-                for j in range(axis_item.layout().count()):
-                    widget = axis_item.layout().itemAt(j).widget()
-                    if hasattr(widget, "source") and widget.source == target_curve:
-                        return widget
-
-        return None
+        return self.control_panel.curve_item_for(target_curve)
 
     @QtCore.Slot()
     def set_min_range(self, value: float = None):
@@ -777,8 +837,10 @@ class AxisItem(QtWidgets.QWidget):
     def set_axis_name(self, name: str = None):
         if name is None and self.sender():
             name = self.sender().text()
+        old_name = self.source.name
         self.source.name = name
         self.source.label_text = name
+        self.control_panel.rename_axis_item(self, old_name)
 
     @QtCore.Slot()
     def show_settings_modal(self):
@@ -792,11 +854,10 @@ class AxisItem(QtWidgets.QWidget):
         if apply:
             for j in range(self.layout().count()):
                 widget = self.layout().itemAt(j).widget()
-                if hasattr(widget, "source"):
-                    curve = widget.source
+                if isinstance(widget, CurveItem):
                     color = ColorButton.index_color(j - 1, palette=palette_name)
-                    curve.color = color
-                    self.find_curve_item_for_curve(curve).on_color_changed(color)
+                    widget.source.color = color
+                    widget.on_color_changed(color)
 
     def dragEnterEvent(self, event: QtGui.QDragEnterEvent):
         if event.possibleActions() & QtCore.Qt.MoveAction:
@@ -860,6 +921,7 @@ class AxisItem(QtWidgets.QWidget):
         # Need to link curve to axis before setting y_axis_name on curve
         self.plot.plotItem.linkDataToAxis(curve_item.source, self.name)
         curve_item.source.y_axis_name = self.name
+        curve_item.axis_item = self
 
         curve_item.curve_deleted.connect(lambda curve: self.handle_curve_deleted(curve))
         curve_item.active_toggle.setCheckState(self.active_toggle.checkState())
@@ -896,6 +958,7 @@ class AxisItem(QtWidgets.QWidget):
             return
 
         self.clear_curves()
+        self.control_panel.remove_axis_item(self)
         self.source.sigYRangeChanged.disconnect(self.handle_range_change)
         self.source.linkedView().sigRangeChangedManually.disconnect(self.disable_auto_range)
         index = self.plot._axes.index(self.source)
@@ -949,24 +1012,30 @@ class CurveItem(QtWidgets.QWidget):
         self.theme_manager.theme_changed.connect(lambda _: self.update_icons())
 
         self.variable_name = self.control_panel.key_gen.send(self.source)
-        self.control_panel.curve_dict[self.variable_name] = self.source
+        self.control_panel.register_curve(self.variable_name, self.source, self)
         if not self.is_formula_curve():
             self.source.unitSignal.connect(lambda unit: self.control_panel.move_curve_to_axis(self, unit))
 
         self.setup_layout()
 
+        if not self.is_formula_curve():
+            pv_metadata.metadata_changed.connect(self.receive_metadata)
+            self.show_metadata(pv_metadata.get(self.source.address) if self.source.address else None)
+
     @property
     def plot(self):
         """Get the PlotWidget that this CurveItem belongs to."""
         return self.control_panel.plot
 
     @property
-    def axis_item(self):
+    def axis_item(self) -> AxisItem:
         """Get the AxisItem that this CurveItem belongs to."""
-        parent = self.parent()
-        while not isinstance(parent, AxisItem):
-            parent = parent.parent()
-        return parent
+        return self._axis_item
+
+    @axis_item.setter
+    def axis_item(self, axis_item: AxisItem) -> None:
+        """Set the AxisItem that this CurveItem belongs to."""
+        self._axis_item = axis_item
 
     def setup_layout(self):
         """Setup the layout and widgets for the CurveItem."""
@@ -1092,6 +1161,22 @@ class CurveItem(QtWidgets.QWidget):
         checked = Qt.CheckState(state) == Qt.Checked
         self.source.setVisible(checked)
 
+    @Slot(str, object)
+    def receive_metadata(self, address: str, metadata: PVMetadata | None) -> None:
+        """Show the curve's PV metadata once it has been read."""
+        if self.is_formula_curve() or not self.source.address:
+            return
+        if address == normalize_address(self.source.address):
+            self.show_metadata(metadata)
+
+    def show_metadata(self, metadata: PVMetadata | None) -> None:
+        """Show the PV's description and units as the line edit's tooltip."""
+        if metadata is None:
+            self.label.setToolTip("")
+            return
+        units = f" [{metadata.units}]" if metadata.units else ""
+        self.label.setToolTip(f"{metadata.description}{units}".strip())
+
     def update_live_icon(self, connected: bool) -> None:
         self.live_connection_status.setVisible(not connected)
 
@@ -1237,7 +1322,7 @@ class CurveItem(QtWidgets.QWidget):
 
         self.plot.removeCurve(self.source)
         self.source.deleteLater()
-        del self.control_panel._curve_dict[self.variable_name]
+        self.control_panel.unregister_curve(self.variable_name)
         self.plot.set_needs_redraw()
 
         self.source = new_formula_curve
@@ -1245,10 +1330,9 @@ class CurveItem(QtWidgets.QWidget):
 
         if not self.variable_name.startswith(FORMULA_KEY_PREFIX):
             self.variable_name = self.control_panel.key_gen.send(new_formula_curve)
-        self.control_panel._curve_dict[self.variable_name] = new_formula_curve
+        self.control_panel.register_curve(self.variable_name, new_formula_curve, self)
 
         self.axis_item.curves_list_changed.emit()
-        self.control_panel.cleanup_duplicate_curves()
 
     @QtCore.Slot()
     def set_curve_pv(self, pv: str = None):
@@ -1260,6 +1344,7 @@ class CurveItem(QtWidgets.QWidget):
             return
 
         self.source.address = pv
+        self.show_metadata(pv_metadata.get(pv) if pv else None)
 
     def close(self) -> bool:
         curve = self.source
@@ -1274,9 +1359,8 @@ class CurveItem(QtWidgets.QWidget):
         except Exception as e:
             logger.warning(f"Error removing curve from plot: {e}")
 
-        del self.control_panel._curve_dict[self.variable_name]
-
         self.curve_deleted.emit(curve)
+        self.control_panel.unregister_curve(self.variable_name)
         self.deleteLater()
 
         return super().close()
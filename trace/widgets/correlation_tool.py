@@ -0,0 +1,144 @@
+import numpy as np
+from pyqtgraph import ImageItem, PlotWidget, ScatterPlotItem, mkBrush, colormap
+from qtpy.QtGui import QHideEvent, QShowEvent
+from qtpy.QtCore import Qt, Slot, QRectF, QTimer
+from qtpy.QtWidgets import QLabel, QWidget, QComboBox, QHBoxLayout, QVBoxLayout
+
+from widgets import curve_segments
+from utilities import CorrelationSeries
+
+
+class CorrelationTool(QWidget):
+    """Window plotting one of the plot's curves against another, time-aligned:
+    at every timestamp of either curve, each curve's newest value at or
+    before it is paired.
+
+    Curves are paired from views of the archive and live data they already
+    hold, and only samples newer than the last pair are joined as live data
+    arrives. Pairs are dropped with the samples the curves drop. Up to
+    SCATTER_LIMIT pairs are drawn as points; beyond that, a 2D histogram of
+    the pairs is drawn as a density image, which costs the same to draw
+    however many pairs there are.
+
+    Parameters
+    ----------
+    plot : TracePlot
+        The plot whose curves are correlated.
+    parent : QWidget, optional
+        The parent widget, by default None.
+    """
+
+    # The most pairs drawn as individual points
+    SCATTER_LIMIT = 10_000
+    REFRESH_MS = 1000
+
+    def __init__(self, plot, parent: QWidget = None):
+        super().__init__(parent)
+        self.setWindowFlag(Qt.Window)
+        self.resize(600, 600)
+        self.setWindowTitle("Correlation Plot")
+        self.plot = plot
+        self.pairs = CorrelationSeries()
+        self._box_curves = []
+
+        layout = QVBoxLayout(self)
+        select_layout = QHBoxLayout()
+        self.x_select_box = QComboBox()
+        self.x_select_box.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.y_select_box = QComboBox()
+        self.y_select_box.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.count_label = QLabel()
+        select_layout.addWidget(QLabel("X:"))
+        select_layout.addWidget(self.x_select_box)
+        select_layout.addWidget(QLabel("Y:"))
+        select_layout.addWidget(self.y_select_box)
+        select_layout.addStretch()
+        select_layout.addWidget(self.count_label)
+        layout.addLayout(select_layout)
+
+        self.plot_widget = PlotWidget(self)
+        self.plot_widget.showGrid(x=True, y=True)
+        self.scatter = ScatterPlotItem(size=4, pen=None, brush=mkBrush(100, 180, 255, 150))
+        self.density = ImageItem()
+        self.density.setColorMap(colormap.get("viridis"))
+        self.plot_widget.addItem(self.density)
+        self.plot_widget.addItem(self.scatter)
+        layout.addWidget(self.plot_widget)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self.REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.x_select_box.currentIndexChanged.connect(self.refresh)
+        self.y_select_box.currentIndexChanged.connect(self.refresh)
+        self.update_curve_boxes()
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+
+    @Slot()
+    def update_curve_boxes(self) -> None:
+        """Populate the X and Y selections with all curves in the plot,
+        keeping each selection if its curve is still plotted.
+        """
+        previous = self.selected_curves()
+        self._box_curves = list(self.plot._curves)
+        names = [curve.name() or getattr(curve, "address", "") for curve in self._box_curves]
+        for box, curve, default in zip((self.x_select_box, self.y_select_box), previous, (0, 1)):
+            box.blockSignals(True)
+            box.clear()
+            box.addItems(names)
+            if curve in self._box_curves:
+                box.setCurrentIndex(self._box_curves.index(curve))
+            else:
+                box.setCurrentIndex(min(default, len(names) - 1))
+            box.blockSignals(False)
+        self.refresh()
+
+    def selected_curves(self) -> tuple:
+        """The curves selected for the X and Y axes, or None where there is none."""
+        curves = []
+        for box in (self.x_select_box, self.y_select_box):
+            index = box.currentIndex()
+            curves.append(self._box_curves[index] if 0 <= index < len(self._box_curves) else None)
+        return tuple(curves)
+
+    @Slot()
+    def refresh(self) -> None:
+        """Pair the selected curves' new samples and redraw, if shown."""
+        if not self.isVisible():
+            return
+        x_curve, y_curve = self.selected_curves()
+        if x_curve is None or y_curve is None:
+            self.pairs.reset()
+        else:
+            x_segments, x_generation = curve_segments(x_curve)
+            y_segments, y_generation = curve_segments(y_curve)
+            generation = (x_curve, x_generation, y_curve, y_generation)
+            self.pairs.update(x_segments, y_segments, generation)
+        self.draw(x_curve, y_curve)
+
+    def draw(self, x_curve, y_curve) -> None:
+        """Draw the pairs as points, or as a density image if there are many."""
+        for axis, curve in (("bottom", x_curve), ("left", y_curve)):
+            name = "" if curve is None else curve.name() or ""
+            self.plot_widget.setLabel(axis, name, units=getattr(curve, "units", None) or None)
+        self.count_label.setText(f"{len(self.pairs)} points")
+
+        if len(self.pairs) <= self.SCATTER_LIMIT:
+            self.density.hide()
+            self.scatter.setData(self.pairs.x, self.pairs.y)
+            self.scatter.show()
+            return
+
+        self.scatter.hide()
+        self.scatter.clear()
+        low_x, high_x, low_y, high_y = self.pairs.extent
+        self.density.setImage(np.log1p(self.pairs.counts), autoLevels=True)
+        self.density.setRect(QRectF(low_x, low_y, high_x - low_x, high_y - low_y))
+        self.density.show()
@@ -0,0 +1,93 @@
+import html
+from datetime import datetime
+
+from pyqtgraph import TextItem, mkPen, mkBrush
+from qtpy.QtCore import Slot, QPointF
+
+from utilities import SeriesCursor
+
+
+class CrosshairReadout(TextItem):
+    """Floating legend that follows the crosshair, listing the time under the
+    cursor and every visible curve's value at that time.
+
+    Curves are read with binary searches of their full archive and live
+    data, rather than of the decimated data drawn, so each mouse move costs
+    O(log n) per curve regardless of how much data is plotted. Curves that
+    cannot read their own values are searched through the data drawn.
+
+    Parameters
+    ----------
+    plot : TracePlot
+        The plot whose crosshair is followed.
+    interpolate : bool, optional
+        Interpolate each curve's value at the cursor's time, rather than
+        showing its nearest sample, by default False.
+    """
+
+    # Distance in pixels between the cursor and the legend's corner
+    OFFSET_PX = 15
+
+    def __init__(self, plot, interpolate: bool = False):
+        super().__init__(anchor=(0, 0), border=mkPen(color="w"), fill=mkBrush(0, 0, 0, 180))
+        self.plot = plot
+        self.interpolate = interpolate
+        self._cursors: dict[object, SeriesCursor] = {}
+        self.setParentItem(plot.plotItem.getViewBox())
+        self.setZValue(1000)
+        self.hide()
+
+    def sample(self, curve, timestamp: float) -> tuple[float, float] | None:
+        """A curve's timestamp and value at a time, or None if it has no data there."""
+        if hasattr(curve, "value_at"):
+            return curve.value_at(timestamp, self.interpolate)
+        times, values = curve.getData()
+        if times is None or values is None:
+            return None
+        cursor = self._cursors.setdefault(curve, SeriesCursor())
+        return cursor.value_at(times, values, timestamp, self.interpolate)
+
+    @Slot(float, float)
+    def update_position(self, scene_x: float, scene_y: float) -> None:
+        """Show the curves' values at the time under the cursor, next to it.
+
+        Parameters
+        ----------
+        scene_x : float
+            The cursor's x coordinate in the scene.
+        scene_y : float
+            The cursor's y coordinate in the scene.
+        """
+        view_box = self.parentItem()
+        scene_pos = QPointF(scene_x, scene_y)
+        timestamp = view_box.mapSceneToView(scene_pos).x()
+        try:
+            time_text = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        except (OverflowError, OSError, ValueError):
+            self.hide()
+            return
+
+        lines = [f"<b>{time_text}</b>"]
+        for curve in self.plot._curves:
+            if not curve.isVisible():
+                continue
+            sample = self.sample(curve, timestamp)
+            value = "&mdash;" if sample is None else self.plot.getFormattedY(sample[1])
+            units = getattr(curve, "units", "")
+            if sample is not None and units:
+                value = f"{value} {html.escape(units)}"
+            name = html.escape(curve.name() or "")
+            lines.append(f'<span style="color: {curve.color.name()}">{name}</span>: {value}')
+        self._cursors = {curve: cursor for curve, cursor in self._cursors.items() if curve in self.plot._curves}
+        self.setHtml("<br>".join(lines))
+
+        # Keep the legend inside the view, flipping it to the cursor's other side at the edges
+        position = view_box.mapFromScene(scene_pos)
+        size = self.boundingRect()
+        x, y = position.x() + self.OFFSET_PX, position.y() + self.OFFSET_PX
+        if x + size.width() > view_box.width():
+            x = position.x() - self.OFFSET_PX - size.width()
+        if y + size.height() > view_box.height():
+            y = position.y() - self.OFFSET_PX - size.height()
+        self.setPos(max(x, 0), max(y, 0))
+        self.show()
@@ -8,7 +8,7 @@ from qtpy.QtWidgets import (
     QVBoxLayout,
 )
 
-from config import color_palette
+import config
 from widgets import SettingsTitle, SettingsRowItem
 
 
@@ -36,7 +36,7 @@ class CurveColorPaletteModal(QWidget):
 
         # combobox for choosing palette
         self.palette_cbox = QComboBox()
-        self.palette_cbox.addItems([key for key in color_palette.keys()])
+        self.palette_cbox.addItems([key for key in config.color_palette.keys()])
         self.palette_cbox.activated.connect(self.set_palette)
 
         palette_row = SettingsRowItem(self, "  Select Palette: ", self.palette_cbox)
@@ -63,7 +63,7 @@ class CurveColorPaletteModal(QWidget):
         palette = self.palette_cbox.currentText()
         self.clear_layout(self.color_preview_layout)
         # Display preview of colors
-        for color in color_palette[palette]:
+        for color in config.color_palette[palette]:
             button = QPushButton()
             button.setStyleSheet(f"background-color: {color.name()}; border-radius: 4px;")
             button.setFixedWidth(30)
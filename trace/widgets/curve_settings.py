@@ -1,6 +1,13 @@
 from qtpy.QtGui import QColor
 from qtpy.QtCore import Qt, Slot, Signal
-from qtpy.QtWidgets import QWidget, QCheckBox, QLineEdit, QVBoxLayout
+from qtpy.QtWidgets import (
+    QWidget,
+    QSpinBox,
+    QCheckBox,
+    QLineEdit,
+    QVBoxLayout,
+    QDoubleSpinBox,
+)
 
 from pydm.widgets.archiver_time_plot import TimePlotCurveItem, PyDMArchiverTimePlot
 
@@ -69,6 +76,31 @@ class CurveSettingsModal(QWidget):
         live_toggle_row = SettingsRowItem(self, "Connect to Live", self.live_toggle)
         main_layout.addLayout(live_toggle_row)
 
+        self.decimation_spinbox = self.deadband_spinbox = None
+        if hasattr(curve, "set_live_filters"):
+            self.decimation_spinbox = QSpinBox(self)
+            self.decimation_spinbox.setRange(1, 10_000)
+            self.decimation_spinbox.setSpecialValueText("Off")
+            self.decimation_spinbox.setPrefix("1 in ")
+            self.decimation_spinbox.setValue(curve.live_filters.decimation)
+            self.decimation_spinbox.setToolTip("Only receive every nth live update, filtered by the IOC when possible")
+            self.decimation_spinbox.valueChanged.connect(lambda n: self.curve.set_live_filters(decimation=n))
+            decimation_row = SettingsRowItem(self, "  Live Decimation", self.decimation_spinbox)
+            main_layout.addLayout(decimation_row)
+
+            self.deadband_spinbox = QDoubleSpinBox(self)
+            self.deadband_spinbox.setRange(0, 1e9)
+            self.deadband_spinbox.setDecimals(4)
+            self.deadband_spinbox.setSpecialValueText("Off")
+            self.deadband_spinbox.setValue(curve.live_filters.deadband)
+            self.deadband_spinbox.setToolTip(
+                "Only receive live updates that change the value by at least this much,\n"
+                "filtered by the IOC when possible"
+            )
+            self.deadband_spinbox.valueChanged.connect(lambda value: self.curve.set_live_filters(deadband=value))
+            deadband_row = SettingsRowItem(self, "  Live Deadband", self.deadband_spinbox)
+            main_layout.addLayout(deadband_row)
+
         self.archive_toggle = QCheckBox("")
         self.archive_toggle.setCheckState(Qt.Checked if self.curve.use_archive_data else Qt.Unchecked)
         self.archive_toggle.stateChanged.connect(self.set_archive_data_connection)
@@ -1,25 +1,21 @@
-import os
 import re
 import json
 import logging
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime
 
-import epics
 import numpy as np
 import pandas as pd
 from scipy.io import savemat
+from qtpy.QtGui import QShowEvent
 from qtpy.QtCore import (
     Qt,
-    QUrl,
     Slot,
     Signal,
     QObject,
-    QThread,
     QModelIndex,
     QAbstractTableModel,
 )
-from qtpy.QtNetwork import QNetworkReply, QNetworkRequest, QNetworkAccessManager
 from qtpy.QtWidgets import (
     QLabel,
     QWidget,
@@ -31,13 +27,15 @@ from qtpy.QtWidgets import (
     QVBoxLayout,
 )
 
+from pydm.utilities import remove_protocol
 from pydm.widgets.archiver_time_plot import (
     TimePlotCurveItem,
     ArchivePlotCurveItem,
     PyDMArchiverTimePlot,
 )
 
-from widgets import FrozenTableView
+from widgets import TraceCurveItem, FrozenTableView
+from services import PVMetadata, ArchiveFetcher, pv_metadata, normalize_address
 
 TZ = datetime.now().astimezone().tzinfo
 SEVERITY_MAP = {0: "NO_ALARM", 1: "MINOR", 2: "MAJOR", 3: "INVALID"}
@@ -52,57 +50,61 @@ if not logger.hasHandlers():
     handler.setLevel("DEBUG")
 
 
-class CAGetThread(QThread):
-    """Thread for making a CA get request to the given address. This is used
-    to get the description of the curve.
-    """
-
-    result_ready = Signal(object)
-
-    def __init__(self, parent: QObject = None, address: str = "") -> None:
-        super().__init__(parent=parent)
-        self.address = address
-        self.stop_flag = False
+def archive_frame(data_dict: list[dict]) -> pd.DataFrame:
+    """Convert an Archiver Appliance JSON reply into rows for the
+    DataVisualizationModel.
 
-    def run(self) -> None:
-        """Get the value for the given address. Interruptable via the
-        stop_flag. Does not attempt to emit the PV Value if interrupted.
-        """
-        pv = epics.PV(self.address)
+    Parameters
+    ----------
+    data_dict : list[dict]
+        The decoded JSON reply.
 
-        if self.stop_flag:
-            return
-
-        try:
-            self.result_ready.emit(pv.value)
-        except epics.ca.ChannelAccessException as e:
-            logger.warning(f"Channel Access error: {e}")
-
-    def stop(self) -> None:
-        """Set the stop flag"""
-        self.stop_flag = True
+    Returns
+    -------
+    pd.DataFrame
+        The reply's points, with their datetime, value, severity, and source.
+    """
+    convert_data = {"Datetime": [], "Value": [], "Severity": []}
+    for point in data_dict[0]["data"]:
+        ts = point["secs"] + (point["nanos"] * 1e-9)
+        convert_data["Datetime"].append(datetime.fromtimestamp(ts))
+        convert_data["Value"].append(point["val"])
+        convert_data["Severity"].append(SEVERITY_MAP[point["severity"]])
+    convert_data["Source"] = ["Archive"] * len(data_dict[0]["data"])
+    return pd.DataFrame(convert_data)
 
 
 class DataVisualizationModel(QAbstractTableModel):
     """Table Model for fetching and storing the data for a given curve on the
     model. Gathers live data directly from the curve, but makes an HTTP request
     to the Archiver Appliance
+
+    Archive requests are sent through an ArchiveFetcher on the model's
+    behalf, so a new request aborts the one in flight and a superseded reply
+    is discarded before it is decoded. Switching curves quickly never shows
+    a previous curve's data.
+
+    Parameters
+    ----------
+    parent : QObject, optional
+        The parent QObject, by default None.
+    archive_fetcher : ArchiveFetcher, optional
+        Sends the model's archive requests, by default a new one.
     """
 
     reply_recieved = Signal()
     description_changed = Signal()
 
-    def __init__(self, parent: QObject = None) -> None:
+    def __init__(self, parent: QObject = None, archive_fetcher: ArchiveFetcher = None) -> None:
         super().__init__(parent)
         self.df = pd.DataFrame(columns=["Datetime", "Value", "Severity", "Source"])
 
         self.address = None
         self.unit = None
         self.description = None
-        self.caget_thread = None
+        self.archive_fetcher = archive_fetcher if archive_fetcher is not None else ArchiveFetcher(self)
 
-        self.network_manager = QNetworkAccessManager()
-        self.network_manager.finished.connect(self.recieve_archive_reply)
+        pv_metadata.metadata_changed.connect(self.receive_metadata)
 
     def rowCount(self, index: QModelIndex = QModelIndex()) -> int:
         """Return the row count of the table"""
@@ -131,8 +133,7 @@ class DataVisualizationModel(QAbstractTableModel):
             return self.df.columns[section]
 
     def set_description(self, description: str) -> None:
-        """Set the description of the curve. This is called when the CAGetThread
-        emits a result_ready signal.
+        """Set the description of the curve.
 
         Parameters
         ----------
@@ -142,6 +143,25 @@ class DataVisualizationModel(QAbstractTableModel):
         self.description = description
         self.description_changed.emit()
 
+    @Slot(str, object)
+    def receive_metadata(self, address: str, metadata: PVMetadata | None) -> None:
+        """Update the description when the metadata of the model's curve is read.
+
+        Parameters
+        ----------
+        address : str
+            The normalized address of the PV whose metadata was read.
+        metadata : PVMetadata | None
+            The PV's metadata, or None if it could not be read.
+        """
+        if not self.address or address != normalize_address(self.address):
+            return
+        if metadata is None:
+            self.set_description("")
+            return
+        self.unit = self.unit or metadata.units
+        self.set_description(metadata.description)
+
     def set_all_data(self, curve_item: TimePlotCurveItem, x_range: list[int] | tuple[int, int]) -> None:
         """Set the model's data for the given curve and the given time range.
         This function determines what kind of data should be saved and prompts
@@ -155,18 +175,18 @@ class DataVisualizationModel(QAbstractTableModel):
         x_range : list[int] | tuple[int, int]
             The time range to collect and store data between
         """
+        self.cancel_archive_request()
         self.address = curve_item.address if curve_item.address else ""
         self.unit = curve_item.units
 
-        # Set the meta data label of the DataInsightTool
-        self.set_description("Loading...")
-
-        # Create a new CAGetThread to get the description of the curve
-        if isinstance(self.caget_thread, CAGetThread) and self.caget_thread.isRunning():
-            self.caget_thread.stop()
-        self.caget_thread = CAGetThread(self, self.address + ".DESC")
-        self.caget_thread.result_ready.connect(self.set_description)
-        self.caget_thread.start()
+        # Set the meta data label of the DataInsightTool from the shared
+        # metadata cache, which reads the description if it is not cached
+        metadata = pv_metadata.get(self.address) if self.address else None
+        if metadata is not None:
+            self.set_description(metadata.description)
+            self.unit = self.unit or metadata.units
+        else:
+            self.set_description("Loading..." if self.address else "")
 
         curve_range = (curve_item.min_x(), curve_item.max_x())
         left_ts = max(x_range[0], curve_range[0])
@@ -198,14 +218,18 @@ class DataVisualizationModel(QAbstractTableModel):
         if data_n == 0:
             return
 
-        data = curve_item.data_buffer[:, -data_n:]
-        indices = np.where((x_range[0] <= data[0]) & (data[0] <= x_range[1]))[0]
+        if isinstance(curve_item, TraceCurveItem):
+            # Read directly from the ring buffer to avoid copying the whole buffer
+            times, values = curve_item.live_buffer.times, curve_item.live_buffer.values
+        else:
+            times, values = curve_item.data_buffer[:, -data_n:]
+        start, end = np.searchsorted(times, x_range[0]), np.searchsorted(times, x_range[1], side="right")
 
         convert_data = {"Datetime": [], "Value": [], "Severity": []}
-        convert_data["Datetime"] = data[0, indices]
-        convert_data["Value"] = data[1, indices]
-        convert_data["Severity"] = ["NaN"] * indices.size
-        convert_data["Source"] = ["Live"] * indices.size
+        convert_data["Datetime"] = times[start:end]
+        convert_data["Value"] = values[start:end]
+        convert_data["Severity"] = ["NaN"] * (end - start)
+        convert_data["Source"] = ["Live"] * (end - start)
 
         live_df = pd.DataFrame(convert_data)
         live_df["Datetime"] = live_df["Datetime"].apply(datetime.fromtimestamp)
@@ -215,10 +239,8 @@ class DataVisualizationModel(QAbstractTableModel):
         self.endResetModel()
 
     def request_archive_data(self, pv_name: str, x_range: list[int] | tuple[int, int]) -> None:
-        """Request data from the Archiver Appliance for the given PV and time range.
-        Only gets raw data, never optimized. Ends early if there is no environment
-        variable PYDM_ARCHIVER_URL, which would contain the url for the Archiver
-        Appliance.
+        """Request raw data from the Archiver Appliance for the given PV and
+        time range, superseding any request still in flight.
 
         Parameters
         ----------
@@ -227,70 +249,44 @@ class DataVisualizationModel(QAbstractTableModel):
         x_range : list[int] | tuple[int, int]
             The time range to collect and store data between
         """
-        # Check the $PYDM_ARCHIVER_URL is populated
-        base_url = os.getenv("PYDM_ARCHIVER_URL")
-        if base_url is None:
-            logger.error(
-                "Environment variable: PYDM_ARCHIVER_URL must be defined to use the archiver plugin, for "
-                "example: http://lcls-archapp.slac.stanford.edu"
-            )
-            return
-
-        # Correctly format the timestamps for the Archiver Appliance
-        from_dt = datetime.fromtimestamp(x_range[0], tz=timezone.utc)
-        from_date_str = from_dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        self.archive_fetcher.fetch(
+            self, remove_protocol(pv_name), x_range[0], x_range[1], "", self.receive_archive_data, decode=archive_frame
+        )
 
-        to_dt = datetime.fromtimestamp(x_range[1], tz=timezone.utc)
-        to_date_str = to_dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    def cancel_archive_request(self) -> bool:
+        """Abort the archive request in flight, if any. Its reply is
+        discarded without being decoded.
 
-        # Construct the request url and make the request
-        url_string = f"{base_url}/retrieval/data/getData.json?pv={pv_name}&from={from_date_str}&to={to_date_str}"
-        request = QNetworkRequest(QUrl(url_string))
-        self.network_manager.get(request)
+        Returns
+        -------
+        bool
+            True if a request was cancelled.
+        """
+        return self.archive_fetcher.cancel(self)
 
-    def recieve_archive_reply(self, reply: QNetworkReply) -> None:
-        """Process the recieved reply to the request made in request_archive_data.
-        Unpack the data and call set_archive_data. Mostly checks if the reply
-        contains an error.
+    def receive_archive_data(self, archive_df: pd.DataFrame | None) -> None:
+        """Add the data received for the request made in request_archive_data
+        to the model.
 
         Parameters
         ----------
-        reply : QNetworkReply
-            Reply to the network request made in request_archive_data
+        archive_df : pd.DataFrame | None
+            The archived rows, or None if the request failed.
         """
         self.reply_recieved.emit()
-        if reply.error() == QNetworkReply.NoError:
-            bytes_str = reply.readAll()
-            try:
-                data_dict = json.loads(str(bytes_str, "utf-8"))
-                self.set_archive_data(data_dict)
-            except json.JSONDecodeError:
-                logger.warning("Data Insight Tool: No data received from archiver")
-        else:
-            logger.debug(
-                f"Request for data from archiver failed, request url: {reply.url()} retrieved header: "
-                f"{reply.header(QNetworkRequest.ContentTypeHeader)} error: {reply.error()}"
-            )
-        reply.deleteLater()
+        if archive_df is None:
+            logger.warning("Data Insight Tool: No data received from archiver")
+            return
+        self.set_archive_data(archive_df)
 
-    def set_archive_data(self, data_dict: dict) -> None:
-        """Set the live data for the given curve in the given time range. Appends
-        rows within the time range to the end of the model's dataframe.
+    def set_archive_data(self, archive_df: pd.DataFrame) -> None:
+        """Add archived rows to the start of the model's dataframe.
 
         Parameters
         ----------
-        data_dict : dict
-            Dictionary containing all data to be added to the model's dataframe
+        archive_df : pd.DataFrame
+            The archived rows, as made by archive_frame
         """
-        convert_data = {"Datetime": [], "Value": [], "Severity": []}
-        for point in data_dict[0]["data"]:
-            ts = point["secs"] + (point["nanos"] * 1e-9)
-            convert_data["Datetime"].append(datetime.fromtimestamp(ts))
-            convert_data["Value"].append(point["val"])
-            convert_data["Severity"].append(SEVERITY_MAP[point["severity"]])
-        convert_data["Source"] = ["Archive"] * len(data_dict[0]["data"])
-        archive_df = pd.DataFrame(convert_data)
-
         if self.df.empty:
             self.beginResetModel()
             self.df = archive_df
@@ -382,8 +378,6 @@ class DataInsightTool(QWidget):
         """Set the plot associated with this widget"""
         self._plot = plot
         self.update_pv_select_box()
-        if self.pv_select_box.count() > 0:
-            self.get_data(0)
 
     def layout_init(self) -> None:
         """Initialize the layout of the Data Insight Tool widget."""
@@ -448,14 +442,31 @@ class DataInsightTool(QWidget):
 
     @Slot()
     def update_pv_select_box(self) -> None:
-        """Populate the pv_select_box with all curves in the plot. This is called
-        when the plot is updated.
+        """Populate the pv_select_box with all curves in the plot, keeping the
+        current selection if its curve is still plotted. This is called when
+        the plot is updated. Data for a newly selected curve is only fetched
+        while the tool is shown.
         """
+        current = self.pv_select_box.currentText()
+        curve_names = [c.address for c in self.plot._curves if isinstance(c, ArchivePlotCurveItem)]
+
         self.pv_select_box.blockSignals(True)
         self.pv_select_box.clear()
-        self.pv_select_box.blockSignals(False)
-        curve_names = [c.address for c in self.plot._curves if isinstance(c, ArchivePlotCurveItem)]
         self.pv_select_box.addItems(curve_names)
+        if current in curve_names:
+            self.pv_select_box.setCurrentIndex(curve_names.index(current))
+        self.pv_select_box.blockSignals(False)
+
+        if self.isVisible() and self.pv_select_box.currentText() != current:
+            self.get_data()
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """Fetch data for the selected curve whenever the tool is shown, as
+        it is not kept up to date while hidden.
+        """
+        super().showEvent(event)
+        if self.pv_select_box.count() > 0:
+            self.get_data()
 
     @Slot()
     def export_data_to_file(self) -> None:
@@ -4,6 +4,7 @@ from pyqtgraph import ViewBox
 from qtpy.QtGui import QFont, QColor
 from qtpy.QtCore import Qt, Slot, Signal, QDateTime
 from qtpy.QtWidgets import (
+    QLabel,
     QSlider,
     QWidget,
     QSpinBox,
@@ -16,34 +17,42 @@ from qtpy.QtWidgets import (
     QDateTimeEdit,
 )
 
-from pydm.widgets import PyDMArchiverTimePlot
-
 from config import logger
-from widgets import ColorButton, SettingsTitle, SettingsRowItem, CurveColorPaletteModal
+from widgets import (
+    TracePlot,
+    ColorButton,
+    DormantPolicy,
+    SettingsTitle,
+    SettingsRowItem,
+    CurveColorPaletteModal,
+)
+from services import EvictionPolicy, live_data_budget
 
 
 class PlotSettingsModal(QWidget):
     """Modal widget for configuring plot settings including title, legend, mouse mode,
-    autoscroll interval, time range, crosshair, appearance, and gridlines.
+    autoscroll interval, refresh rate, time range, crosshair, appearance, gridlines,
+    and live data retention.
 
     This widget provides a comprehensive interface for customizing the appearance
-    and behavior of the PyDMArchiverTimePlot.
+    and behavior of the TracePlot.
     """
 
     auto_scroll_interval_change = Signal(int)
+    render_rate_change = Signal(int)
     grid_alpha_change = Signal(int)
     set_all_y_axis_gridlines = Signal(bool)
     disable_autoscroll = Signal()
     sig_curve_palette_changed = Signal(str, bool)
 
-    def __init__(self, parent: QWidget, plot: PyDMArchiverTimePlot):
+    def __init__(self, parent: QWidget, plot: TracePlot):
         """Initialize the plot settings modal.
 
         Parameters
         ----------
         parent : QWidget
             The parent widget
-        plot : PyDMArchiverTimePlot
+        plot : TracePlot
             The plot widget to configure
         """
         super().__init__(parent)
@@ -84,6 +93,16 @@ class PlotSettingsModal(QWidget):
         as_interval_row = SettingsRowItem(self, "Autoscroll Interval", self.as_interval_spinbox)
         main_layout.addLayout(as_interval_row)
 
+        self.render_rate_spinbox = QSpinBox(self)
+        self.render_rate_spinbox.setMinimum(1)
+        self.render_rate_spinbox.setMaximum(60)
+        self.render_rate_spinbox.setValue(10)
+        self.render_rate_spinbox.setSuffix(" fps")
+        self.render_rate_spinbox.setToolTip("Maximum plot redraws per second, lowered automatically under load")
+        self.render_rate_spinbox.valueChanged.connect(self.render_rate_change.emit)
+        render_rate_row = SettingsRowItem(self, "Max Refresh Rate", self.render_rate_spinbox)
+        main_layout.addLayout(render_rate_row)
+
         self.start_datetime = QDateTimeEdit(self)
         self.start_datetime.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
         self.start_datetime.setCalendarPopup(True)
@@ -103,6 +122,14 @@ class PlotSettingsModal(QWidget):
         crosshair_row = SettingsRowItem(self, "Show Crosshair", self.crosshair_checkbox)
         main_layout.addLayout(crosshair_row)
 
+        self.interpolate_readout_checkbox = QCheckBox(self)
+        self.interpolate_readout_checkbox.setToolTip(
+            "Interpolate each curve's value at the crosshair's time rather than showing the nearest sample"
+        )
+        self.interpolate_readout_checkbox.toggled.connect(self.set_interpolate_readout)
+        interpolate_row = SettingsRowItem(self, "  Interpolate Readout", self.interpolate_readout_checkbox)
+        main_layout.addLayout(interpolate_row)
+
         appearance_label = SettingsTitle(self, "Appearance")
         main_layout.addWidget(appearance_label)
 
@@ -145,6 +172,77 @@ class PlotSettingsModal(QWidget):
         grid_opacity_row = SettingsRowItem(self, "  Gridline Opacity", self.grid_opacity_slider)
         main_layout.addLayout(grid_opacity_row)
 
+        live_data_label = SettingsTitle(self, "Live Data")
+        main_layout.addWidget(live_data_label)
+
+        live_data_store = self.plot.live_data_store
+
+        self.buffer_size_spinbox = QSpinBox(self)
+        self.buffer_size_spinbox.setRange(100, 10_000_000)
+        self.buffer_size_spinbox.setSingleStep(1000)
+        self.buffer_size_spinbox.setValue(live_data_store.capacity)
+        self.buffer_size_spinbox.setSuffix(" pts")
+        self.buffer_size_spinbox.valueChanged.connect(self.plot.setBufferSize)
+        buffer_size_row = SettingsRowItem(self, "  Points per Curve", self.buffer_size_spinbox)
+        main_layout.addLayout(buffer_size_row)
+
+        self.retention_spinbox = QSpinBox(self)
+        self.retention_spinbox.setRange(0, 24 * 7)
+        self.retention_spinbox.setSpecialValueText("Unlimited")
+        self.retention_spinbox.setSuffix(" h")
+        self.retention_spinbox.valueChanged.connect(lambda hours: live_data_store.set_max_age(hours * 3600))
+        retention_row = SettingsRowItem(self, "  Retention Time", self.retention_spinbox)
+        main_layout.addLayout(retention_row)
+
+        self.memory_budget_spinbox = QSpinBox(self)
+        self.memory_budget_spinbox.setRange(16, 64 * 1024)
+        self.memory_budget_spinbox.setValue(live_data_budget.limit // 1024**2)
+        self.memory_budget_spinbox.setSuffix(" MiB")
+        self.memory_budget_spinbox.setToolTip("Memory for the live data of every window's curves")
+        self.memory_budget_spinbox.valueChanged.connect(live_data_budget.set_budget)
+        memory_budget_row = SettingsRowItem(self, "  Memory Budget (All Windows)", self.memory_budget_spinbox)
+        main_layout.addLayout(memory_budget_row)
+
+        self.eviction_combo = QComboBox(self)
+        for policy in EvictionPolicy:
+            self.eviction_combo.addItem(policy.value.title(), policy)
+        self.eviction_combo.setCurrentIndex(self.eviction_combo.findData(live_data_budget.policy))
+        self.eviction_combo.setToolTip("How every window's live data is reduced when over the memory budget")
+        self.eviction_combo.currentIndexChanged.connect(
+            lambda _: live_data_budget.set_policy(self.eviction_combo.currentData())
+        )
+        eviction_row = SettingsRowItem(self, "  When Over Budget (All Windows)", self.eviction_combo)
+        main_layout.addLayout(eviction_row)
+
+        self.dormant_combo = QComboBox(self)
+        for policy in DormantPolicy:
+            self.dormant_combo.addItem(policy.value.title(), policy)
+        self.dormant_combo.setCurrentIndex(self.dormant_combo.findData(self.plot.dormant_policy))
+        self.dormant_combo.setToolTip(
+            "Unsubscribe hidden curves from live data and backfill it from the archiver when shown,\n"
+            "or stay subscribed and keep one sample per second"
+        )
+        self.dormant_combo.currentIndexChanged.connect(
+            lambda _: self.plot.set_dormant_policy(self.dormant_combo.currentData())
+        )
+        dormant_row = SettingsRowItem(self, "  Hidden Curves", self.dormant_combo)
+        main_layout.addLayout(dormant_row)
+
+        self.auto_decimation_checkbox = QCheckBox(self)
+        self.auto_decimation_checkbox.setChecked(self.plot.auto_live_decimation)
+        self.auto_decimation_checkbox.setToolTip(
+            "Decimate live data from PVs that update faster than the plot can show over its time span"
+        )
+        self.auto_decimation_checkbox.toggled.connect(self.plot.set_auto_live_decimation)
+        auto_decimation_row = SettingsRowItem(self, "  Auto Decimation", self.auto_decimation_checkbox)
+        main_layout.addLayout(auto_decimation_row)
+
+        self.memory_usage_label = QLabel(self)
+        live_data_budget.memory_usage_changed.connect(self.set_memory_usage)
+        self.set_memory_usage(live_data_budget.memory_usage)
+        memory_usage_row = SettingsRowItem(self, "  Memory Usage (All Windows)", self.memory_usage_label)
+        main_layout.addLayout(memory_usage_row)
+
         plot_viewbox = self.plot.plotItem.vb
         plot_viewbox.sigXRangeChanged.connect(self.set_axis_datetimes)
         plot_viewbox.sigRangeChangedManually.connect(lambda *_: self.set_axis_datetimes())
@@ -159,6 +257,17 @@ class PlotSettingsModal(QWidget):
         interval *= 1000  # Convert to milliseconds
         return interval
 
+    @Slot(int)
+    def set_memory_usage(self, usage: int) -> None:
+        """Display the memory currently allocated for every window's live data.
+
+        Parameters
+        ----------
+        usage : int
+            The number of bytes allocated
+        """
+        self.memory_usage_label.setText(f"{usage / 1024**2:.1f} MiB")
+
     @property
     def x_grid_visible(self):
         """Check if X-axis gridlines are visible."""
@@ -250,6 +359,17 @@ class PlotSettingsModal(QWidget):
         checked = Qt.CheckState(state) == Qt.Checked
         self.plot.enableCrosshair(checked, 100, 100)
 
+    @Slot(bool)
+    def set_interpolate_readout(self, checked: bool) -> None:
+        """Set whether the crosshair readout interpolates curves' values.
+
+        Parameters
+        ----------
+        checked : bool
+            Whether values are interpolated rather than read from the nearest sample
+        """
+        self.plot.crosshair_readout.interpolate = checked
+
     @Slot(object, object)
     def set_axis_datetimes(self, _: ViewBox = None, time_range: tuple[float, float] = None) -> None:
         """Slot used to update the QDateTimeEdits on the Axis tab. This
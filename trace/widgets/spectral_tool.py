@@ -0,0 +1,279 @@
+import threading
+from queue import Queue
+from typing import NamedTuple
+
+import numpy as np
+from pyqtgraph import ImageItem, PlotWidget, colormap
+from qtpy.QtGui import QHideEvent, QShowEvent
+from qtpy.QtCore import Qt, Slot, QRectF, QTimer, Signal
+from qtpy.QtWidgets import QLabel, QWidget, QComboBox, QHBoxLayout, QVBoxLayout
+
+from config import logger
+from widgets import curve_series
+from utilities import SlidingWelch, grid_step, resample_uniform, amplitude_spectrum
+
+
+class SpectrumJob(NamedTuple):
+    """A request for the spectrum of a curve's data within a time range."""
+
+    curve_key: int
+    times: np.ndarray
+    values: np.ndarray
+    generation: object
+    start_time: float
+    end_time: float
+    mode: str
+    segment: int
+
+
+class Spectrum(NamedTuple):
+    """A computed spectrum. For spectrograms, values holds one row of power
+    per segment, at the given times; otherwise times is empty.
+    """
+
+    mode: str
+    frequencies: np.ndarray
+    values: np.ndarray
+    times: np.ndarray
+    step: float
+
+
+class SpectralTool(QWidget):
+    """Window showing the frequency content of one of the plot's curves over
+    the plot's visible time range: its amplitude spectrum, its Welch power
+    spectral density, or its spectrogram.
+
+    The curve's archive and live data are resampled onto a uniform grid,
+    holding each value until the next sample, and transformed with NumPy's
+    real FFT. Spectra are computed on a worker thread, so the plot stays
+    responsive, and recomputed every REFRESH_MS while the tool is shown. The
+    Welch segments' periodograms are kept between updates, so as the range
+    slides forward with live data only new segments are transformed.
+
+    Parameters
+    ----------
+    plot : TracePlot
+        The plot whose curves are analyzed.
+    parent : QWidget, optional
+        The parent widget, by default None.
+    """
+
+    FFT = "Amplitude Spectrum"
+    PSD = "Power Spectral Density"
+    SPECTROGRAM = "Spectrogram"
+    MODES = (FFT, PSD, SPECTROGRAM)
+    SEGMENTS = (256, 512, 1024, 2048, 4096, 8192)
+    REFRESH_MS = 1000
+
+    _computed = Signal(object)
+
+    def __init__(self, plot, parent: QWidget = None):
+        super().__init__(parent)
+        self.setWindowFlag(Qt.Window)
+        self.resize(700, 500)
+        self.setWindowTitle("Spectral Analysis")
+        self.plot = plot
+        self._box_curves = []
+        self._jobs: Queue[SpectrumJob | None] = None
+        self._thread = None
+        self._busy = False
+        self._pending = False
+
+        layout = QVBoxLayout(self)
+        controls_layout = QHBoxLayout()
+        self.curve_select_box = QComboBox()
+        self.curve_select_box.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.mode_select_box = QComboBox()
+        self.mode_select_box.addItems(self.MODES)
+        self.segment_select_box = QComboBox()
+        self.segment_select_box.addItems([str(segment) for segment in self.SEGMENTS])
+        self.segment_select_box.setCurrentText("1024")
+        self.segment_select_box.setToolTip("Samples per Welch segment")
+        self.status_label = QLabel()
+        controls_layout.addWidget(self.curve_select_box)
+        controls_layout.addWidget(self.mode_select_box)
+        controls_layout.addWidget(QLabel("Segment:"))
+        controls_layout.addWidget(self.segment_select_box)
+        controls_layout.addStretch()
+        controls_layout.addWidget(self.status_label)
+        layout.addLayout(controls_layout)
+
+        self.plot_widget = PlotWidget(self)
+        self.plot_widget.showGrid(x=True, y=True)
+        self.spectrum_curve = self.plot_widget.plot(pen="c")
+        self.spectrogram = ImageItem()
+        self.spectrogram.setColorMap(colormap.get("viridis"))
+        self.plot_widget.addItem(self.spectrogram)
+        layout.addWidget(self.plot_widget)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self.REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._computed.connect(self._receive)
+        self.curve_select_box.currentIndexChanged.connect(self.refresh)
+        self.mode_select_box.currentIndexChanged.connect(self.refresh)
+        self.segment_select_box.currentIndexChanged.connect(self.refresh)
+        self.update_curve_boxes()
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        self.start()
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+        self.stop()
+
+    def start(self) -> None:
+        """Start the worker thread. Called when the tool is shown."""
+        if self._thread is not None:
+            return
+        # Each worker thread has its own queue, so a stopped worker's job is not taken by a new one
+        self._jobs = Queue()
+        self._thread = threading.Thread(target=self._work, args=(self._jobs,), name="SpectralTool", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker thread. A spectrum it is still computing is
+        discarded rather than waited on.
+        """
+        self._busy = self._pending = False
+        if self._thread is None:
+            return
+        self._jobs.put(None)
+        self._jobs = None
+        self._thread = None
+
+    @Slot()
+    def update_curve_boxes(self) -> None:
+        """Populate the curve selection with all curves in the plot, keeping
+        the selection if its curve is still plotted.
+        """
+        previous = self.selected_curve()
+        self._box_curves = list(self.plot._curves)
+        self.curve_select_box.blockSignals(True)
+        self.curve_select_box.clear()
+        self.curve_select_box.addItems([curve.name() or getattr(curve, "address", "") for curve in self._box_curves])
+        if previous in self._box_curves:
+            self.curve_select_box.setCurrentIndex(self._box_curves.index(previous))
+        self.curve_select_box.blockSignals(False)
+        self.refresh()
+
+    def selected_curve(self):
+        """The curve selected for analysis, or None if there is none."""
+        index = self.curve_select_box.currentIndex()
+        return self._box_curves[index] if 0 <= index < len(self._box_curves) else None
+
+    @Slot()
+    def refresh(self) -> None:
+        """Send the selected curve's data in the visible range to the worker
+        thread. If a spectrum is still being computed, it is sent once that
+        one arrives.
+        """
+        if self._thread is None:
+            return
+        if self._busy:
+            self._pending = True
+            return
+        curve = self.selected_curve()
+        if curve is None:
+            self.spectrum_curve.clear()
+            self.spectrogram.hide()
+            return
+        times, values, generation = curve_series(curve)
+        min_x, max_x = self.plot.getXAxis().range
+        mode = self.mode_select_box.currentText()
+        segment = int(self.segment_select_box.currentText())
+        self._busy, self._pending = True, False
+        self._jobs.put(SpectrumJob(id(curve), times, values, generation, min_x, max_x, mode, segment))
+
+    def compute(self, job: SpectrumJob, welch: SlidingWelch) -> Spectrum:
+        """Compute a spectrum. Called on the worker thread.
+
+        Parameters
+        ----------
+        job : SpectrumJob
+            The data and the spectrum to compute.
+        welch : SlidingWelch
+            The periodograms kept for the job's curve and segment length.
+
+        Returns
+        -------
+        Spectrum
+            The computed spectrum.
+        """
+        if job.mode == self.FFT:
+            end_time = min(job.end_time, job.times[-1]) if job.times.size else job.start_time
+            step = grid_step(job.times, job.start_time, end_time)
+            if np.isnan(step):
+                return Spectrum(job.mode, np.empty(0), np.empty(0), np.empty(0), step)
+            samples = resample_uniform(
+                job.times, job.values, job.start_time, step, int((end_time - job.start_time) / step) + 1
+            )
+            return Spectrum(job.mode, *amplitude_spectrum(samples, step), np.empty(0), step)
+
+        welch.update(job.times, job.values, job.start_time, job.end_time, job.generation)
+        if job.mode == self.PSD:
+            return Spectrum(job.mode, *welch.psd(), np.empty(0), welch.step)
+        return Spectrum(job.mode, welch.frequencies, welch.power.copy(), welch.segment_times, welch.step)
+
+    def _work(self, jobs: Queue) -> None:
+        """Compute spectra from the queue on the worker thread until stopped."""
+        welch_key, welch = None, None
+        while (job := jobs.get()) is not None:
+            if (job.curve_key, job.segment) != welch_key:
+                welch_key, welch = (job.curve_key, job.segment), SlidingWelch(job.segment)
+            try:
+                spectrum = self.compute(job, welch)
+            except Exception as e:
+                logger.warning(f"Unable to compute spectrum: {e}")
+                spectrum = Spectrum(job.mode, np.empty(0), np.empty(0), np.empty(0), np.nan)
+            if jobs is not self._jobs:
+                return
+            self._computed.emit(spectrum)
+
+    @Slot(object)
+    def _receive(self, spectrum: Spectrum) -> None:
+        """Draw a spectrum computed by the worker thread, and send the next
+        request if one is waiting.
+        """
+        if not self._busy:
+            return  # Stopped while the spectrum was being computed
+        self._busy = False
+        self.draw(spectrum)
+        if self._pending:
+            self.refresh()
+
+    def draw(self, spectrum: Spectrum) -> None:
+        """Draw a spectrum as a line, or a spectrogram as an image."""
+        rate = f"{1 / spectrum.step:.4g} Hz" if spectrum.step > 0 else "no data"
+        self.status_label.setText(f"Sample rate: {rate}")
+
+        if spectrum.mode != self.SPECTROGRAM:
+            self.spectrogram.hide()
+            self.plot_widget.setLogMode(x=False, y=True)
+            self.plot_widget.setLabel("left", "Amplitude" if spectrum.mode == self.FFT else "Power Density (/Hz)")
+            self.plot_widget.setLabel("bottom", "Frequency", units="Hz")
+            # The DC component is left out, as the mean was removed and it cannot be drawn on a log scale
+            self.spectrum_curve.setData(spectrum.frequencies[1:], spectrum.values[1:])
+            return
+
+        self.spectrum_curve.clear()
+        self.plot_widget.setLogMode(x=False, y=False)
+        self.plot_widget.setLabel("left", "Frequency", units="Hz")
+        self.plot_widget.setLabel("bottom", "Time in Range", units="s")
+        power = spectrum.values
+        if not power.size or not np.isfinite(power).any():
+            self.spectrogram.hide()
+            return
+        with np.errstate(divide="ignore"):
+            image = np.log10(power)
+        finite = np.isfinite(image)
+        image[~finite] = image[finite].min()
+        self.spectrogram.setImage(image, autoLevels=True)
+        width = spectrum.times[1] - spectrum.times[0] if len(spectrum.times) > 1 else spectrum.step
+        start = spectrum.times[0] - width / 2 - self.plot.getXAxis().range[0]
+        self.spectrogram.setRect(QRectF(start, 0, width * len(power), spectrum.frequencies[-1]))
+        self.spectrogram.show()
@@ -0,0 +1,128 @@
+import numpy as np
+from qtpy.QtGui import QColor
+from qtpy.QtCore import Slot, QTimer
+from qtpy.QtWidgets import (
+    QWidget,
+    QHeaderView,
+    QVBoxLayout,
+    QTableWidget,
+    QTableWidgetItem,
+    QAbstractItemView,
+)
+
+from utilities import WindowSummary, sample_quantiles
+
+
+class StatisticsPanel(QWidget):
+    """Table of summary statistics for every curve over the plot's visible
+    time range: count, minimum, maximum, mean, standard deviation, RMS, and
+    percentiles.
+
+    Statistics are read from the data the plot already holds. Curves that
+    keep block summary and min/max indexes answer in O(log n) however much
+    data is visible, and percentiles are estimated from a bounded sample.
+    The table is refreshed, while shown, when the visible range changes and
+    every REFRESH_MS as live data arrives.
+
+    Parameters
+    ----------
+    plot : TracePlot
+        The plot whose curves are summarized.
+    parent : QWidget, optional
+        The parent widget, by default None.
+    """
+
+    # Percentiles shown after the summary statistics
+    PERCENTILES = (5, 50, 95)
+    COLUMNS = ("Curve", "Count", "Min", "Max", "Mean", "Std", "RMS") + tuple(f"P{p}" for p in PERCENTILES)
+    REFRESH_MS = 1000
+    # Changes to the visible range are coalesced for this long
+    RANGE_DELAY_MS = 100
+
+    def __init__(self, plot, parent: QWidget = None):
+        super().__init__(parent)
+        self.plot = plot
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.table = QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(self.table)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self.REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._range_timer = QTimer(self)
+        self._range_timer.setSingleShot(True)
+        self._range_timer.setInterval(self.RANGE_DELAY_MS)
+        self._range_timer.timeout.connect(self.refresh)
+        plot.plotItem.vb.sigXRangeChanged.connect(self.schedule_refresh)
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+        self._range_timer.stop()
+
+    @Slot()
+    def schedule_refresh(self) -> None:
+        """Refresh the table shortly, if it is shown."""
+        if self.isVisible() and not self._range_timer.isActive():
+            self._range_timer.start()
+
+    def curve_statistics(self, curve, min_x: float, max_x: float) -> tuple[WindowSummary, list[float]]:
+        """A curve's summary and percentiles within a time range.
+
+        Parameters
+        ----------
+        curve : BasePlotCurveItem
+            The curve to summarize.
+        min_x : float
+            The oldest timestamp in the range.
+        max_x : float
+            The newest timestamp in the range.
+
+        Returns
+        -------
+        tuple[WindowSummary, list[float]]
+            The curve's summary statistics and its PERCENTILES.
+        """
+        quantiles = tuple(p / 100 for p in self.PERCENTILES)
+        if hasattr(curve, "summary"):
+            return curve.summary(min_x, max_x), sample_quantiles(curve.window_values(min_x, max_x), quantiles)
+
+        # Curves without indexes, such as formulas, are summarized from the data drawn
+        x, y = curve.getData()
+        if x is None or y is None:
+            return WindowSummary(), sample_quantiles([], quantiles)
+        start, stop = np.searchsorted(x, min_x), np.searchsorted(x, max_x, side="right")
+        return WindowSummary.from_values(y[start:stop]), sample_quantiles([y[start:stop]], quantiles)
+
+    @Slot()
+    def refresh(self) -> None:
+        """Recompute every curve's statistics over the visible time range."""
+        if not self.isVisible():
+            return
+        min_x, max_x = self.plot.getXAxis().range
+        curves = list(self.plot._curves)
+        self.table.setRowCount(len(curves))
+        for row, curve in enumerate(curves):
+            summary, percentiles = self.curve_statistics(curve, min_x, max_x)
+            values = (summary.minimum, summary.maximum, summary.mean, summary.std, summary.rms, *percentiles)
+            texts = [curve.name() or "", str(summary.count)]
+            texts += ["" if np.isnan(value) else self.plot.getFormattedY(value) for value in values]
+            for column, text in enumerate(texts):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(text)
+            self.table.item(row, 0).setForeground(QColor(curve.color))
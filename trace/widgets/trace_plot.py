@@ -0,0 +1,1461 @@
+import time
+from enum import Enum
+
+import numpy as np
+from qtpy.QtGui import QPaintEvent
+from qtpy.QtCore import Slot, QTimer, Signal
+
+from pydm.utilities import remove_protocol
+from pydm.widgets.channel import PyDMChannel
+from pydm.widgets.timeplot import PyDMTimePlot
+from pydm.widgets.archiver_time_plot import (
+    MIN_TIME_SPAN,
+    APPROX_SECONDS_300_YEARS,
+    FormulaCurveItem,
+    ArchivePlotCurveItem,
+    PyDMArchiverTimePlot,
+)
+
+from widgets import CrosshairReadout
+from services import (
+    ArchiveCache,
+    LiveDataStore,
+    ArchiveFetcher,
+    ArchivePrefetcher,
+    SharedLiveChannel,
+    metrics,
+    archive_cache,
+    live_channels,
+)
+from utilities import (
+    RingBuffer,
+    M4Decimator,
+    MinMaxIndex,
+    SeriesCursor,
+    SummaryIndex,
+    WindowSummary,
+    ChannelFilters,
+    rate_decimation,
+)
+
+
+def curve_series(curve) -> tuple[np.ndarray, np.ndarray, object]:
+    """A curve's full series and the generation identifying it, for the
+    analysis tools.
+
+    Parameters
+    ----------
+    curve : BasePlotCurveItem
+        The curve to read.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, object]
+        The curve's timestamps, values, and generation.
+    """
+    if isinstance(curve, TraceCurveItem):
+        return curve.series()
+    times, values = curve.getData()
+    if times is None or values is None:
+        return np.empty(0), np.empty(0), None
+    # Curves without a series, such as formulas, are re-evaluated as a whole and analyzed anew
+    return np.asarray(times, dtype=float), np.asarray(values, dtype=float), object()
+
+
+def curve_segments(curve) -> tuple[tuple[tuple[np.ndarray, np.ndarray], ...], object]:
+    """A curve's series as views of its archive and live data where it has
+    them, without copying, and the generation identifying it. The views are
+    only valid until the curve next receives data.
+
+    Parameters
+    ----------
+    curve : BasePlotCurveItem
+        The curve to read.
+
+    Returns
+    -------
+    tuple[tuple[tuple[np.ndarray, np.ndarray], ...], object]
+        The curve's (timestamps, values) segments, oldest first, and its generation.
+    """
+    if isinstance(curve, TraceCurveItem):
+        return curve.series_segments()
+    times, values, generation = curve_series(curve)
+    return ((times, values),), generation
+
+
+class DormantPolicy(Enum):
+    """What hidden curves do with their live data subscription."""
+
+    UNSUBSCRIBE = "unsubscribe"
+    THROTTLE = "throttle"
+
+
+class LiveChannelHandle:
+    """Stands in for a curve's shared live channel among its plot's
+    channels, so connecting and disconnecting the plot follows and releases
+    the shared channel instead of connecting or disconnecting it for every
+    curve that shares it.
+
+    Parameters
+    ----------
+    curve : TraceCurveItem
+        The curve whose shared live channel is handled.
+    """
+
+    def __init__(self, curve: "TraceCurveItem"):
+        self.curve = curve
+
+    @property
+    def address(self) -> str:
+        return self.curve.address
+
+    def connect(self) -> None:
+        self.curve.follow_live_channel()
+
+    def disconnect(self, destroying: bool = False) -> None:
+        self.curve.release_live_channel()
+
+
+class TraceCurveItem(ArchivePlotCurveItem):
+    """ArchivePlotCurveItem that keeps its live data in a RingBuffer, rather
+    than rolling a full-size array on every update.
+
+    Live data comes from a SharedLiveChannel in the process-wide
+    ``live_channels`` registry, so curves showing the same PV, in any
+    window, share one subscription and one buffer. While following every
+    update, ``live_buffer`` is the shared buffer itself; while paused,
+    dormant, or sampling at a fixed rate it is a copy in the curve's own
+    buffer from its LiveDataStore.
+
+    The ``data_buffer`` and ``points_accumulated`` attributes used by PyDM are
+    kept as a compatibility layer over the ring buffer.
+
+    Line curves are decimated to at most four points per horizontal pixel of
+    the viewport before being handed to pyqtgraph, so drawing cost depends on
+    the plot's width rather than the number of samples.
+
+    While a recording is replayed into it, the curve is detached from live
+    data and the archiver by ``set_replaying``.
+
+    Archive data is requested through ``request_archive_data``, which serves
+    requests from an ArchiveCache when it can and stores the replies of
+    requests it cannot. Requests are sent by an ArchiveFetcher, so a new
+    request aborts the curve's previous one and only the latest reply is
+    ever received.
+
+    Hidden curves are dormant: their archive requests are cancelled, and
+    depending on ``dormant_policy`` their live channel is unsubscribed or
+    throttled to one sample per ``DORMANT_SAMPLE_S``. When shown again the
+    curve emits woke, so the plot can request what it missed.
+
+    The live channel can be subscribed through decimation and deadband
+    filters, set by the user in ``live_filters`` or applied automatically by
+    the plot with ``set_auto_decimation``. Channel Access channels are
+    filtered by the IOC, so filtered updates are never sent; other channels
+    are filtered as updates arrive. Curves with different filters follow
+    different shared channels. ``address`` is always the unfiltered
+    address, so archive requests and saved files are unaffected.
+    """
+
+    sample_appended = Signal(float, float)
+    live_channel_changed = Signal()
+    woke = Signal(float)
+
+    # Seconds between samples kept by a dormant curve with a throttled subscription
+    DORMANT_SAMPLE_S = 1.0
+    # Gaps in live data shorter than this are not backfilled from the archiver
+    MIN_BACKFILL_S = 5.0
+
+    def __init__(
+        self,
+        *args,
+        live_data_store: LiveDataStore,
+        archive_cache: ArchiveCache = None,
+        archive_fetcher: ArchiveFetcher = None,
+        replaying: bool = False,
+        **kws,
+    ):
+        """Initialize the curve with a ring buffer from the given store.
+
+        Parameters
+        ----------
+        *args
+            Positional arguments passed on to ArchivePlotCurveItem.
+        live_data_store : LiveDataStore
+            The store that owns this curve's live data buffer.
+        archive_cache : ArchiveCache, optional
+            The cache archive data is read from and stored in, by default none.
+        archive_fetcher : ArchiveFetcher, optional
+            Sends the curve's archive requests, by default PyDM's archiver plugin does.
+        replaying : bool, optional
+            Whether the curve starts detached for a replay, by default False.
+        **kws
+            Keyword arguments passed on to ArchivePlotCurveItem.
+        """
+        # Attributes that must exist before super().__init__() call
+        self.live_data_store = live_data_store
+        self._own_buffer = live_data_store.create_buffer()
+        self.live_buffer: RingBuffer = self._own_buffer
+        self.live_channel: SharedLiveChannel = None
+        self.archive_cache = archive_cache
+        self.archive_fetcher = archive_fetcher
+        self._live_decimator = M4Decimator()
+        self._archive_decimator = M4Decimator()
+        self._archive_index = MinMaxIndex()
+        self._archive_sums = SummaryIndex()
+        self._archive_cursor = SeriesCursor()
+        self._live_cursor = SeriesCursor()
+        self._archive_generation = 0
+        self._archive_request_time = None
+        self._replaying = replaying
+        self._use_archive_after_replay = None
+        self._archive_request = None
+        self._cached_data = None
+        self._cache_delivery = None
+        self.dormant_policy = DormantPolicy.UNSUBSCRIBE
+        self._dormant_since = None
+        self._live_suspended = False
+        self._last_dormant_sample = 0.0
+        self._unfiltered_address = None
+        self.live_filters = ChannelFilters()
+        self._auto_decimation = 1
+        self._updates_seen = 0
+        self._rate_measured_at = time.monotonic()
+
+        super().__init__(*args, **kws)
+        self.archive_data_request_signal.connect(self._mark_archive_request)
+        if replaying:
+            self._use_archive_after_replay, self.use_archive_data = self.use_archive_data, False
+
+        # Cache hits are delivered from the event loop, and can be superseded like replies
+        self._cache_delivery = QTimer(self)
+        self._cache_delivery.setSingleShot(True)
+        self._cache_delivery.timeout.connect(self._deliver_cached_data)
+
+    @property
+    def address(self) -> str | None:
+        """The curve's PV address, without the live channel's filters."""
+        return self._unfiltered_address
+
+    @address.setter
+    def address(self, new_address: str) -> None:
+        """Set the curve's address, cancelling any archive request for the old
+        one. The curve follows the shared live channel for the new address,
+        unless it is dormant and unsubscribed.
+        """
+        if new_address and new_address == self._unfiltered_address:
+            return
+        if self.cancel_archive_request():
+            # Still report the response so the plot is not left waiting on it
+            self.archive_data_received_signal.emit()
+        self._release_live_channel()
+        self._unfiltered_address = new_address or None
+
+        # PyDM subscribes the curve to a channel of its own, which the shared
+        # channel replaces. It is disconnected after the shared channel
+        # connects, so a connection to the same PV is kept open.
+        ArchivePlotCurveItem.address.fset(self, new_address)
+        own_channel, self.channel = self.channel, None
+        self._own_buffer.clear()
+        if not self._live_suspended:
+            self._acquire_live_channel()
+        if own_channel is not None:
+            own_channel.disconnect()
+
+    def channels(self) -> list[PyDMChannel]:
+        """The channels the curve owns. The shared live channel is owned by
+        the registry, so it is left out for PyDM not to disconnect it.
+        """
+        return [self.archive_channel]
+
+    def _acquire_live_channel(self) -> None:
+        """Follow the shared live channel for the curve's PV and filters."""
+        if not self._unfiltered_address or self.live_channel is not None or self._replaying:
+            return
+        channel = live_channels.acquire(self._unfiltered_address, self, self.channel_filters, self.live_data_store)
+        self.live_data_store.add_channel(channel)
+        # A channel no other curve kept subscribed starts empty, so it
+        # continues from the curve's copy of the data it had
+        if not len(channel.buffer) and len(self.live_buffer):
+            channel.buffer.extend(self.live_buffer.times, self.live_buffer.values)
+
+        channel.sample_received.connect(self._receive_sample)
+        channel.connection_state_changed.connect(self.connectionStateChanged)
+        channel.units_changed.connect(self.unitsChanged)
+        channel.severity_changed.connect(self.severityChanged)
+        self.live_channel = channel
+        self.channel = channel.channel
+        self._updates_seen = channel.updates_received
+
+        # The channel's state was announced before the curve followed it
+        if channel.connected:
+            self.connectionStateChanged(True)
+        if channel.units:
+            self.unitsChanged(channel.units)
+        if channel.severity is not None:
+            self.severityChanged(channel.severity)
+        self._update_buffer_sharing()
+        self.live_channel_changed.emit()
+
+    def release_live_channel(self) -> None:
+        """Stop following the shared live channel for good, such as when the
+        curve is removed from its plot.
+        """
+        self._live_suspended = True
+        self._release_live_channel(keep_data=False)
+
+    def follow_live_channel(self) -> None:
+        """Follow the shared live channel again after it was released,
+        unless the curve is dormant and unsubscribed.
+        """
+        self._suspend_live(self.dormant and self.dormant_policy is DormantPolicy.UNSUBSCRIBE)
+
+    def _release_live_channel(self, keep_data: bool = True) -> None:
+        """Stop following the shared live channel, keeping a copy of its data
+        unless told otherwise.
+        """
+        channel, self.live_channel = self.live_channel, None
+        if channel is None:
+            return
+        self.channel = None
+        if keep_data:
+            self._update_buffer_sharing()
+        else:
+            self._own_buffer.clear()
+            self.live_buffer = self._own_buffer
+        try:
+            channel.sample_received.disconnect(self._receive_sample)
+            channel.connection_state_changed.disconnect(self.connectionStateChanged)
+            channel.units_changed.disconnect(self.unitsChanged)
+            channel.severity_changed.disconnect(self.severityChanged)
+        except (RuntimeError, TypeError):
+            # The channel was already deleted, such as when the process is exiting
+            return
+        live_channels.release(channel, self)
+        self.live_channel_changed.emit()
+
+    @property
+    def replaying(self) -> bool:
+        """Whether the curve is detached from live data and the archiver for a replay."""
+        return self._replaying
+
+    def set_replaying(self, replaying: bool) -> None:
+        """Detach the curve from live data and the archiver while a recording
+        is replayed into it, or reattach it once the replay ends. Detaching
+        releases the live channel, cancels archive requests, and stops any
+        new ones; the curve's data is cleared either way, so replayed and
+        live samples are never mixed.
+
+        Parameters
+        ----------
+        replaying : bool
+            Whether a recording is being replayed into the curve.
+        """
+        if replaying == self._replaying:
+            return
+        if replaying:
+            self._use_archive_after_replay, self.use_archive_data = self.use_archive_data, False
+            cancelled = self.cancel_archive_request()
+            if self.archive_fetcher is not None:
+                cancelled = self.archive_fetcher.cancel(self._backfill_owner) or cancelled
+            if cancelled:
+                # Still report the response so the plot is not left waiting on it
+                self.archive_data_received_signal.emit()
+            self._release_live_channel(keep_data=False)
+        else:
+            self.use_archive_data = self._use_archive_after_replay
+        self._replaying = replaying
+
+        self._own_buffer.clear()
+        self.live_buffer = self._own_buffer
+        self._live_decimator = M4Decimator()
+        self.initializeArchiveBuffer()
+        if not (replaying or self._live_suspended):
+            self._acquire_live_channel()
+        self.data_changed.emit()
+
+    def _update_buffer_sharing(self) -> None:
+        """Read the shared channel's buffer while following every update,
+        and a copy of it in the curve's own buffer otherwise, so pausing,
+        throttling, or sampling at a fixed rate does not affect other curves.
+        """
+        follows = (
+            self.live_channel is not None
+            and self._liveData
+            and not self.dormant
+            and self._update_mode == PyDMTimePlot.OnValueChange
+        )
+        buffer = self.live_channel.buffer if follows else self._own_buffer
+        if buffer is self.live_buffer:
+            return
+        if not follows:
+            buffer.clear()
+            buffer.extend(self.live_buffer.times, self.live_buffer.values)
+        self.live_buffer = buffer
+        self._live_decimator = M4Decimator()
+        self.data_changed.emit()
+
+    @property
+    def channel_filters(self) -> ChannelFilters:
+        """The filters the live channel is subscribed through: the user's,
+        decimated further if the plot has applied a larger decimation.
+        """
+        return self.live_filters._replace(decimation=max(self.live_filters.decimation, self._auto_decimation))
+
+    def set_live_filters(self, decimation: int = None, deadband: float = None) -> None:
+        """Set the user's filters for the live channel, resubscribing it if
+        they change the filters applied.
+
+        Parameters
+        ----------
+        decimation : int, optional
+            Keep only every nth update, or 1 for every update, by default unchanged.
+        deadband : float, optional
+            Drop updates that change the value by less than this, or 0 for
+            none, by default unchanged.
+        """
+        if decimation is not None:
+            self.live_filters = self.live_filters._replace(decimation=max(1, int(decimation)))
+        if deadband is not None:
+            self.live_filters = self.live_filters._replace(deadband=max(0.0, float(deadband)))
+        self._apply_channel_filters()
+
+    def set_auto_decimation(self, decimation: int) -> None:
+        """Set the decimation applied by the plot to bring the PV's update
+        rate down to what it can display. The user's decimation is kept if larger.
+
+        Parameters
+        ----------
+        decimation : int
+            Keep only every nth update, or 1 for every update.
+        """
+        decimation = max(1, int(decimation))
+        if decimation == self._auto_decimation:
+            return
+        self._auto_decimation = decimation
+        self._apply_channel_filters()
+
+    def _apply_channel_filters(self) -> None:
+        """Follow the shared live channel for the current filters instead.
+        Unlike setting the address, the live data is kept.
+        """
+        if self.live_channel is None or self.live_channel.filters == self.channel_filters:
+            return
+        self._release_live_channel()
+        self._acquire_live_channel()
+        self._rate_measured_at = time.monotonic()
+        metrics.increment("live.resubscribed", curve=self._unfiltered_address)
+
+    def measure_update_rate(self) -> float:
+        """The PV's updates per second since the curve last measured it,
+        including those the IOC decimated away.
+        """
+        now = time.monotonic()
+        elapsed = now - self._rate_measured_at
+        self._rate_measured_at = now
+        channel = self.live_channel
+        if channel is None or elapsed <= 0:
+            return 0.0
+        count, self._updates_seen = channel.updates_received - self._updates_seen, channel.updates_received
+        decimation = channel.filters.decimation if channel.server_filtered else 1
+        return count * decimation / elapsed
+
+    @property
+    def dormant(self) -> bool:
+        """Whether the curve is hidden, with its archive requests paused and
+        its live data unsubscribed or throttled.
+        """
+        return self._dormant_since is not None
+
+    def setVisible(self, visible: bool) -> None:
+        """Show or hide the curve, making it dormant while it is hidden."""
+        super().setVisible(visible)
+        self.set_dormant(not visible)
+
+    def set_dormant(self, dormant: bool) -> None:
+        """Make the curve dormant, or wake it and emit woke with the time it
+        went dormant.
+
+        Parameters
+        ----------
+        dormant : bool
+            Whether the curve should be dormant.
+        """
+        if dormant == self.dormant:
+            return
+        if not dormant:
+            since, self._dormant_since = self._dormant_since, None
+            self._suspend_live(False)
+            self._update_buffer_sharing()
+            self.woke.emit(since)
+            return
+
+        self._dormant_since = time.time()
+        cancelled = self.cancel_archive_request()
+        if self.archive_fetcher is not None:
+            cancelled = self.archive_fetcher.cancel(self._backfill_owner) or cancelled
+        if cancelled:
+            # Still report the response so the plot is not left waiting on it
+            self.archive_data_received_signal.emit()
+        self._suspend_live(self.dormant_policy is DormantPolicy.UNSUBSCRIBE)
+        self._update_buffer_sharing()
+
+    def set_dormant_policy(self, policy: DormantPolicy) -> None:
+        """Set what the curve does with its live subscription while dormant,
+        applying it immediately if the curve is dormant.
+
+        Parameters
+        ----------
+        policy : DormantPolicy
+            The new policy.
+        """
+        self.dormant_policy = policy
+        if self.dormant:
+            self._suspend_live(policy is DormantPolicy.UNSUBSCRIBE)
+
+    def _suspend_live(self, suspend: bool) -> None:
+        """Stop or start following the curve's shared live channel, which is
+        unsubscribed once no curve follows it.
+        """
+        if suspend == self._live_suspended:
+            return
+        self._live_suspended = suspend
+        if suspend:
+            self._release_live_channel()
+        else:
+            self._acquire_live_channel()
+
+    def to_dict(self) -> dict:
+        """The curve's properties, including the user's live channel filters if set."""
+        dic_ = super().to_dict()
+        if self._replaying:
+            dic_["useArchiveData"] = self._use_archive_after_replay
+        if self.live_filters.decimation > 1:
+            dic_["liveDecimation"] = self.live_filters.decimation
+        if self.live_filters.deadband > 0:
+            dic_["liveDeadband"] = self.live_filters.deadband
+        return dic_
+
+    @property
+    def data_buffer(self) -> np.ndarray:
+        """A (2, N) copy of the live buffer's timestamps and values. Prefer
+        ``live_buffer.times`` and ``live_buffer.values`` to avoid the copy.
+        """
+        return np.vstack((self.live_buffer.times, self.live_buffer.values.astype(float)))
+
+    @data_buffer.setter
+    def data_buffer(self, data: np.ndarray) -> None:
+        self.live_buffer.clear()
+        self.live_buffer.extend(data[0], data[1])
+
+    @property
+    def points_accumulated(self) -> int:
+        """The number of samples in the live buffer."""
+        return len(self.live_buffer)
+
+    @points_accumulated.setter
+    def points_accumulated(self, count: int) -> None:
+        # PyDM treats the last ``count`` columns of data_buffer as valid
+        self.live_buffer.truncate(count)
+
+    @property
+    def liveData(self) -> bool:
+        return self._liveData
+
+    @liveData.setter
+    def liveData(self, get_live: bool) -> None:
+        """Pause or resume live data. A paused curve keeps a copy of the
+        shared live data; once resumed, any gap the shared buffer does not
+        cover is backfilled from the archiver.
+        """
+        self._liveData = bool(get_live)
+        self._update_buffer_sharing()
+        if get_live and len(self.live_buffer):
+            self.backfill_live_data(self.live_buffer.times[-1], time.time())
+
+    def receiveNewValue(self, new_value: float) -> None:
+        """Receive a new value of the curve's PV, as its live channel does.
+        The value is passed to the shared channel, which filters it, appends
+        it to the shared buffer once, and announces it to every curve
+        following the channel.
+
+        Parameters
+        ----------
+        new_value : float
+            The new y-value to append to the live data buffer
+        """
+        if self.live_channel is not None:
+            self.live_channel.receive_value(new_value)
+        else:
+            self._receive_sample(time.time(), new_value)
+
+    @Slot(float, float)
+    def _receive_sample(self, timestamp: float, value: float) -> None:
+        """Take a live sample announced by the shared channel. It is already
+        in the shared buffer, so it is only appended if the curve reads its
+        own buffer. Dormant curves only keep a sample every DORMANT_SAMPLE_S.
+
+        Parameters
+        ----------
+        timestamp : float
+            The sample's timestamp in seconds since the epoch.
+        value : float
+            The sample's value.
+        """
+        if not self._liveData:
+            return
+        if self.dormant:
+            if timestamp - self._last_dormant_sample >= self.DORMANT_SAMPLE_S:
+                self._last_dormant_sample = timestamp
+                self.append_sample(timestamp, value)
+            return
+
+        if self._update_mode == PyDMTimePlot.OnValueChange:
+            if self.live_buffer is self._own_buffer:
+                self.append_sample(timestamp, value)
+            else:
+                self._sample_added(timestamp, value)
+        elif self._update_mode == PyDMTimePlot.AtFixedRate:
+            self.update_min_max_y_values(value)
+            self.latest_value = value
+
+    @Slot()
+    def asyncUpdate(self) -> None:
+        """Append the latest buffered value to the ring buffer when updating at a fixed rate."""
+        if (
+            self._update_mode != PyDMTimePlot.AtFixedRate
+            or self.latest_value is None
+            or self.dormant
+            or self._replaying
+        ):
+            return
+        self.append_sample(time.time(), self.latest_value)
+
+    def append_sample(self, timestamp: float, value: float) -> None:
+        """Append a single sample to the live buffer. This is the entry point
+        for all live data, whether from the curve's channel or a replay.
+
+        Parameters
+        ----------
+        timestamp : float
+            The sample's timestamp in seconds since the epoch.
+        value : float
+            The sample's value.
+        """
+        self.live_buffer.append(timestamp, value)
+        self._sample_added(timestamp, value)
+
+    def _sample_added(self, timestamp: float, value: float) -> None:
+        """Announce a sample added to the live buffer."""
+        metrics.increment("live.samples", curve=self.address)
+        self.update_min_max_y_values(value)
+        self.sample_appended.emit(timestamp, value)
+        self.data_changed.emit()
+
+    def initialize_buffer(self) -> None:
+        """Remove all live data from the live buffer. A shared buffer is
+        left alone if other curves are reading it.
+        """
+        self._update_buffer_sharing()
+        self._own_buffer.clear()
+        if self.live_channel is not None and self.live_channel.consumers == [self]:
+            self.live_channel.buffer.clear()
+
+    def setBufferSize(self, value: int) -> None:
+        """Set the number of live samples the curve's own buffer retains,
+        keeping the newest data. Shared buffers are sized by the live data
+        stores of the curves reading them.
+
+        Parameters
+        ----------
+        value : int
+            The new capacity of the curve's own buffer.
+        """
+        self._bufferSize = int(value)
+        if self._own_buffer.capacity != self._bufferSize:
+            self._own_buffer.resize(self._bufferSize)
+
+    def insert_live_data(self, data: np.ndarray) -> None:
+        """Insert data directly into the live buffer, replacing live samples in
+        the same time range.
+
+        Parameters
+        ----------
+        data : np.ndarray
+           A numpy array of shape (2, length_of_data). Index 0 contains
+           timestamps and index 1 contains the data observations.
+        """
+        self.live_buffer.insert(data[0], data[1])
+
+    def request_archive_data(self, min_x: float, max_x: float, processing_command: str = "") -> bool:
+        """Request archive data for the given time range, from the archive
+        cache if it holds the whole range, otherwise from the archiver.
+        Cached data is delivered from the event loop, like a reply. Any
+        request still in flight is superseded.
+
+        Parameters
+        ----------
+        min_x : float
+            Timestamp of the oldest data to retrieve.
+        max_x : float
+            Timestamp of the newest data to retrieve.
+        processing_command : str, optional
+            Processing for the archiver to apply, by default none.
+
+        Returns
+        -------
+        bool
+            True if a previous request was still in flight and has been superseded.
+        """
+        superseded = self.cancel_archive_request()
+        if self.archive_cache is not None:
+            data = self.archive_cache.lookup(self.address, processing_command, min_x, max_x)
+            if data is not None:
+                metrics.increment("archive.cache_hits")
+                self._cached_data = data
+                self._cache_delivery.start(0)
+                return superseded
+            self._archive_request = (processing_command, min_x, max_x)
+
+        if self.archive_fetcher is None:
+            self.archive_data_request_signal.emit(min_x, max_x, processing_command)
+            return superseded
+        self.archive_fetcher.fetch(
+            self, remove_protocol(self.address), min_x, max_x, processing_command, self._receive_archive_reply
+        )
+        return superseded
+
+    @property
+    def _backfill_owner(self) -> tuple:
+        """The owner of the curve's live backfill requests, which are
+        separate from, and not superseded by, its other archive requests.
+        """
+        return (self, "backfill")
+
+    def backfill_live_data(self, start: float, end: float) -> bool:
+        """Request archived samples for a gap in the live data, such as while
+        live data was paused or the curve was unsubscribed, and merge them
+        into the live buffer.
+
+        Parameters
+        ----------
+        start : float
+            Timestamp of the start of the gap.
+        end : float
+            Timestamp of the end of the gap.
+
+        Returns
+        -------
+        bool
+            True if a request was sent, False if the gap is too short to need one.
+        """
+        # Avoids noisy requests when first rendering the plot
+        if end - start <= self.MIN_BACKFILL_S or not self.address or self._replaying:
+            return False
+        if self.archive_fetcher is None:
+            self.archive_data_request_signal.emit(start, end - 1, "")
+            return True
+        self.archive_fetcher.fetch(
+            self._backfill_owner, remove_protocol(self.address), start, end - 1, "", self._receive_backfill
+        )
+        return True
+
+    def _receive_backfill(self, data: np.ndarray | None) -> None:
+        """Merge the reply to a live backfill request into the live buffer."""
+        self.archiveConnectionStateChanged(data is not None)
+        if data is not None and data.shape[1]:
+            self.insert_live_data(data)
+            self.data_changed.emit()
+        self.archive_data_received_signal.emit()
+
+    def cancel_archive_request(self) -> bool:
+        """Abort the curve's archive request, if one is in flight.
+
+        Returns
+        -------
+        bool
+            True if a request was cancelled.
+        """
+        cancelled = self._cached_data is not None
+        if self._cache_delivery is not None:
+            self._cache_delivery.stop()
+        self._cached_data = None
+        if self.archive_fetcher is not None:
+            cancelled = self.archive_fetcher.cancel(self) or cancelled
+        self._archive_request = None
+        return cancelled
+
+    @Slot()
+    def _deliver_cached_data(self) -> None:
+        """Receive the data of the latest request served from the cache."""
+        data, self._cached_data = self._cached_data, None
+        if data is not None:
+            self._receive_archive_reply(data)
+
+    def _receive_archive_reply(self, data: np.ndarray | None) -> None:
+        """Receive the reply to the curve's latest request, reporting the
+        archive connection's state as PyDM's archiver plugin does.
+
+        Parameters
+        ----------
+        data : np.ndarray | None
+            The data received, or None if the request failed.
+        """
+        self.archiveConnectionStateChanged(data is not None)
+        if data is None or data.shape[1] == 0:
+            self._archive_request = None
+            self._archive_request_time = None
+            # Still report the response so the plot is not left waiting on it
+            self.archive_data_received_signal.emit()
+            return
+        self.receiveArchiveData(data)
+
+    @Slot(float, float, str)
+    def _mark_archive_request(self, *args) -> None:
+        """Note when archive data was last requested, to measure the request's latency."""
+        self._archive_request_time = time.perf_counter()
+
+    @Slot(np.ndarray)
+    def receiveArchiveData(self, data: np.ndarray) -> None:
+        """Receive data from the archiver, dropping any samples that overlap
+        the live buffer before handing it to ArchivePlotCurveItem. The points
+        received and time taken to store them are recorded in the shared
+        metrics. Replies to the ArchiveFetcher's requests have their latency,
+        size, and decode time recorded by it; for requests sent by PyDM's
+        archiver plugin, only the latency is known and recorded here.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Archived data with timestamps at index 0 and values at index 1.
+        """
+        if self._replaying:
+            return
+        if self._archive_request_time is not None:
+            metrics.observe("archive.latency", time.perf_counter() - self._archive_request_time)
+            self._archive_request_time = None
+        metrics.increment("archive.points", data.shape[1], curve=self.address)
+
+        with metrics.timer("archive.ingest"):
+            self._store_archive_data(data)
+
+    def _store_archive_data(self, data: np.ndarray) -> None:
+        """Store data received from the archiver, see receiveArchiveData."""
+        last_ts = self.archive_data_buffer[0][-1]
+        is_live_backfill = self.archive_data_buffer.any() and (int(last_ts) <= data[0][0])
+        if self._archive_request is not None and not is_live_backfill:
+            self.archive_cache.store(self.address, *self._archive_request, data)
+            self._archive_request = None
+        if len(self.live_buffer) and not is_live_backfill:
+            end = np.searchsorted(data[0], self.live_buffer.times[0], side="right")
+            data = data[:, :end]
+        if data.shape[1] == 0:
+            # Still report the response so the plot is not left waiting on it
+            self.archive_data_received_signal.emit()
+            return
+        super().receiveArchiveData(data)
+        if is_live_backfill:
+            # ArchivePlotCurveItem does not report responses it backfills into
+            # the live buffer, which leaves the plot waiting on them
+            self.archive_data_received_signal.emit()
+        else:
+            self._archive_generation += 1
+
+    def insert_archive_data(self, data: np.ndarray) -> None:
+        """Insert data into the archive buffer, invalidating its decimation cache."""
+        super().insert_archive_data(data)
+        self._archive_generation += 1
+
+    def initializeArchiveBuffer(self) -> None:
+        """Clear the archive buffer, invalidating its decimation cache."""
+        super().initializeArchiveBuffer()
+        self._archive_generation += 1
+
+    @Slot()
+    def redrawCurve(self, min_x: float = None, max_x: float = None) -> None:
+        """Redraw the curve from the archive buffer and the live ring buffer.
+        Skips rendering if the curve is not visible.
+
+        Parameters
+        ----------
+        min_x : float, optional
+            The minimum timestamp currently visible on the plot.
+        max_x : float, optional
+            The maximum timestamp currently visible on the plot.
+        """
+        if not self.isVisible():
+            return
+
+        archive_start = self.archive_data_buffer.shape[1] - self.archive_points_accumulated
+        archive_x, archive_y = self.archive_data_buffer[:2, archive_start:]
+        live_x, live_y = self.live_buffer.times, self.live_buffer.values
+
+        view_box = self.getViewBox()
+        width = view_box.width() if view_box is not None else 0
+        if self.plot_style != "Bar" and min_x is not None and width > 0:
+            x_range = (min_x, max_x)
+            archive_x, archive_y = self._archive_decimator.decimate(
+                archive_x, archive_y, x_range, width, self._archive_generation
+            )
+            live_x, live_y = self._live_decimator.decimate(live_x, live_y, x_range, width, self.live_buffer.generation)
+
+        # Concatenating also copies the live data, as pyqtgraph keeps a
+        # reference to the arrays it is given
+        x = np.concatenate((archive_x, live_x))
+        y = np.concatenate((archive_y, live_y))
+
+        try:
+            if self.plot_style == "Bar":
+                min_index = np.searchsorted(x, min_x)
+                max_index = np.searchsorted(x, max_x) + 1
+                self._setBarGraphItem(x=x[min_index:max_index], y=y[min_index:max_index])
+            else:
+                self.setData(x=x, y=y)
+        except (ZeroDivisionError, OverflowError, TypeError):
+            # Solve an issue with pyqtgraph and initial downsampling
+            pass
+
+        if self._show_extension_line:
+            self.set_extension_line_data()
+
+    def _archive_series(self) -> tuple[np.ndarray, np.ndarray, tuple]:
+        """Views of the archive data received, and the generation
+        identifying it for the indexes built over it.
+        """
+        archive_start = self.archive_data_buffer.shape[1] - self.archive_points_accumulated
+        archive_x, archive_y = self.archive_data_buffer[:2, archive_start:]
+        return archive_x, archive_y, (self._archive_generation, archive_start, archive_y.size)
+
+    def dataBounds(
+        self, ax: int, frac: float = 1.0, orthoRange: tuple[float, float] = None
+    ) -> tuple[float, float] | tuple[None, None]:
+        """The range of the curve's data along an axis, as used to auto-range
+        the plot. The y range of the data within the visible time range, or
+        the given range, is read from min/max indexes of the archive and live
+        data rather than by scanning every visible sample.
+
+        Parameters
+        ----------
+        ax : int
+            0 for the x axis, 1 for the y axis.
+        frac : float, optional
+            The fraction of the data's range to return, by default all of it.
+        orthoRange : tuple[float, float], optional
+            The time range to measure the data in, by default the visible one.
+
+        Returns
+        -------
+        tuple[float, float] | tuple[None, None]
+            The minimum and maximum, or Nones if there is no data in the range.
+        """
+        view_box = self.getViewBox()
+        if ax != 1 or frac < 1.0 or self.plot_style == "Bar" or view_box is None:
+            return super().dataBounds(ax, frac, orthoRange)
+
+        min_x, max_x = orthoRange or view_box.viewRange()[0]
+        archive_x, archive_y, generation = self._archive_series()
+        start, stop = np.searchsorted(archive_x, min_x), np.searchsorted(archive_x, max_x, side="right")
+        self._archive_index.update(archive_y, generation=generation)
+        archive_min, archive_max = self._archive_index.extremes(int(start), int(stop))
+        live_min, live_max = self.live_buffer.value_range(min_x, max_x)
+
+        low, high = np.fmin(archive_min, live_min), np.fmax(archive_max, live_max)
+        if np.isnan(low):
+            return None, None
+        return float(low), float(high)
+
+    def value_at(self, timestamp: float, interpolate: bool = False) -> tuple[float, float] | None:
+        """The curve's value at a time, read from its archive and live data
+        with a binary search, as shown by the crosshair readout.
+
+        Parameters
+        ----------
+        timestamp : float
+            The time to read the curve at.
+        interpolate : bool, optional
+            Interpolate between the samples on either side of the time,
+            rather than taking the nearest sample, by default False.
+
+        Returns
+        -------
+        tuple[float, float] | None
+            The timestamp and value read, or None if the curve has no data
+            around the time.
+        """
+        live_x = self.live_buffer.times
+        if live_x.size and timestamp >= live_x[0]:
+            return self._live_cursor.value_at(live_x, self.live_buffer.values, timestamp, interpolate)
+
+        archive_x, archive_y, _ = self._archive_series()
+        sample = self._archive_cursor.value_at(archive_x, archive_y, timestamp, interpolate)
+        if sample is None and archive_x.size and live_x.size and archive_x[-1] < timestamp:
+            # Between the archive and live data, where the nearest sample is either's end
+            if live_x[0] - timestamp < timestamp - archive_x[-1]:
+                return float(live_x[0]), float(self.live_buffer.values[0])
+            return float(archive_x[-1]), float(archive_y[-1])
+        return sample
+
+    def summary(self, min_x: float, max_x: float) -> WindowSummary:
+        """Summary statistics of the curve's archive and live data within a
+        time range, read from block summary and min/max indexes of the data
+        rather than by scanning it.
+
+        Parameters
+        ----------
+        min_x : float
+            The oldest timestamp in the range.
+        max_x : float
+            The newest timestamp in the range.
+
+        Returns
+        -------
+        WindowSummary
+            The data's count, mean, squared deviations, minimum, and maximum.
+        """
+        archive_x, archive_y, generation = self._archive_series()
+        start, stop = np.searchsorted(archive_x, min_x), np.searchsorted(archive_x, max_x, side="right")
+        self._archive_index.update(archive_y, generation=generation)
+        self._archive_sums.update(archive_y, generation=generation)
+        minimum, maximum = self._archive_index.extremes(int(start), int(stop))
+        archive = self._archive_sums.summary(int(start), int(stop))._replace(minimum=minimum, maximum=maximum)
+        return archive.combine(self.live_buffer.summary(min_x, max_x))
+
+    def window_values(self, min_x: float, max_x: float) -> list[np.ndarray]:
+        """Views of the curve's archive and live values within a time range."""
+        archive_x, archive_y, _ = self._archive_series()
+        start, stop = np.searchsorted(archive_x, min_x), np.searchsorted(archive_x, max_x, side="right")
+        live_start, live_stop = self.live_buffer.window(min_x, max_x)
+        return [archive_y[start:stop], self.live_buffer.values[live_start:live_stop]]
+
+    def series_segments(self) -> tuple[tuple[tuple[np.ndarray, np.ndarray], ...], tuple]:
+        """Views of the curve's archive data and of its live data, oldest
+        first, and the generation identifying them. Archive samples at or
+        after the oldest live sample are left out.
+        """
+        archive_x, archive_y, generation = self._archive_series()
+        live_times, live_values = self.live_buffer.times, self.live_buffer.values
+        if live_times.size:
+            stop = np.searchsorted(archive_x, live_times[0])
+            archive_x, archive_y = archive_x[:stop], archive_y[:stop]
+        return ((archive_x, archive_y), (live_times, live_values)), (generation, self.live_buffer.generation)
+
+    def series(self) -> tuple[np.ndarray, np.ndarray, tuple]:
+        """The curve's archive data followed by its live data as one series,
+        copied, and the generation identifying it.
+        """
+        segments, generation = self.series_segments()
+        times = np.concatenate([times for times, _ in segments])
+        values = np.concatenate([values for _, values in segments])
+        return times, values, generation
+
+    def set_extension_line_data(self) -> None:
+        """Draw a dotted line extending from the latest live or archived point."""
+        if self._liveData and len(self.live_buffer):
+            self.extend_line_from(self.live_buffer.times[-1], self.live_buffer.values[-1])
+        elif not self._liveData and self.archive_points_accumulated:
+            self.extend_line_from(*self.archive_data_buffer[:, -1])
+
+    def extend_line_from(self, x: float, y: float) -> None:
+        """Set the extension line to run horizontally from the given point.
+
+        Parameters
+        ----------
+        x : float
+            The timestamp the line starts at.
+        y : float
+            The value the line is drawn at.
+        """
+        x_line = np.array([x, x + APPROX_SECONDS_300_YEARS])
+        y_line = np.array([y, y], dtype=float)
+        self._extension_line.setData(x=x_line, y=y_line)
+
+    def min_x(self) -> float:
+        """The oldest timestamp in the live buffer."""
+        return self.live_buffer.times[0] if len(self.live_buffer) else time.time()
+
+    def max_x(self) -> float:
+        """The newest timestamp in the live buffer."""
+        return self.live_buffer.times[-1] if len(self.live_buffer) else time.time()
+
+
+class TraceFormulaCurveItem(FormulaCurveItem):
+    """FormulaCurveItem that records the time taken by each evaluation of its
+    formula in the shared metrics.
+    """
+
+    def evaluate(self) -> None:
+        """Evaluate the formula over its input curves' data."""
+        with metrics.timer("formula.evaluate"):
+            super().evaluate()
+
+
+class TracePlot(PyDMArchiverTimePlot):
+    """PyDMArchiverTimePlot whose curves store live data in ring buffers
+    managed by the process-wide LiveDataStore, and are decimated to the
+    viewport when drawn.
+
+    Archive data is cached in the process-wide ArchiveCache, shared with
+    every other window, and the windows next to the visible time range are
+    prefetched into the cache by an ArchivePrefetcher. Curves'
+    requests are sent by the plot's ArchiveFetcher, which aborts requests
+    superseded by a newer one for the same curve, so the plot always
+    requests the range it is showing rather than waiting on stale replies.
+
+    Hidden curves are dormant and skipped by archive requests. When one is
+    shown again, the plot only requests what it missed: the visible range if
+    it was requested while the curve was hidden, and the gap in its live
+    data if its live channel was unsubscribed.
+
+    Every RATE_CHECK_MS the plot measures each curve's live update rate, and
+    with ``auto_live_decimation`` decimates the live channels of PVs that
+    update faster than the plot has pixels for over its time span.
+
+    Curves share their live channels with every other curve showing the
+    same PV, on this plot or another window's. Removing or clearing curves
+    releases their channels, as does closing the plot's window.
+
+    With the crosshair enabled, a CrosshairReadout follows the cursor and
+    lists every visible curve's value at the time under it.
+    """
+
+    curve_added = Signal(object)
+
+    RATE_CHECK_MS = 5000
+
+    def __init__(self, *args, store: LiveDataStore = None, **kwargs):
+        """Initialize the plot.
+
+        Parameters
+        ----------
+        *args
+            Positional arguments passed on to PyDMArchiverTimePlot.
+        store : LiveDataStore, optional
+            The store for curves' live data, by default a new store for this
+            plot, counted toward the budget shared by every window.
+        **kwargs
+            Keyword arguments passed on to PyDMArchiverTimePlot.
+        """
+        self.archive_cache = archive_cache
+        self.archive_fetcher = ArchiveFetcher()
+        self.dormant_policy = DormantPolicy.UNSUBSCRIBE
+        self.replaying = False
+        self._archive_requested_at = 0.0
+        self.auto_live_decimation = True
+        super().__init__(*args, **kwargs)
+        self.archive_fetcher.setParent(self)
+        self.live_data_store = store or LiveDataStore(parent=self)
+        self.archive_prefetcher = ArchivePrefetcher(self, self.archive_cache, self.archive_fetcher, parent=self)
+        self.crosshair_readout = CrosshairReadout(self)
+
+        # Curves are decimated to the visible range, so redraw them when it changes
+        self.plotItem.vb.sigXRangeChanged.connect(self.set_needs_redraw)
+
+        self._rate_check_timer = QTimer(self)
+        self._rate_check_timer.setInterval(self.RATE_CHECK_MS)
+        self._rate_check_timer.timeout.connect(self.update_live_decimation)
+        self._rate_check_timer.start()
+
+    def addYChannel(self, *args, liveDecimation: int = 1, liveDeadband: float = 0.0, **kwargs) -> TraceCurveItem:
+        """Add a curve to the plot and announce it with curve_added. The
+        curve's live channel is subscribed through the given filters.
+        """
+        curve = super().addYChannel(*args, **kwargs)
+        if isinstance(curve, TraceCurveItem):
+            curve.set_live_filters(liveDecimation, liveDeadband)
+        self.curve_added.emit(curve)
+        return curve
+
+    def enableCrosshair(self, is_enabled: bool, starting_x_pos: float, starting_y_pos: float, *args, **kwargs) -> None:
+        """Enable or disable the crosshair. The crosshair readout replaces
+        PyDM's per-curve labels, which search only the data drawn.
+        """
+        super().enableCrosshair(is_enabled, starting_x_pos, starting_y_pos, *args, **kwargs)
+        try:
+            self.crosshair_position_updated.disconnect(self.updateLabel)
+        except (RuntimeError, TypeError):
+            pass
+        try:
+            self.crosshair_position_updated.disconnect(self.crosshair_readout.update_position)
+        except (RuntimeError, TypeError):
+            pass
+        if is_enabled:
+            self.crosshair_position_updated.connect(self.crosshair_readout.update_position)
+        else:
+            self.crosshair_readout.hide()
+
+    def createCurveItem(self, *args, **kwargs) -> TraceCurveItem:
+        """Create and return a curve item with a ring buffer for live data"""
+        curve_item = TraceCurveItem(
+            *args,
+            live_data_store=self.live_data_store,
+            archive_cache=self.archive_cache,
+            archive_fetcher=self.archive_fetcher,
+            replaying=self.replaying,
+            **kwargs,
+        )
+        curve_item.set_dormant_policy(self.dormant_policy)
+        curve_item.woke.connect(lambda since: self.wake_curve(curve_item, since))
+        curve_item.archive_data_received_signal.connect(self.archive_data_received)
+        curve_item.prompt_archive_request.connect(self.requestDataFromArchiver)
+        return curve_item
+
+    def removeCurve(self, plot_item: ArchivePlotCurveItem) -> None:
+        """Remove a curve from the plot, releasing its shared live channel."""
+        if isinstance(plot_item, TraceCurveItem):
+            plot_item.release_live_channel()
+        super().removeCurve(plot_item)
+
+    def clearCurves(self) -> None:
+        """Remove all curves from the plot, releasing their shared live channels."""
+        self.release_live_channels()
+        super().clearCurves()
+
+    def set_replaying(self, replaying: bool) -> None:
+        """Detach every curve from live data and the archiver while a
+        recording is replayed into them, or reattach them and request their
+        archive data once the replay ends. Curves added while replaying start
+        detached.
+
+        Parameters
+        ----------
+        replaying : bool
+            Whether a recording is being replayed into the plot.
+        """
+        if replaying == self.replaying:
+            return
+        self.replaying = replaying
+        if replaying:
+            self.archive_prefetcher.cancel()
+        for curve in self._curves:
+            if isinstance(curve, TraceCurveItem):
+                curve.set_replaying(replaying)
+        if not replaying:
+            self.requestDataFromArchiver()
+
+    def release_live_channels(self) -> None:
+        """Release the shared live channels of every curve on the plot."""
+        for curve in self._curves:
+            if isinstance(curve, TraceCurveItem):
+                curve.release_live_channel()
+
+    def channels(self) -> list[PyDMChannel | LiveChannelHandle]:
+        """The live channels of the plot's curves. Shared live channels are
+        owned by the registry rather than the plot, so they are stood in for
+        by handles that release and follow them when PyDM disconnects and
+        connects the plot, such as when its window closes.
+        """
+        return [
+            LiveChannelHandle(curve) if isinstance(curve, TraceCurveItem) else curve.channel for curve in self._curves
+        ]
+
+    def addFormulaChannel(self, yAxisName: str, **kwargs) -> TraceFormulaCurveItem:
+        """Create a formula curve whose evaluations are timed, and link it to the given y axis"""
+        formula_curve = TraceFormulaCurveItem(yAxisName=yAxisName, **kwargs)
+
+        self._curves.append(formula_curve)
+        self.plotItem.linkDataToAxis(formula_curve, yAxisName)
+
+        return formula_curve
+
+    def archive_processing_command(self, curve: ArchivePlotCurveItem, requested_seconds: float) -> str:
+        """The processing command to request a curve's archive data over the
+        given number of seconds with. Spans too long for raw data are
+        requested as optimized data.
+
+        Parameters
+        ----------
+        curve : ArchivePlotCurveItem
+            The curve the data is requested for.
+        requested_seconds : float
+            The length of the requested time range.
+
+        Returns
+        -------
+        str
+            The processing command, or an empty string for raw data.
+        """
+        # Max amount of raw data to return before using optimized data
+        max_data_request = int(0.80 * self.getArchiveBufferSize())
+        if requested_seconds <= max_data_request:
+            return ""
+        optimized_data_bins = getattr(curve, "optimized_data_bins", None) or self.optimized_data_bins
+        return "optimized_" + str(optimized_data_bins)
+
+    def _handle_caching_off(self, min_x: float, max_x: float) -> None:
+        """Request the new range's data when the x-axis range changes. Unlike
+        PyDMArchiverTimePlot, requests are made while others are in flight,
+        as they supersede them, so the plot is never left without the data
+        for its final range.
+
+        Parameters
+        ----------
+        min_x : float
+            Timestamp at the left of the new range.
+        max_x : float
+            Timestamp at the right of the new range.
+        """
+        if min_x == self._min_x and max_x == self._max_x:
+            return
+        self._min_x = min_x
+        self._max_x = max_x
+        self.setTimeSpan(max_x - min_x)
+        if not self._archive_request_queued:
+            self._archive_request_queued = True
+            QTimer.singleShot(self.request_cooldown, self.requestDataFromArchiver)
+
+    def requestDataFromArchiver(self, min_x: float = None, max_x: float = None) -> None:
+        """Request archive data for every visible curve, as
+        PyDMArchiverTimePlot does, letting Trace's curves serve the requests
+        from the archive cache when they can. Requests that supersede one
+        still in flight take over its place among the pending responses.
+
+        Parameters
+        ----------
+        min_x : float, optional
+            Timestamp of the start of the time range, by default the left of the plot.
+        max_x : float, optional
+            Timestamp of the end of the time range, by default the oldest live
+            data of each curve.
+        """
+        requests_sent = 0
+        new_requests = 0
+        if min_x is None:
+            min_x = self._min_x
+        for curve in self._curves:
+            if not (curve.use_archive_data and curve.isVisible()):
+                continue
+            superseded = self.request_curve_archive_data(curve, min_x, max_x)
+            if superseded is None:
+                continue
+            requests_sent += 1
+            new_requests += not superseded
+
+        self._pending_archive_responses += new_requests
+        if not requests_sent:
+            self._archive_request_queued = False
+        else:
+            self._archive_requested_at = time.time()
+            self.archive_request_started.emit()
+
+    def request_curve_archive_data(self, curve: ArchivePlotCurveItem, min_x: float, max_x: float = None) -> bool | None:
+        """Request one curve's archive data, without counting the request
+        among the pending responses.
+
+        Parameters
+        ----------
+        curve : ArchivePlotCurveItem
+            The curve to request data for.
+        min_x : float
+            Timestamp of the start of the time range.
+        max_x : float, optional
+            Timestamp of the end of the time range, by default the curve's oldest live data.
+
+        Returns
+        -------
+        bool | None
+            None if the range is too short to request, otherwise whether the
+            request superseded one still in flight.
+        """
+        if max_x is None:  # If the caller didn't request a max, use the oldest data from the curve
+            max_x = curve.min_x()
+        if not self._cache_data:
+            max_x = min(max_x, self._max_x)
+        requested_seconds = max_x - min_x
+        if requested_seconds <= MIN_TIME_SPAN:
+            return None  # Avoids noisy requests when first rendering the plot
+
+        processing_command = self.archive_processing_command(curve, requested_seconds)
+        if isinstance(curve, TraceCurveItem):
+            return curve.request_archive_data(min_x, max_x - 1, processing_command)
+        curve.archive_data_request_signal.emit(min_x, max_x - 1, processing_command)
+        return False
+
+    def wake_curve(self, curve: TraceCurveItem, since: float) -> None:
+        """Request the archive data a curve missed while it was dormant.
+
+        Parameters
+        ----------
+        curve : TraceCurveItem
+            The curve that was shown again.
+        since : float
+            Timestamp of when the curve went dormant.
+        """
+        requests = 0
+        if curve.use_archive_data and self._archive_requested_at > since:
+            requests += self.request_curve_archive_data(curve, self._min_x) is False
+        if curve.dormant_policy is DormantPolicy.UNSUBSCRIBE and curve.liveData and len(curve.live_buffer):
+            requests += curve.backfill_live_data(curve.live_buffer.times[-1], time.time())
+
+        if requests:
+            self._pending_archive_responses += requests
+            self.archive_request_started.emit()
+
+    def set_dormant_policy(self, policy: DormantPolicy) -> None:
+        """Set what hidden curves do with their live data subscriptions.
+
+        Parameters
+        ----------
+        policy : DormantPolicy
+            The new policy for every curve on the plot.
+        """
+        self.dormant_policy = policy
+        for curve in self._curves:
+            if isinstance(curve, TraceCurveItem):
+                curve.set_dormant_policy(policy)
+
+    def display_rate(self) -> float:
+        """The live updates per second the plot can display: one per
+        horizontal pixel over the visible time span.
+        """
+        min_x, max_x = self.plotItem.vb.viewRange()[0]
+        if max_x <= min_x:
+            return 0.0
+        return self.plotItem.vb.width() / (max_x - min_x)
+
+    @Slot()
+    def update_live_decimation(self) -> None:
+        """Measure each curve's live update rate and, with auto decimation,
+        decimate the live channels of curves updating faster than the plot
+        can display. Dormant curves keep their decimation until shown.
+        """
+        display_rate = self.display_rate()
+        for curve in self._curves:
+            if not isinstance(curve, TraceCurveItem):
+                continue
+            rate = curve.measure_update_rate()
+            if curve.dormant:
+                continue
+            curve.set_auto_decimation(rate_decimation(rate, display_rate) if self.auto_live_decimation else 1)
+
+    def set_auto_live_decimation(self, enabled: bool) -> None:
+        """Enable or disable decimating fast live channels automatically.
+        Disabling it removes the decimation already applied.
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether live channels are decimated automatically.
+        """
+        self.auto_live_decimation = enabled
+        if enabled:
+            return
+        for curve in self._curves:
+            if isinstance(curve, TraceCurveItem):
+                curve.set_auto_decimation(1)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """Paint the plot, recording the time taken in the shared metrics."""
+        with metrics.timer("render.paint"):
+            super().paintEvent(event)
+
+    def setBufferSize(self, value: int) -> None:
+        """Set the number of live samples retained for every curve of the
+        plot. Other windows' curves keep their own windows' settings.
+
+        Parameters
+        ----------
+        value : int
+            The new capacity of each curve's live buffer.
+        """
+        super().setBufferSize(value)
+        self.live_data_store.set_capacity(self._bufferSize)
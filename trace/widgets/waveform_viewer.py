@@ -0,0 +1,238 @@
+import time
+
+import numpy as np
+from pyqtgraph import ImageItem, PlotWidget, colormap
+from qtpy.QtGui import QHideEvent, QShowEvent
+from qtpy.QtCore import Qt, Slot, QRectF, QTimer
+from qtpy.QtWidgets import (
+    QLabel,
+    QWidget,
+    QSpinBox,
+    QLineEdit,
+    QHBoxLayout,
+    QPushButton,
+    QVBoxLayout,
+)
+
+from pydm.utilities import remove_protocol
+from pydm.widgets.channel import PyDMChannel
+
+from services import ArchiveFetcher, decode_waveform_data
+from utilities import WaveformBuffer, median_interval
+
+
+class WaveformViewer(QWidget):
+    """Window for a waveform (array) PV, such as a BPM or profile monitor
+    readout: a plot of its latest waveform above a waterfall image of its
+    recent history, newest at the top.
+
+    Waveforms are appended to a preallocated WaveformBuffer as they arrive,
+    at up to the PV's full rate, and the plots are redrawn at most every
+    RENDER_MS from zero-copy views of the buffer. The PV is only subscribed
+    while the viewer is shown. History from before the viewer was opened can
+    be fetched from the archiver, limited to what the history has room for,
+    and is merged in behind the live waveforms.
+
+    Parameters
+    ----------
+    archive_fetcher : ArchiveFetcher, optional
+        Sends the viewer's archive requests, by default a new one.
+    parent : QWidget, optional
+        The parent widget, by default None.
+    capacity : int, optional
+        The number of waveforms kept in the history, by default
+        WaveformBuffer's default.
+    """
+
+    RENDER_MS = 50
+    DEFAULT_HISTORY_S = 60
+
+    def __init__(self, archive_fetcher: ArchiveFetcher = None, parent: QWidget = None, capacity: int = None):
+        super().__init__(parent)
+        self.setWindowFlag(Qt.Window)
+        self.resize(700, 700)
+        self.setWindowTitle("Waveform Viewer")
+        self.archive_fetcher = archive_fetcher if archive_fetcher is not None else ArchiveFetcher(self)
+        self.buffer = WaveformBuffer() if capacity is None else WaveformBuffer(capacity)
+        self.address = ""
+        self.channel = None
+        self._dirty = False
+
+        layout = QVBoxLayout(self)
+        controls_layout = QHBoxLayout()
+        self.address_line_edit = QLineEdit()
+        self.address_line_edit.setPlaceholderText("Waveform PV")
+        self.address_line_edit.returnPressed.connect(self.set_address_from_line_edit)
+        self.history_spin_box = QSpinBox()
+        self.history_spin_box.setRange(1, 7 * 24 * 3600)
+        self.history_spin_box.setValue(self.DEFAULT_HISTORY_S)
+        self.history_spin_box.setSuffix(" s")
+        self.history_spin_box.setToolTip("Length of history to fetch from the archiver")
+        self.fetch_button = QPushButton("Fetch Archive")
+        self.fetch_button.clicked.connect(self.fetch_archive)
+        self.status_label = QLabel()
+        controls_layout.addWidget(self.address_line_edit)
+        controls_layout.addWidget(self.history_spin_box)
+        controls_layout.addWidget(self.fetch_button)
+        layout.addLayout(controls_layout)
+        layout.addWidget(self.status_label)
+
+        self.latest_plot = PlotWidget(self)
+        self.latest_plot.showGrid(x=True, y=True)
+        self.latest_plot.setLabel("bottom", "Element")
+        self.latest_curve = self.latest_plot.plot(pen="c")
+        layout.addWidget(self.latest_plot, 1)
+
+        self.waterfall_plot = PlotWidget(self)
+        self.waterfall_plot.setLabel("bottom", "Element")
+        self.waterfall_plot.setLabel("left", "Waveforms Ago")
+        self.waterfall_plot.setXLink(self.latest_plot)
+        self.waterfall = ImageItem(axisOrder="row-major")
+        self.waterfall.setColorMap(colormap.get("viridis"))
+        self.waterfall_plot.addItem(self.waterfall)
+        layout.addWidget(self.waterfall_plot, 2)
+
+        self._render_timer = QTimer(self)
+        self._render_timer.setInterval(self.RENDER_MS)
+        self._render_timer.timeout.connect(self.render)
+
+    def channels(self) -> list[PyDMChannel]:
+        """The viewer's live channel, for PyDM to close with the window."""
+        return [] if self.channel is None else [self.channel]
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        self.subscribe()
+        self._render_timer.start()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        super().hideEvent(event)
+        self._render_timer.stop()
+        self.unsubscribe()
+
+    @Slot()
+    def set_address_from_line_edit(self) -> None:
+        """Show the PV entered in the address line edit."""
+        self.set_address(self.address_line_edit.text().strip())
+
+    def set_address(self, address: str) -> None:
+        """Show a different waveform PV, discarding the previous one's history.
+
+        Parameters
+        ----------
+        address : str
+            The PV's address, or an empty string for none.
+        """
+        self.unsubscribe()
+        self.archive_fetcher.cancel(self)
+        self.address = address
+        self.address_line_edit.setText(address)
+        self.buffer.clear()
+        self._dirty = True
+        if self.isVisible():
+            self.subscribe()
+        self.render()
+
+    def subscribe(self) -> None:
+        """Subscribe to the PV's live waveforms."""
+        if self.channel is not None or not self.address:
+            return
+        self.channel = PyDMChannel(
+            address=self.address, connection_slot=self.receive_connection, value_slot=self.receive_waveform
+        )
+        self.channel.connect()
+
+    def unsubscribe(self) -> None:
+        """Stop receiving the PV's live waveforms."""
+        channel, self.channel = self.channel, None
+        if channel is not None:
+            channel.disconnect()
+
+    @Slot(bool)
+    def receive_connection(self, connected: bool) -> None:
+        """Show whether the PV is connected."""
+        self.status_label.setText("" if connected else f"{self.address} is disconnected")
+
+    def receive_waveform(self, waveform: np.ndarray) -> None:
+        """Timestamp a live waveform and append it to the history.
+
+        Parameters
+        ----------
+        waveform : np.ndarray
+            The PV's new value.
+        """
+        self.buffer.append(time.time(), np.atleast_1d(np.asarray(waveform, dtype=float)))
+        self._dirty = True
+
+    @Slot()
+    def fetch_archive(self) -> None:
+        """Fetch the archived waveforms from the history length before the
+        oldest waveform shown, or before now.
+
+        Only as many waveforms as the history has room for are requested:
+        the range is shortened to that many of the live waveforms' intervals,
+        and a range longer than one second per free row is sampled by the
+        archiver to one waveform per bin. Replies are decoded on the
+        fetcher's worker thread.
+        """
+        if not self.address:
+            return
+        free = self.buffer.capacity - len(self.buffer)
+        if free <= 0:
+            self.status_label.setText("The history is full")
+            return
+        end = self.buffer.times[0] if len(self.buffer) else time.time()
+        history = self.history_spin_box.value()
+        interval = median_interval(self.buffer.times)
+        if np.isfinite(interval):
+            history = min(history, interval * free)
+        processing_command = f"lastSample_{int(np.ceil(history / free))}" if history > free else ""
+
+        self.status_label.setText("Fetching archive data...")
+        self.archive_fetcher.fetch(
+            self,
+            remove_protocol(self.address),
+            end - history,
+            end,
+            processing_command,
+            self.receive_archive,
+            decode=decode_waveform_data,
+            threaded=True,
+        )
+
+    def receive_archive(self, data: tuple[np.ndarray, np.ndarray] | None) -> None:
+        """Merge archived waveforms into the history.
+
+        Parameters
+        ----------
+        data : tuple[np.ndarray, np.ndarray] | None
+            The waveforms' timestamps and the waveforms, one per row, or
+            None if the request failed.
+        """
+        if data is None:
+            self.status_label.setText("Unable to fetch archive data")
+            return
+        times, waveforms = data
+        self.status_label.setText(f"Fetched {times.size} archived waveforms")
+        self.buffer.insert(times, waveforms)
+        self._dirty = True
+        self.render()
+
+    @Slot()
+    def render(self) -> None:
+        """Redraw the latest waveform and the waterfall if the history has changed."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        latest = self.buffer.latest()
+        if latest is None:
+            self.latest_curve.clear()
+            self.waterfall.clear()
+            return
+
+        self.latest_curve.setData(latest)
+        if not np.isfinite(latest).any():
+            return
+        image = self.buffer.image
+        self.waterfall.setImage(image, autoLevels=True)
+        self.waterfall.setRect(QRectF(0, -len(image), image.shape[1], len(image)))